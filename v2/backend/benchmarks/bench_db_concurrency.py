@@ -0,0 +1,162 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Read latency under mixed read/write load, with and without the read pool.
+
+Seeds a throwaway database with synthetic recordings, then runs concurrent
+readers (list_recordings, FTS search, transcript fetch) alongside a writer
+that performs rerate-style bulk speaker_mapping updates. Reports p50/p95/max
+read latency for read_pool_size=0 (everything on the writer) and for the
+configured pool size.
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/bench_db_concurrency.py [--recordings 5000] [--pool 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import app.database as db_mod  # noqa: E402
+from app.config import Settings  # noqa: E402
+from app.services import recording_service  # noqa: E402
+
+WORDS = (
+    "budget roadmap hiring launch design review customer pipeline quarterly "
+    "migration latency database incident retro planning demo feedback"
+).split()
+
+
+def _text(n_words: int) -> str:
+    return " ".join(random.choices(WORDS, k=n_words))
+
+
+async def _seed(n: int, user_id: str) -> None:
+    db = await db_mod.get_write_db()
+    await db.execute("INSERT INTO users (id, name) VALUES (?, 'Bench')", (user_id,))
+    for i in range(n):
+        mapping = {
+            f"Speaker {s}": {
+                "displayName": f"Person {s}",
+                "identificationStatus": "unknown",
+                "embeddingId": i * 3 + s,
+            }
+            for s in range(3)
+        }
+        await db.execute(
+            """INSERT INTO recordings
+               (id, user_id, title, original_filename, source, status,
+                transcript_text, diarized_text, speaker_mapping, recorded_at)
+               VALUES (?, ?, ?, 'bench.mp3', 'upload', 'ready', ?, ?, ?,
+                       datetime('now', ?))""",
+            (
+                str(uuid.uuid4()), user_id, _text(6), _text(400), _text(400),
+                json.dumps(mapping), f"-{i} minutes",
+            ),
+        )
+    await db.commit()
+
+
+async def _writer(user_id: str, stop: asyncio.Event) -> int:
+    """Rewrite every recording's speaker_mapping, committing once per pass."""
+    db = await db_mod.get_write_db()
+    passes = 0
+    while not stop.is_set():
+        rows = await db.execute_fetchall(
+            "SELECT id, speaker_mapping FROM recordings WHERE user_id = ?", (user_id,)
+        )
+        for row in rows:
+            mapping = json.loads(row["speaker_mapping"])
+            for entry in mapping.values():
+                entry["similarity"] = random.random()
+            await db.execute(
+                "UPDATE recordings SET speaker_mapping = ?, updated_at = datetime('now') WHERE id = ?",
+                (json.dumps(mapping), row["id"]),
+            )
+        await db.commit()
+        passes += 1
+    return passes
+
+
+async def _reader(user_id: str, n_ops: int, latencies: list[float]) -> None:
+    for i in range(n_ops):
+        start = time.perf_counter()
+        kind = i % 3
+        if kind == 0:
+            await recording_service.list_recordings(user_id, page=random.randint(1, 20))
+        elif kind == 1:
+            await recording_service.list_recordings(user_id, search=random.choice(WORDS))
+        else:
+            db = await db_mod.get_read_db()
+            await db.execute_fetchall(
+                "SELECT diarized_text FROM recordings WHERE user_id = ? LIMIT 1 OFFSET ?",
+                (user_id, random.randint(0, 100)),
+            )
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _run(db_path: Path, pool_size: int, n_recordings: int, readers: int, ops: int) -> dict:
+    settings = Settings(database_path=str(db_path), database_read_pool_size=pool_size)
+    db_mod.get_settings = lambda: settings  # type: ignore[assignment]
+    await db_mod.init_db()
+
+    user_id = "bench-user"
+    rows = await (await db_mod.get_write_db()).execute_fetchall("SELECT 1 FROM users")
+    if not rows:
+        await _seed(n_recordings, user_id)
+
+    stop = asyncio.Event()
+    writer_task = asyncio.create_task(_writer(user_id, stop))
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_reader(user_id, ops, latencies) for _ in range(readers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    passes = await writer_task
+    await db_mod.close_db()
+
+    latencies.sort()
+    return {
+        "pool_size": pool_size,
+        "reads": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "max_ms": round(latencies[-1], 1),
+        "reads_per_s": round(len(latencies) / elapsed, 1),
+        "writer_passes": passes,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", type=int, default=2000)
+    parser.add_argument("--pool", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=30, help="Reads per reader")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        results = []
+        for pool_size in (0, args.pool):
+            results.append(
+                await _run(db_path, pool_size, args.recordings, args.readers, args.ops)
+            )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""ECAPA embedding wall time: one forward pass per window vs batched windows.
+
+Builds the same window set speaker_processor._select_windows picks for a typical
+recording (speakers x MAX_SEGMENTS_PER_SPEAKER center windows, plus a
+ragged tail of shorter ones), then embeds it once per window with
+embedding_from_waveform and again with embeddings_for_windows at several
+batch sizes. Also reports the minimum cosine similarity between the
+per-window and batched embeddings, to show padding with wav_lens does not
+change the result materially.
+
+Uses a real audio file if given, otherwise synthetic noise (timing is the
+same; ECAPA cost depends only on length).
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/bench_ecapa_batching.py [--audio path.mp3] \\
+        [--speakers 4] [--threads 4] [--batch-sizes 8,16,32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from app.services.embedding_engine import EmbeddingEngine  # noqa: E402
+from app.services.speaker_processor import (  # noqa: E402
+    CENTER_WINDOW,
+    MAX_SEGMENTS_PER_SPEAKER,
+    MIN_DURATION,
+)
+
+
+def _windows(total_s: float, speakers: int) -> list[tuple[float, float]]:
+    random.seed(0)
+    out = []
+    for _ in range(speakers * MAX_SEGMENTS_PER_SPEAKER):
+        # ~70% full center windows, the rest ragged between MIN_DURATION and CENTER_WINDOW
+        dur = CENTER_WINDOW if random.random() < 0.7 else random.uniform(MIN_DURATION, CENTER_WINDOW)
+        start = random.uniform(0, total_s - dur)
+        out.append((start, start + dur))
+    return out
+
+
+def _cos(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--audio", help="Audio file (default: 30 min of synthetic noise)")
+    parser.add_argument("--speakers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = default)")
+    parser.add_argument("--batch-sizes", default="8,16,32")
+    parser.add_argument("--model-path", default="pretrained_models/spkrec-ecapa-voxceleb")
+    args = parser.parse_args()
+
+    import torch
+
+    engine = EmbeddingEngine(model_path=args.model_path, num_threads=args.threads)
+    engine._ensure_model()
+
+    if args.audio:
+        wav, sr = engine.load_audio_mono_16k(args.audio)
+    else:
+        sr = 16000
+        wav = torch.randn(1, 30 * 60 * sr) * 0.1
+    windows = _windows(wav.shape[1] / sr, args.speakers)
+
+    start = time.perf_counter()
+    baseline = []
+    for s, e in windows:
+        seg = engine.slice_audio(wav, sr, s, e)
+        baseline.append(engine.embedding_from_waveform(seg))
+    loop_s = time.perf_counter() - start
+
+    results = [{
+        "mode": "per_window",
+        "windows": len(windows),
+        "torch_threads": torch.get_num_threads(),
+        "wall_s": round(loop_s, 2),
+    }]
+    for size in (int(x) for x in args.batch_sizes.split(",")):
+        start = time.perf_counter()
+        batched = engine.embeddings_for_windows(wav, sr, windows, batch_size=size)
+        elapsed = time.perf_counter() - start
+        results.append({
+            "mode": f"batched_{size}",
+            "wall_s": round(elapsed, 2),
+            "speedup": round(loop_s / elapsed, 2),
+            "min_cosine_vs_per_window": round(min(_cos(a, b) for a, b in zip(baseline, batched)), 4),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""FTS re-index count and time per sync cycle: legacy vs column-scoped trigger.
+
+Replays the UPDATE statements one sync cycle issues against `recordings`
+(job submission, processing/status flips, transcript completion, search
+summary, speaker identification, meeting notes, and a re-rating pass over
+the library) under both the legacy whole-row `recordings_au` trigger and
+the current one from FTS_SCHEMA_SQL. A SQL function injected into each
+trigger body counts how often the FTS row is deleted and re-inserted.
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/bench_fts_writes.py [--library 2000] [--new 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from app.database import FTS_SCHEMA_SQL, SCHEMA_SQL  # noqa: E402
+
+LEGACY_AU_TRIGGER = """
+CREATE TRIGGER recordings_au AFTER UPDATE ON recordings BEGIN
+    INSERT INTO recordings_fts(recordings_fts, rowid, title, description, diarized_text, transcript_text, search_summary)
+    VALUES ('delete', old.rowid, old.title, old.description, old.diarized_text, old.transcript_text, old.search_summary);
+    INSERT INTO recordings_fts(rowid, title, description, diarized_text, transcript_text, search_summary)
+    VALUES (new.rowid, new.title, new.description, new.diarized_text, new.transcript_text, new.search_summary);
+END;
+"""
+
+WORDS = "budget roadmap hiring launch design review customer pipeline quarterly retro".split()
+
+
+def _text(n: int) -> str:
+    return " ".join(random.choices(WORDS, k=n))
+
+
+def _instrument(sql: str) -> str:
+    return sql.replace(
+        "BEGIN\n    INSERT INTO recordings_fts(recordings_fts",
+        "BEGIN\n    SELECT fts_reindexed();\n    INSERT INTO recordings_fts(recordings_fts",
+    )
+
+
+def _setup(path: Path, legacy: bool, library: int, counter: list[int]) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.create_function("fts_reindexed", 0, lambda: counter.append(1))
+    conn.executescript(SCHEMA_SQL)
+    fts_sql = FTS_SCHEMA_SQL
+    if legacy:
+        start = fts_sql.index("-- Only re-tokenize")
+        fts_sql = fts_sql[:start] + LEGACY_AU_TRIGGER
+    conn.executescript(_instrument(fts_sql))
+    conn.execute("INSERT INTO users (id, name) VALUES ('u', 'Bench')")
+    mapping = json.dumps({"Speaker 1": {"identificationStatus": "unknown"}})
+    conn.executemany(
+        """INSERT INTO recordings (id, user_id, title, original_filename, source, status,
+                                   transcript_text, diarized_text, speaker_mapping)
+           VALUES (?, 'u', ?, 'a.mp3', 'plaud', 'ready', ?, ?, ?)""",
+        [(str(uuid.uuid4()), _text(5), _text(3000), _text(3000), mapping) for _ in range(library)],
+    )
+    conn.commit()
+    return conn
+
+
+def _sync_cycle(conn: sqlite3.Connection, new: int) -> None:
+    """One scheduled sync + poll cycle, statement shapes from sync_service."""
+    ids = []
+    for _ in range(new):
+        rid = str(uuid.uuid4())
+        ids.append(rid)
+        conn.execute(
+            """INSERT INTO recordings (id, user_id, title, original_filename, source, status)
+               VALUES (?, 'u', ?, 'a.mp3', 'plaud', 'transcribing')""",
+            (rid, _text(4)),
+        )
+        conn.execute(
+            "UPDATE recordings SET provider_job_id = ?, processing_started = datetime('now') WHERE id = ?",
+            ("job", rid),
+        )
+    for rid in ids:
+        conn.execute("UPDATE recordings SET status = 'processing' WHERE id = ?", (rid,))
+        conn.execute(
+            """UPDATE recordings
+               SET status = 'ready', transcript_text = ?, diarized_text = ?, token_count = 1000,
+                   speaker_mapping = NULL, title = COALESCE(?, title),
+                   processing_completed = datetime('now'), updated_at = datetime('now')
+               WHERE id = ?""",
+            (_text(3000), _text(3000), _text(5), rid),
+        )
+        conn.execute(
+            "UPDATE recordings SET search_summary = ?, search_keywords = '[]', updated_at = datetime('now') WHERE id = ?",
+            (_text(60), rid),
+        )
+        conn.execute(
+            """UPDATE recordings SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'),
+                   updated_at = datetime('now') WHERE id = ?""",
+            (json.dumps({"Speaker 1": {"identificationStatus": "auto"}}), rid),
+        )
+        conn.execute(
+            """UPDATE recordings SET meeting_notes = ?, meeting_notes_generated_at = datetime('now'),
+                   updated_at = datetime('now') WHERE id = ?""",
+            (_text(200), rid),
+        )
+    # Re-rating pass touching a slice of the library
+    conn.execute(
+        """UPDATE recordings SET speaker_mapping = speaker_mapping,
+               speaker_mapping_updated_at = datetime('now'), updated_at = datetime('now')
+           WHERE rowid % 10 = 0"""
+    )
+    conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library", type=int, default=2000, help="Existing recordings")
+    parser.add_argument("--new", type=int, default=10, help="New recordings per cycle")
+    args = parser.parse_args()
+
+    results = []
+    for legacy in (True, False):
+        random.seed(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            counter: list[int] = []
+            conn = _setup(Path(tmp) / "bench.db", legacy, args.library, counter)
+            counter.clear()
+            start = time.perf_counter()
+            _sync_cycle(conn, args.new)
+            elapsed = time.perf_counter() - start
+            conn.close()
+        results.append({
+            "trigger": "legacy" if legacy else "column_scoped",
+            "fts_reindexes_per_cycle": len(counter),
+            "cycle_ms": round(elapsed * 1000, 1),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""DB size and list/scan latency with transcript_json inline vs in recording_content.
+
+Seeds N recordings with the raw transcript JSON stored on the recordings row
+(the legacy layout), measures, then runs the same move that _migrate_schema
+performs plus a VACUUM and measures again.
+
+Reported per layout: database file size, list_recordings p50/p95 (page 1 and
+a deep page), and a full rerate-style scan of (id, speaker_mapping).
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/bench_recording_content.py [--recordings 10000] [--json-kb 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import app.database as db_mod  # noqa: E402
+from app.config import Settings  # noqa: E402
+from app.services import content_store, recording_service  # noqa: E402
+
+WORDS = "budget roadmap hiring launch design review customer pipeline quarterly retro".split()
+
+
+def _transcript_json(target_bytes: int) -> str:
+    phrases = []
+    size = 0
+    offset = 0
+    while size < target_bytes:
+        text = " ".join(random.choices(WORDS, k=25))
+        phrase = {
+            "speaker": random.randint(1, 4),
+            "offsetInTicks": offset,
+            "durationInTicks": 50_000_000,
+            "nBest": [{"display": text, "confidence": random.random(),
+                       "words": [{"word": w, "offsetInTicks": offset} for w in text.split()]}],
+        }
+        offset += 50_000_000
+        phrases.append(phrase)
+        size += len(json.dumps(phrase))
+    return json.dumps({"recognizedPhrases": phrases})
+
+
+async def _seed(n: int, json_kb: int, user_id: str) -> None:
+    db = await db_mod.get_write_db()
+    await db.execute("INSERT INTO users (id, name) VALUES (?, 'Bench')", (user_id,))
+    samples = [_transcript_json(json_kb * 1024) for _ in range(20)]
+    for i in range(n):
+        mapping = {f"Speaker {s}": {"identificationStatus": "unknown", "embeddingId": i * 3 + s}
+                   for s in range(1, 4)}
+        await db.execute(
+            """INSERT INTO recordings
+               (id, user_id, title, original_filename, source, status, transcript_text,
+                diarized_text, transcript_json, speaker_mapping, recorded_at)
+               VALUES (?, ?, ?, 'bench.mp3', 'plaud', 'ready', ?, ?, ?, ?, datetime('now', ?))""",
+            (str(uuid.uuid4()), user_id, " ".join(random.choices(WORDS, k=5)),
+             " ".join(random.choices(WORDS, k=800)), " ".join(random.choices(WORDS, k=800)),
+             random.choice(samples), json.dumps(mapping), f"-{i} minutes"),
+        )
+        if i % 1000 == 999:
+            await db.commit()
+    await db.commit()
+
+
+async def _measure(db_path: Path, user_id: str, label: str) -> dict:
+    db = await db_mod.get_write_db()
+    await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    async def timed(coro_fn, reps: int) -> list[float]:
+        out = []
+        for _ in range(reps):
+            start = time.perf_counter()
+            await coro_fn()
+            out.append((time.perf_counter() - start) * 1000)
+        return sorted(out)
+
+    first = await timed(lambda: recording_service.list_recordings(user_id, page=1), 30)
+    deep = await timed(lambda: recording_service.list_recordings(user_id, page=200), 30)
+    scan = await timed(
+        lambda: db.execute_fetchall(
+            "SELECT id, speaker_mapping FROM recordings WHERE user_id = ?", (user_id,)
+        ),
+        5,
+    )
+    return {
+        "layout": label,
+        "db_mb": round(db_path.stat().st_size / 1e6, 1),
+        "list_page1_p50_ms": round(statistics.median(first), 2),
+        "list_page1_p95_ms": round(first[int(len(first) * 0.95) - 1], 2),
+        "list_page200_p50_ms": round(statistics.median(deep), 2),
+        "mapping_scan_p50_ms": round(statistics.median(scan), 1),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", type=int, default=10000)
+    parser.add_argument("--json-kb", type=int, default=40, help="Approx transcript_json size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        settings = Settings(database_path=str(db_path), database_read_pool_size=0)
+        db_mod.get_settings = lambda: settings  # type: ignore[assignment]
+        await db_mod.init_db()
+
+        user_id = "bench-user"
+        await _seed(args.recordings, args.json_kb, user_id)
+        results = [await _measure(db_path, user_id, "inline")]
+
+        db = await db_mod.get_write_db()
+        moved = await content_store.move_inline_transcript_json(db)
+        await db.execute("VACUUM")
+        results.append(await _measure(db_path, user_id, "recording_content"))
+        results[-1]["moved"] = moved
+
+        await db_mod.close_db()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
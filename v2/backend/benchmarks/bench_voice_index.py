@@ -0,0 +1,118 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Voice index latency at library scale.
+
+Seeds a throwaway database with synthetic recordings carrying speaker
+embeddings (--speakers rows in total), then reports:
+
+  - cold load of the per-user voice index
+  - find_voice_matches latency (p50/p95) against a warm index
+  - refresh cost after a few recordings are identified (incremental append)
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/bench_voice_index.py [--speakers 100000] [--queries 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import app.database as db_mod  # noqa: E402
+from app.config import Settings  # noqa: E402
+from app.services import speaker_embedding_store, voice_index  # noqa: E402
+
+SPEAKERS_PER_RECORDING = 4
+
+
+async def _seed_recordings(user_id: str, n: int, rng: np.random.Generator) -> list[str]:
+    db = await db_mod.get_write_db()
+    rec_ids = []
+    for _ in range(n):
+        rec_id = str(uuid.uuid4())
+        rec_ids.append(rec_id)
+        await db.execute(
+            """INSERT INTO recordings (id, user_id, title, original_filename, source, status)
+               VALUES (?, ?, 'bench', 'bench.mp3', 'plaud', 'ready')""",
+            (rec_id, user_id),
+        )
+        mapping = {}
+        for s in range(SPEAKERS_PER_RECORDING):
+            label = f"Speaker {s + 1}"
+            emb = rng.standard_normal(192).astype(np.float32)
+            mapping[label] = {
+                "identificationStatus": "unknown",
+                "embeddingId": await speaker_embedding_store.save_embedding(rec_id, label, emb, db=db),
+            }
+        await db.execute(
+            "UPDATE recordings SET speaker_mapping = ? WHERE id = ?", (json.dumps(mapping), rec_id)
+        )
+    await db.commit()
+    return rec_ids
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--speakers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(database_path=str(Path(tmp) / "bench.db"))
+        db_mod.get_settings = lambda: settings  # type: ignore[assignment]
+        voice_index.get_settings = lambda: settings  # type: ignore[assignment]
+        await db_mod.init_db()
+
+        user_id = "bench-user"
+        await (await db_mod.get_write_db()).execute(
+            "INSERT INTO users (id, name) VALUES (?, 'Bench')", (user_id,)
+        )
+        rec_ids = await _seed_recordings(user_id, args.speakers // SPEAKERS_PER_RECORDING, rng)
+
+        start = time.perf_counter()
+        index = await voice_index.get_index(user_id)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        latencies = []
+        for _ in range(args.queries):
+            rec = rec_ids[int(rng.integers(len(rec_ids)))]
+            start = time.perf_counter()
+            await voice_index.find_voice_matches(
+                user_id, recording_id=rec, speaker_label="Speaker 1", threshold=0.2,
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        await _seed_recordings(user_id, 5, rng)
+        start = time.perf_counter()
+        grown = await voice_index.get_index(user_id)
+        refresh_ms = (time.perf_counter() - start) * 1000
+
+        await db_mod.close_db()
+
+    print(json.dumps({
+        "entries": len(index),
+        "cold_load_ms": round(cold_ms, 1),
+        "query_p50_ms": round(statistics.median(latencies), 1),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "incremental_refresh_ms": round(refresh_ms, 1),
+        "entries_after_refresh": len(grown),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
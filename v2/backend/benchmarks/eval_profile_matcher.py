@@ -0,0 +1,196 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Profile matcher accuracy vs. latency: centroid, subcentroid and knn.
+
+Reads manually verified speaker_mapping entries (speaker embedding +
+participantId) from a QuickScribe database, holds out every Nth recording
+per participant as the test set, builds profiles from the rest the way
+profile_store does, and scores each held-out speaker with every
+ProfileMatrix mode. Reports, per mode:
+
+  - top1_accuracy: best candidate is the right participant
+  - auto_precision / auto_recall at speaker_id_auto_threshold
+  - suggest_recall at speaker_id_suggest_threshold
+  - query latency for the whole test batch (median of --repeat runs)
+
+Without --db, uses synthetic speakers recorded under two acoustic
+conditions each (the case sub-centroids target).
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/eval_profile_matcher.py [--db data/app.db] [--user USER_ID] \\
+        [--holdout-every 5] [--subcentroids 3] [--knn-k 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from app.config import Settings  # noqa: E402
+from app.services import profile_store  # noqa: E402
+from app.services.profile_store import ProfileMatrix  # noqa: E402
+
+# (participant_id, recording_id, embedding)
+Sample = tuple[str, str, np.ndarray]
+
+
+def _load_verified(db_path: str, user_id: str | None) -> list[Sample]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    sql = "SELECT id, speaker_mapping FROM recordings WHERE speaker_mapping IS NOT NULL"
+    rows = conn.execute(sql + (" AND user_id = ?" if user_id else ""), (user_id,) if user_id else ())
+    samples = []
+    for r in rows:
+        try:
+            mapping = json.loads(r["speaker_mapping"])
+        except (json.JSONDecodeError, TypeError):
+            continue
+        for entry in mapping.values():
+            if not isinstance(entry, dict) or not entry.get("manuallyVerified"):
+                continue
+            pid = entry.get("participantId")
+            if not pid:
+                continue
+            if entry.get("embeddingId"):
+                blob = conn.execute(
+                    "SELECT vector FROM speaker_embeddings WHERE id = ?", (entry["embeddingId"],)
+                ).fetchone()
+                emb = np.frombuffer(blob[0], dtype=np.float32) if blob else None
+            elif entry.get("embedding"):
+                emb = np.asarray(entry["embedding"], dtype=np.float32)
+            else:
+                emb = None
+            if emb is not None and emb.shape == (profile_store.EMBEDDING_DIM,):
+                samples.append((pid, r["id"], emb))
+    conn.close()
+    return samples
+
+
+def _synthetic(speakers: int, per_condition: int, rng: np.random.Generator) -> list[Sample]:
+    dim = profile_store.EMBEDDING_DIM
+    samples = []
+    for s in range(speakers):
+        base = rng.standard_normal(dim)
+        # Two acoustic conditions: shared voice plus a condition-specific shift
+        conditions = [base + 1.2 * rng.standard_normal(dim) for _ in range(2)]
+        for c, center in enumerate(conditions):
+            for i in range(per_condition):
+                emb = center + 0.6 * rng.standard_normal(dim)
+                samples.append((f"p{s}", f"r{s}-{c}-{i}", emb.astype(np.float32)))
+    return samples
+
+
+def _split(samples: list[Sample], every: int) -> tuple[list[Sample], list[Sample]]:
+    by_pid: dict[str, list[Sample]] = {}
+    for s in samples:
+        by_pid.setdefault(s[0], []).append(s)
+    train, test = [], []
+    for group in by_pid.values():
+        group.sort(key=lambda s: s[1])
+        if len(group) < 2:
+            train.extend(group)
+            continue
+        for i, s in enumerate(group):
+            (test if i % every == every - 1 else train).append(s)
+    return train, test
+
+
+def _profiles(train: list[Sample], n_sub: int) -> list[dict]:
+    by_pid: dict[str, list[np.ndarray]] = {}
+    for pid, _, emb in train:
+        by_pid.setdefault(pid, []).append(profile_store._l2_normalize(emb))
+    profiles = []
+    for pid, embs in by_pid.items():
+        embs = embs[-profile_store.MAX_EMBEDDINGS_PER_PROFILE:]
+        profiles.append({
+            "participant_id": pid,
+            "display_name": pid,
+            "centroid": profile_store._compute_centroid(embs),
+            "embeddings": embs,
+            "subcentroids": profile_store._compute_subcentroids(embs, n_sub),
+        })
+    return profiles
+
+
+def _evaluate(matrix: ProfileMatrix, test: list[Sample], auto_t: float, suggest_t: float,
+              repeat: int) -> dict:
+    queries = np.stack([emb for _, _, emb in test])
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = matrix.top_candidates(queries, top_n=5, threshold=0.0)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    top1 = auto_hits = auto_total = suggest_hits = 0
+    for (pid, _, _), candidates in zip(test, results):
+        best = candidates[0] if candidates else None
+        correct = best is not None and best["participantId"] == pid
+        top1 += correct
+        if best and best["similarity"] >= auto_t:
+            auto_total += 1
+            auto_hits += correct
+        if correct and best["similarity"] >= suggest_t:
+            suggest_hits += 1
+
+    n = len(test)
+    return {
+        "mode": matrix.mode,
+        "top1_accuracy": round(top1 / n, 4),
+        "auto_precision": round(auto_hits / auto_total, 4) if auto_total else None,
+        "auto_recall": round(auto_hits / n, 4),
+        "suggest_recall": round(suggest_hits / n, 4),
+        "batch_ms": round(statistics.median(timings), 2),
+        "per_query_us": round(statistics.median(timings) * 1000 / n, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="SQLite database (default: synthetic data)")
+    parser.add_argument("--user", help="Only this user's recordings")
+    parser.add_argument("--holdout-every", type=int, default=5)
+    parser.add_argument("--subcentroids", type=int, default=3)
+    parser.add_argument("--knn-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--speakers", type=int, default=50, help="Synthetic speakers")
+    args = parser.parse_args()
+
+    settings = Settings()
+    if args.db:
+        samples = _load_verified(args.db, args.user)
+    else:
+        samples = _synthetic(args.speakers, 10, np.random.default_rng(0))
+    train, test = _split(samples, args.holdout_every)
+    if not test:
+        sys.exit("Not enough verified speakers to hold any out")
+
+    profiles = _profiles(train, args.subcentroids)
+    results = {
+        "profiles": len(profiles),
+        "train": len(train),
+        "test": len(test),
+        "modes": [
+            _evaluate(
+                ProfileMatrix(profiles, mode=mode, knn_k=args.knn_k), test,
+                settings.speaker_id_auto_threshold, settings.speaker_id_suggest_threshold,
+                args.repeat,
+            )
+            for mode in ProfileMatrix.MODES
+        ],
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+# /// script
+# requires-python = ">=3.11"
+# ///
+"""Offline speaker-ID evaluation: accuracy and throughput from verified mappings.
+
+Replays the speaker_processor pipeline (diarization parse, segment merge,
+_select_windows, window decode + ECAPA embedding, _match_speakers) over
+every recording that has manually verified speakers, reading a local
+SQLite database and local blobs. Nothing is written to the database.
+
+Profiles are leave-one-recording-out: each recording is matched against
+profiles built from the verified speakers of the user's *other*
+recordings, using the fresh centroids from this run (or the stored
+speaker_embeddings row when a recording could not be embedded), so a
+speaker never matches their own sample.
+
+Reports, for the configured speaker_id_matcher:
+
+  - auto precision / recall at speaker_id_auto_threshold
+  - suggest precision / recall (auto or suggest) at speaker_id_suggest_threshold
+  - top1 accuracy of the best candidate
+  - embeddings per second, audio decode time, and matching time
+
+Recall is over "enrolled" speakers (whose participant has a profile from
+other recordings); unenrolled speakers only count against precision.
+
+--use-cache reuses segment_embeddings rows for the current model version
+and only decodes windows that are missing; --cache-only skips audio
+entirely (accuracy only, no decode/embedding timings).
+
+Usage:
+    cd v2/backend
+    PYTHONPATH=src uv run benchmarks/eval_speaker_id.py [--db data/app.db] \\
+        [--blob-dir data/blobs] [--user USER_ID] [--limit N] [--use-cache | --cache-only] \\
+        [--matcher centroid] [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from app.config import Settings  # noqa: E402
+from app.services import content_store, profile_store, segment_store, speaker_processor  # noqa: E402
+from app.services.embedding_engine import (  # noqa: E402
+    EmbeddingEngine,
+    decode_windows,
+    l2_normalize,
+    merge_adjacent_segments,
+)
+from app.services.profile_store import ProfileMatrix  # noqa: E402
+
+
+@dataclass
+class Case:
+    recording_id: str
+    user_id: str
+    file_path: str | None
+    transcript_json: str | None
+    truth: dict[str, str]  # speaker_label -> participant_id
+    stored: dict[str, np.ndarray]  # speaker_label -> stored embedding
+    labels: list[str] = field(default_factory=list)
+    embeddings: list[np.ndarray | None] = field(default_factory=list)
+    centroids: dict[str, np.ndarray] = field(default_factory=dict)
+    windows: int = 0
+    audio_s: float = 0.0
+    decode_s: float = 0.0
+    embed_s: float = 0.0
+    embedded: int = 0
+    skipped: str | None = None
+
+
+def _load_cases(conn: sqlite3.Connection, user_id: str | None, limit: int | None) -> list[Case]:
+    sql = """SELECT r.id, r.user_id, r.file_path, r.speaker_mapping,
+                    rc.transcript_json AS content, rc.encoding
+             FROM recordings r
+             LEFT JOIN recording_content rc ON rc.recording_id = r.id
+             WHERE r.speaker_mapping LIKE '%manuallyVerified%'"""
+    params: tuple = ()
+    if user_id:
+        sql += " AND r.user_id = ?"
+        params = (user_id,)
+    sql += " ORDER BY r.recorded_at"
+
+    cases = []
+    for r in conn.execute(sql, params):
+        try:
+            mapping = json.loads(r["speaker_mapping"])
+        except (json.JSONDecodeError, TypeError):
+            continue
+        truth: dict[str, str] = {}
+        stored: dict[str, np.ndarray] = {}
+        for label, entry in mapping.items():
+            if not isinstance(entry, dict) or not entry.get("manuallyVerified"):
+                continue
+            pid = entry.get("participantId")
+            if not pid:
+                continue
+            truth[label] = pid
+            if entry.get("embeddingId"):
+                blob = conn.execute(
+                    "SELECT vector FROM speaker_embeddings WHERE id = ?", (entry["embeddingId"],)
+                ).fetchone()
+                if blob and len(blob[0]) == profile_store.EMBEDDING_DIM * 4:
+                    stored[label] = np.frombuffer(blob[0], dtype=np.float32).copy()
+        if not truth:
+            continue
+        cases.append(Case(
+            recording_id=r["id"],
+            user_id=r["user_id"],
+            file_path=r["file_path"],
+            transcript_json=content_store.decode_transcript_json(r["content"], r["encoding"]),
+            truth=truth,
+            stored=stored,
+        ))
+        if limit and len(cases) >= limit:
+            break
+    return cases
+
+
+def _cached_windows(conn: sqlite3.Connection, recording_id: str, version: str) -> dict:
+    rows = conn.execute(
+        """SELECT start_ms, end_ms, vector FROM segment_embeddings
+           WHERE recording_id = ? AND model_version = ?""",
+        (recording_id, version),
+    )
+    return {
+        (r["start_ms"], r["end_ms"]):
+            np.frombuffer(r["vector"], dtype=np.float32).copy() if r["vector"] is not None else None
+        for r in rows
+    }
+
+
+def _embed_case(
+    case: Case,
+    conn: sqlite3.Connection,
+    engine: EmbeddingEngine | None,
+    blob_dir: Path,
+    version: str,
+    use_cache: bool,
+) -> None:
+    """Run the audio half of the pipeline for one recording, timing each stage."""
+    if not case.transcript_json:
+        case.skipped = "no transcript"
+        return
+    diarization = speaker_processor._parse_diarization(case.transcript_json)
+    if not diarization:
+        case.skipped = "no diarization"
+        return
+    diarization = merge_adjacent_segments(diarization)
+
+    # Identify every speaker, including the verified ones we score against
+    windows, case.labels = speaker_processor._select_windows(diarization, set())
+    if not windows:
+        case.skipped = "no windows"
+        return
+    case.windows = len(windows)
+
+    cached = _cached_windows(conn, case.recording_id, version) if use_cache else {}
+    by_key = {segment_store.window_key(w): cached[segment_store.window_key(w)]
+              for w in windows if segment_store.window_key(w) in cached}
+    missing = [w for w in windows if segment_store.window_key(w) not in by_key]
+
+    if missing:
+        if engine is None:
+            case.skipped = "not cached"
+            return
+        audio = blob_dir / case.file_path if case.file_path else None
+        if audio is None or not audio.exists():
+            case.skipped = "no audio"
+            return
+        import torch
+
+        start = time.perf_counter()
+        pcm = decode_windows(str(audio), missing)
+        case.decode_s = time.perf_counter() - start
+        case.audio_s = sum(len(p) for p in pcm) / 16000
+
+        start = time.perf_counter()
+        computed = engine._embed_clips(
+            [torch.from_numpy(p) for p in pcm], 16000, speaker_processor.MIN_DURATION, None,
+        )
+        case.embed_s = time.perf_counter() - start
+        case.embedded = sum(e is not None for e in computed)
+        for w, emb in zip(missing, computed):
+            by_key[segment_store.window_key(w)] = emb
+
+    case.embeddings = [by_key[segment_store.window_key(w)] for w in windows]
+    per_label: dict[str, list[np.ndarray]] = {}
+    for label, emb in zip(case.labels, case.embeddings):
+        if emb is not None:
+            per_label.setdefault(label, []).append(l2_normalize(emb))
+    case.centroids = {
+        label: l2_normalize(np.stack(embs).mean(axis=0)) for label, embs in per_label.items()
+    }
+
+
+def _profile(pid: str, embs: list[np.ndarray], n_sub: int) -> dict:
+    embs = embs[-profile_store.MAX_EMBEDDINGS_PER_PROFILE:]
+    return {
+        "participant_id": pid,
+        "display_name": pid,
+        "centroid": profile_store._compute_centroid(embs),
+        "embeddings": embs,
+        "subcentroids": profile_store._compute_subcentroids(embs, n_sub),
+    }
+
+
+def _training_samples(cases: list[Case]) -> dict[str, list[tuple[str, str, np.ndarray]]]:
+    """Per user: (participant_id, recording_id, embedding) for each verified speaker."""
+    samples: dict[str, list[tuple[str, str, np.ndarray]]] = {}
+    for case in cases:
+        for label, pid in case.truth.items():
+            emb = case.centroids.get(label)
+            if emb is None:
+                emb = case.stored.get(label)
+            if emb is not None:
+                samples.setdefault(case.user_id, []).append(
+                    (pid, case.recording_id, profile_store._l2_normalize(emb))
+                )
+    return samples
+
+
+def _loo_matrix(
+    case: Case,
+    samples: list[tuple[str, str, np.ndarray]],
+    settings: Settings,
+) -> ProfileMatrix:
+    by_pid: dict[str, list[np.ndarray]] = {}
+    for pid, rec_id, emb in samples:
+        if rec_id != case.recording_id:
+            by_pid.setdefault(pid, []).append(emb)
+    profiles = [
+        _profile(pid, embs, settings.speaker_id_subcentroids) for pid, embs in by_pid.items()
+    ]
+    return ProfileMatrix(
+        profiles, mode=settings.speaker_id_matcher, knn_k=settings.speaker_id_knn_k,
+    )
+
+
+def _ratio(num: int, den: int) -> float | None:
+    return round(num / den, 4) if den else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="SQLite database (default: settings.database_path)")
+    parser.add_argument("--blob-dir", help="Local blob directory (default: settings.local_blob_path)")
+    parser.add_argument("--user", help="Only this user's recordings")
+    parser.add_argument("--limit", type=int, help="Max recordings to evaluate")
+    parser.add_argument("--matcher", choices=ProfileMatrix.MODES, help="Override speaker_id_matcher")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Reuse segment_embeddings; only embed missing windows")
+    parser.add_argument("--cache-only", action="store_true",
+                        help="Only use segment_embeddings (no audio, no timings)")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)-7s %(message)s",
+    )
+    settings = Settings()
+    if args.matcher:
+        settings.speaker_id_matcher = args.matcher
+    auto_t = settings.speaker_id_auto_threshold
+    suggest_t = settings.speaker_id_suggest_threshold
+    # _match_speakers reads thresholds through get_settings(); pin them to ours
+    speaker_processor._thresholds = lambda: (auto_t, suggest_t)
+
+    db_path = args.db or settings.database_path
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    blob_dir = Path(args.blob_dir or settings.local_blob_path or ".")
+    version = segment_store.model_version(settings.speaker_id_model_path)
+    engine = None
+    if not args.cache_only:
+        engine = EmbeddingEngine(
+            settings.speaker_id_model_path,
+            batch_size=settings.speaker_id_batch_size,
+            num_threads=settings.speaker_id_torch_threads,
+        )
+
+    cases = _load_cases(conn, args.user, args.limit)
+    if not cases:
+        sys.exit("No recordings with manually verified speakers")
+
+    load_start = time.perf_counter()
+    if engine is not None:
+        engine._ensure_model()
+    model_load_s = time.perf_counter() - load_start
+
+    for i, case in enumerate(cases, 1):
+        _embed_case(case, conn, engine, blob_dir, version, args.use_cache or args.cache_only)
+        print(
+            f"[{i}/{len(cases)}] {case.recording_id[:8]} "
+            f"{case.skipped or f'{case.windows} windows ({case.embedded} newly embedded)'}",
+            file=sys.stderr,
+        )
+    conn.close()
+
+    samples = _training_samples(cases)
+    evaluated = [c for c in cases if c.skipped is None]
+    speakers = enrolled = top1 = 0
+    auto_tp = auto_fp = suggest_tp = suggest_fp = 0
+    match_ms: list[float] = []
+    per_recording = []
+    for case in evaluated:
+        matrix = _loo_matrix(case, samples.get(case.user_id, []), settings)
+        start = time.perf_counter()
+        results = speaker_processor._match_speakers(case.labels, case.embeddings, set(), matrix)
+        match_ms.append((time.perf_counter() - start) * 1000)
+
+        rec_correct = 0
+        for label, pid in case.truth.items():
+            result = results.get(label)
+            if result is None:
+                continue
+            speakers += 1
+            enrolled += pid in matrix.participant_ids
+            candidates = result["topCandidates"]
+            top1 += bool(candidates) and candidates[0]["participantId"] == pid
+            correct = result["participantId"] == pid
+            rec_correct += correct and result["status"] == "auto"
+            if result["status"] == "auto":
+                auto_tp += correct
+                auto_fp += not correct
+            if result["status"] in ("auto", "suggest"):
+                suggest_tp += correct
+                suggest_fp += not correct
+        per_recording.append({
+            "recording_id": case.recording_id,
+            "verified": len(case.truth),
+            "auto_correct": rec_correct,
+            "windows": case.windows,
+            "decode_s": round(case.decode_s, 3),
+            "embed_s": round(case.embed_s, 3),
+            "match_ms": round(match_ms[-1], 2),
+        })
+
+    embedded = sum(c.embedded for c in evaluated)
+    embed_s = sum(c.embed_s for c in evaluated)
+    decode_s = sum(c.decode_s for c in evaluated)
+    audio_s = sum(c.audio_s for c in evaluated)
+    skipped: dict[str, int] = {}
+    for c in cases:
+        if c.skipped:
+            skipped[c.skipped] = skipped.get(c.skipped, 0) + 1
+
+    results = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "database": str(db_path),
+        "model_version": version,
+        "matcher": settings.speaker_id_matcher,
+        "auto_threshold": auto_t,
+        "suggest_threshold": suggest_t,
+        "recordings": len(cases),
+        "evaluated": len(evaluated),
+        "skipped": skipped,
+        "accuracy": {
+            "speakers": speakers,
+            "enrolled": enrolled,
+            "top1_accuracy": _ratio(top1, enrolled),
+            "auto_precision": _ratio(auto_tp, auto_tp + auto_fp),
+            "auto_recall": _ratio(auto_tp, enrolled),
+            "suggest_precision": _ratio(suggest_tp, suggest_tp + suggest_fp),
+            "suggest_recall": _ratio(suggest_tp, enrolled),
+        },
+        "throughput": {
+            "model_load_s": round(model_load_s, 2),
+            "windows_embedded": embedded,
+            "embeddings_per_s": round(embedded / embed_s, 2) if embed_s else None,
+            "embed_s": round(embed_s, 2),
+            "decode_s": round(decode_s, 2),
+            "decoded_audio_s": round(audio_s, 1),
+            "decode_realtime_factor": round(audio_s / decode_s, 1) if decode_s else None,
+            "match_ms_p50": round(statistics.median(match_ms), 2) if match_ms else None,
+            "match_ms_max": round(max(match_ms), 2) if match_ms else None,
+        },
+        "per_recording": per_recording,
+    }
+    out = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(out + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(out)
+
+
+if __name__ == "__main__":
+    main()
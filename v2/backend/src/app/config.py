@@ -34,6 +34,8 @@ class Settings(BaseSettings):
 
     # --- Database ---
     database_path: str = "./data/app.db"
+    # Read-only connections for SELECT-only paths (0 = all queries on the writer)
+    database_read_pool_size: int = 4
 
     # --- Auth ---
     auth_disabled: bool = False
@@ -54,16 +56,42 @@ class Settings(BaseSettings):
     azure_openai_mini_deployment: str = ""
     azure_openai_chat_deployment: str = ""
     azure_openai_api_version: str = "2024-06-01"
+    # Shared scheduler limits per deployment: {"deployment": [rpm, tpm]} (0 = unlimited)
+    llm_rate_limits: dict[str, tuple[int, int]] = {}
+    llm_default_rpm: int = 0
+    llm_default_tpm: int = 0
+    llm_max_concurrency: int = 16
+    llm_max_retries: int = 3
 
     # --- Azure Speech Services ---
     speech_services_key: str = ""
     speech_services_region: str = ""
+    # Transcription polling: scheduler interval (each job is only checked when
+    # due, see sync_service._poll_due), concurrent status checks, and whether
+    # to list all jobs in one paged call instead of one GET per job
+    transcription_poll_seconds: int = 60
+    transcription_poll_concurrency: int = 8
+    transcription_poll_bulk: bool = False
 
     # --- Speaker ID ---
     speaker_id_enabled: bool = True
     speaker_id_auto_threshold: float = 0.78
     speaker_id_suggest_threshold: float = 0.68
     speaker_id_model_path: str = "/app/pretrained_models/spkrec-ecapa-voxceleb"
+    # ECAPA windows per forward pass, and torch CPU threads (0 = torch default)
+    speaker_id_batch_size: int = 16
+    speaker_id_torch_threads: int = 0
+    # Worker processes for speaker ID (each loads ECAPA once); 0 = run in an
+    # API-process thread instead
+    speaker_id_workers: int = 2
+    # Profile matching: "centroid" (one mean per profile), "subcentroid"
+    # (max over k-means sub-centroids) or "knn" (mean of the k most similar
+    # stored embeddings per profile)
+    speaker_id_matcher: str = "centroid"
+    speaker_id_subcentroids: int = 3
+    speaker_id_knn_k: int = 5
+    # Delay before re-rating after a profile change; new changes restart the timer
+    speaker_rerate_debounce_seconds: int = 60
 
     # --- Plaud ---
     plaud_enabled: bool = True
@@ -71,11 +99,37 @@ class Settings(BaseSettings):
     # --- Sync ---
     sync_interval_minutes: int = 15
     max_recordings_per_sync: int | None = None
+    # Import pipeline workers per stage (each transcode is one ffmpeg process)
+    sync_download_concurrency: int = 4
+    sync_transcode_concurrency: int = 2
+    sync_upload_concurrency: int = 4
+    sync_submit_concurrency: int = 2
     max_speaker_id_per_user: int = 10
 
+    # --- Background jobs ---
+    # Per-task-type worker limits overriding job_tasks defaults,
+    # e.g. {"meeting_notes": 4}
+    job_concurrency: dict[str, int] = {}
+
     # --- Deep Search ---
     deep_search_batch_token_limit: int = 50_000
     deep_search_max_candidates: int = 10
+    # Tier 2 extractions in flight (each holds a full transcript in memory)
+    deep_search_extract_concurrency: int = 8
+    # Tier 1 sends at most this many summaries to the LLM, picked by local
+    # vector + bm25 retrieval (0 = send every summary). Off by default: with
+    # the built-in lexical "hashing" encoder it can drop relevant recordings
+    # that share no words with the question; enable it (e.g. 150) with a
+    # sentence-transformers encoder for large libraries, trading some recall
+    # for a smaller, faster Tier 1 prompt.
+    deep_search_prefilter_top_k: int = 0
+    # "hashing" (built in) or "sentence-transformers:<model>" (optional package)
+    semantic_index_encoder: str = "hashing"
+    semantic_index_chunk_words: int = 300
+    # Answer cache (per question + corpus fingerprint) and Tier 2 extract cache
+    deep_search_cache_ttl_seconds: int = 3600
+    deep_search_cache_max_entries: int = 256
+    deep_search_extract_cache_max_entries: int = 2048
 
     # --- Server ---
     app_port: int = 8000
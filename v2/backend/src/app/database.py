@@ -1,16 +1,29 @@
 """SQLite database connection and schema management.
 
 Uses aiosqlite for async access. WAL mode enabled for concurrent reads.
+
+One writer connection (``get_write_db`` / ``get_db``) owns all writes; every
+aiosqlite connection runs its statements on a single worker thread, so the
+writer doubles as the serialized write queue. A small pool of read-only
+connections (``get_read_db``) serves SELECT-only paths so listing, search and
+transcript fetches don't queue behind long write transactions.
 """
 
 from __future__ import annotations
 
+import itertools
+import logging
+
 import aiosqlite
 from pathlib import Path
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 _db: aiosqlite.Connection | None = None
+_read_pool: list[aiosqlite.Connection] = []
+_read_cycle: itertools.cycle | None = None
 
 
 SCHEMA_SQL = """
@@ -69,7 +82,7 @@ CREATE TABLE IF NOT EXISTS recordings (
     -- Transcript data
     transcript_text     TEXT,
     diarized_text       TEXT,
-    transcript_json     TEXT,
+    transcript_json     TEXT,   -- legacy; moved to recording_content on startup
     token_count         INTEGER,
     speaker_mapping     TEXT,
 
@@ -82,13 +95,24 @@ CREATE TABLE IF NOT EXISTS recordings (
     meeting_notes_generated_at TEXT,
     meeting_notes_tags      TEXT,
     speaker_mapping_updated_at TEXT,
+    speaker_rated_version   INTEGER,
 
     -- Timestamps
     created_at          TEXT DEFAULT (datetime('now')),
-    updated_at          TEXT DEFAULT (datetime('now'))
+    updated_at          TEXT DEFAULT (datetime('now')),
+
+    -- List order key; indexed by idx_recordings_user_sort (created in _migrate_schema)
+    sort_at             TEXT GENERATED ALWAYS AS (COALESCE(recorded_at, created_at, '')) VIRTUAL
 );
 
 CREATE INDEX IF NOT EXISTS idx_recordings_user_id ON recordings(user_id);
+
+-- Heavy payloads kept off the recordings row (see services/content_store.py)
+CREATE TABLE IF NOT EXISTS recording_content (
+    recording_id    TEXT PRIMARY KEY REFERENCES recordings(id) ON DELETE CASCADE,
+    transcript_json BLOB,
+    encoding        TEXT NOT NULL DEFAULT 'zlib'
+);
 CREATE INDEX IF NOT EXISTS idx_recordings_status ON recordings(status);
 CREATE INDEX IF NOT EXISTS idx_recordings_recorded_at ON recordings(user_id, recorded_at DESC);
 CREATE INDEX IF NOT EXISTS idx_recordings_plaud_id ON recordings(plaud_id);
@@ -120,6 +144,7 @@ CREATE TABLE IF NOT EXISTS tags (
     name        TEXT NOT NULL,
     color       TEXT NOT NULL,
     created_at  TEXT DEFAULT (datetime('now')),
+    recording_count INTEGER NOT NULL DEFAULT 0,  -- owner's ready recordings; kept by trg_tag_count_*
     UNIQUE(user_id, name)
 );
 
@@ -177,6 +202,7 @@ CREATE TABLE IF NOT EXISTS speaker_profiles (
     centroid        BLOB,
     n_samples       INTEGER DEFAULT 0,
     embeddings_blob BLOB,
+    subcentroids    BLOB,  -- (k, 192) float32 k-means centers of embeddings
     recording_ids   TEXT,
     embedding_std   REAL,
     created_at      TEXT DEFAULT (datetime('now')),
@@ -186,8 +212,98 @@ CREATE TABLE IF NOT EXISTS speaker_profiles (
 
 CREATE INDEX IF NOT EXISTS idx_speaker_profiles_user ON speaker_profiles(user_id);
 
+-- Append-only log of profile writes; MAX(id) per user is the profile version
+CREATE TABLE IF NOT EXISTS speaker_profile_changes (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id         TEXT NOT NULL REFERENCES users(id),
+    participant_id  TEXT,
+    change          TEXT NOT NULL,
+    created_at      TEXT DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_speaker_profile_changes_user ON speaker_profile_changes(user_id, id);
+
+-- Derived from recordings.speaker_mapping by the triggers below; never
+-- written directly. Lets participant/speaker filters use indexes instead of
+-- scanning every mapping's JSON.
+CREATE TABLE IF NOT EXISTS recording_speakers (
+    recording_id      TEXT NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    label             TEXT NOT NULL,
+    user_id           TEXT NOT NULL,
+    participant_id    TEXT,
+    display_name      TEXT,
+    status            TEXT,
+    similarity        REAL,
+    manually_verified INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (recording_id, label)
+);
+
+CREATE INDEX IF NOT EXISTS idx_recording_speakers_participant ON recording_speakers(participant_id);
+CREATE INDEX IF NOT EXISTS idx_recording_speakers_user_status ON recording_speakers(user_id, status);
+
+CREATE TRIGGER IF NOT EXISTS recording_speakers_ai AFTER INSERT ON recordings
+WHEN new.speaker_mapping IS NOT NULL BEGIN
+    INSERT OR REPLACE INTO recording_speakers
+        (recording_id, label, user_id, participant_id, display_name, status, similarity, manually_verified)
+    SELECT new.id, je.key, new.user_id,
+           json_extract(je.value, '$.participantId'),
+           json_extract(je.value, '$.displayName'),
+           json_extract(je.value, '$.identificationStatus'),
+           json_extract(je.value, '$.similarity'),
+           COALESCE(json_extract(je.value, '$.manuallyVerified'), 0)
+    FROM json_each(CASE WHEN json_valid(new.speaker_mapping) THEN new.speaker_mapping ELSE '{}' END) AS je
+    WHERE je.type = 'object';
+END;
+
+CREATE TRIGGER IF NOT EXISTS recording_speakers_au AFTER UPDATE OF speaker_mapping ON recordings BEGIN
+    DELETE FROM recording_speakers WHERE recording_id = old.id;
+    INSERT OR REPLACE INTO recording_speakers
+        (recording_id, label, user_id, participant_id, display_name, status, similarity, manually_verified)
+    SELECT new.id, je.key, new.user_id,
+           json_extract(je.value, '$.participantId'),
+           json_extract(je.value, '$.displayName'),
+           json_extract(je.value, '$.identificationStatus'),
+           json_extract(je.value, '$.similarity'),
+           COALESCE(json_extract(je.value, '$.manuallyVerified'), 0)
+    FROM json_each(CASE WHEN json_valid(new.speaker_mapping) THEN new.speaker_mapping ELSE '{}' END) AS je
+    WHERE je.type = 'object';
+END;
+
+CREATE TRIGGER IF NOT EXISTS recording_speakers_ad AFTER DELETE ON recordings BEGIN
+    DELETE FROM recording_speakers WHERE recording_id = old.id;
+END;
+
 CREATE INDEX IF NOT EXISTS idx_recording_tags_recording ON recording_tags(recording_id);
 CREATE INDEX IF NOT EXISTS idx_recording_tags_tag ON recording_tags(tag_id);
+
+-- tags.recording_count: the tag owner's ready recordings carrying the tag
+CREATE TRIGGER IF NOT EXISTS trg_tag_count_insert AFTER INSERT ON recording_tags BEGIN
+    UPDATE tags SET recording_count = recording_count + 1
+    WHERE id = NEW.tag_id AND user_id = (
+        SELECT user_id FROM recordings WHERE id = NEW.recording_id AND status = 'ready');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tag_count_delete AFTER DELETE ON recording_tags BEGIN
+    UPDATE tags SET recording_count = recording_count - 1
+    WHERE id = OLD.tag_id AND user_id = (
+        SELECT user_id FROM recordings WHERE id = OLD.recording_id AND status = 'ready');
+END;
+
+-- A recording delete cascades to recording_tags after the recording row is
+-- gone (so trg_tag_count_delete no longer sees it); uncount its tags here
+CREATE TRIGGER IF NOT EXISTS trg_tag_count_recording_delete BEFORE DELETE ON recordings
+WHEN OLD.status = 'ready' BEGIN
+    UPDATE tags SET recording_count = recording_count - 1
+    WHERE user_id = OLD.user_id
+      AND id IN (SELECT tag_id FROM recording_tags WHERE recording_id = OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tag_count_recording_status AFTER UPDATE OF status ON recordings
+WHEN (OLD.status = 'ready') <> (NEW.status = 'ready') BEGIN
+    UPDATE tags SET recording_count = recording_count + (CASE WHEN NEW.status = 'ready' THEN 1 ELSE -1 END)
+    WHERE user_id = NEW.user_id
+      AND id IN (SELECT tag_id FROM recording_tags WHERE recording_id = NEW.id);
+END;
 CREATE INDEX IF NOT EXISTS idx_analysis_templates_user ON analysis_templates(user_id);
 CREATE INDEX IF NOT EXISTS idx_sync_runs_started_at ON sync_runs(started_at DESC);
 CREATE INDEX IF NOT EXISTS idx_sync_runs_status ON sync_runs(status);
@@ -261,6 +377,120 @@ CREATE TABLE IF NOT EXISTS collection_searches (
 );
 
 CREATE INDEX IF NOT EXISTS idx_collection_searches_collection ON collection_searches(collection_id);
+
+-- Speaker identification work queue, drained by services/speaker_id_queue.py.
+-- At most one job per user runs at a time, in id order.
+CREATE TABLE IF NOT EXISTS speaker_id_jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id      TEXT NOT NULL,
+    recording_id TEXT NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    status       TEXT NOT NULL DEFAULT 'pending',  -- pending | running | done | failed
+    identified   INTEGER,
+    error        TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    created_at   TEXT DEFAULT (datetime('now')),
+    started_at   TEXT,
+    finished_at  TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_speaker_id_jobs_status ON speaker_id_jobs(status, user_id, id);
+
+-- Durable background tasks (see services/job_queue.py)
+CREATE TABLE IF NOT EXISTS jobs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    type            TEXT NOT NULL,
+    payload         TEXT NOT NULL DEFAULT '{}',
+    priority        INTEGER NOT NULL DEFAULT 100,  -- lower runs first
+    status          TEXT NOT NULL DEFAULT 'pending',  -- pending | running | done | failed
+    idempotency_key TEXT,
+    run_id          TEXT,  -- sync_run whose run_logs receive the job's log lines
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    max_attempts    INTEGER NOT NULL DEFAULT 3,
+    run_after       TEXT NOT NULL DEFAULT (datetime('now')),
+    lease_until     TEXT,
+    error           TEXT,
+    created_at      TEXT DEFAULT (datetime('now')),
+    started_at      TEXT,
+    finished_at     TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority, id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_key ON jobs(idempotency_key)
+    WHERE idempotency_key IS NOT NULL AND status IN ('pending', 'running');
+
+-- Per-speaker centroid embeddings referenced from speaker_mapping entries
+-- by embeddingId (see services/speaker_embedding_store.py)
+CREATE TABLE IF NOT EXISTS speaker_embeddings (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id  TEXT NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    speaker_label TEXT NOT NULL,
+    vector        BLOB NOT NULL,  -- raw float32
+    UNIQUE (recording_id, speaker_label)
+);
+
+-- ECAPA embeddings per audio window (see services/segment_store.py)
+CREATE TABLE IF NOT EXISTS segment_embeddings (
+    recording_id  TEXT NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    start_ms      INTEGER NOT NULL,
+    end_ms        INTEGER NOT NULL,
+    model_version TEXT NOT NULL,
+    vector        BLOB,  -- raw float32; NULL = window produced no embedding
+    created_at    TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (recording_id, start_ms, end_ms, model_version)
+);
+
+-- Local semantic index for deep search Tier 1 (see services/semantic_index.py)
+CREATE TABLE IF NOT EXISTS search_chunks (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id TEXT NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    user_id      TEXT NOT NULL,
+    chunk_index  INTEGER NOT NULL,
+    source       TEXT NOT NULL,
+    vector       BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_chunks_user ON search_chunks(user_id);
+CREATE INDEX IF NOT EXISTS idx_search_chunks_recording ON search_chunks(recording_id);
+
+-- One row per indexed recording; absence means "needs (re)indexing"
+CREATE TABLE IF NOT EXISTS search_index_state (
+    recording_id TEXT PRIMARY KEY REFERENCES recordings(id) ON DELETE CASCADE,
+    encoder      TEXT NOT NULL,
+    indexed_at   TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TRIGGER IF NOT EXISTS search_index_au
+AFTER UPDATE OF title, description, search_summary, diarized_text, transcript_text ON recordings
+WHEN old.title IS NOT new.title
+  OR old.description IS NOT new.description
+  OR old.search_summary IS NOT new.search_summary
+  OR old.diarized_text IS NOT new.diarized_text
+  OR old.transcript_text IS NOT new.transcript_text
+BEGIN
+    DELETE FROM search_index_state WHERE recording_id = new.id;
+    DELETE FROM search_chunks WHERE recording_id = new.id;
+END;
+
+-- Pre-rendered deep search Tier 1 lines with their token counts; a row is
+-- dropped when anything it renders changes and rebuilt on the next search
+CREATE TABLE IF NOT EXISTS search_corpus (
+    recording_id TEXT PRIMARY KEY REFERENCES recordings(id) ON DELETE CASCADE,
+    body         TEXT NOT NULL,
+    speakers     TEXT NOT NULL DEFAULT '[]',
+    token_count  INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS search_corpus_au
+AFTER UPDATE OF title, description, search_summary, recorded_at, duration_seconds, speaker_mapping ON recordings
+WHEN old.title IS NOT new.title
+  OR old.description IS NOT new.description
+  OR old.search_summary IS NOT new.search_summary
+  OR old.recorded_at IS NOT new.recorded_at
+  OR old.duration_seconds IS NOT new.duration_seconds
+  OR old.speaker_mapping IS NOT new.speaker_mapping
+BEGIN
+    DELETE FROM search_corpus WHERE recording_id = new.id;
+END;
 """
 
 FTS_SCHEMA_SQL = """
@@ -281,7 +511,16 @@ CREATE TRIGGER IF NOT EXISTS recordings_ad AFTER DELETE ON recordings BEGIN
     VALUES ('delete', old.rowid, old.title, old.description, old.diarized_text, old.transcript_text, old.search_summary);
 END;
 
-CREATE TRIGGER IF NOT EXISTS recordings_au AFTER UPDATE ON recordings BEGIN
+-- Only re-tokenize when an indexed column actually changes; status, speaker
+-- and timestamp updates leave the FTS row alone.
+CREATE TRIGGER IF NOT EXISTS recordings_au
+AFTER UPDATE OF title, description, diarized_text, transcript_text, search_summary ON recordings
+WHEN old.title IS NOT new.title
+  OR old.description IS NOT new.description
+  OR old.diarized_text IS NOT new.diarized_text
+  OR old.transcript_text IS NOT new.transcript_text
+  OR old.search_summary IS NOT new.search_summary
+BEGIN
     INSERT INTO recordings_fts(recordings_fts, rowid, title, description, diarized_text, transcript_text, search_summary)
     VALUES ('delete', old.rowid, old.title, old.description, old.diarized_text, old.transcript_text, old.search_summary);
     INSERT INTO recordings_fts(rowid, title, description, diarized_text, transcript_text, search_summary)
@@ -291,13 +530,59 @@ END;
 
 
 async def get_db() -> aiosqlite.Connection:
-    """Get the database connection singleton."""
+    """Get the database connection singleton (the writer connection)."""
     global _db
     if _db is None:
         raise RuntimeError("Database not initialized. Call init_db() first.")
     return _db
 
 
+async def get_write_db() -> aiosqlite.Connection:
+    """Get the dedicated writer connection.
+
+    Same connection as get_db(); use this name in new code that writes so the
+    intent is explicit at the call site.
+    """
+    return await get_db()
+
+
+async def get_read_db() -> aiosqlite.Connection:
+    """Get a read-only connection from the pool (round-robin).
+
+    Only use for SELECT-only paths. Reads see the last committed state, not
+    uncommitted changes made on the writer. Falls back to the writer when the
+    pool is disabled (in-memory databases, tests, read_pool_size=0).
+    """
+    if not _read_pool or _read_cycle is None:
+        return await get_db()
+    return next(_read_cycle)
+
+
+async def _open_read_pool(db_path: Path, size: int) -> None:
+    """Open `size` read-only WAL connections to the database file."""
+    global _read_cycle
+    for _ in range(size):
+        conn = await aiosqlite.connect(f"file:{db_path.resolve()}?mode=ro", uri=True)
+        conn.row_factory = aiosqlite.Row
+        await conn.execute("PRAGMA busy_timeout=5000")
+        await conn.execute("PRAGMA query_only=ON")
+        _read_pool.append(conn)
+    _read_cycle = itertools.cycle(_read_pool) if _read_pool else None
+    if _read_pool:
+        logger.info("Opened %d read-only database connection(s)", len(_read_pool))
+
+
+async def _close_read_pool() -> None:
+    global _read_cycle
+    _read_cycle = None
+    while _read_pool:
+        conn = _read_pool.pop()
+        try:
+            await conn.close()
+        except Exception as exc:
+            logger.warning("Failed to close read connection: %s", exc)
+
+
 async def _migrate_schema(db: aiosqlite.Connection) -> None:
     """Run lightweight migrations for schema additions."""
     # Add search_summary and search_keywords columns if missing
@@ -323,6 +608,15 @@ async def _migrate_schema(db: aiosqlite.Connection) -> None:
                SELECT rowid, title, description, diarized_text, transcript_text, search_summary FROM recordings"""
         )
 
+    # Replace the whole-row FTS update trigger with the column-scoped one
+    cursor = await db.execute(
+        "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='recordings_au'"
+    )
+    row = await cursor.fetchone()
+    if row and "UPDATE OF" not in row[0]:
+        await db.execute("DROP TRIGGER recordings_au")
+        await db.executescript(FTS_SCHEMA_SQL)
+
     # Add search_traces table if missing
     cursor = await db.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='search_traces'"
@@ -397,6 +691,101 @@ async def _migrate_schema(db: aiosqlite.Connection) -> None:
         await db.execute("ALTER TABLE recordings ADD COLUMN meeting_notes_tags TEXT")
     if "speaker_mapping_updated_at" not in columns:
         await db.execute("ALTER TABLE recordings ADD COLUMN speaker_mapping_updated_at TEXT")
+    if "speaker_rated_version" not in columns:
+        await db.execute("ALTER TABLE recordings ADD COLUMN speaker_rated_version INTEGER")
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_recordings_speaker_rated ON recordings(user_id, speaker_rated_version)"
+    )
+    # Profiles that predate the change log start at version 1, so the first
+    # re-rate after upgrading covers every pending suggest/unknown entry
+    await db.execute(
+        """INSERT INTO speaker_profile_changes (user_id, change)
+           SELECT DISTINCT sp.user_id, 'migration' FROM speaker_profiles sp
+           WHERE NOT EXISTS (
+               SELECT 1 FROM speaker_profile_changes c WHERE c.user_id = sp.user_id)"""
+    )
+
+    # List ordering column + keyset pagination indexes. ALTER TABLE can only
+    # add VIRTUAL generated columns, so fresh databases use VIRTUAL too.
+    # Early builds left sort_at NULL when both timestamps were NULL, which
+    # cursors cannot express; rebuild that column with the '' fallback.
+    cursor = await db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recordings'")
+    recordings_sql = (await cursor.fetchone())[0]
+    cursor = await db.execute("PRAGMA table_xinfo(recordings)")
+    has_sort_at = "sort_at" in {row[1] for row in await cursor.fetchall()}
+    if has_sort_at and "COALESCE(recorded_at, created_at))" in recordings_sql:
+        await db.execute("DROP INDEX IF EXISTS idx_recordings_user_sort")
+        await db.execute("DROP INDEX IF EXISTS idx_recordings_user_status_sort")
+        await db.execute("ALTER TABLE recordings DROP COLUMN sort_at")
+        has_sort_at = False
+    if not has_sort_at:
+        await db.execute(
+            """ALTER TABLE recordings ADD COLUMN sort_at TEXT
+               GENERATED ALWAYS AS (COALESCE(recorded_at, created_at, '')) VIRTUAL"""
+        )
+    await db.execute(
+        """CREATE INDEX IF NOT EXISTS idx_recordings_user_sort
+           ON recordings(user_id, sort_at DESC, id DESC)"""
+    )
+    await db.execute(
+        """CREATE INDEX IF NOT EXISTS idx_recordings_user_status_sort
+           ON recordings(user_id, status, sort_at DESC, id DESC)"""
+    )
+
+    # Materialized per-tag recording counts (maintained by trg_tag_count_*)
+    cursor = await db.execute("PRAGMA table_info(tags)")
+    if "recording_count" not in {row[1] for row in await cursor.fetchall()}:
+        await db.execute("ALTER TABLE tags ADD COLUMN recording_count INTEGER NOT NULL DEFAULT 0")
+        await db.execute(
+            """UPDATE tags SET recording_count = (
+                   SELECT COUNT(*) FROM recording_tags rt
+                   JOIN recordings r ON r.id = rt.recording_id
+                   WHERE rt.tag_id = tags.id AND r.user_id = tags.user_id AND r.status = 'ready')"""
+        )
+
+    # Add subcentroids column to speaker_profiles if missing
+    cursor = await db.execute("PRAGMA table_info(speaker_profiles)")
+    profile_columns = {row[1] for row in await cursor.fetchall()}
+    if "subcentroids" not in profile_columns:
+        await db.execute("ALTER TABLE speaker_profiles ADD COLUMN subcentroids BLOB")
+    cursor = await db.execute("PRAGMA table_info(speaker_id_jobs)")
+    if "attempts" not in {row[1] for row in await cursor.fetchall()}:
+        await db.execute("ALTER TABLE speaker_id_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+    from app.services.profile_store import backfill_subcentroids
+    clustered = await backfill_subcentroids(db)
+    if clustered:
+        logger.info("Computed sub-centroids for %d speaker profile(s)", clustered)
+
+    # Backfill recording_speakers for databases that predate the table
+    cursor = await db.execute("SELECT 1 FROM recording_speakers LIMIT 1")
+    if not await cursor.fetchone():
+        await db.execute(
+            """INSERT OR REPLACE INTO recording_speakers
+                   (recording_id, label, user_id, participant_id, display_name,
+                    status, similarity, manually_verified)
+               SELECT r.id, je.key, r.user_id,
+                      json_extract(je.value, '$.participantId'),
+                      json_extract(je.value, '$.displayName'),
+                      json_extract(je.value, '$.identificationStatus'),
+                      json_extract(je.value, '$.similarity'),
+                      COALESCE(json_extract(je.value, '$.manuallyVerified'), 0)
+               FROM recordings r,
+                    json_each(CASE WHEN json_valid(r.speaker_mapping) THEN r.speaker_mapping ELSE '{}' END) AS je
+               WHERE r.speaker_mapping IS NOT NULL AND je.type = 'object'"""
+        )
+
+    # Move transcript_json off the recordings row into recording_content
+    from app.services.content_store import move_inline_transcript_json
+    moved = await move_inline_transcript_json(db)
+    if moved:
+        logger.info("Moved transcript_json for %d recording(s) to recording_content", moved)
+
+    # Move speaker_mapping embedding lists into speaker_embeddings
+    from app.services.speaker_embedding_store import move_inline_embeddings
+    moved = await move_inline_embeddings(db)
+    if moved:
+        logger.info("Moved speaker embeddings for %d recording(s) to speaker_embeddings", moved)
 
     # Backfill null recorded_at with created_at for uploaded recordings
     await db.execute(
@@ -406,6 +795,37 @@ async def _migrate_schema(db: aiosqlite.Connection) -> None:
     await db.commit()
 
 
+async def optimize_fts(full: bool = False, merge_pages: int = 500) -> int:
+    """Merge recordings_fts index segments.
+
+    Incremental by default: runs FTS5 'merge' steps of `merge_pages` pages
+    until a step does no work, so each write transaction stays small (which
+    keeps Litestream's WAL shipping smooth). `full=True` runs 'optimize',
+    collapsing the index into a single segment in one transaction.
+
+    Returns:
+        Number of merge steps run (1 for a full optimize).
+    """
+    db = await get_write_db()
+    if full:
+        await db.execute("INSERT INTO recordings_fts(recordings_fts) VALUES ('optimize')")
+        await db.commit()
+        return 1
+
+    steps = 0
+    while True:
+        before = db.total_changes
+        await db.execute(
+            "INSERT INTO recordings_fts(recordings_fts, rank) VALUES ('merge', ?)",
+            (merge_pages,),
+        )
+        await db.commit()
+        steps += 1
+        # Per the FTS5 docs, a step that changes fewer than 2 rows did no work
+        if db.total_changes - before < 2 or steps >= 100:
+            return steps
+
+
 async def init_db() -> aiosqlite.Connection:
     """Initialize the database connection and create schema."""
     global _db
@@ -425,12 +845,17 @@ async def init_db() -> aiosqlite.Connection:
     # Run migrations for existing databases
     await _migrate_schema(_db)
 
+    # Read pool must open after the writer has set WAL mode and created schema
+    if settings.database_path != ":memory:" and settings.database_read_pool_size > 0:
+        await _open_read_pool(settings.db_path, settings.database_read_pool_size)
+
     return _db
 
 
 async def close_db() -> None:
-    """Close the database connection."""
+    """Close the read pool and the writer connection."""
     global _db
+    await _close_read_pool()
     if _db is not None:
         await _db.close()
         _db = None
@@ -6,14 +6,24 @@ import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.auth import get_current_user
 from app.config import get_settings
 from app.database import close_db, init_db
 from app.scheduler.jobs import start_scheduler, stop_scheduler
+from app.services import (
+    job_queue,
+    job_tasks,  # noqa: F401  (registers job handlers)
+    llm_client,
+    run_logger,
+    speaker_id_queue,
+    speaker_id_worker,
+    speech_client,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -60,11 +70,19 @@ async def lifespan(app: FastAPI):
         logger.warning("Marked %d stale running sync run(s) as aborted", result.rowcount)
 
     start_scheduler()
+    await speaker_id_queue.start_dispatcher()
+    await job_queue.start_dispatcher()
 
     yield
 
     # Shutdown
     stop_scheduler()
+    await speaker_id_queue.stop_dispatcher()
+    await job_queue.stop_dispatcher()
+    speaker_id_worker.shutdown_pool()
+    await llm_client.close_client()
+    await speech_client.close_client()
+    await run_logger.flush()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -124,6 +142,12 @@ async def health():
     return {"status": "ok", "version": settings.api_version}
 
 
+@app.get("/api/metrics/llm", tags=["system"], dependencies=[Depends(get_current_user)])
+async def llm_metrics():
+    """LLM scheduler queue depth, waits and rate-limit counts per deployment."""
+    return llm_client.metrics()
+
+
 @app.get("/api/version", tags=["system"])
 async def version():
     """API version."""
@@ -202,7 +226,8 @@ likely matches quickly while still falling back to deeper transcript search when
 
 Participants are first-class entities. Use list_participants to browse the known speaker directory and \
 search_participants for fuzzy, high-recall name matching across display names and aliases. Once you identify \
-a participant, pass their participant_id into search_recordings to narrow results. All tools are read-only. \
+a participant, pass their participant_id into search_recordings to narrow results; find_voice_matches finds \
+recordings where that person's voice appears even when the speaker was never labeled. All tools are read-only. \
 ai_chat is stateless per call, scoped to a single recording, and depends on transcript availability and AI \
 configuration."""
 mcp.mount_http()  # Serves at /mcp
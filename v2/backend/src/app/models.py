@@ -80,8 +80,9 @@ class SpeakerMappingEntry(BaseModel):
     suggestedDisplayName: str | None = None
     topCandidates: list[TopCandidate] | None = None
     identifiedAt: str | None = None
+    ratedAtVersion: int | None = None  # profile version this entry was matched against
     useForTraining: bool = False
-    embedding: list[float] | None = None  # 192-dim ECAPA-TDNN
+    embeddingId: int | None = None  # speaker_embeddings row (192-dim ECAPA-TDNN)
 
 
 SpeakerMapping = dict[str, SpeakerMappingEntry]
@@ -203,6 +204,7 @@ class Tag(BaseModel):
     name: str
     color: str
     created_at: datetime | None = None
+    recording_count: int = 0  # ready recordings carrying the tag
 
 
 class AnalysisTemplate(BaseModel):
@@ -303,9 +305,10 @@ class RecordingDetail(BaseModel):
 
 class PaginatedResponse(BaseModel):
     data: list = []
-    total: int = 0
+    total: int | None = 0  # None when skipped (keyset pages after the first)
     page: int = 1
     per_page: int = 50
+    next_cursor: str | None = None
 
 
 class RecordingUpdate(BaseModel):
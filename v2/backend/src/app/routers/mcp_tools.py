@@ -227,6 +227,15 @@ async def search_recordings(
             "for `has_more`/`next_offset` hints in the envelope."
         ),
     ),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Opaque `next_cursor` from a previous paginated response; continues "
+            "right after its last result (overrides `offset`). Faster than "
+            "`offset` for deep pages. Needs a recorded_at sort and a "
+            "non-cascade mode (or no query)."
+        ),
+    ),
     view: str | None = Query(
         None,
         description=(
@@ -264,8 +273,9 @@ async def search_recordings(
         False,
         description=(
             "When true, return an envelope: "
-            "{results, limit, offset, has_more, next_offset, total}. "
-            "`total` is null in cascade mode (computing it is non-trivial). "
+            "{results, limit, offset, has_more, next_offset, next_cursor, total}. "
+            "`total` is null in cascade mode (computing it is non-trivial) "
+            "and on pages fetched by `cursor`. "
             "When false (default), return the bare list of results."
         ),
     ),
@@ -306,8 +316,10 @@ async def search_recordings(
     {field_catalog}
 
     Pagination — pass `paginated=true` to get an envelope with `has_more`,
-    `next_offset`, and (for non-cascade modes) `total`. Otherwise the bare
-    list of results is returned (the historical default).
+    `next_offset`, `next_cursor` and (for non-cascade modes) `total`.
+    Otherwise the bare list of results is returned (the historical default).
+    To page deep into a large library, pass each page's `next_cursor` back as
+    `cursor` instead of growing `offset`.
 
     Response shapes:
       paginated=false (default): [ {recording}, {recording}, ... ]
@@ -317,7 +329,8 @@ async def search_recordings(
         "offset":      int,
         "has_more":    bool,
         "next_offset": int | null,
-        "total":       int | null   // null in cascade mode
+        "next_cursor": str | null,  // null in cascade mode / non-date sorts
+        "total":       int | null   // null in cascade mode / cursor pages
       }
 
     After identifying promising candidates, call get_recording for one or
@@ -325,23 +338,27 @@ async def search_recordings(
     fields = _validate_fields_or_400(fields)
     view_enum = _resolve_view(view)
 
-    results, has_more, total = await mcp_search_service.search_recordings(
-        user_id=user.id,
-        query=query,
-        mode=mode.value,
-        participant_id=participant_id,
-        date_from=date_from.isoformat() if date_from else None,
-        date_to=date_to.isoformat() if date_to else None,
-        limit=limit,
-        offset=offset,
-        title_filter=title,
-        tag_ids=list(tag_id) if tag_id else None,
-        tag_match=tag_match,
-        sort=sort,
-        view=view_enum,
-        fields=fields,
-        compute_total=paginated,
-    )
+    try:
+        results, has_more, total, next_cursor = await mcp_search_service.search_recordings(
+            user_id=user.id,
+            query=query,
+            mode=mode.value,
+            participant_id=participant_id,
+            date_from=date_from.isoformat() if date_from else None,
+            date_to=date_to.isoformat() if date_to else None,
+            limit=limit,
+            offset=offset,
+            title_filter=title,
+            tag_ids=list(tag_id) if tag_id else None,
+            tag_match=tag_match,
+            sort=sort,
+            view=view_enum,
+            fields=fields,
+            compute_total=paginated,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if paginated:
         return {
@@ -349,7 +366,8 @@ async def search_recordings(
             "limit": limit,
             "offset": offset,
             "has_more": has_more,
-            "next_offset": offset + limit if has_more else None,
+            "next_offset": offset + limit if has_more and not cursor else None,
+            "next_cursor": next_cursor,
             "total": total,
         }
     return results
@@ -724,13 +742,14 @@ async def list_participants(user: CurrentUser):
                   COALESCE(rc.recording_count, 0) AS recording_count
            FROM participants p
            LEFT JOIN (
-               SELECT json_extract(je.value, '$.participantId') AS pid,
-                      COUNT(DISTINCT r.id) AS recording_count
-               FROM recordings r, json_each(r.speaker_mapping) AS je
-               WHERE r.user_id = ?
+               SELECT rs.participant_id AS pid,
+                      COUNT(DISTINCT rs.recording_id) AS recording_count
+               FROM recording_speakers rs
+               JOIN recordings r ON r.id = rs.recording_id
+               WHERE rs.user_id = ?
                  AND r.status = 'ready'
-                 AND r.speaker_mapping IS NOT NULL
-               GROUP BY pid
+                 AND rs.participant_id IS NOT NULL
+               GROUP BY rs.participant_id
            ) rc ON rc.pid = p.id
            WHERE p.user_id = ?
            ORDER BY p.display_name ASC""",
@@ -784,22 +803,13 @@ async def list_tags(user: CurrentUser):
 
     Returns: list of {id, name, color, recording_count}."""
     db = await get_db()
-    # Single-query GROUP BY — same pattern as the rewritten list_participants.
-    # Tag → recording_tags → recordings. The double join through
-    # `recordings.user_id = t.user_id` is defense in depth: recording_tags
-    # itself lacks user_id.
+    # recording_count is materialized on tags by triggers (see database.py):
+    # the owner's ready recordings carrying the tag.
     rows = await db.execute_fetchall(
-        """SELECT t.id, t.name, t.color,
-                  COUNT(DISTINCT r.id) AS recording_count
-           FROM tags t
-           LEFT JOIN recording_tags rt ON rt.tag_id = t.id
-           LEFT JOIN recordings r
-                ON r.id = rt.recording_id
-                AND r.user_id = t.user_id
-                AND r.status = 'ready'
-           WHERE t.user_id = ?
-           GROUP BY t.id, t.name, t.color
-           ORDER BY t.name ASC""",
+        """SELECT id, name, color, recording_count
+           FROM tags
+           WHERE user_id = ?
+           ORDER BY name ASC""",
         (user.id,),
     )
 
@@ -884,13 +894,14 @@ async def search_participants(
                    COALESCE(rc.recording_count, 0) AS recording_count
             FROM participants p
             LEFT JOIN (
-                SELECT json_extract(je.value, '$.participantId') AS pid,
-                       COUNT(DISTINCT r.id) AS recording_count
-                FROM recordings r, json_each(r.speaker_mapping) AS je
-                WHERE r.user_id = ?
+                SELECT rs.participant_id AS pid,
+                       COUNT(DISTINCT rs.recording_id) AS recording_count
+                FROM recording_speakers rs
+                JOIN recordings r ON r.id = rs.recording_id
+                WHERE rs.user_id = ?
                   AND r.status = 'ready'
-                  AND r.speaker_mapping IS NOT NULL
-                GROUP BY pid
+                  AND rs.participant_id IS NOT NULL
+                GROUP BY rs.participant_id
             ) rc ON rc.pid = p.id
             WHERE p.user_id = ? AND ({where_likes})
             LIMIT ?""",
@@ -920,6 +931,67 @@ async def search_participants(
     return [item for _, item in scored[:limit]]
 
 
+# ---------------------------------------------------------------------------
+# 5b. Find voice matches
+# ---------------------------------------------------------------------------
+
+
+@router.get("/voice-matches", operation_id="find_voice_matches")
+async def find_voice_matches(
+    user: CurrentUser,
+    participant_id: str | None = Query(
+        None,
+        description=(
+            "Participant whose voice to look for (uses their speaker profile). "
+            "Get IDs from search_participants. Give this OR recording_id + speaker_label."
+        ),
+    ),
+    recording_id: str | None = Query(
+        None,
+        description="Recording containing the reference speaker (with speaker_label).",
+    ),
+    speaker_label: str | None = Query(
+        None,
+        description='Reference speaker\'s label in recording_id, e.g. "Speaker 2".',
+    ),
+    unassigned_only: bool = Query(
+        False,
+        description="Only return speakers not yet assigned to any participant.",
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Max recordings to return (1–100)."),
+):
+    """Find recordings where a particular voice appears, by voice similarity.
+
+    Matches speaker voice embeddings across the whole library, including
+    speakers that were never identified by name. Use it to answer "what other
+    meetings was this person in?" when name-based search_recordings misses
+    unlabeled appearances, or to find where an unknown speaker from one
+    recording shows up elsewhere (pass recording_id + speaker_label).
+
+    Returns one row per recording, best match first: {recording_id, title,
+    recorded_at, speaker_label, similarity (cosine, 0–1), participant_id,
+    display_name, status}. Similarity above ~0.78 is a confident match;
+    0.68–0.78 is plausible. participant_id is null for unassigned speakers."""
+    from app.services import voice_index
+
+    if not participant_id and not (recording_id and speaker_label):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide participant_id, or recording_id and speaker_label",
+        )
+    matches = await voice_index.find_voice_matches(
+        user.id,
+        participant_id=participant_id,
+        recording_id=recording_id,
+        speaker_label=speaker_label,
+        limit=limit,
+        unassigned_only=unassigned_only,
+    )
+    if matches is None:
+        raise HTTPException(status_code=404, detail="No voice embedding found for that speaker")
+    return matches
+
+
 # ---------------------------------------------------------------------------
 # 6. AI chat
 # ---------------------------------------------------------------------------
@@ -14,7 +14,7 @@ from app.models import (
     ParticipantUpdate,
     User,
 )
-from app.services import participant_service
+from app.services import participant_service, voice_index
 
 router = APIRouter(prefix="/api/participants", tags=["participants"])
 
@@ -105,3 +105,24 @@ async def merge_participants(participant_id: str, other_id: str, user: CurrentUs
         raise HTTPException(status_code=404, detail="Other participant not found")
     merged = await participant_service.merge_participants(user.id, participant_id, other_id)
     return merged
+
+
+@router.get("/{participant_id}/voice-matches")
+async def find_voice_matches(
+    participant_id: str,
+    user: CurrentUser,
+    limit: int = Query(20, ge=1, le=200),
+    threshold: float | None = Query(None, ge=0.0, le=1.0),
+    unassigned_only: bool = Query(False),
+):
+    """Recordings where this participant's voice appears, best match first."""
+    matches = await voice_index.find_voice_matches(
+        user.id,
+        participant_id=participant_id,
+        limit=limit,
+        threshold=threshold,
+        unassigned_only=unassigned_only,
+    )
+    if matches is None:
+        raise HTTPException(status_code=404, detail="No voice profile for participant")
+    return matches
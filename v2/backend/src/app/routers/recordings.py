@@ -17,7 +17,7 @@ from app.models import (
     SpeakerAssignment,
     User,
 )
-from app.services import ai_service, recording_service, tag_service
+from app.services import ai_service, recording_service, tag_service, voice_index
 
 router = APIRouter(prefix="/api/recordings", tags=["recordings"])
 
@@ -41,14 +41,16 @@ async def list_recordings(
     search: str | None = None,
     date_range: str | None = None,
     sort: str | None = None,
+    cursor: str | None = None,
 ):
-    """List the current user's recordings (paginated)."""
+    """List the current user's recordings (paginated by page or `next_cursor`)."""
     result = await recording_service.list_recordings(
         user_id=user.id,
         page=page,
         per_page=per_page,
         search=search,
         date_from=date_range,  # date_range maps to date_from; date_to not exposed here
+        cursor=cursor,
     )
     return result
 
@@ -252,11 +254,34 @@ async def dismiss_speaker(
     return updated
 
 
+@router.get("/{recording_id}/speakers/{label}/voice-matches")
+async def find_voice_matches(
+    recording_id: str,
+    label: str,
+    user: CurrentUser,
+    limit: int = Query(20, ge=1, le=200),
+    threshold: float | None = Query(None, ge=0.0, le=1.0),
+    unassigned_only: bool = Query(False),
+):
+    """Other recordings where this speaker's voice appears, best match first."""
+    matches = await voice_index.find_voice_matches(
+        user.id,
+        recording_id=recording_id,
+        speaker_label=label,
+        limit=limit,
+        threshold=threshold,
+        unassigned_only=unassigned_only,
+    )
+    if matches is None:
+        raise HTTPException(status_code=404, detail="No embedding for this speaker")
+    return matches
+
+
 @router.post("/{recording_id}/identify-speakers", response_model=RecordingDetail)
 async def identify_speakers(recording_id: str, user: CurrentUser):
     """Manually trigger speaker identification for a recording."""
     from app.config import get_settings
-    from app.services import speaker_processor
+    from app.services import speaker_id_queue
 
     settings = get_settings()
     if not settings.speaker_id_enabled:
@@ -268,10 +293,7 @@ async def identify_speakers(recording_id: str, user: CurrentUser):
     if recording.source == "paste":
         raise HTTPException(status_code=400, detail="Cannot identify speakers for pasted transcripts")
 
-    async with speaker_processor._speaker_id_lock:
-        identified = await speaker_processor.process_recording(user.id, recording_id)
-        if identified:
-            await speaker_processor.rerate_speakers(user.id)
+    await speaker_id_queue.identify_now(user.id, recording_id)
 
     return await recording_service.get_recording(user.id, recording_id)
 
@@ -286,8 +308,11 @@ async def generate_meeting_notes(recording_id: str, user: CurrentUser):
         raise HTTPException(status_code=400, detail="Recording has no transcript")
 
     from app.services import meeting_notes_service
+    from app.services.llm_client import Priority
 
-    notes = await meeting_notes_service.generate_meeting_notes(recording_id, user.id)
+    notes = await meeting_notes_service.generate_meeting_notes(
+        recording_id, user.id, Priority.INTERACTIVE
+    )
     if notes is None:
         raise HTTPException(status_code=500, detail="Meeting notes generation failed")
 
@@ -310,7 +335,7 @@ async def reidentify_speakers(recording_id: str, user: CurrentUser):
 
     from app.config import get_settings
     from app.database import get_db
-    from app.services import speaker_processor
+    from app.services import speaker_id_queue
 
     settings = get_settings()
     if not settings.speaker_id_enabled:
@@ -346,7 +371,7 @@ async def reidentify_speakers(recording_id: str, user: CurrentUser):
                     "suggestedDisplayName",
                     "topCandidates",
                     "identifiedAt",
-                    "embedding",
+                    "embeddingId",
                 ]:
                     entry.pop(key, None)
 
@@ -359,10 +384,7 @@ async def reidentify_speakers(recording_id: str, user: CurrentUser):
         await db.commit()
 
     # Re-run identification
-    async with speaker_processor._speaker_id_lock:
-        identified = await speaker_processor.process_recording(user.id, recording_id)
-        if identified:
-            await speaker_processor.rerate_speakers(user.id)
+    await speaker_id_queue.identify_now(user.id, recording_id)
 
     return await recording_service.get_recording(user.id, recording_id)
 
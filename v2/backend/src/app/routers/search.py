@@ -12,6 +12,7 @@ from app.auth import get_current_user
 from app.database import get_db
 from app.models import DeepSearchRequest, User
 from app.services import deep_search, search_summary_service
+from app.services.llm_client import Priority
 
 router = APIRouter(prefix="/api/search", tags=["search"])
 
@@ -49,7 +50,7 @@ async def generate_summary(recording_id: str, user: CurrentUser):
     """Generate or regenerate the search summary for a recording."""
     try:
         result = await search_summary_service.generate_search_summary(
-            recording_id, user.id
+            recording_id, user.id, Priority.INTERACTIVE
         )
         return result
     except ValueError as exc:
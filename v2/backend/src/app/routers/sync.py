@@ -7,9 +7,9 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.auth import get_current_user
-from app.database import get_db
+from app.database import get_read_db
 from app.models import PaginatedResponse, SyncRunDetail, SyncRunSummary, User
-from app.services import sync_service
+from app.services import job_queue, sync_service
 
 router = APIRouter(prefix="/api/sync", tags=["sync"])
 
@@ -25,8 +25,8 @@ async def trigger_sync(user: CurrentUser):
 
 @router.post("/poll", status_code=200)
 async def poll_transcriptions(user: CurrentUser):
-    """Manually trigger a poll for pending transcriptions."""
-    completed = await sync_service.poll_pending_transcriptions()
+    """Manually trigger a poll for pending transcriptions (ignores the poll schedule)."""
+    completed = await sync_service.poll_pending_transcriptions(force=True)
     return {"completed": completed, "count": len(completed)}
 
 
@@ -60,7 +60,7 @@ async def get_sync_run(run_id: str, user: CurrentUser):
 @router.get("/runs/{run_id}/logs")
 async def get_run_logs(run_id: str, user: CurrentUser, after: int = 0):
     """Get log entries for a run, optionally after a given ID for polling."""
-    db = await get_db()
+    db = await get_read_db()
     rows = await db.execute_fetchall(
         "SELECT id, timestamp, level, message FROM run_logs WHERE run_id = ? AND id > ? ORDER BY id ASC",
         (run_id, after),
@@ -69,3 +69,15 @@ async def get_run_logs(run_id: str, user: CurrentUser, after: int = 0):
         "logs": [dict(r) for r in rows],
         "run_id": run_id,
     }
+
+
+@router.get("/jobs")
+async def get_job_stats(user: CurrentUser, hours: int = Query(24, ge=1, le=720)):
+    """Background job backlog, throughput and latency per task type."""
+    return {"hours": hours, "types": await job_queue.stats(hours)}
+
+
+@router.get("/runs/{run_id}/jobs")
+async def get_run_jobs(run_id: str, user: CurrentUser):
+    """Background jobs queued by a run, with their status and timings."""
+    return {"jobs": await job_queue.jobs_for_run(run_id), "run_id": run_id}
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
@@ -13,34 +14,72 @@ logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
 
 
-async def plaud_sync_job() -> None:
-    """Sync recordings from Plaud for all enabled users."""
-    from app.services import sync_service
+async def _enqueue(task_type: str, payload: dict | None = None, key: str | None = None) -> None:
+    """Queue a task for the job dispatcher; a still-queued previous run absorbs it."""
+    from app.services import job_queue
 
-    logger.info("Starting scheduled Plaud sync")
     try:
-        await sync_service.run_sync(trigger="scheduled")
+        await job_queue.enqueue(task_type, payload, key=key or task_type)
     except Exception:
-        logger.exception("Plaud sync job failed")
+        logger.exception("Failed to enqueue %s job", task_type)
+
+
+async def plaud_sync_job() -> None:
+    """Sync recordings from Plaud for all enabled users."""
+    logger.info("Queueing scheduled Plaud sync")
+    await _enqueue("plaud_sync", {"trigger": "scheduled"})
 
 
 async def poll_transcriptions_job() -> None:
     """Poll Azure Speech Services for completed transcriptions."""
-    from app.services import sync_service
+    await _enqueue("transcription_poll")
+
+
+async def rerate_speakers_job(user_id: str) -> None:
+    """Re-rate a user's suggest/unknown speakers against their current profiles."""
+    from app.services import speaker_processor
 
-    logger.info("Polling for pending transcriptions")
     try:
-        await sync_service.poll_pending_transcriptions()
+        async with speaker_processor.user_lock(user_id):
+            rerated = await speaker_processor.rerate_speakers(user_id)
+        if rerated:
+            logger.info("Re-rated speakers in %d recordings for user %s", rerated, user_id)
     except Exception:
-        logger.exception("Transcription polling job failed")
+        logger.exception("Speaker re-rating job failed for user %s", user_id)
+
+
+async def schedule_rerate(user_id: str) -> None:
+    """Debounced re-rating: (re)arm a one-shot rerate job for the user.
+
+    Each call pushes the run back by speaker_rerate_debounce_seconds, so a
+    burst of identifications during a sync triggers a single pass. Runs
+    inline when the scheduler is not running (CLI, tests).
+
+    Must not be called while holding speaker_processor.user_lock(user_id).
+    """
+    if not scheduler.running:
+        await rerate_speakers_job(user_id)
+        return
+
+    delay = get_settings().speaker_rerate_debounce_seconds
+    scheduler.add_job(
+        rerate_speakers_job,
+        "date",
+        run_date=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        args=[user_id],
+        id=f"rerate_speakers:{user_id}",
+        replace_existing=True,
+    )
 
 
 async def refresh_meeting_notes_job() -> None:
-    """Generate or regenerate meeting notes for recordings that need them."""
+    """Queue meeting notes for recordings that lack them or have stale ones.
+
+    A backstop for notes whose job failed or that predate a speaker edit;
+    notes for new transcriptions are queued when the transcript lands.
+    """
     from app.database import get_db
-    from app.services import meeting_notes_service
 
-    logger.info("Starting meeting notes refresh job")
     try:
         db = await get_db()
         rows = await db.execute_fetchall(
@@ -53,38 +92,32 @@ async def refresh_meeting_notes_job() -> None:
                        AND (meeting_notes_generated_at IS NULL
                             OR meeting_notes_generated_at < speaker_mapping_updated_at))
                  )
-               ORDER BY COALESCE(recorded_at, created_at) DESC
-               LIMIT 10"""
-        )
-
-        if not rows:
-            logger.info("Meeting notes refresh: no recordings need notes")
-            return
-
-        generated = 0
-        failed = 0
-        for row in rows:
-            r = dict(row)
-            try:
-                result = await meeting_notes_service.generate_meeting_notes(
-                    r["id"], r["user_id"]
-                )
-                if result:
-                    generated += 1
-                else:
-                    failed += 1
-            except Exception as exc:
-                failed += 1
-                logger.warning(
-                    "Meeting notes refresh failed for %s: %s", r["id"][:8], exc
-                )
-
-        logger.info(
-            "Meeting notes refresh complete: %d generated, %d failed",
-            generated, failed,
+               ORDER BY sort_at DESC, id DESC
+               LIMIT 50"""
         )
     except Exception:
         logger.exception("Meeting notes refresh job failed")
+        return
+
+    for row in rows:
+        await _enqueue(
+            "meeting_notes",
+            {"recording_id": row["id"], "user_id": row["user_id"]},
+            key=f"meeting_notes:{row['id']}",
+        )
+    if rows:
+        logger.info("Meeting notes refresh: queued %d recording(s)", len(rows))
+
+
+async def fts_maintenance_job() -> None:
+    """Incrementally merge the recordings_fts index segments."""
+    await _enqueue("fts_maintenance")
+
+
+async def semantic_index_job() -> None:
+    """Index ready recordings missing from the deep search semantic index."""
+    if get_settings().deep_search_prefilter_top_k > 0:
+        await _enqueue("semantic_index")
 
 
 def start_scheduler() -> None:
@@ -102,9 +135,10 @@ def start_scheduler() -> None:
     scheduler.add_job(
         poll_transcriptions_job,
         "interval",
-        minutes=5,
+        seconds=settings.transcription_poll_seconds,
         id="poll_transcriptions",
         replace_existing=True,
+        max_instances=1,
     )
 
     scheduler.add_job(
@@ -116,10 +150,30 @@ def start_scheduler() -> None:
         max_instances=1,
     )
 
+    scheduler.add_job(
+        fts_maintenance_job,
+        "interval",
+        hours=24,
+        id="fts_maintenance",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    scheduler.add_job(
+        semantic_index_job,
+        "interval",
+        minutes=10,
+        id="semantic_index",
+        replace_existing=True,
+        max_instances=1,
+    )
+
     scheduler.start()
     logger.info(
-        "Scheduler started — sync every %d min, polling every 5 min, meeting notes every 60 min",
+        "Scheduler started — sync every %d min, polling every %d s, meeting notes every 60 min, "
+        "FTS maintenance daily, semantic index every 10 min",
         settings.sync_interval_minutes,
+        settings.transcription_poll_seconds,
     )
 
 
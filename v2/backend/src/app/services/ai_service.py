@@ -12,6 +12,8 @@ from openai import AsyncAzureOpenAI
 from app.config import get_settings
 from app.models import ChatResponse
 from app.prompts import render
+from app.services import llm_client
+from app.services.llm_client import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -30,13 +32,8 @@ def _count_tokens(text: str) -> int:
 
 
 def _get_client() -> AsyncAzureOpenAI:
-    """Create an async Azure OpenAI client."""
-    settings = get_settings()
-    return AsyncAzureOpenAI(
-        azure_endpoint=settings.azure_openai_endpoint,
-        api_key=settings.azure_openai_api_key,
-        api_version=settings.azure_openai_api_version,
-    )
+    """Get the shared async Azure OpenAI client."""
+    return llm_client.get_client()
 
 
 # Reserve tokens for system prompt overhead + completion
@@ -78,9 +75,10 @@ async def generate_title_description(transcript: str) -> dict:
     truncated = _truncate_transcript(transcript, max_tokens=8_000)
     prompt_text = render("generate_title_description", transcript=truncated)
 
-    client = _get_client()
     try:
-        response = await client.chat.completions.create(
+        response = await llm_client.chat_completion(
+            Priority.BACKGROUND,
+            client=_get_client(),
             model=settings.azure_openai_mini_deployment,
             messages=[{"role": "user", "content": prompt_text}],
             max_completion_tokens=4000,
@@ -97,8 +95,6 @@ async def generate_title_description(transcript: str) -> dict:
     except (json.JSONDecodeError, KeyError, IndexError) as exc:
         logger.warning("Failed to parse title/description response: %s", exc)
         return {"title": "Untitled Recording", "description": ""}
-    finally:
-        await client.close()
 
 
 async def infer_speakers(transcript: str) -> dict:
@@ -116,9 +112,10 @@ async def infer_speakers(transcript: str) -> dict:
     truncated = _truncate_transcript(transcript, max_tokens=10_000)
     prompt_text = render("infer_speaker_names", transcript=truncated)
 
-    client = _get_client()
     try:
-        response = await client.chat.completions.create(
+        response = await llm_client.chat_completion(
+            Priority.INTERACTIVE,
+            client=_get_client(),
             model=settings.azure_openai_deployment,
             messages=[{"role": "user", "content": prompt_text}],
             response_format={"type": "json_object"},
@@ -129,8 +126,6 @@ async def infer_speakers(transcript: str) -> dict:
     except (json.JSONDecodeError, KeyError, IndexError) as exc:
         logger.warning("Failed to parse speaker inference response: %s", exc)
         return {}
-    finally:
-        await client.close()
 
 
 async def chat(
@@ -161,32 +156,30 @@ async def chat(
 
     all_messages = [system_message] + messages
 
-    client = _get_client()
     start_ms = int(time.time() * 1000)
-    try:
-        response = await client.chat.completions.create(
-            model=settings.azure_openai_chat_deployment or settings.azure_openai_mini_deployment or settings.azure_openai_deployment,
-            messages=all_messages,
-            reasoning_effort="low",
-        )
+    response = await llm_client.chat_completion(
+        Priority.INTERACTIVE,
+        client=_get_client(),
+        model=settings.azure_openai_chat_deployment or settings.azure_openai_mini_deployment or settings.azure_openai_deployment,
+        messages=all_messages,
+        reasoning_effort="low",
+    )
 
-        elapsed_ms = int(time.time() * 1000) - start_ms
-        choice = response.choices[0]
-        usage = None
-        if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-
-        return ChatResponse(
-            message=choice.message.content or "",
-            usage=usage,
-            response_time_ms=elapsed_ms,
-        )
-    finally:
-        await client.close()
+    elapsed_ms = int(time.time() * 1000) - start_ms
+    choice = response.choices[0]
+    usage = None
+    if response.usage:
+        usage = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+        }
+
+    return ChatResponse(
+        message=choice.message.content or "",
+        usage=usage,
+        response_time_ms=elapsed_ms,
+    )
 
 
 async def synthesize(
@@ -241,32 +234,30 @@ async def synthesize(
 
     all_messages = [system_message, {"role": "user", "content": question}]
 
-    client = _get_client()
     start_ms = int(time.time() * 1000)
-    try:
-        response = await client.chat.completions.create(
-            model=settings.azure_openai_chat_deployment or settings.azure_openai_mini_deployment or settings.azure_openai_deployment,
-            messages=all_messages,
-            reasoning_effort="low",
-        )
+    response = await llm_client.chat_completion(
+        Priority.INTERACTIVE,
+        client=_get_client(),
+        model=settings.azure_openai_chat_deployment or settings.azure_openai_mini_deployment or settings.azure_openai_deployment,
+        messages=all_messages,
+        reasoning_effort="low",
+    )
 
-        elapsed_ms = int(time.time() * 1000) - start_ms
-        choice = response.choices[0]
-        usage = None
-        if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-
-        return ChatResponse(
-            message=choice.message.content or "",
-            usage=usage,
-            response_time_ms=elapsed_ms,
-        )
-    finally:
-        await client.close()
+    elapsed_ms = int(time.time() * 1000) - start_ms
+    choice = response.choices[0]
+    usage = None
+    if response.usage:
+        usage = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+        }
+
+    return ChatResponse(
+        message=choice.message.content or "",
+        usage=usage,
+        response_time_ms=elapsed_ms,
+    )
 
 
 async def run_analysis(transcript: str, prompt_template: str) -> str:
@@ -283,13 +274,11 @@ async def run_analysis(transcript: str, prompt_template: str) -> str:
     truncated = _truncate_transcript(transcript)
     prompt_text = prompt_template.format(transcript=truncated)
 
-    client = _get_client()
-    try:
-        response = await client.chat.completions.create(
-            model=settings.azure_openai_deployment,
-            messages=[{"role": "user", "content": prompt_text}],
-        )
+    response = await llm_client.chat_completion(
+        Priority.INTERACTIVE,
+        client=_get_client(),
+        model=settings.azure_openai_deployment,
+        messages=[{"role": "user", "content": prompt_text}],
+    )
 
-        return response.choices[0].message.content or ""
-    finally:
-        await client.close()
+    return response.choices[0].message.content or ""
@@ -299,8 +299,10 @@ async def search_to_add(
         where_clauses.append("r.recorded_at <= ?")
         params.append(date_to)
     if speaker:
-        # Search in speaker_mapping JSON for display name
-        where_clauses.append("r.speaker_mapping LIKE ?")
+        where_clauses.append(
+            "r.id IN (SELECT recording_id FROM recording_speakers"
+            " WHERE user_id = r.user_id AND display_name LIKE ?)"
+        )
         params.append(f"%{speaker}%")
 
     where_sql = " AND ".join(where_clauses)
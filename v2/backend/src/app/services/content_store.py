@@ -0,0 +1,126 @@
+"""Side-table storage for heavy per-recording payloads.
+
+The raw Azure Speech transcript JSON is often larger than everything else in
+a recording row combined. Keeping it in `recordings` pushed list metadata,
+status and speaker_mapping onto overflow pages for every scan, so it lives
+in `recording_content` instead, zlib-compressed.
+
+Callers pass and receive the JSON as a plain string; compression is an
+internal detail recorded per row in the `encoding` column.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+import aiosqlite
+
+from app.database import get_db
+
+ENCODING_ZLIB = "zlib"
+ENCODING_PLAIN = "plain"
+
+
+def encode_transcript_json(text: str) -> tuple[bytes, str]:
+    """Compress transcript JSON for storage. Returns (blob, encoding)."""
+    return zlib.compress(text.encode("utf-8"), 6), ENCODING_ZLIB
+
+
+def decode_transcript_json(blob: bytes | str | None, encoding: str | None) -> str | None:
+    """Inverse of encode_transcript_json; tolerates uncompressed rows."""
+    if blob is None:
+        return None
+    if encoding == ENCODING_ZLIB:
+        return zlib.decompress(blob).decode("utf-8")
+    return blob.decode("utf-8") if isinstance(blob, bytes) else blob
+
+
+async def save_transcript_json(
+    recording_id: str,
+    text: str | None,
+    db: aiosqlite.Connection | None = None,
+) -> None:
+    """Upsert (or clear, when text is None) a recording's transcript JSON.
+
+    Does not commit; callers commit alongside their own recordings write.
+    """
+    db = db or await get_db()
+    if text is None:
+        await db.execute(
+            "DELETE FROM recording_content WHERE recording_id = ?", (recording_id,)
+        )
+        return
+    blob, encoding = encode_transcript_json(text)
+    await db.execute(
+        """INSERT INTO recording_content (recording_id, transcript_json, encoding)
+           VALUES (?, ?, ?)
+           ON CONFLICT(recording_id) DO UPDATE
+           SET transcript_json = excluded.transcript_json, encoding = excluded.encoding""",
+        (recording_id, blob, encoding),
+    )
+
+
+async def get_transcript_json(
+    recording_id: str,
+    db: aiosqlite.Connection | None = None,
+) -> str | None:
+    """Load and decode a recording's transcript JSON, if any."""
+    db = db or await get_db()
+    rows = await db.execute_fetchall(
+        "SELECT transcript_json, encoding FROM recording_content WHERE recording_id = ?",
+        (recording_id,),
+    )
+    if not rows:
+        return None
+    r = dict(rows[0])
+    return decode_transcript_json(r["transcript_json"], r["encoding"])
+
+
+async def get_transcript_json_bulk(
+    recording_ids: list[str],
+    db: aiosqlite.Connection | None = None,
+) -> dict[str, str]:
+    """Load transcript JSON for many recordings in one query."""
+    if not recording_ids:
+        return {}
+    db = db or await get_db()
+    placeholders = ",".join("?" for _ in recording_ids)
+    rows = await db.execute_fetchall(
+        f"""SELECT recording_id, transcript_json, encoding FROM recording_content
+            WHERE recording_id IN ({placeholders})""",
+        recording_ids,
+    )
+    result = {}
+    for row in rows:
+        r = dict(row)
+        result[r["recording_id"]] = decode_transcript_json(r["transcript_json"], r["encoding"])
+    return result
+
+
+async def move_inline_transcript_json(db: aiosqlite.Connection, batch_size: int = 200) -> int:
+    """Move any transcript_json still stored on `recordings` into the side table.
+
+    Runs from _migrate_schema on every start, so rows written to the legacy
+    column by older tooling (e.g. tools/migrate.py) are picked up too.
+
+    Returns:
+        Number of recordings moved.
+    """
+    moved = 0
+    while True:
+        rows = await db.execute_fetchall(
+            "SELECT id, transcript_json FROM recordings WHERE transcript_json IS NOT NULL LIMIT ?",
+            (batch_size,),
+        )
+        if not rows:
+            break
+        for row in rows:
+            r = dict(row)
+            await save_transcript_json(r["id"], r["transcript_json"], db=db)
+        await db.executemany(
+            "UPDATE recordings SET transcript_json = NULL WHERE id = ?",
+            [(dict(r)["id"],) for r in rows],
+        )
+        await db.commit()
+        moved += len(rows)
+    return moved
@@ -18,14 +18,16 @@ import re
 import string
 import time
 import uuid
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 
 import tiktoken
 from openai import AsyncAzureOpenAI
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.prompts import render_messages
+from app.services import llm_client, search_cache, semantic_index
+from app.services.llm_client import Priority
 
 logger = logging.getLogger(__name__)
 
@@ -72,12 +74,7 @@ def _filter_tag_map(tag_map: dict, text: str) -> dict:
 
 
 def _get_client() -> AsyncAzureOpenAI:
-    settings = get_settings()
-    return AsyncAzureOpenAI(
-        azure_endpoint=settings.azure_openai_endpoint,
-        api_key=settings.azure_openai_api_key,
-        api_version=settings.azure_openai_api_version,
-    )
+    return llm_client.get_client()
 
 
 def _extract_reasoning_tokens(usage) -> int | None:
@@ -137,69 +134,69 @@ async def _call_llm_json(
     question: str = "",
 ) -> dict:
     """Call LLM and parse JSON response."""
-    client = _get_client()
     start = time.time()
-    try:
-        response = await client.chat.completions.create(
-            model=model,
-            messages=messages,
-            response_format={"type": "json_object"},
-        )
-        content = response.choices[0].message.content or "{}"
-        duration_ms = _ms(start)
-
-        if trace_log is not None:
-            prompt_text = "\n".join(m.get("content", "") for m in messages)
-            usage = response.usage
-            reasoning_tokens = _extract_reasoning_tokens(usage)
-            entry = {
-                "tier": trace_tier,
-                "step": trace_step,
-                "model": model,
-                "prompt_tokens": usage.prompt_tokens if usage else 0,
-                "completion_tokens": usage.completion_tokens if usage else 0,
-                "reasoning_tokens": reasoning_tokens,
-                "duration_ms": duration_ms,
-                "input_preview": prompt_text[:500],
-                "output_preview": content[:500],
-                "output_raw": content,
-                "input_text": prompt_text,
-                "output_text": content,
-                "search_id": search_id,
-            }
-            trace_log.append(entry)
+    response = await llm_client.chat_completion(
+        Priority.INTERACTIVE,
+        client=_get_client(),
+        model=model,
+        messages=messages,
+        response_format={"type": "json_object"},
+    )
+    content = response.choices[0].message.content or "{}"
+    duration_ms = _ms(start)
+
+    if trace_log is not None:
+        prompt_text = "\n".join(m.get("content", "") for m in messages)
+        usage = response.usage
+        reasoning_tokens = _extract_reasoning_tokens(usage)
+        entry = {
+            "tier": trace_tier,
+            "step": trace_step,
+            "model": model,
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0,
+            "reasoning_tokens": reasoning_tokens,
+            "duration_ms": duration_ms,
+            "input_preview": prompt_text[:500],
+            "output_preview": content[:500],
+            "output_raw": content,
+            "input_text": prompt_text,
+            "output_text": content,
+            "search_id": search_id,
+        }
+        trace_log.append(entry)
 
-            if search_id:
-                await _persist_trace(search_id, question, entry)
+        if search_id:
+            await _persist_trace(search_id, question, entry)
 
-        # Try parsing JSON; if it fails, ask the model to fix it
+    # Try parsing JSON; if it fails, ask the model to fix it
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        logger.warning(f"JSON parse failed for {trace_step}, attempting repair")
+        # Strip markdown fences
+        text = content.strip()
+        if text.startswith("```"):
+            text = text.split("\n", 1)[1] if "\n" in text else text[3:]
+            if text.endswith("```"):
+                text = text[:-3]
+            text = text.strip()
         try:
-            return json.loads(content)
+            return json.loads(text)
         except json.JSONDecodeError:
-            logger.warning(f"JSON parse failed for {trace_step}, attempting repair")
-            # Strip markdown fences
-            text = content.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                text = text.strip()
-            try:
-                return json.loads(text)
-            except json.JSONDecodeError:
-                # One-shot repair call
-                repair_response = await client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "user", "content": f"I expected valid JSON but got this response. Please return ONLY valid JSON that preserves the content:\n\n{content[:2000]}"},
-                    ],
-                    response_format={"type": "json_object"},
-                )
-                repaired = repair_response.choices[0].message.content or "{}"
-                logger.info(f"JSON repair succeeded for {trace_step}")
-                return json.loads(repaired)
-    finally:
-        await client.close()
+            # One-shot repair call
+            repair_response = await llm_client.chat_completion(
+                Priority.INTERACTIVE,
+                client=_get_client(),
+                model=model,
+                messages=[
+                    {"role": "user", "content": f"I expected valid JSON but got this response. Please return ONLY valid JSON that preserves the content:\n\n{content[:2000]}"},
+                ],
+                response_format={"type": "json_object"},
+            )
+            repaired = repair_response.choices[0].message.content or "{}"
+            logger.info(f"JSON repair succeeded for {trace_step}")
+            return json.loads(repaired)
 
 
 async def _call_llm_text(
@@ -213,43 +210,41 @@ async def _call_llm_text(
     question: str = "",
 ) -> str:
     """Call LLM and return text response."""
-    client = _get_client()
     start = time.time()
-    try:
-        response = await client.chat.completions.create(
-            model=model,
-            messages=messages,
-        )
-        content = response.choices[0].message.content or ""
-        duration_ms = _ms(start)
-
-        if trace_log is not None:
-            prompt_text = "\n".join(m.get("content", "") for m in messages)
-            usage = response.usage
-            reasoning_tokens = _extract_reasoning_tokens(usage)
-            entry = {
-                "tier": trace_tier,
-                "step": trace_step,
-                "model": model,
-                "prompt_tokens": usage.prompt_tokens if usage else 0,
-                "completion_tokens": usage.completion_tokens if usage else 0,
-                "reasoning_tokens": reasoning_tokens,
-                "duration_ms": duration_ms,
-                "input_preview": prompt_text[:500],
-                "output_preview": content[:500],
-                "output_raw": content,
-                "input_text": prompt_text,
-                "output_text": content,
-                "search_id": search_id,
-            }
-            trace_log.append(entry)
+    response = await llm_client.chat_completion(
+        Priority.INTERACTIVE,
+        client=_get_client(),
+        model=model,
+        messages=messages,
+    )
+    content = response.choices[0].message.content or ""
+    duration_ms = _ms(start)
+
+    if trace_log is not None:
+        prompt_text = "\n".join(m.get("content", "") for m in messages)
+        usage = response.usage
+        reasoning_tokens = _extract_reasoning_tokens(usage)
+        entry = {
+            "tier": trace_tier,
+            "step": trace_step,
+            "model": model,
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0,
+            "reasoning_tokens": reasoning_tokens,
+            "duration_ms": duration_ms,
+            "input_preview": prompt_text[:500],
+            "output_preview": content[:500],
+            "output_raw": content,
+            "input_text": prompt_text,
+            "output_text": content,
+            "search_id": search_id,
+        }
+        trace_log.append(entry)
 
-            if search_id:
-                await _persist_trace(search_id, question, entry)
+        if search_id:
+            await _persist_trace(search_id, question, entry)
 
-        return content
-    finally:
-        await client.close()
+    return content
 
 
 def _extract_speaker_names_list(speaker_mapping_json: str | None) -> list[str]:
@@ -297,11 +292,114 @@ def _build_trace_summary(trace_log: list[dict], start: float) -> dict:
 # ---------------------------------------------------------------------------
 
 
+_CACHEABLE_EVENTS = {"candidates", "extract", "tag_map", "result"}
+
+
+async def _with_answer_cache(
+    key: tuple,
+    events: AsyncGenerator[dict, None],
+    on_hit: Callable[[list[dict]], Awaitable[None]] | None = None,
+) -> AsyncGenerator[dict, None]:
+    """Replay a cached answer for key, or stream events and cache the outcome.
+
+    Only the user-visible events (candidates, extracts, tag_map, result) are
+    stored; runs that emit an error are not cached. A replay keeps the
+    original search_id, so its traces in /api/search/history still resolve;
+    on_hit(cached_events) lets the caller record the repeat elsewhere.
+    """
+    cache = search_cache.answer_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        await events.aclose()
+        logger.info(f"Deep search cache hit | scope={key[0]}")
+        yield {"event": "status", "data": "Using cached answer..."}
+        for event in cached:
+            yield event
+        if on_hit is not None:
+            await on_hit(cached)
+        yield _build_trace_summary([], time.time())
+        yield {"event": "done", "data": ""}
+        return
+
+    recorded: list[dict] = []
+    failed = False
+    async for event in events:
+        if event["event"] == "error":
+            failed = True
+        elif event["event"] in _CACHEABLE_EVENTS:
+            recorded.append(event)
+        yield event
+    if not failed and any(e["event"] == "result" for e in recorded):
+        cache.set(key, recorded)
+
+
 async def search_collection(
     question: str, collection_id: str, user_id: str
 ) -> AsyncGenerator[dict, None]:
     """Run deep search on a collection's recordings (Tier 2 + 3 only).
 
+    Identical questions over an unchanged item set are answered from cache.
+    """
+    key = (
+        collection_id,
+        user_id,
+        search_cache.normalize_question(question),
+        await search_cache.collection_fingerprint(collection_id, user_id),
+    )
+
+    async def record_hit(cached: list[dict]) -> None:
+        result = next(e["data"] for e in cached if e["event"] == "result")
+        item_count = sum(len(e["data"]) for e in cached if e["event"] == "candidates")
+        await _save_collection_search(
+            collection_id, question, result.get("answer", ""), item_count, result.get("search_id")
+        )
+
+    async for event in _with_answer_cache(
+        key, _search_collection_uncached(question, collection_id, user_id), on_hit=record_hit
+    ):
+        yield event
+
+
+async def _save_collection_search(
+    collection_id: str, question: str, answer: str, item_count: int, search_id: str
+) -> None:
+    """Add a row to the collection's search history."""
+    try:
+        from app.services.collection_service import compute_item_set_hash
+        item_set_hash = await compute_item_set_hash(collection_id)
+        db = await get_db()
+        await db.execute(
+            """INSERT INTO collection_searches
+               (id, collection_id, question, answer, item_count, item_set_hash, search_id)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (str(uuid.uuid4()), collection_id, question, answer, item_count, item_set_hash, search_id),
+        )
+        await db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to save collection search record: {e}")
+
+
+async def deep_search(question: str, user_id: str) -> AsyncGenerator[dict, None]:
+    """Run the 3-tier deep search pipeline, yielding SSE events for progress.
+
+    Identical questions over an unchanged library are answered from cache;
+    see _deep_search_uncached for the event types.
+    """
+    key = (
+        "all",
+        user_id,
+        search_cache.normalize_question(question),
+        await search_cache.library_fingerprint(user_id),
+    )
+    async for event in _with_answer_cache(key, _deep_search_uncached(question, user_id)):
+        yield event
+
+
+async def _search_collection_uncached(
+    question: str, collection_id: str, user_id: str
+) -> AsyncGenerator[dict, None]:
+    """Run deep search on a collection's recordings (Tier 2 + 3 only).
+
     Skips Tier 1 entirely — all collection items are treated as candidates.
     Yields the same SSE events as regular deep_search.
     """
@@ -457,21 +555,9 @@ async def search_collection(
             f"Collection search done | {len(extracts)} extracts synthesized | {_ms(qa_start)}ms"
         )
 
-        # Save to collection_searches
-        try:
-            from app.services.collection_service import compute_item_set_hash
-            item_set_hash = await compute_item_set_hash(collection_id)
-            answer_text = result.get("answer", "")
-            cs_id = str(uuid.uuid4())
-            await db.execute(
-                """INSERT INTO collection_searches
-                   (id, collection_id, question, answer, item_count, item_set_hash, search_id)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (cs_id, collection_id, question, answer_text, len(candidates), item_set_hash, search_id),
-            )
-            await db.commit()
-        except Exception as e:
-            logger.warning(f"Failed to save collection search record: {e}")
+        await _save_collection_search(
+            collection_id, question, result.get("answer", ""), len(candidates), search_id
+        )
 
         # Create a sync_run entry for tracing
         try:
@@ -498,7 +584,7 @@ async def search_collection(
         yield {"event": "done", "data": ""}
 
 
-async def deep_search(question: str, user_id: str) -> AsyncGenerator[dict, None]:
+async def _deep_search_uncached(question: str, user_id: str) -> AsyncGenerator[dict, None]:
     """Run the 3-tier deep search pipeline, yielding SSE events for progress.
 
     Event types:
@@ -653,6 +739,80 @@ async def deep_search(question: str, user_id: str) -> AsyncGenerator[dict, None]
 # Tier 1: Router
 # ---------------------------------------------------------------------------
 
+# Upper bound on the tokens a "[[AB12]] " prefix adds to a cached line
+_TAG_TOKEN_OVERHEAD = 8
+
+
+def _render_corpus_body(row: dict, speakers: list[str]) -> str:
+    """Render a recording's Tier 1 line (without its per-search tag)."""
+    summary = row.get("search_summary") or row.get("description") or ""
+    if not summary:
+        return ""
+    return (
+        f"{row.get('title') or 'Untitled'}\n"
+        f"date:{row.get('recorded_at') or '?'} | "
+        f"speakers:{', '.join(speakers) if speakers else '?'} | "
+        f"duration:{_format_duration(row.get('duration_seconds'))}\n"
+        f"{summary}"
+    )
+
+
+async def _load_routing_corpus(user_id: str) -> list[dict]:
+    """Load every ready recording's pre-rendered Tier 1 line, newest first.
+
+    Lines missing from `search_corpus` (new recordings, or ones whose
+    rendered fields changed and were dropped by the search_corpus_au
+    trigger) are rendered, token-counted and stored here, so tiktoken and
+    speaker_mapping parsing only run for recordings that changed.
+    """
+    db = await get_read_db()
+    rows = [dict(r) for r in await db.execute_fetchall(
+        """SELECT r.id, r.title, r.recorded_at, c.body, c.speakers, c.token_count
+           FROM recordings r
+           LEFT JOIN search_corpus c ON c.recording_id = r.id
+           WHERE r.user_id = ? AND r.status = 'ready'
+           ORDER BY r.recorded_at DESC""",
+        (user_id,),
+    )]
+
+    missing = [r["id"] for r in rows if r["body"] is None]
+    if not missing:
+        return rows
+
+    write_db = await get_db()
+    built: dict[str, dict] = {}
+    for i in range(0, len(missing), 500):
+        chunk = missing[i:i + 500]
+        placeholders = ",".join("?" for _ in chunk)
+        source_rows = await write_db.execute_fetchall(
+            f"""SELECT id, title, description, search_summary, duration_seconds,
+                       recorded_at, speaker_mapping
+                FROM recordings WHERE id IN ({placeholders})""",
+            chunk,
+        )
+        for src in source_rows:
+            src = dict(src)
+            speakers = _extract_speaker_names_list(src.get("speaker_mapping"))
+            body = _render_corpus_body(src, speakers)
+            built[src["id"]] = {
+                "body": body,
+                "speakers": json.dumps(speakers),
+                "token_count": count_tokens(body) if body else 0,
+            }
+    await write_db.executemany(
+        """INSERT OR REPLACE INTO search_corpus (recording_id, body, speakers, token_count)
+           VALUES (?, ?, ?, ?)""",
+        [(rid, b["body"], b["speakers"], b["token_count"]) for rid, b in built.items()],
+    )
+    await write_db.commit()
+    logger.info(f"Tier 1 router | rendered {len(built)} corpus line(s)")
+
+    for row in rows:
+        if row["id"] in built:
+            row.update(built[row["id"]])
+    return [r for r in rows if r["body"] is not None]
+
+
 
 async def _tier1_router(
     question: str, user_id: str, *, trace_log: list[dict] | None = None,
@@ -663,52 +823,41 @@ async def _tier1_router(
     Returns (result, tag_map).
     """
     settings = get_settings()
-    db = await get_db()
-
-    # Load all recordings with summary data for this user
-    rows = await db.execute_fetchall(
-        """SELECT id, title, description, search_summary, duration_seconds,
-                  recorded_at, speaker_mapping
-           FROM recordings
-           WHERE user_id = ? AND status = 'ready'
-           ORDER BY recorded_at DESC""",
-        (user_id,),
-    )
+    rows = await _load_routing_corpus(user_id)
 
     if not rows:
         logger.warning("Tier 1 router | no recordings found")
         return {"answered": False, "candidates": []}, {}
 
-    # Assign tags and build tagged lines
+    # Narrow large libraries to the locally retrieved top-K before the LLM
+    top_k = settings.deep_search_prefilter_top_k
+    if top_k > 0 and len(rows) > top_k:
+        keep = await semantic_index.prefilter(user_id, question, top_k)
+        before = len(rows)
+        rows = [r for r in rows if r["id"] in keep]
+        logger.info(f"Tier 1 router | prefilter kept {len(rows)}/{before} recordings")
+
+    # Assign tags; lines and token counts come pre-rendered from the corpus
     used_tags: set[str] = set()
     tag_map: dict[str, dict] = {}
     tagged_lines: list[tuple[str, str, int]] = []  # (tag, text, token_count)
 
     for row in rows:
-        row = dict(row)
-        summary = row.get("search_summary") or row.get("description") or ""
-        if not summary:
+        if not row["body"]:
             continue
 
         tag = generate_unique_tag(used_tags)
         used_tags.add(tag)
 
-        speakers = _extract_speaker_names_list(row.get("speaker_mapping"))
         tag_map[tag] = {
             "recording_id": row["id"],
-            "title": row.get("title") or "Untitled",
-            "date": row.get("recorded_at") or "",
-            "speakers": speakers,
+            "title": row["title"] or "Untitled",
+            "date": row["recorded_at"] or "",
+            "speakers": json.loads(row["speakers"]),
         }
-
-        line = (
-            f"[[{tag}]] {row.get('title') or 'Untitled'}\n"
-            f"date:{row.get('recorded_at') or '?'} | "
-            f"speakers:{', '.join(speakers) if speakers else '?'} | "
-            f"duration:{_format_duration(row.get('duration_seconds'))}\n"
-            f"{summary}"
+        tagged_lines.append(
+            (tag, f"[[{tag}]] {row['body']}", row["token_count"] + _TAG_TOKEN_OVERHEAD)
         )
-        tagged_lines.append((tag, line, count_tokens(line)))
 
     if not tagged_lines:
         logger.warning("Tier 1 router | no summaries available")
@@ -926,14 +1075,19 @@ async def _tier2_extract(
 ) -> list[dict]:
     """For each candidate recording, extract relevant info from the full transcript.
 
-    Runs in parallel with a concurrency cap of 8.
+    Runs in parallel, at most deep_search_extract_concurrency at a time;
+    the shared LLM scheduler additionally paces the calls.
     Returns list of {tag, title, date, answer} for relevant extracts.
     """
     settings = get_settings()
-    db = await get_db()
+    db = await get_read_db()
     model = settings.azure_openai_mini_deployment
+    extract_cache = search_cache.extract_cache()
+    normalized_question = search_cache.normalize_question(question)
 
-    sem = asyncio.Semaphore(8)  # Cap concurrent LLM calls
+    # Bounds transcripts held in memory and reads in flight; the LLM
+    # scheduler separately paces the calls themselves
+    sem = asyncio.Semaphore(max(1, settings.deep_search_extract_concurrency))
 
     async def extract_one(candidate: dict) -> dict | None:
         async with sem:
@@ -942,7 +1096,7 @@ async def _tier2_extract(
 
             # Load full transcript
             row = await db.execute_fetchall(
-                "SELECT diarized_text, transcript_text FROM recordings WHERE id = ?",
+                "SELECT diarized_text, transcript_text, updated_at FROM recordings WHERE id = ?",
                 (rec_id,),
             )
             if not row:
@@ -953,6 +1107,18 @@ async def _tier2_extract(
             if not transcript:
                 return None
 
+            extract = {
+                "tag": tag,
+                "title": candidate.get("title", "Untitled"),
+                "date": candidate.get("date", ""),
+                "speakers": candidate.get("speakers", []),
+            }
+            cache_key = (normalized_question, rec_id, rec.get("updated_at"), model)
+            cached = extract_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Tier 2 | {tag} ({candidate.get('title', '?')[:30]}) -> cached")
+                return {**extract, "answer": cached} if cached else None
+
             # Truncate very long transcripts
             max_chars = 100_000
             if len(transcript) > max_chars:
@@ -985,19 +1151,15 @@ async def _tier2_extract(
                 stripped = answer.strip()
                 if not stripped or stripped.upper() == "NOT_RELEVANT":
                     logger.info(f"Tier 2 | {tag} ({candidate.get('title', '?')[:30]}) -> NOT_RELEVANT")
+                    extract_cache.set(cache_key, "")
                     return None
 
                 logger.info(
                     f"Tier 2 | {tag} ({candidate.get('title', '?')[:30]}) -> "
                     f"{len(stripped.split())} words"
                 )
-                return {
-                    "tag": tag,
-                    "title": candidate.get("title", "Untitled"),
-                    "date": candidate.get("date", ""),
-                    "speakers": candidate.get("speakers", []),
-                    "answer": stripped,
-                }
+                extract_cache.set(cache_key, stripped)
+                return {**extract, "answer": stripped}
             except Exception as e:
                 logger.error(f"Tier 2 extract error for {tag}: {e}")
                 return None
@@ -11,6 +11,7 @@ import logging
 import os
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -29,14 +30,20 @@ def l2_normalize(v: np.ndarray) -> np.ndarray:
     return v / (np.linalg.norm(v) + 1e-12)
 
 
-def get_engine(model_path: str | None = None) -> EmbeddingEngine:
+def get_engine(
+    model_path: str | None = None,
+    batch_size: int = 16,
+    num_threads: int = 0,
+) -> EmbeddingEngine:
     """Get or create the singleton EmbeddingEngine instance.
 
     The model is loaded on first call and kept in memory for the process lifetime.
     """
     global _engine
     if _engine is None:
-        _engine = EmbeddingEngine(model_path=model_path)
+        _engine = EmbeddingEngine(
+            model_path=model_path, batch_size=batch_size, num_threads=num_threads,
+        )
     return _engine
 
 
@@ -47,9 +54,16 @@ class EmbeddingEngine:
     192-dimensional speaker embeddings.
     """
 
-    def __init__(self, model_path: str | None = None):
+    def __init__(
+        self,
+        model_path: str | None = None,
+        batch_size: int = 16,
+        num_threads: int = 0,
+    ):
         self._model = None
         self._model_path = model_path or "/app/pretrained_models/spkrec-ecapa-voxceleb"
+        self.batch_size = max(1, batch_size)
+        self._num_threads = num_threads
 
     def _load_model(self):
         """Check that speaker-id dependencies are available."""
@@ -71,6 +85,9 @@ class EmbeddingEngine:
         import torch  # noqa: F811
         from speechbrain.inference.speaker import EncoderClassifier
 
+        if self._num_threads > 0:
+            torch.set_num_threads(self._num_threads)
+
         logger.info("Loading ECAPA-TDNN model from %s (CPU)...", self._model_path)
         self._model = EncoderClassifier.from_hparams(
             source="speechbrain/spkrec-ecapa-voxceleb",
@@ -137,6 +154,90 @@ class EmbeddingEngine:
             emb = emb.squeeze().detach().cpu().numpy()
             return emb.astype(np.float32)
 
+    def embeddings_for_windows(
+        self,
+        wav: "torch.Tensor",
+        sr: int,
+        windows: list[tuple[float, float]],
+        min_dur_s: float = 0.0,
+        batch_size: int | None = None,
+    ) -> list[np.ndarray | None]:
+        """Extract embeddings for many time windows of a loaded waveform.
+
+        Args:
+            wav: Mono 16kHz waveform of shape (1, samples).
+            sr: Sample rate of wav.
+            windows: List of (start_s, end_s) tuples.
+            min_dur_s: Windows shorter than this (after slicing) get None.
+            batch_size: Windows per forward pass (default: engine batch_size).
+
+        Returns:
+            List of float32 (192,) embeddings aligned with windows.
+        """
+        clips = [self.slice_audio(wav, sr, s, e).squeeze(0) for s, e in windows]
+        return self._embed_clips(clips, sr, min_dur_s, batch_size)
+
+    def embeddings_for_file_windows(
+        self,
+        audio_path: str,
+        windows: list[tuple[float, float]],
+        min_dur_s: float = 0.0,
+        batch_size: int | None = None,
+    ) -> list[np.ndarray | None]:
+        """Like embeddings_for_windows, but decodes only the windows from disk.
+
+        Memory and temp-disk use scale with the selected speech, not with
+        the recording length (see decode_windows).
+        """
+        import torch
+
+        clips = [torch.from_numpy(pcm) for pcm in decode_windows(audio_path, windows)]
+        return self._embed_clips(clips, 16000, min_dur_s, batch_size)
+
+    def _embed_clips(
+        self,
+        clips: list["torch.Tensor"],
+        sr: int,
+        min_dur_s: float,
+        batch_size: int | None,
+    ) -> list[np.ndarray | None]:
+        """Embed 1-D clips in batched forward passes.
+
+        Clips are sorted by length so each batch holds similar lengths
+        (center-windowed segments are mostly identical), zero-padded to the
+        longest in the batch, and passed with relative `wav_lens` so
+        SpeechBrain's feature normalization and attentive pooling ignore
+        the padding.
+        """
+        import torch
+
+        results: list[np.ndarray | None] = [None] * len(clips)
+        min_samples = max(1, int(min_dur_s * sr))
+        slices = [(i, clip) for i, clip in enumerate(clips) if clip.shape[0] >= min_samples]
+        if not slices:
+            return results
+
+        self._ensure_model()
+        slices.sort(key=lambda item: item[1].shape[0], reverse=True)
+        size = batch_size or self.batch_size
+
+        with torch.inference_mode():
+            for b in range(0, len(slices), size):
+                batch = slices[b:b + size]
+                max_len = batch[0][1].shape[0]
+                padded = torch.zeros(len(batch), max_len, dtype=batch[0][1].dtype)
+                for row, (_, seg) in enumerate(batch):
+                    padded[row, : seg.shape[0]] = seg
+                wav_lens = torch.tensor(
+                    [seg.shape[0] / max_len for _, seg in batch], dtype=torch.float32
+                )
+                embs = self._model.encode_batch(padded, wav_lens=wav_lens)
+                embs = embs.reshape(len(batch), -1).detach().cpu().numpy().astype(np.float32)
+                for row, (i, _) in enumerate(batch):
+                    results[i] = embs[row]
+
+        return results
+
     def embeddings_for_segments(
         self,
         audio_path: str,
@@ -146,7 +247,7 @@ class EmbeddingEngine:
     ) -> list[np.ndarray | None]:
         """Extract embeddings for multiple time segments from one audio file.
 
-        Loads audio once for efficiency.
+        Decodes only the needed windows and embeds them in batched passes.
 
         Args:
             audio_path: Path to audio file.
@@ -160,30 +261,61 @@ class EmbeddingEngine:
         if not segments:
             return []
 
-        wav, sr = self.load_audio_mono_16k(audio_path)
-        embeddings: list[np.ndarray | None] = []
-
+        windows: list[tuple[float, float]] = []
         for start_s, end_s in segments:
             dur = end_s - start_s
             if dur < min_dur_s:
-                embeddings.append(None)
+                # Zero-length window; filtered by min_dur_s below
+                windows.append((start_s, start_s))
                 continue
 
             if dur > max_dur_s:
                 mid = (start_s + end_s) / 2.0
                 start_s = mid - max_dur_s / 2.0
                 end_s = mid + max_dur_s / 2.0
+            windows.append((start_s, end_s))
 
-            seg = self.slice_audio(wav, sr, start_s, end_s)
+        return self.embeddings_for_file_windows(audio_path, windows, min_dur_s=min_dur_s)
 
-            if seg.shape[1] < int(min_dur_s * sr):
-                embeddings.append(None)
-                continue
 
-            emb = self.embedding_from_waveform(seg)
-            embeddings.append(emb)
+def decode_windows(
+    path: str,
+    windows: list[tuple[float, float]],
+    sr: int = 16000,
+    max_workers: int = 4,
+) -> list[np.ndarray]:
+    """Decode only the given time windows of an audio file.
+
+    Each window is one ffmpeg call with input seeking (-ss before -i) and
+    raw s16le mono PCM piped over stdout, so nothing is written to disk and
+    only the requested samples are ever held in memory.
+
+    Returns:
+        Mono float32 arrays in [-1, 1), aligned with windows (empty for
+        windows outside the audio).
+    """
+
+    def decode(window: tuple[float, float]) -> np.ndarray:
+        start_s = max(0.0, window[0])
+        dur = window[1] - start_s
+        if dur <= 0:
+            return np.zeros(0, dtype=np.float32)
+        proc = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-v", "error",
+                "-ss", f"{start_s:.3f}", "-t", f"{dur:.3f}", "-i", path,
+                "-f", "s16le", "-ac", "1", "-ar", str(sr), "pipe:1",
+            ],
+            capture_output=True,
+            check=True,
+            timeout=120,
+        )
+        return np.frombuffer(proc.stdout, dtype="<i2").astype(np.float32) / 32768.0
 
-        return embeddings
+    if not windows:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(decode, windows))
 
 
 def merge_adjacent_segments(
@@ -0,0 +1,407 @@
+"""Durable SQLite-backed queue for background tasks.
+
+Work that used to run inline (post-transcription enrichment) or straight
+from APScheduler is stored as a row in `jobs` and run by a dispatcher task
+started with the app, so a restart loses nothing:
+
+- Typed tasks: handlers are registered per `type` (see job_tasks) with a
+  default priority, a concurrency limit, a lease and a retry budget.
+- Priorities: lower `priority` is claimed first, then oldest first.
+- Leases: a claimed job holds `lease_until`, renewed while its handler
+  runs. Jobs whose lease expired (the process died) are claimable again.
+- Retries: a failing job is retried with exponential backoff until
+  `max_attempts`, then marked `failed`.
+- Idempotency keys: at most one pending/running job per key, so repeated
+  enqueues (a poll seeing the same completed transcription, a scheduler
+  tick while the last run is still going) collapse into one.
+
+A job may carry the `run_id` of a sync_run; its handler logs go to that
+run's run_logs. `stats()` reports backlog depth, throughput and wait/run
+latency per task type (GET /api/sync/jobs).
+
+Without a running dispatcher (CLI, tests), `drain()` runs due jobs inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app.config import get_settings
+from app.database import get_db, get_read_db
+from app.services.run_logger import RunLogger
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 5.0
+_BACKOFF_BASE_S = 30
+_BACKOFF_MAX_S = 3600
+# Finished jobs are kept this long for stats and run pages
+_RETENTION_DAYS = 30
+
+
+@dataclass
+class Job:
+    """A claimed job as seen by its handler."""
+
+    id: int
+    type: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    run_logger: RunLogger | None = None
+
+    @property
+    def final_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+
+Handler = Callable[[Job], Awaitable[Any]]
+
+
+@dataclass
+class TaskType:
+    handler: Handler
+    concurrency: int = 1
+    priority: int = 100
+    max_attempts: int = 3
+    lease_seconds: int = 600
+
+
+_task_types: dict[str, TaskType] = {}
+
+_dispatcher: asyncio.Task | None = None
+_wakeup: asyncio.Event | None = None
+
+
+def register(
+    task_type: str,
+    handler: Handler,
+    *,
+    concurrency: int = 1,
+    priority: int = 100,
+    max_attempts: int = 3,
+    lease_seconds: int = 600,
+) -> None:
+    """Register the handler for a task type.
+
+    `job_concurrency` in settings overrides `concurrency` per type.
+    """
+    _task_types[task_type] = TaskType(handler, concurrency, priority, max_attempts, lease_seconds)
+
+
+def _concurrency(task_type: str) -> int:
+    override = get_settings().job_concurrency.get(task_type)
+    return max(1, override if override is not None else _task_types[task_type].concurrency)
+
+
+async def enqueue(
+    task_type: str,
+    payload: dict | None = None,
+    *,
+    key: str | None = None,
+    priority: int | None = None,
+    delay_seconds: int = 0,
+    run_id: str | None = None,
+    commit: bool = True,
+) -> int:
+    """Add a job; returns the id of the existing active job if `key` is taken.
+
+    Pass commit=False to make the insert part of the caller's transaction.
+    """
+    spec = _task_types.get(task_type)
+    db = await get_db()
+    cursor = await db.execute(
+        """INSERT INTO jobs (type, payload, priority, idempotency_key, run_id, max_attempts, run_after)
+           VALUES (?, ?, ?, ?, ?, ?, datetime('now', ?))
+           ON CONFLICT DO NOTHING""",
+        (
+            task_type,
+            json.dumps(payload or {}),
+            priority if priority is not None else (spec.priority if spec else 100),
+            key,
+            run_id,
+            spec.max_attempts if spec else 3,
+            f"+{int(delay_seconds)} seconds",
+        ),
+    )
+    job_id = cursor.lastrowid if cursor.rowcount else None
+    if job_id is None:
+        rows = await db.execute_fetchall(
+            """SELECT id FROM jobs
+               WHERE idempotency_key = ? AND status IN ('pending', 'running')""",
+            (key,),
+        )
+        job_id = rows[0]["id"]
+    if commit:
+        await db.commit()
+    if _wakeup is not None:
+        _wakeup.set()
+    return job_id
+
+
+async def claim_next(
+    running: dict[str, int] | None = None,
+    types: set[str] | None = None,
+) -> Job | None:
+    """Claim the most urgent due job whose type has a free worker slot."""
+    running = running or {}
+    types = [
+        t for t in _task_types
+        if running.get(t, 0) < _concurrency(t) and (types is None or t in types)
+    ]
+    if not types:
+        return None
+    db = await get_db()
+    placeholders = ",".join("?" for _ in types)
+    rows = await db.execute_fetchall(
+        f"""SELECT id, type FROM jobs
+            WHERE status = 'pending' AND run_after <= datetime('now')
+              AND type IN ({placeholders})
+            ORDER BY priority, id
+            LIMIT 1""",
+        types,
+    )
+    if not rows:
+        return None
+    job_id, task_type = rows[0]["id"], rows[0]["type"]
+    lease = _task_types[task_type].lease_seconds
+    rows = await db.execute_fetchall(
+        """UPDATE jobs
+           SET status = 'running', attempts = attempts + 1, error = NULL,
+               started_at = datetime('now'), lease_until = datetime('now', ?)
+           WHERE id = ? AND status = 'pending'
+           RETURNING id, type, payload, attempts, max_attempts, run_id""",
+        (f"+{lease} seconds", job_id),
+    )
+    await db.commit()
+    if not rows:
+        return None
+    r = rows[0]
+    return Job(
+        id=r["id"],
+        type=r["type"],
+        payload=json.loads(r["payload"]),
+        attempts=r["attempts"],
+        max_attempts=r["max_attempts"],
+        run_logger=RunLogger(r["run_id"]) if r["run_id"] else None,
+    )
+
+
+async def _finish(job: Job, error: str | None) -> None:
+    db = await get_db()
+    if error is None:
+        await db.execute(
+            """UPDATE jobs SET status = 'done', lease_until = NULL, finished_at = datetime('now')
+               WHERE id = ?""",
+            (job.id,),
+        )
+    elif job.final_attempt:
+        await db.execute(
+            """UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL,
+                   finished_at = datetime('now')
+               WHERE id = ?""",
+            (error, job.id),
+        )
+    else:
+        backoff = min(_BACKOFF_BASE_S * 2 ** (job.attempts - 1), _BACKOFF_MAX_S)
+        await db.execute(
+            """UPDATE jobs SET status = 'pending', error = ?, lease_until = NULL,
+                   run_after = datetime('now', ?)
+               WHERE id = ?""",
+            (error, f"+{backoff} seconds", job.id),
+        )
+    await db.commit()
+
+
+async def _renew_lease(job: Job, lease: int) -> None:
+    while True:
+        await asyncio.sleep(lease / 3)
+        db = await get_db()
+        await db.execute(
+            "UPDATE jobs SET lease_until = datetime('now', ?) WHERE id = ? AND status = 'running'",
+            (f"+{lease} seconds", job.id),
+        )
+        await db.commit()
+
+
+async def run_job(job: Job) -> bool:
+    """Run a claimed job and record the outcome. Returns True on success."""
+    spec = _task_types[job.type]
+    renew = asyncio.create_task(_renew_lease(job, spec.lease_seconds))
+    try:
+        await spec.handler(job)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        logger.warning(
+            "Job %d (%s) failed on attempt %d/%d: %s",
+            job.id, job.type, job.attempts, job.max_attempts, error,
+        )
+        if job.run_logger:
+            await job.run_logger.warning(
+                "%s failed (attempt %d/%d): %s" % (job.type, job.attempts, job.max_attempts, error)
+            )
+        await _finish(job, error)
+        return False
+    finally:
+        renew.cancel()
+    await _finish(job, None)
+    return True
+
+
+async def reclaim_expired() -> int:
+    """Return jobs whose lease ran out to the queue (or fail them if out of attempts)."""
+    db = await get_db()
+    result = await db.execute(
+        """UPDATE jobs
+           SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+               error = 'Lease expired', lease_until = NULL,
+               finished_at = CASE WHEN attempts >= max_attempts THEN datetime('now') END
+           WHERE status = 'running' AND lease_until < datetime('now')"""
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def drain(types: set[str] | None = None) -> int:
+    """Run due jobs inline until none are left (CLI, tests).
+
+    Respects per-type concurrency. Returns the number of jobs run.
+    """
+    running: dict[str, int] = {}
+    tasks: dict[asyncio.Task, str] = {}
+    done = 0
+    while True:
+        while (job := await claim_next(running, types)) is not None:
+            running[job.type] = running.get(job.type, 0) + 1
+            tasks[asyncio.create_task(run_job(job))] = job.type
+        if not tasks:
+            return done
+        finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in finished:
+            running[tasks.pop(task)] -= 1
+            done += 1
+
+
+async def _dispatch_loop() -> None:
+    running: dict[str, int] = {}
+    tasks: dict[asyncio.Task, str] = {}
+
+    def on_done(task: asyncio.Task) -> None:
+        running[tasks.pop(task)] -= 1
+        _wakeup.set()
+
+    while True:
+        _wakeup.clear()
+        try:
+            if await reclaim_expired():
+                logger.warning("Re-queued job(s) with expired leases")
+            while (job := await claim_next(running)) is not None:
+                running[job.type] = running.get(job.type, 0) + 1
+                task = asyncio.create_task(run_job(job))
+                tasks[task] = job.type
+                task.add_done_callback(on_done)
+        except Exception:
+            logger.exception("Job dispatcher failed to claim a job")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_dispatcher() -> None:
+    """Recover jobs interrupted by a restart and start draining the queue."""
+    global _dispatcher, _wakeup
+    db = await get_db()
+    # Single process: anything still running was interrupted. The attempt
+    # stays counted, so a job that keeps crashing the process runs out.
+    result = await db.execute(
+        """UPDATE jobs SET status = 'pending', lease_until = NULL, started_at = NULL
+           WHERE status = 'running'"""
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning("Re-queued %d interrupted job(s)", result.rowcount)
+    await db.execute(
+        "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < datetime('now', ?)",
+        (f"-{_RETENTION_DAYS} days",),
+    )
+    await db.commit()
+
+    _wakeup = asyncio.Event()
+    _dispatcher = asyncio.create_task(_dispatch_loop())
+
+
+async def stop_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.cancel()
+        try:
+            await _dispatcher
+        except asyncio.CancelledError:
+            pass
+        _dispatcher = None
+
+
+def is_running() -> bool:
+    return _dispatcher is not None and not _dispatcher.done()
+
+
+async def stats(hours: int = 24) -> dict[str, dict]:
+    """Backlog, throughput and latency per task type.
+
+    Wait is claim time minus enqueue time for the last attempt; run is
+    finish minus claim. Throughput and latencies cover jobs finished in
+    the last `hours`.
+    """
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT type,
+                  SUM(status = 'pending' AND run_after <= datetime('now')) AS due,
+                  SUM(status = 'pending' AND run_after > datetime('now')) AS delayed,
+                  SUM(status = 'running') AS running,
+                  SUM(status = 'done' AND finished_at >= datetime('now', ?)) AS done,
+                  SUM(status = 'failed' AND finished_at >= datetime('now', ?)) AS failed,
+                  SUM(status = 'pending' AND attempts > 0) AS retrying,
+                  AVG(CASE WHEN status = 'done' AND finished_at >= datetime('now', ?)
+                      THEN (julianday(started_at) - julianday(created_at)) * 86400 END) AS avg_wait_s,
+                  AVG(CASE WHEN status = 'done' AND finished_at >= datetime('now', ?)
+                      THEN (julianday(finished_at) - julianday(started_at)) * 86400 END) AS avg_run_s,
+                  MIN(CASE WHEN status = 'pending' THEN created_at END) AS oldest_pending
+           FROM jobs
+           GROUP BY type""",
+        (f"-{hours} hours",) * 4,
+    )
+    result = {}
+    for r in rows:
+        result[r["type"]] = {
+            "due": r["due"] or 0,
+            "delayed": r["delayed"] or 0,
+            "running": r["running"] or 0,
+            "retrying": r["retrying"] or 0,
+            "done": r["done"] or 0,
+            "failed": r["failed"] or 0,
+            "per_hour": round((r["done"] or 0) / hours, 2),
+            "avg_wait_s": round(r["avg_wait_s"], 2) if r["avg_wait_s"] is not None else None,
+            "avg_run_s": round(r["avg_run_s"], 2) if r["avg_run_s"] is not None else None,
+            "oldest_pending": r["oldest_pending"],
+            "concurrency": _concurrency(r["type"]) if r["type"] in _task_types else None,
+        }
+    return result
+
+
+async def jobs_for_run(run_id: str) -> list[dict]:
+    """Jobs queued on behalf of a sync run, oldest first."""
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT id, type, payload, status, attempts, max_attempts, error,
+                  created_at, started_at, finished_at,
+                  (julianday(started_at) - julianday(created_at)) * 86400 AS wait_s,
+                  (julianday(finished_at) - julianday(started_at)) * 86400 AS run_s
+           FROM jobs WHERE run_id = ? ORDER BY id""",
+        (run_id,),
+    )
+    return [{**dict(r), "payload": json.loads(r["payload"])} for r in rows]
@@ -0,0 +1,112 @@
+"""Handlers for the background job queue (see job_queue).
+
+Importing this module registers every task type. Priorities put finishing
+a transcription ahead of the AI enrichment it unlocks, and enrichment
+ahead of periodic maintenance; recurring tasks get a single attempt since
+the next scheduler tick retries them anyway.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from app.database import get_db
+from app.models import RecordingStatus
+from app.services import job_queue
+from app.services.job_queue import Job
+
+logger = logging.getLogger(__name__)
+
+
+async def transcription_complete(job: Job) -> None:
+    from app.services import sync_service
+
+    p = job.payload
+    try:
+        await sync_service._handle_transcription_complete(
+            p["recording_id"], p["user_id"], p["job_id"], sync_service.SpeechClient(), job.run_logger,
+        )
+    except Exception as exc:
+        if job.final_attempt:
+            # Never downgrade a recording whose transcript was already stored
+            db = await get_db()
+            await db.execute(
+                """UPDATE recordings
+                   SET status = ?, status_message = ?, updated_at = datetime('now')
+                   WHERE id = ? AND status != ?""",
+                (
+                    RecordingStatus.failed.value,
+                    f"Post-processing failed: {exc}",
+                    p["recording_id"],
+                    RecordingStatus.ready.value,
+                ),
+            )
+            await db.commit()
+            if job.run_logger:
+                await job.run_logger.error(
+                    "Processing failed for %s: %s" % (p["recording_id"][:8], exc)
+                )
+        raise
+
+
+async def title_description(job: Job) -> None:
+    from app.services import sync_service
+
+    await sync_service._enrich_title_description(job.payload["recording_id"], job.run_logger)
+
+
+async def search_summary(job: Job) -> None:
+    from app.services import search_summary_service
+
+    recording_id = job.payload["recording_id"]
+    await search_summary_service.generate_search_summary(recording_id, job.payload["user_id"])
+    if job.run_logger:
+        await job.run_logger.info("Search summary generated for %s" % recording_id[:8])
+
+
+async def meeting_notes(job: Job) -> None:
+    from app.services import meeting_notes_service
+
+    recording_id = job.payload["recording_id"]
+    notes = await meeting_notes_service.generate_meeting_notes(recording_id, job.payload["user_id"])
+    if notes is None:
+        raise RuntimeError(f"Meeting notes generation failed for {recording_id}")
+    if job.run_logger:
+        await job.run_logger.info("Meeting notes generated for %s" % recording_id[:8])
+
+
+async def plaud_sync(job: Job) -> None:
+    from app.services import sync_service
+
+    await sync_service.run_sync(trigger=job.payload.get("trigger", "scheduled"))
+
+
+async def transcription_poll(job: Job) -> None:
+    from app.services import sync_service
+
+    await sync_service.poll_pending_transcriptions()
+
+
+async def fts_maintenance(job: Job) -> None:
+    from app.database import optimize_fts
+
+    steps = await optimize_fts()
+    logger.info("FTS maintenance complete: %d merge step(s)", steps)
+
+
+async def semantic_index(job: Job) -> None:
+    from app.services.semantic_index import index_pending
+
+    indexed = await index_pending()
+    if indexed:
+        logger.info("Semantic index job complete: %d recording(s) indexed", indexed)
+
+
+job_queue.register("transcription_complete", transcription_complete, concurrency=3, priority=10)
+job_queue.register("title_description", title_description, concurrency=2, priority=20)
+job_queue.register("search_summary", search_summary, concurrency=2, priority=30)
+job_queue.register("meeting_notes", meeting_notes, concurrency=2, priority=40)
+job_queue.register("transcription_poll", transcription_poll, priority=50, max_attempts=1)
+job_queue.register("plaud_sync", plaud_sync, priority=60, max_attempts=1, lease_seconds=3600)
+job_queue.register("semantic_index", semantic_index, priority=70, max_attempts=1, lease_seconds=3600)
+job_queue.register("fts_maintenance", fts_maintenance, priority=80, max_attempts=1)
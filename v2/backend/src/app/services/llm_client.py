@@ -0,0 +1,262 @@
+"""Shared Azure OpenAI client and per-deployment request scheduler.
+
+Every service used to build its own AsyncAzureOpenAI (and HTTP connection
+pool) per call and cap concurrency locally, so simultaneous searches and
+background jobs multiplied the load on a deployment. Instead:
+
+- `get_client()` returns one process-wide client with keep-alive pooling.
+- `chat_completion()` routes each call through a per-deployment scheduler:
+  a token bucket for requests/minute and tokens/minute, a concurrency cap,
+  and a strict priority queue so interactive work (chat, deep search) is
+  admitted before background work (summaries, meeting notes, titles).
+- A 429 pauses the whole deployment for its `retry-after` before the call
+  is retried, so one throttled call doesn't trigger a stampede.
+- `metrics()` reports queue depth, in-flight calls, waits and 429 counts.
+
+Limits come from `llm_rate_limits` ({"deployment": [rpm, tpm]}) with
+`llm_default_rpm` / `llm_default_tpm` as fallbacks (0 = unlimited).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any
+
+import openai
+from openai import AsyncAzureOpenAI
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Completion budget assumed when a call doesn't set max_completion_tokens
+_DEFAULT_COMPLETION_ESTIMATE = 2000
+_CHARS_PER_TOKEN = 4
+
+_client: AsyncAzureOpenAI | None = None
+_deployments: dict[str, "_Deployment"] = {}
+_seq = itertools.count()
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+def get_client() -> AsyncAzureOpenAI:
+    """Get the process-wide Azure OpenAI client.
+
+    Retries are disabled on the client itself; chat_completion() retries so
+    that 429 back-off is coordinated across callers.
+    """
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = AsyncAzureOpenAI(
+            azure_endpoint=settings.azure_openai_endpoint,
+            api_key=settings.azure_openai_api_key,
+            api_version=settings.azure_openai_api_version,
+            max_retries=0,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+class _Deployment:
+    """Token buckets, concurrency cap and priority queue for one deployment."""
+
+    def __init__(self, name: str, rpm: int, tpm: int, max_concurrency: int):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.request_tokens = float(rpm)
+        self.token_tokens = float(tpm)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.waiters: list[tuple[int, int, float, float, asyncio.Future]] = []
+        self.timer: asyncio.TimerHandle | None = None
+        # Metrics
+        self.completed = 0
+        self.rate_limited = 0
+        self.waits_ms: deque[float] = deque(maxlen=500)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        if self.rpm:
+            self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60)
+        if self.tpm:
+            self.token_tokens = min(self.tpm, self.token_tokens + elapsed * self.tpm / 60)
+
+    def _delay_for(self, cost: float, now: float) -> float:
+        """Seconds until a call of this cost may start (0 = now)."""
+        delay = max(0.0, self.paused_until - now)
+        if self.rpm and self.request_tokens < 1:
+            delay = max(delay, (1 - self.request_tokens) * 60 / self.rpm)
+        if self.tpm and self.token_tokens < cost:
+            delay = max(delay, (cost - self.token_tokens) * 60 / self.tpm)
+        return delay
+
+    def pump(self) -> None:
+        """Admit queued calls in priority order while capacity allows."""
+        self.timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self.waiters:
+            _, _, cost, enqueued, fut = self.waiters[0]
+            if fut.done():  # cancelled while waiting
+                heapq.heappop(self.waiters)
+                continue
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                return  # release() pumps again
+            delay = self._delay_for(cost, now)
+            if delay > 0:
+                self.timer = asyncio.get_running_loop().call_later(delay, self.pump)
+                return
+            heapq.heappop(self.waiters)
+            if self.rpm:
+                self.request_tokens -= 1
+            if self.tpm:
+                self.token_tokens -= cost
+            self.in_flight += 1
+            self.waits_ms.append((now - enqueued) * 1000)
+            fut.set_result(None)
+
+    async def acquire(self, priority: Priority, cost: float) -> None:
+        if self.tpm:
+            cost = min(cost, self.tpm)  # an oversized call must still fit eventually
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (int(priority), next(_seq), cost, time.monotonic(), fut))
+        if self.timer is None:
+            self.pump()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self, token_correction: float = 0.0) -> None:
+        """Finish a call; token_correction is actual minus estimated tokens."""
+        self.in_flight -= 1
+        if self.tpm and token_correction:
+            self.token_tokens = min(self.tpm, self.token_tokens - token_correction)
+        if self.timer is None:
+            self.pump()
+
+    def pause(self, seconds: float) -> None:
+        self.rate_limited += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> dict:
+        waits = sorted(self.waits_ms)
+        queued = [w for w in self.waiters if not w[4].done()]
+        return {
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "in_flight": self.in_flight,
+            "queue_depth": {
+                p.name.lower(): sum(1 for w in queued if w[0] == p) for p in Priority
+            },
+            "completed": self.completed,
+            "rate_limited": self.rate_limited,
+            "paused_for_s": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "wait_ms_p50": round(waits[len(waits) // 2], 1) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(len(waits) * 0.95) - 1], 1) if waits else 0.0,
+            "wait_ms_max": round(waits[-1], 1) if waits else 0.0,
+        }
+
+
+def _deployment(name: str) -> _Deployment:
+    dep = _deployments.get(name)
+    if dep is None:
+        settings = get_settings()
+        rpm, tpm = settings.llm_rate_limits.get(
+            name, (settings.llm_default_rpm, settings.llm_default_tpm)
+        )
+        dep = _Deployment(name, rpm, tpm, settings.llm_max_concurrency)
+        _deployments[name] = dep
+    return dep
+
+
+def _estimate_tokens(kwargs: dict) -> int:
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in kwargs.get("messages", []))
+    completion = kwargs.get("max_completion_tokens") or _DEFAULT_COMPLETION_ESTIMATE
+    return prompt_chars // _CHARS_PER_TOKEN + completion
+
+
+def _retry_after(exc: openai.APIStatusError) -> float:
+    headers = getattr(exc.response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                pass
+    return 10.0
+
+
+async def chat_completion(
+    priority: Priority,
+    client: AsyncAzureOpenAI | None = None,
+    **kwargs: Any,
+):
+    """Scheduled `client.chat.completions.create(**kwargs)`.
+
+    Waits for the deployment's rate budget (in priority order), retries 429s
+    after the server's retry-after and transient errors with back-off.
+    """
+    client = client or get_client()
+    dep = _deployment(kwargs.get("model") or "")
+    estimate = _estimate_tokens(kwargs)
+    max_retries = get_settings().llm_max_retries
+
+    for attempt in range(max_retries + 1):
+        await dep.acquire(priority, estimate)
+        correction = 0.0
+        backoff = 0.0
+        try:
+            response = await client.chat.completions.create(**kwargs)
+            total = getattr(getattr(response, "usage", None), "total_tokens", None)
+            if isinstance(total, int):
+                correction = total - estimate
+            dep.completed += 1
+            return response
+        except openai.RateLimitError as exc:
+            if attempt == max_retries:
+                raise
+            delay = _retry_after(exc)
+            logger.warning("LLM 429 on %s, pausing deployment %.1fs", dep.name, delay)
+            dep.pause(delay)
+        except (openai.APIConnectionError, openai.InternalServerError) as exc:
+            if attempt == max_retries:
+                raise
+            delay = min(30.0, 2 ** attempt)
+            logger.warning("LLM call to %s failed (%s), retrying in %ds", dep.name, exc, delay)
+            backoff = delay
+        finally:
+            dep.release(correction)
+        # Back off without holding a concurrency slot
+        if backoff:
+            await asyncio.sleep(backoff)
+
+
+def metrics() -> dict:
+    """Scheduler state per deployment, for the metrics endpoint."""
+    return {name: dep.snapshot() for name, dep in _deployments.items()}
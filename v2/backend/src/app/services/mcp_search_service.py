@@ -7,10 +7,11 @@ envelope; this module owns SQL, FTS5, projection, and pagination math.
 Public functions:
 
   search_recordings(...)
-      Returns (results, has_more, total). `total` is None when:
+      Returns (results, has_more, total, next_cursor). `total` is None when:
         - paginated=False (caller doesn't need it), or
         - mode == cascade (computing it would require a second UNION-CTE
-          query — deferred; see plan).
+          query — deferred; see plan), or
+        - the call continues from a cursor.
 
   fetch_recordings_bulk(...)
       Bulk lookup for get_recordings. Returns (results, missing_ids).
@@ -25,7 +26,7 @@ import json
 import logging
 import re
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models import (
     ALLOWED_RECORDING_FIELDS,
     McpSortOrder,
@@ -33,6 +34,7 @@ from app.models import (
     McpView,
     view_field_set,
 )
+from app.services.recording_service import decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +47,9 @@ _MCP_COLUMNS = """
     r.id, r.title, r.description, r.duration_seconds,
     r.recorded_at, r.source, r.status, r.speaker_mapping,
     r.token_count, r.created_at, r.updated_at,
-    r.search_summary, r.search_keywords
+    r.search_summary, r.search_keywords, r.sort_at,
+    (SELECT group_concat(rt.tag_id) FROM recording_tags rt
+     WHERE rt.recording_id = r.id) AS tag_ids_csv
 """
 
 _BATCH_COLUMNS = _MCP_COLUMNS + """,
@@ -56,9 +60,9 @@ _BATCH_COLUMNS = _MCP_COLUMNS + """,
 # Map sort enum -> SQL ORDER BY fragment. NULLs are pushed last consistently.
 _SORT_SQL: dict[McpSortOrder, str] = {
     McpSortOrder.recorded_at_desc:
-        "COALESCE(r.recorded_at, r.created_at) DESC",
+        "r.sort_at DESC, r.id DESC",
     McpSortOrder.recorded_at_asc:
-        "COALESCE(r.recorded_at, r.created_at) ASC",
+        "r.sort_at ASC, r.id ASC",
     McpSortOrder.duration_desc:
         "r.duration_seconds DESC NULLS LAST",
     McpSortOrder.duration_asc:
@@ -69,6 +73,13 @@ _SORT_SQL: dict[McpSortOrder, str] = {
         "r.token_count ASC NULLS LAST",
 }
 
+# Keyset (cursor) conditions for the sorts that have one: the rows after the
+# cursor's (sort_at, id) in sort order. Served by idx_recordings_user_status_sort.
+_KEYSET_SQL: dict[McpSortOrder, str] = {
+    McpSortOrder.recorded_at_desc: "(r.sort_at, r.id) < (?, ?)",
+    McpSortOrder.recorded_at_asc: "(r.sort_at, r.id) > (?, ?)",
+}
+
 # Python sort keys for cascade-flat-sort (when sort != recorded_at_desc, the
 # default). Each key returns a tuple where None comes last regardless of
 # direction so that None-trailing matches the SQL.
@@ -226,24 +237,6 @@ def _project_recording(
     return out
 
 
-async def _get_tag_ids_bulk(recording_ids: list[str]) -> dict[str, list[str]]:
-    """Fetch tag IDs for multiple recordings in one query."""
-    if not recording_ids:
-        return {}
-    db = await get_db()
-    placeholders = ",".join("?" for _ in recording_ids)
-    rows = await db.execute_fetchall(
-        f"SELECT recording_id, tag_id FROM recording_tags "
-        f"WHERE recording_id IN ({placeholders})",
-        recording_ids,
-    )
-    result: dict[str, list[str]] = {rid: [] for rid in recording_ids}
-    for row in rows:
-        r = dict(row)
-        result[r["recording_id"]].append(r["tag_id"])
-    return result
-
-
 def _build_base_where(
     user_id: str,
     participant_id: str | None,
@@ -252,10 +245,12 @@ def _build_base_where(
     title_filter: str | None = None,
     tag_ids: list[str] | None = None,
     tag_match: McpTagMatch = McpTagMatch.any,
+    keyset: tuple[str, list] | None = None,
 ) -> tuple[str, list]:
     """Build WHERE clause fragments and params for common filters.
 
     Returns (where_clause, params) where where_clause starts with 'WHERE'.
+    `keyset` is a (condition, params) pair from _keyset() for cursor pages.
     Tags are filtered through the recording_tags join table; tenant isolation
     is achieved indirectly because the recording_id ultimately joins back to
     `recordings` which is already user_id-filtered.
@@ -265,20 +260,16 @@ def _build_base_where(
 
     if participant_id:
         clauses.append(
-            """r.id IN (
-                SELECT r2.id FROM recordings r2, json_each(r2.speaker_mapping) AS je
-                WHERE r2.id = r.id
-                  AND json_extract(je.value, '$.participantId') = ?
-            )"""
+            "r.id IN (SELECT recording_id FROM recording_speakers WHERE participant_id = ?)"
         )
         params.append(participant_id)
 
     if date_from:
-        clauses.append("COALESCE(r.recorded_at, r.created_at) >= ?")
+        clauses.append("r.sort_at >= ?")
         params.append(date_from)
 
     if date_to:
-        clauses.append("COALESCE(r.recorded_at, r.created_at) <= ?")
+        clauses.append("r.sort_at <= ?")
         params.append(date_to)
 
     if title_filter:
@@ -307,9 +298,27 @@ def _build_base_where(
             )
             params.extend(tag_ids)
 
+    if keyset:
+        clauses.append(keyset[0])
+        params.extend(keyset[1])
+
     return "WHERE " + " AND ".join(clauses), params
 
 
+def _keyset(sort: McpSortOrder, cursor: str | None) -> tuple[str, list] | None:
+    """Decode a cursor into a WHERE condition for `sort`.
+
+    Raises ValueError for a malformed cursor or a sort without keyset support.
+    """
+    if cursor is None:
+        return None
+    if sort not in _KEYSET_SQL:
+        raise ValueError(
+            f"cursor requires sort in {sorted(s.value for s in _KEYSET_SQL)!r}; use offset instead"
+        )
+    return _KEYSET_SQL[sort], list(decode_cursor(cursor))
+
+
 async def _fts_search(
     user_id: str,
     fts_query: str,
@@ -324,12 +333,14 @@ async def _fts_search(
     title_filter: str | None = None,
     tag_ids: list[str] | None = None,
     tag_match: McpTagMatch = McpTagMatch.any,
+    keyset: tuple[str, list] | None = None,
 ) -> list[dict]:
     """Run an FTS5 MATCH query with filters. Returns list of row dicts."""
-    db = await get_db()
+    db = await get_read_db()
     where_clause, params = _build_base_where(
         user_id, participant_id, date_from, date_to,
         title_filter=title_filter, tag_ids=tag_ids, tag_match=tag_match,
+        keyset=keyset,
     )
 
     fts_condition = (
@@ -422,16 +433,29 @@ async def search_recordings(
     view: McpView | None = None,
     fields: list[str] | None = None,
     compute_total: bool = False,
-) -> tuple[list[dict], bool, int | None]:
+    cursor: str | None = None,
+) -> tuple[list[dict], bool, int | None, str | None]:
     """Search or list recordings.
 
-    Returns (results, has_more, total).
+    Returns (results, has_more, total, next_cursor).
 
     has_more is computed via a limit+1 fetch and is always populated.
-    total is None unless compute_total=True AND mode != "cascade".
+    total is None unless compute_total=True AND mode != "cascade", and is
+    skipped on cursor pages (the first page already reported it).
+
+    `cursor` continues after the last row of a previous page by keyset
+    instead of OFFSET, so deep pages cost the same as the first. It needs
+    a recorded_at sort and is not available for cascade search; next_cursor
+    is None where cursors don't apply or there are no more rows.
+
+    Raises ValueError for a malformed or unsupported cursor.
     """
     limit = max(1, min(limit, 100))
     field_set = _resolve_field_set(fields, view, batch=False)
+    keyset = _keyset(sort, cursor)
+    if keyset is not None:
+        offset = 0
+        compute_total = False
 
     # Cascade with default sort preserves tier-major ordering. With explicit
     # non-default sort we flatten and apply globally (Opus review's
@@ -446,6 +470,7 @@ async def search_recordings(
             limit, offset, sort_sql=sort_sql,
             title_filter=title_filter,
             tag_ids=tag_ids, tag_match=tag_match,
+            keyset=keyset,
         )
         total = None
         if compute_total:
@@ -454,12 +479,14 @@ async def search_recordings(
                 title_filter=title_filter,
                 tag_ids=tag_ids, tag_match=tag_match,
             )
-        return _project_rows(rows, field_set), has_more, total
+        return _project_rows(rows, field_set), has_more, total, _next_cursor(rows, has_more, sort)
 
     sanitized = _sanitize_fts_query(query)
     assert sanitized is not None  # narrowed above
 
     if mode == "cascade":
+        if keyset is not None:
+            raise ValueError("cursor is not supported for cascade search; use offset or a single mode")
         if flat_cascade:
             rows_with_tier, has_more = await _cascade_search_flat(
                 user_id, sanitized, participant_id, date_from, date_to,
@@ -478,6 +505,7 @@ async def search_recordings(
             _project_rows_with_tier(rows_with_tier, field_set),
             has_more,
             None,  # cascade total is deferred
+            None,
         )
 
     # Single-tier modes
@@ -498,6 +526,7 @@ async def search_recordings(
         limit=limit + 1, offset=offset, sort_sql=sort_sql,
         title_filter=title_filter,
         tag_ids=tag_ids, tag_match=tag_match,
+        keyset=keyset,
     )
     has_more = len(rows) > limit
     rows = rows[:limit]
@@ -511,14 +540,22 @@ async def search_recordings(
             fts_query=fts_query,
         )
 
+    _enrich_with_tags(rows)
     rows_with_tier = [(r, tier_label) for r in rows]
     return (
         _project_rows_with_tier(rows_with_tier, field_set),
         has_more,
         total,
+        _next_cursor(rows, has_more, sort),
     )
 
 
+def _next_cursor(rows: list[dict], has_more: bool, sort: McpSortOrder) -> str | None:
+    if not has_more or not rows or sort not in _KEYSET_SQL:
+        return None
+    return encode_cursor(rows[-1]["sort_at"], rows[-1]["id"])
+
+
 def _project_rows(rows: list[dict], field_set: tuple[str, ...]) -> list[dict]:
     """Async-free row projection for non-search results (no match_tier)."""
     # NOTE: tag enrichment must be done by the caller before passing to
@@ -543,12 +580,12 @@ def _project_rows_with_tier(
     ]
 
 
-async def _enrich_with_tags(rows: list[dict]) -> None:
-    """Attach `_tag_ids` to each row in place by bulk-fetching tags."""
-    rec_ids = [r["id"] for r in rows]
-    tag_map = await _get_tag_ids_bulk(rec_ids)
+def _enrich_with_tags(rows: list[dict]) -> None:
+    """Attach `_tag_ids` to each row in place from the inline `tag_ids_csv`
+    column (tag ids are UUIDs, so commas are safe separators)."""
     for r in rows:
-        r["_tag_ids"] = tag_map.get(r["id"], [])
+        csv = r.get("tag_ids_csv")
+        r["_tag_ids"] = csv.split(",") if csv else []
 
 
 async def _cascade_search_tiered(
@@ -604,7 +641,7 @@ async def _cascade_search_tiered(
     page = page[:limit]
 
     rows_only = [r for r, _ in page]
-    await _enrich_with_tags(rows_only)
+    _enrich_with_tags(rows_only)
     return page, has_more
 
 
@@ -683,7 +720,7 @@ async def _cascade_search_flat(
     page = page[:limit]
 
     rows_only = [r for r, _ in page]
-    await _enrich_with_tags(rows_only)
+    _enrich_with_tags(rows_only)
     return page, has_more
 
 
@@ -699,12 +736,14 @@ async def _list_recordings(
     title_filter: str | None = None,
     tag_ids: list[str] | None = None,
     tag_match: McpTagMatch = McpTagMatch.any,
+    keyset: tuple[str, list] | None = None,
 ) -> tuple[list[dict], bool]:
     """List recordings with filters (no FTS search). Returns (rows, has_more)."""
-    db = await get_db()
+    db = await get_read_db()
     where_clause, params = _build_base_where(
         user_id, participant_id, date_from, date_to,
         title_filter=title_filter, tag_ids=tag_ids, tag_match=tag_match,
+        keyset=keyset,
     )
 
     sql = f"""
@@ -720,7 +759,7 @@ async def _list_recordings(
     row_dicts = [dict(r) for r in rows]
     has_more = len(row_dicts) > limit
     row_dicts = row_dicts[:limit]
-    await _enrich_with_tags(row_dicts)
+    _enrich_with_tags(row_dicts)
     return row_dicts, has_more
 
 
@@ -740,7 +779,7 @@ async def _count_recordings(
     Used to populate `total` in the paginated envelope. Not called for cascade
     mode (caller passes total=None for cascade).
     """
-    db = await get_db()
+    db = await get_read_db()
     where_clause, params = _build_base_where(
         user_id, participant_id, date_from, date_to,
         title_filter=title_filter, tag_ids=tag_ids, tag_match=tag_match,
@@ -807,7 +846,7 @@ async def fetch_recordings_bulk(
             seen.add(rid)
             ordered_ids.append(rid)
 
-    db = await get_db()
+    db = await get_read_db()
     placeholders = ",".join("?" for _ in ordered_ids)
 
     sql = f"""
@@ -827,18 +866,16 @@ async def fetch_recordings_bulk(
     if not found_ids:
         return [], missing_ids
 
-    # Tag enrichment if needed
+    # Tag ids come back inline (tag_ids_csv)
     needs_tags = "tag_ids" in field_set
     if needs_tags:
-        tag_map = await _get_tag_ids_bulk(found_ids)
-    else:
-        tag_map = {}
+        _enrich_with_tags([row_map[rid] for rid in found_ids])
 
     results = [
         _project_recording(
             row_map[rid],
             field_set=field_set,
-            tag_ids=tag_map.get(rid) if needs_tags else None,
+            tag_ids=row_map[rid]["_tag_ids"] if needs_tags else None,
         )
         for rid in found_ids
     ]
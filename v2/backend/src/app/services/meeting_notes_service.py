@@ -16,17 +16,14 @@ from openai import AsyncAzureOpenAI
 from app.config import get_settings
 from app.database import get_db
 from app.prompts import render
+from app.services import llm_client
+from app.services.llm_client import Priority
 
 logger = logging.getLogger(__name__)
 
 
 def _get_client() -> AsyncAzureOpenAI:
-    settings = get_settings()
-    return AsyncAzureOpenAI(
-        azure_endpoint=settings.azure_openai_endpoint,
-        api_key=settings.azure_openai_api_key,
-        api_version=settings.azure_openai_api_version,
-    )
+    return llm_client.get_client()
 
 
 def _format_duration(seconds: float | None) -> str:
@@ -74,12 +71,17 @@ def _parse_topic_tags(notes: str) -> list[str]:
     return []
 
 
-async def generate_meeting_notes(recording_id: str, user_id: str) -> str | None:
+async def generate_meeting_notes(
+    recording_id: str,
+    user_id: str,
+    priority: Priority = Priority.BACKGROUND,
+) -> str | None:
     """Generate structured meeting notes for a recording.
 
     Args:
         recording_id: The recording ID.
         user_id: The user ID (for authorization).
+        priority: LLM scheduling priority; user-triggered calls pass INTERACTIVE.
 
     Returns:
         The generated meeting notes markdown, or None on failure.
@@ -118,9 +120,10 @@ async def generate_meeting_notes(recording_id: str, user_id: str) -> str | None:
         transcript=transcript,
     )
 
-    client = _get_client()
     try:
-        response = await client.chat.completions.create(
+        response = await llm_client.chat_completion(
+            priority,
+            client=_get_client(),
             model=settings.azure_openai_mini_deployment,
             messages=[
                 {"role": "user", "content": prompt_text},
@@ -160,5 +163,3 @@ async def generate_meeting_notes(recording_id: str, user_id: str) -> str | None:
     except Exception:
         logger.exception("Failed to generate meeting notes for %s", recording_id)
         return None
-    finally:
-        await client.close()
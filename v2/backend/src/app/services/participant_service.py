@@ -15,6 +15,30 @@ from app.models import Participant, ParticipantCreate, ParticipantUpdate
 logger = logging.getLogger(__name__)
 
 
+# Re-point every speaker_mapping entry for one participant in a single UPDATE.
+# recording_speakers narrows it to the affected recordings; its trigger then
+# re-derives their rows from the rewritten JSON.
+_REASSIGN_SPEAKER_MAPPING_SQL = """
+    UPDATE recordings
+    SET speaker_mapping = (
+            SELECT json_group_object(
+                je.key,
+                CASE
+                    WHEN je.type != 'object' THEN je.value
+                    WHEN json_extract(je.value, '$.participantId') = :old_id
+                        THEN json_set(je.value, '$.participantId', :new_id,
+                                      '$.displayName', :new_name)
+                    ELSE je.value
+                END)
+            FROM json_each(recordings.speaker_mapping) AS je
+        ),
+        speaker_mapping_updated_at = datetime('now'),
+        updated_at = datetime('now')
+    WHERE user_id = :user_id
+      AND id IN (SELECT recording_id FROM recording_speakers WHERE participant_id = :old_id)
+"""
+
+
 def _row_to_participant(row: dict) -> Participant:
     """Convert a DB row to a Participant model."""
     return Participant(**row)
@@ -155,27 +179,10 @@ async def delete_participant(user_id: str, participant_id: str) -> None:
     db = await get_db()
 
     # Clear references in speaker_mapping JSON across recordings
-    rows = await db.execute_fetchall(
-        "SELECT id, speaker_mapping FROM recordings WHERE user_id = ? AND speaker_mapping IS NOT NULL",
-        (user_id,),
+    await db.execute(
+        _REASSIGN_SPEAKER_MAPPING_SQL,
+        {"old_id": participant_id, "new_id": None, "new_name": None, "user_id": user_id},
     )
-    for row in rows:
-        r = dict(row)
-        try:
-            mapping = json.loads(r["speaker_mapping"])
-            changed = False
-            for label, entry in mapping.items():
-                if entry.get("participantId") == participant_id:
-                    entry["participantId"] = None
-                    entry["displayName"] = None
-                    changed = True
-            if changed:
-                await db.execute(
-                    "UPDATE recordings SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'), updated_at = datetime('now') WHERE id = ?",
-                    (json.dumps(mapping), r["id"]),
-                )
-        except (json.JSONDecodeError, AttributeError):
-            continue
 
     await db.execute(
         "DELETE FROM participants WHERE id = ? AND user_id = ?",
@@ -276,27 +283,15 @@ async def merge_participants(
     )
 
     # Transfer speaker_mapping references
-    rows = await db.execute_fetchall(
-        "SELECT id, speaker_mapping FROM recordings WHERE user_id = ? AND speaker_mapping IS NOT NULL",
-        (user_id,),
+    await db.execute(
+        _REASSIGN_SPEAKER_MAPPING_SQL,
+        {
+            "old_id": secondary_id,
+            "new_id": primary_id,
+            "new_name": primary.display_name,
+            "user_id": user_id,
+        },
     )
-    for row in rows:
-        r = dict(row)
-        try:
-            mapping = json.loads(r["speaker_mapping"])
-            changed = False
-            for label, entry in mapping.items():
-                if entry.get("participantId") == secondary_id:
-                    entry["participantId"] = primary_id
-                    entry["displayName"] = primary.display_name
-                    changed = True
-            if changed:
-                await db.execute(
-                    "UPDATE recordings SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'), updated_at = datetime('now') WHERE id = ?",
-                    (json.dumps(mapping), r["id"]),
-                )
-        except (json.JSONDecodeError, AttributeError):
-            continue
 
     # Transfer speaker_profiles
     await db.execute(
@@ -304,6 +299,8 @@ async def merge_participants(
            WHERE user_id = ? AND participant_id = ?""",
         (primary_id, primary.display_name, user_id, secondary_id),
     )
+    from app.services.profile_store import record_profile_change
+    await record_profile_change(user_id, primary_id, "merge")
 
     # Delete secondary
     await db.execute(
@@ -7,6 +7,8 @@ them to core Recording models at the boundary.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
 from dataclasses import dataclass, field
@@ -20,6 +22,7 @@ logger = logging.getLogger(__name__)
 _PLAUD_API_BASE = "https://api.plaud.ai"
 _TIMEOUT = httpx.Timeout(30.0, connect=10.0)
 _DOWNLOAD_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+_DOWNLOAD_ATTEMPTS = 4
 
 
 # Browser-spoofing headers required by the Plaud API
@@ -145,17 +148,26 @@ async def get_download_url(token: str, file_id: str) -> str:
 
 
 async def download_file(
-    token: str, audio_file: AudioFile, output_dir: str | Path
+    token: str,
+    audio_file: AudioFile,
+    output_dir: str | Path,
+    sha256: str | None = None,
 ) -> Path:
     """Download a Plaud recording to a local file.
 
     Handles the .opus -> .mp3 quirk: Plaud labels some files as .opus
     but they are actually MP3-encoded.
 
+    The body is streamed to disk in chunks, so memory use does not grow
+    with the recording size; see stream_to_file for resume and checksum
+    handling.
+
     Args:
         token: Plaud bearer token.
         audio_file: The AudioFile to download.
         output_dir: Directory to save the file.
+        sha256: Optional expected hex SHA-256 of the file. Plaud's file
+            list carries no checksum, so the sync pipeline does not pass one.
 
     Returns:
         Path to the downloaded file.
@@ -181,15 +193,97 @@ async def download_file(
     download_url = await get_download_url(token, audio_file.id)
 
     async with httpx.AsyncClient(timeout=_DOWNLOAD_TIMEOUT) as client:
-        resp = await client.get(download_url)
-        resp.raise_for_status()
-
-    local_path.write_bytes(resp.content)
+        size = await stream_to_file(client, download_url, local_path, sha256=sha256)
 
     logger.info(
         "Downloaded %s (%d bytes, %.0fs)",
         filename,
-        len(resp.content),
+        size,
         audio_file.duration_seconds,
     )
     return local_path
+
+
+async def stream_to_file(
+    client: httpx.AsyncClient,
+    url: str,
+    path: Path,
+    sha256: str | None = None,
+    attempts: int = _DOWNLOAD_ATTEMPTS,
+) -> int:
+    """Stream a URL to a file, resuming with HTTP Range after a dropped connection.
+
+    Bytes go to `<path>.part` and are hashed as they arrive; the file is
+    renamed into place only once it is complete and verified. The body is
+    checked against Content-Length and, when given, against `sha256`.
+    (S3 ETags are not used: they are not an MD5 for multipart or KMS
+    encrypted objects.) A server that ignores the Range header gets a
+    clean restart.
+
+    Range offsets count bytes on the wire, so the body is requested with
+    `Accept-Encoding: identity`; if a server content-encodes it anyway,
+    an interrupted download restarts from zero instead of resuming.
+
+    Returns:
+        Number of bytes written.
+
+    Raises:
+        RuntimeError: Still incomplete after `attempts` tries, or the
+            checksum does not match.
+        httpx.HTTPStatusError: A 4xx response (e.g. an expired URL).
+    """
+    part = path.with_name(path.name + ".part")
+    sha = hashlib.sha256()
+    written = 0
+    total: int | None = None
+    resumable = True
+
+    try:
+        with open(part, "wb") as f:
+            for attempt in range(1, attempts + 1):
+                headers = {"Accept-Encoding": "identity"}
+                if written and resumable:
+                    headers["Range"] = f"bytes={written}-"
+                try:
+                    async with client.stream("GET", url, headers=headers) as resp:
+                        resp.raise_for_status()
+                        if written and resp.status_code != 206:
+                            # Range ignored (or not sent): start from byte 0 again
+                            f.seek(0)
+                            f.truncate()
+                            sha = hashlib.sha256()
+                            written = 0
+                        encoded = resp.headers.get("content-encoding", "identity") != "identity"
+                        resumable = not encoded
+                        if total is None or resp.status_code != 206:
+                            length = resp.headers.get("content-length")
+                            total = int(length) + written if length and not encoded else None
+                        async for chunk in resp.aiter_bytes():
+                            f.write(chunk)
+                            sha.update(chunk)
+                            written += len(chunk)
+                    if total is None or written >= total:
+                        break
+                    error = f"connection closed at {written} of {total} bytes"
+                except httpx.HTTPStatusError as exc:
+                    if exc.response.status_code < 500:
+                        raise
+                    error = str(exc)
+                except httpx.TransportError as exc:
+                    error = str(exc) or type(exc).__name__
+                if attempt == attempts:
+                    raise RuntimeError(f"Download failed after {attempts} attempts: {error}")
+                logger.warning(
+                    "Download interrupted at %d bytes (attempt %d/%d): %s",
+                    written, attempt, attempts, error,
+                )
+                await asyncio.sleep(min(2 ** attempt, 30))
+
+        if sha256 and sha.hexdigest() != sha256.lower():
+            raise RuntimeError(f"SHA-256 mismatch for {path.name}")
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
+    part.replace(path)
+    return written
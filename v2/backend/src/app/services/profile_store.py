@@ -13,15 +13,21 @@ import logging
 import uuid
 from datetime import datetime, timezone
 
+import aiosqlite
 import numpy as np
 
+from app.config import get_settings
 from app.database import get_db
+from app.services import speaker_embedding_store
 
 logger = logging.getLogger(__name__)
 
 EMBEDDING_DIM = 192
 MAX_EMBEDDINGS_PER_PROFILE = 100
 
+# user_id -> ProfileMatrix; dropped whenever that user's profiles are written
+_matrix_cache: dict[str, "ProfileMatrix"] = {}
+
 
 def _serialize_embedding(embedding: np.ndarray) -> bytes:
     """Serialize a single embedding to raw float32 bytes."""
@@ -74,26 +80,256 @@ def _compute_embedding_std(embeddings: list[np.ndarray], centroid: np.ndarray) -
     return float(np.std(distances))
 
 
+def _compute_subcentroids(
+    embeddings: list[np.ndarray],
+    k: int,
+    iterations: int = 10,
+) -> np.ndarray:
+    """Spherical k-means over a profile's embeddings.
+
+    Keeps separate modes (e.g. phone vs. room mic) that a single centroid
+    would average away. Deterministic: seeded with the embedding closest to
+    the centroid, then farthest-point picks.
+
+    Returns:
+        (k', D) L2-normalized centers, k' = min(k, len(embeddings)).
+    """
+    x = np.stack(embeddings).astype(np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True) + 1e-12
+    k = max(1, min(k, len(x)))
+    centroid = _l2_normalize(x.mean(axis=0))
+    if k == 1:
+        return centroid[None, :]
+
+    centers = [x[int(np.argmax(x @ centroid))]]
+    for _ in range(k - 1):
+        nearest = np.max(x @ np.stack(centers).T, axis=1)
+        centers.append(x[int(np.argmin(nearest))])
+    c = np.stack(centers)
+
+    for _ in range(iterations):
+        assign = np.argmax(x @ c.T, axis=1)
+        new_c = c.copy()
+        for j in range(k):
+            members = x[assign == j]
+            if len(members):
+                new_c[j] = _l2_normalize(members.mean(axis=0))
+        if np.allclose(new_c, c):
+            break
+        c = new_c
+    return c
+
+
+class ProfileMatrix:
+    """Pre-normalized profile centroids stacked for batch matching.
+
+    Row i of ``centroids`` belongs to ``participant_ids[i]`` /
+    ``display_names[i]``. Profiles without a centroid are excluded.
+
+    ``mode`` selects how a query is scored against a profile:
+
+    - ``centroid``: cosine to the profile centroid.
+    - ``subcentroid``: max cosine over the profile's k-means sub-centroids.
+    - ``knn``: mean of the ``knn_k`` highest cosines to its stored embeddings.
+
+    The non-centroid modes keep a padded (P, M, D) ``members`` tensor so
+    every profile is scored in one product.
+    """
+
+    __slots__ = (
+        "centroids", "participant_ids", "display_names",
+        "mode", "knn_k", "members", "member_counts",
+    )
+
+    MODES = ("centroid", "subcentroid", "knn")
+
+    def __init__(self, profiles: list[dict], mode: str = "centroid", knn_k: int = 5):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown matcher mode: {mode!r}")
+        usable = [p for p in profiles if p["centroid"] is not None]
+        self.participant_ids: list[str] = [p["participant_id"] for p in usable]
+        self.display_names: list[str] = [p["display_name"] for p in usable]
+        self.mode = mode
+        self.knn_k = max(1, knn_k)
+        if usable:
+            mat = np.stack([p["centroid"] for p in usable]).astype(np.float32)
+            mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12
+        else:
+            mat = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self.centroids: np.ndarray = mat
+
+        self.members: np.ndarray | None = None
+        self.member_counts: np.ndarray | None = None
+        if mode != "centroid" and usable:
+            key = "subcentroids" if mode == "subcentroid" else "embeddings"
+            groups = []
+            for p, centroid in zip(usable, mat):
+                vecs = p.get(key)
+                groups.append(
+                    np.asarray(vecs, dtype=np.float32).reshape(-1, mat.shape[1])
+                    if vecs is not None and len(vecs) else centroid[None, :]
+                )
+            counts = np.array([len(g) for g in groups])
+            members = np.zeros((len(groups), counts.max(), mat.shape[1]), dtype=np.float32)
+            for i, g in enumerate(groups):
+                members[i, :len(g)] = g / (np.linalg.norm(g, axis=1, keepdims=True) + 1e-12)
+            self.members = members
+            self.member_counts = counts
+
+    def __len__(self) -> int:
+        return len(self.participant_ids)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """(S, P) similarity of each normalized query to each profile."""
+        if self.mode == "centroid":
+            return queries @ self.centroids.T
+
+        out = np.empty((len(queries), len(self)), dtype=np.float32)
+        valid = np.arange(self.members.shape[1]) < self.member_counts[:, None]  # (P, M)
+        for start in range(0, len(queries), 256):
+            chunk = queries[start:start + 256]
+            sims = np.einsum("sd,pmd->spm", chunk, self.members)
+            sims = np.where(valid, sims, -np.inf)
+            if self.mode == "subcentroid":
+                out[start:start + 256] = sims.max(axis=2)
+            else:
+                k = np.minimum(self.knn_k, self.member_counts)  # (P,)
+                top = -np.sort(-sims, axis=2)[:, :, :k.max()]
+                take = np.arange(top.shape[2]) < k[:, None]  # (P, K)
+                out[start:start + 256] = np.where(take, top, 0.0).sum(axis=2) / k
+        return out
+
+    def top_candidates(
+        self,
+        embeddings: np.ndarray,
+        top_n: int = 5,
+        threshold: float = 0.40,
+    ) -> list[list[dict]]:
+        """Score a batch of embeddings against every profile in one product.
+
+        Args:
+            embeddings: (S, 192) or (192,) query embeddings, normalized here.
+            top_n: Number of best candidates to keep per query.
+            threshold: Minimum (rounded) cosine similarity for a candidate.
+
+        Returns:
+            One list per query of ``{"participantId", "displayName",
+            "similarity"}`` dicts, best first.
+        """
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if len(self) == 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+
+        queries = queries / (np.linalg.norm(queries, axis=1, keepdims=True) + 1e-12)
+        sims = self.scores(queries)  # (S, P)
+
+        k = min(top_n, sims.shape[1])
+        if k < sims.shape[1]:
+            top_idx = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            top_idx = np.broadcast_to(np.arange(k), (len(queries), k))
+        top_sims = np.take_along_axis(sims, top_idx, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+        top_idx = np.take_along_axis(top_idx, order, axis=1)
+        top_sims = np.take_along_axis(top_sims, order, axis=1)
+
+        results = []
+        for idx_row, sim_row in zip(top_idx.tolist(), top_sims.tolist()):
+            candidates = []
+            for i, sim in zip(idx_row, sim_row):
+                sim = round(sim, 4)
+                if sim < threshold:
+                    break
+                candidates.append({
+                    "participantId": self.participant_ids[i],
+                    "displayName": self.display_names[i],
+                    "similarity": sim,
+                })
+            results.append(candidates)
+        return results
+
+
+async def get_profile_matrix(user_id: str) -> ProfileMatrix:
+    """Return the cached ProfileMatrix for a user, building it on a miss."""
+    matrix = _matrix_cache.get(user_id)
+    if matrix is None:
+        settings = get_settings()
+        matrix = ProfileMatrix(
+            await get_profiles(user_id),
+            mode=settings.speaker_id_matcher,
+            knn_k=settings.speaker_id_knn_k,
+        )
+        _matrix_cache[user_id] = matrix
+    return matrix
+
+
+def invalidate_profile_matrix(user_id: str | None = None) -> None:
+    """Drop the cached ProfileMatrix for a user (or for everyone)."""
+    if user_id is None:
+        _matrix_cache.clear()
+    else:
+        _matrix_cache.pop(user_id, None)
+
+
+async def get_profile_version(user_id: str) -> int:
+    """Return the user's current profile version (0 if never changed).
+
+    Speaker entries rated at this version cannot be improved by re-rating
+    until another profile change is recorded.
+    """
+    db = await get_db()
+    rows = await db.execute_fetchall(
+        "SELECT COALESCE(MAX(id), 0) AS version FROM speaker_profile_changes WHERE user_id = ?",
+        (user_id,),
+    )
+    return dict(rows[0])["version"]
+
+
+async def record_profile_change(
+    user_id: str, participant_id: str | None, change: str,
+) -> None:
+    """Append to the profile change log and drop the cached matrix.
+
+    Does not commit; callers commit alongside the profile write itself.
+    """
+    db = await get_db()
+    await db.execute(
+        "INSERT INTO speaker_profile_changes (user_id, participant_id, change) VALUES (?, ?, ?)",
+        (user_id, participant_id, change),
+    )
+    invalidate_profile_matrix(user_id)
+
+
 async def get_profiles(user_id: str) -> list[dict]:
     """Load all speaker profiles for a user.
 
     Returns:
         List of dicts with keys: participant_id, display_name, centroid,
-        embeddings, recording_ids, n_samples, embedding_std.
+        embeddings, subcentroids, recording_ids, n_samples, embedding_std.
     """
     db = await get_db()
     rows = await db.execute_fetchall(
         """SELECT id, participant_id, display_name, centroid, n_samples,
-                  embeddings_blob, recording_ids, embedding_std
+                  embeddings_blob, subcentroids, recording_ids, embedding_std
            FROM speaker_profiles WHERE user_id = ?""",
         (user_id,),
     )
+    settings = get_settings()
+    # Stored by save_profile / backfill_subcentroids; only cluster here for
+    # a row that slipped through, and only if the matcher will use it
+    cluster_missing = settings.speaker_id_matcher == "subcentroid"
 
     profiles = []
     for row in rows:
         r = dict(row)
         centroid = _deserialize_embedding(r["centroid"]) if r["centroid"] else None
         embeddings = _deserialize_embeddings(r["embeddings_blob"])
+        if r["subcentroids"]:
+            subcentroids = np.stack(_deserialize_embeddings(r["subcentroids"]))
+        elif embeddings and cluster_missing:
+            subcentroids = _compute_subcentroids(embeddings, settings.speaker_id_subcentroids)
+        else:
+            subcentroids = None
         recording_ids = json.loads(r["recording_ids"]) if r["recording_ids"] else []
         profiles.append({
             "id": r["id"],
@@ -101,6 +337,7 @@ async def get_profiles(user_id: str) -> list[dict]:
             "display_name": r["display_name"],
             "centroid": centroid,
             "embeddings": embeddings,
+            "subcentroids": subcentroids,
             "recording_ids": recording_ids,
             "n_samples": r["n_samples"] or 0,
             "embedding_std": r["embedding_std"],
@@ -109,6 +346,40 @@ async def get_profiles(user_id: str) -> list[dict]:
     return profiles
 
 
+async def backfill_subcentroids(db: aiosqlite.Connection, batch_size: int = 200) -> int:
+    """Store k-means sub-centroids for profiles saved before they existed.
+
+    Runs from _migrate_schema on every start, so get_profiles never has to
+    cluster at load time.
+
+    Returns:
+        Number of profiles updated.
+    """
+    n_sub = get_settings().speaker_id_subcentroids
+    updated = 0
+    last_rowid = 0
+    while True:
+        rows = await db.execute_fetchall(
+            """SELECT rowid, id, embeddings_blob FROM speaker_profiles
+               WHERE rowid > ? AND subcentroids IS NULL AND embeddings_blob IS NOT NULL
+               ORDER BY rowid LIMIT ?""",
+            (last_rowid, batch_size),
+        )
+        if not rows:
+            break
+        last_rowid = rows[-1]["rowid"]
+        for r in rows:
+            embeddings = _deserialize_embeddings(r["embeddings_blob"])
+            if not embeddings:
+                continue
+            blob = _compute_subcentroids(embeddings, n_sub).astype(np.float32).tobytes()
+            await db.execute(
+                "UPDATE speaker_profiles SET subcentroids = ? WHERE id = ?", (blob, r["id"])
+            )
+            updated += 1
+    return updated
+
+
 async def save_profile(
     user_id: str,
     participant_id: str,
@@ -122,6 +393,8 @@ async def save_profile(
     """Upsert a speaker profile.
 
     Uses INSERT OR REPLACE on the (user_id, participant_id) unique constraint.
+    K-means sub-centroids of ``embeddings`` are computed and stored here so
+    the subcentroid matcher never clusters at query time.
     """
     db = await get_db()
     now = datetime.now(timezone.utc).isoformat()
@@ -134,20 +407,26 @@ async def save_profile(
 
     centroid_blob = _serialize_embedding(centroid) if centroid is not None else None
     embeddings_blob = _serialize_embeddings(embeddings) if embeddings else None
+    subcentroids_blob = (
+        _compute_subcentroids(embeddings, get_settings().speaker_id_subcentroids)
+        .astype(np.float32).tobytes()
+        if embeddings else None
+    )
 
     if existing:
         profile_id = dict(existing[0])["id"]
         await db.execute(
             """UPDATE speaker_profiles
                SET display_name = ?, centroid = ?, n_samples = ?,
-                   embeddings_blob = ?, recording_ids = ?, embedding_std = ?,
-                   updated_at = ?
+                   embeddings_blob = ?, subcentroids = ?, recording_ids = ?,
+                   embedding_std = ?, updated_at = ?
                WHERE id = ?""",
             (
                 display_name,
                 centroid_blob,
                 n_samples,
                 embeddings_blob,
+                subcentroids_blob,
                 json.dumps(recording_ids),
                 embedding_std,
                 now,
@@ -159,8 +438,9 @@ async def save_profile(
         await db.execute(
             """INSERT INTO speaker_profiles
                (id, user_id, participant_id, display_name, centroid, n_samples,
-                embeddings_blob, recording_ids, embedding_std, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                embeddings_blob, subcentroids, recording_ids, embedding_std,
+                created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 profile_id,
                 user_id,
@@ -169,6 +449,7 @@ async def save_profile(
                 centroid_blob,
                 n_samples,
                 embeddings_blob,
+                subcentroids_blob,
                 json.dumps(recording_ids),
                 embedding_std,
                 now,
@@ -176,6 +457,7 @@ async def save_profile(
             ),
         )
 
+    await record_profile_change(user_id, participant_id, "upsert")
     await db.commit()
 
 
@@ -197,31 +479,15 @@ async def match_speaker(
         Dict with keys: participant_id, display_name, similarity, top_candidates.
         participant_id is None if best match is below threshold.
     """
-    profiles = await get_profiles(user_id)
-
-    if not profiles:
-        return {
-            "participant_id": None,
-            "display_name": None,
-            "similarity": None,
-            "top_candidates": [],
+    matrix = await get_profile_matrix(user_id)
+    top_candidates = [
+        {
+            "participant_id": c["participantId"],
+            "display_name": c["displayName"],
+            "similarity": c["similarity"],
         }
-
-    embedding_norm = _l2_normalize(embedding)
-    results = []
-
-    for profile in profiles:
-        if profile["centroid"] is None:
-            continue
-        sim = _cosine_similarity(embedding_norm, profile["centroid"])
-        results.append({
-            "participant_id": profile["participant_id"],
-            "display_name": profile["display_name"],
-            "similarity": round(sim, 4),
-        })
-
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    top_candidates = [c for c in results[:top_n] if c["similarity"] >= threshold]
+        for c in matrix.top_candidates(embedding, top_n=top_n, threshold=threshold)[0]
+    ]
 
     if not top_candidates:
         return {
@@ -330,6 +596,7 @@ async def rebuild_all_profiles(user_id: str) -> int:
 
     # Delete existing profiles for this user
     await db.execute("DELETE FROM speaker_profiles WHERE user_id = ?", (user_id,))
+    await record_profile_change(user_id, None, "clear")
     await db.commit()
     await run_logger.info("Cleared existing profiles")
 
@@ -341,8 +608,8 @@ async def rebuild_all_profiles(user_id: str) -> int:
 
     await run_logger.info("Scanning %d recording(s) for verified embeddings" % len(rows))
 
-    # Collect: participant_id -> [(embedding, recording_id)]
-    participant_data: dict[str, list[tuple[np.ndarray, str]]] = {}
+    # Collect verified entries first, then load their embeddings in bulk
+    verified_entries: list[tuple[str, int, str]] = []  # (participant_id, embedding_id, recording_id)
 
     for row in rows:
         r = dict(row)
@@ -365,15 +632,23 @@ async def rebuild_all_profiles(user_id: str) -> int:
             if not pid:
                 continue
 
-            emb_data = entry.get("embedding")
-            if not emb_data or not isinstance(emb_data, list):
+            embedding_id = entry.get("embeddingId")
+            if not embedding_id:
                 continue
 
-            embedding = np.array(emb_data, dtype=np.float32)
-            if embedding.shape != (EMBEDDING_DIM,):
-                continue
+            verified_entries.append((pid, embedding_id, recording_id))
+
+    embeddings = await speaker_embedding_store.load_embeddings(
+        [embedding_id for _, embedding_id, _ in verified_entries], db=db,
+    )
 
-            participant_data.setdefault(pid, []).append((_l2_normalize(embedding), recording_id))
+    # Collect: participant_id -> [(embedding, recording_id)]
+    participant_data: dict[str, list[tuple[np.ndarray, str]]] = {}
+    for pid, embedding_id, recording_id in verified_entries:
+        embedding = embeddings.get(embedding_id)
+        if embedding is None or embedding.shape != (EMBEDDING_DIM,):
+            continue
+        participant_data.setdefault(pid, []).append((_l2_normalize(embedding), recording_id))
 
     await run_logger.info(
         "Found %d participant(s) with verified embeddings" % len(participant_data)
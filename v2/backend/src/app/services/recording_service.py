@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import base64
 import json
 import logging
 import uuid
@@ -9,7 +10,7 @@ from datetime import datetime, timezone
 
 from fastapi import HTTPException
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import (
     PaginatedResponse,
     PasteTranscriptRequest,
@@ -22,7 +23,7 @@ from app.models import (
     SpeakerMapping,
     SpeakerMappingEntry,
 )
-from app.services import storage_service
+from app.services import content_store, storage_service
 
 logger = logging.getLogger(__name__)
 
@@ -30,15 +31,17 @@ logger = logging.getLogger(__name__)
 _SUMMARY_COLUMNS = """
     id, user_id, title, description, original_filename, duration_seconds,
     recorded_at, source, status, token_count, plaud_id, speaker_mapping,
-    created_at, updated_at
+    created_at, updated_at,
+    (SELECT group_concat(tag_id) FROM recording_tags
+     WHERE recording_id = recordings.id) AS tag_ids_csv
 """
 
 
-def _row_to_summary(
-    row: dict,
-    tag_ids: list[str] | None = None,
-) -> RecordingSummary:
-    """Convert a DB row to a RecordingSummary, extracting speaker names."""
+def _row_to_summary(row: dict) -> RecordingSummary:
+    """Convert a DB row to a RecordingSummary, extracting speaker names.
+
+    Tag ids come from the inline `tag_ids_csv` column of _SUMMARY_COLUMNS.
+    """
     speaker_names: list[str] | None = None
     mapping_raw = row.get("speaker_mapping")
     if mapping_raw:
@@ -66,7 +69,7 @@ def _row_to_summary(
         token_count=row.get("token_count"),
         plaud_id=row.get("plaud_id"),
         speaker_names=speaker_names,
-        tag_ids=tag_ids,
+        tag_ids=row["tag_ids_csv"].split(",") if row.get("tag_ids_csv") else [],
         created_at=row.get("created_at"),
         updated_at=row.get("updated_at"),
     )
@@ -145,23 +148,32 @@ async def _get_tag_ids(recording_id: str) -> list[str]:
     return [dict(r)["tag_id"] for r in rows]
 
 
-async def _get_tag_ids_bulk(recording_ids: list[str]) -> dict[str, list[str]]:
-    """Fetch tag IDs for multiple recordings in one query."""
-    if not recording_ids:
-        return {}
+def encode_cursor(sort_at: str, recording_id: str) -> str:
+    """Opaque keyset cursor for the row after which the next page starts.
 
-    db = await get_db()
-    placeholders = ",".join("?" for _ in recording_ids)
-    rows = await db.execute_fetchall(
-        f"SELECT recording_id, tag_id FROM recording_tags WHERE recording_id IN ({placeholders})",
-        recording_ids,
-    )
+    sort_at is never NULL (the column falls back to ''), so every cursor
+    this emits is accepted by decode_cursor.
+    """
+    if not isinstance(sort_at, str):
+        raise ValueError("Cursor sort key must be a string")
+    raw = json.dumps([sort_at, recording_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-    result: dict[str, list[str]] = {rid: [] for rid in recording_ids}
-    for row in rows:
-        r = dict(row)
-        result[r["recording_id"]].append(r["tag_id"])
-    return result
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_at, recording_id = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(sort_at, str) or not isinstance(recording_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_at, recording_id
 
 
 async def list_recordings(
@@ -171,78 +183,91 @@ async def list_recordings(
     search: str | None = None,
     date_from: str | None = None,
     date_to: str | None = None,
+    cursor: str | None = None,
 ) -> PaginatedResponse:
-    """List recordings with pagination, optional search and date filtering.
+    """List recordings, newest first, with optional search and date filtering.
+
+    Pages are ordered by (sort_at, id) descending, which
+    idx_recordings_user_sort serves directly. Passing the previous
+    response's `next_cursor` continues after its last row (keyset
+    pagination), so deep pages cost the same as the first; `page` still
+    works as an OFFSET for older clients. `total` is only computed
+    without a cursor, so a client paging by cursor counts once.
 
     Args:
         user_id: Owner's user ID.
-        page: 1-based page number.
+        page: 1-based page number (ignored when `cursor` is given).
         per_page: Results per page (max 100).
         search: Optional FTS5 search query.
         date_from: Optional ISO date string for start of date range.
         date_to: Optional ISO date string for end of date range.
+        cursor: Optional `next_cursor` from the previous page.
 
     Returns:
         PaginatedResponse containing RecordingSummary items.
+
+    Raises:
+        HTTPException 400 if the cursor is malformed.
     """
-    db = await get_db()
+    db = await get_read_db()
     per_page = min(per_page, 100)
-    offset = (page - 1) * per_page
-    params: list = []
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
+    where = "WHERE user_id = ?"
+    params: list = [user_id]
     if search:
-        # Use FTS5 for text search + LIKE on speaker_mapping for speaker names
-        base_query = f"""
-            SELECT {_SUMMARY_COLUMNS}
-            FROM recordings
-            WHERE user_id = ? AND (
+        # Use FTS5 for text search + recording_speakers for speaker names
+        where += """ AND (
                 rowid IN (SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?)
-                OR speaker_mapping LIKE ?
-            )
-        """
-        count_query = """
-            SELECT COUNT(*) as cnt FROM recordings
-            WHERE user_id = ? AND (
-                rowid IN (SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?)
-                OR speaker_mapping LIKE ?
-            )
-        """
-        params = [user_id, search, f"%{search}%"]
-    else:
-        base_query = f"SELECT {_SUMMARY_COLUMNS} FROM recordings WHERE user_id = ?"
-        count_query = "SELECT COUNT(*) as cnt FROM recordings WHERE user_id = ?"
-        params = [user_id]
+                OR id IN (SELECT recording_id FROM recording_speakers
+                          WHERE user_id = ? AND display_name LIKE ?)
+            )"""
+        params += [search, user_id, f"%{search}%"]
 
     # Date range filters
     if date_from:
-        base_query += " AND recorded_at >= ?"
-        count_query += " AND recorded_at >= ?"
+        where += " AND recorded_at >= ?"
         params.append(date_from)
     if date_to:
-        base_query += " AND recorded_at <= ?"
-        count_query += " AND recorded_at <= ?"
+        where += " AND recorded_at <= ?"
         params.append(date_to)
 
-    # Count total
-    count_rows = await db.execute_fetchall(count_query, params)
-    total = dict(count_rows[0])["cnt"] if count_rows else 0
-
-    # Fetch page
-    base_query += " ORDER BY COALESCE(recorded_at, created_at) DESC LIMIT ? OFFSET ?"
-    rows = await db.execute_fetchall(base_query, params + [per_page, offset])
-
-    recording_ids = [dict(r)["id"] for r in rows]
-    tag_map = await _get_tag_ids_bulk(recording_ids)
-
-    data = [
-        _row_to_summary(
-            dict(r),
-            tag_ids=tag_map.get(dict(r)["id"]),
+    total = None
+    if after is None:
+        count_rows = await db.execute_fetchall(
+            f"SELECT COUNT(*) as cnt FROM recordings {where}", params
         )
-        for r in rows
-    ]
+        total = dict(count_rows[0])["cnt"] if count_rows else 0
+
+    # Fetch page (one extra row tells whether there is a next page)
+    page_params = list(params)
+    if after is not None:
+        where += " AND (sort_at, id) < (?, ?)"
+        page_params += list(after)
+        offset = 0
+    else:
+        offset = (page - 1) * per_page
+    rows = await db.execute_fetchall(
+        f"""SELECT {_SUMMARY_COLUMNS}, sort_at FROM recordings {where}
+            ORDER BY sort_at DESC, id DESC LIMIT ? OFFSET ?""",
+        page_params + [per_page + 1, offset],
+    )
+    rows = [dict(r) for r in rows]
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1]["sort_at"], rows[-1]["id"])
 
-    return PaginatedResponse(data=data, total=total, page=page, per_page=per_page)
+    data = [_row_to_summary(r) for r in rows]
+
+    return PaginatedResponse(
+        data=data, total=total, page=page, per_page=per_page, next_cursor=next_cursor,
+    )
 
 
 async def get_recording(user_id: str, recording_id: str) -> RecordingDetail:
@@ -260,13 +285,13 @@ async def get_recording(user_id: str, recording_id: str) -> RecordingDetail:
     if not rows:
         raise HTTPException(status_code=404, detail="Recording not found")
 
+    row = dict(rows[0])
+    row["transcript_json"] = (
+        await content_store.get_transcript_json(recording_id, db=db)
+        or row.get("transcript_json")
+    )
     tag_ids = await _get_tag_ids(recording_id)
-    detail = _row_to_detail(dict(rows[0]), tag_ids=tag_ids)
-
-    # Strip embedding arrays from API responses (192-float arrays are large)
-    if detail.speaker_mapping:
-        for entry in detail.speaker_mapping.values():
-            entry.embedding = None
+    detail = _row_to_detail(row, tag_ids=tag_ids)
 
     # Get collections this recording belongs to
     col_rows = await db.execute_fetchall(
@@ -312,24 +337,26 @@ async def create_recording(
             id, user_id, original_filename, source, title, description,
             file_path, duration_seconds, recorded_at, plaud_id,
             plaud_metadata_json, status, transcript_text, diarized_text,
-            transcript_json, token_count, speaker_mapping,
+            token_count, speaker_mapping,
             created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
                   datetime('now'), datetime('now'))""",
         (
             recording_id, user_id, original_filename, source.value,
             title, description, file_path, duration_seconds, recorded_at,
             plaud_id, plaud_metadata_json, status.value,
-            transcript_text, diarized_text, transcript_json,
+            transcript_text, diarized_text,
             token_count, speaker_mapping,
         ),
     )
+    if transcript_json is not None:
+        await content_store.save_transcript_json(recording_id, transcript_json, db=db)
     await db.commit()
 
     rows = await db.execute_fetchall(
         "SELECT * FROM recordings WHERE id = ?", (recording_id,)
     )
-    return Recording(**dict(rows[0]))
+    return Recording(**{**dict(rows[0]), "transcript_json": transcript_json})
 
 
 async def update_recording(
@@ -541,14 +568,15 @@ async def assign_speaker(
     )
 
     # Update speaker profile with embedding if available (training loop)
-    embedding = mapping[speaker_label].get("embedding")
-    if manually_verified and embedding and participant_id:
+    embedding_id = mapping[speaker_label].get("embeddingId")
+    if manually_verified and embedding_id and participant_id:
         try:
-            from app.services import profile_store
-            await profile_store.update_profile_with_embedding(
-                user_id, participant_id, display_name or "Unknown",
-                embedding, recording_id,
-            )
+            from app.services import profile_store, speaker_embedding_store
+            embedding = await speaker_embedding_store.load_embedding(embedding_id, db=db)
+            if embedding is not None:
+                await profile_store.update_profile_with_embedding(
+                    user_id, participant_id, embedding, recording_id,
+                )
         except Exception as e:
             logger.warning("Failed to update speaker profile: %s", e)
     await db.commit()
@@ -729,7 +757,7 @@ async def search_recordings(user_id: str, query: str) -> list[RecordingSummary]:
 
     Uses SQLite FTS5. Returns up to 50 results ranked by relevance.
     """
-    db = await get_db()
+    db = await get_read_db()
 
     rows = await db.execute_fetchall(
         f"""SELECT {_SUMMARY_COLUMNS}
@@ -737,18 +765,12 @@ async def search_recordings(user_id: str, query: str) -> list[RecordingSummary]:
             WHERE user_id = ? AND rowid IN (
                 SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?
             )
-            ORDER BY COALESCE(recorded_at, created_at) DESC
+            ORDER BY sort_at DESC, id DESC
             LIMIT 50""",
         (user_id, query),
     )
 
-    recording_ids = [dict(r)["id"] for r in rows]
-    tag_map = await _get_tag_ids_bulk(recording_ids)
-
-    return [
-        _row_to_summary(dict(r), tag_ids=tag_map.get(dict(r)["id"]))
-        for r in rows
-    ]
+    return [_row_to_summary(dict(r)) for r in rows]
 
 
 def _parse_duration_to_seconds(iso_dur: str) -> float | None:
@@ -778,31 +800,33 @@ async def get_recordings_for_review(user_id: str) -> list[dict]:
     rows = await db.execute_fetchall(
         """SELECT id, user_id, title, original_filename, recorded_at,
                   duration_seconds, speaker_mapping, source, status,
-                  transcript_json, file_path
+                  file_path
            FROM recordings
-           WHERE user_id = ? AND speaker_mapping IS NOT NULL
-             AND (speaker_mapping LIKE '%"identificationStatus":"suggest"%'
-               OR speaker_mapping LIKE '%"identificationStatus": "suggest"%'
-               OR speaker_mapping LIKE '%"identificationStatus":"unknown"%'
-               OR speaker_mapping LIKE '%"identificationStatus": "unknown"%')
-           ORDER BY COALESCE(recorded_at, created_at) DESC""",
+           WHERE id IN (
+               SELECT recording_id FROM recording_speakers
+               WHERE user_id = ? AND status IN ('suggest', 'unknown')
+           )
+           ORDER BY sort_at DESC, id DESC""",
         (user_id,),
     )
 
     if not rows:
         return []
 
+    transcripts = await content_store.get_transcript_json_bulk(
+        [dict(row)["id"] for row in rows], db=db
+    )
+
     results = []
     for row in rows:
         r = dict(row)
+        r["transcript_json"] = transcripts.get(r["id"])
         # Parse speaker_mapping through Pydantic for normalization
         try:
             raw_mapping = json.loads(r["speaker_mapping"])
             mapping = {}
             for label, entry_data in raw_mapping.items():
                 entry = SpeakerMappingEntry.model_validate(entry_data)
-                # Strip embeddings
-                entry.embedding = None
                 mapping[label] = entry.model_dump()
         except (json.JSONDecodeError, Exception):
             continue
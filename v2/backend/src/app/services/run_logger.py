@@ -1,7 +1,14 @@
-"""RunLogger — writes structured log entries to the run_logs table in real time.
+"""RunLogger — writes structured log entries to the run_logs table.
 
-Each log call commits immediately so polling clients see new entries right away.
-Includes a sync adapter for use inside asyncio.to_thread() contexts.
+Log lines are buffered and written in batches (one executemany + commit)
+every _FLUSH_INTERVAL_S or _FLUSH_MAX_LINES lines, whichever comes first,
+instead of one commit per line on the shared writer connection. Polling
+clients tailing /api/sync/runs/{id}/logs see new entries within the flush
+interval; finishing a run (and shutdown) calls flush() so nothing is left
+behind.
+
+Includes a sync adapter for use inside asyncio.to_thread() contexts that
+hands lines to the event loop without waiting for them to be written.
 """
 
 from __future__ import annotations
@@ -14,72 +21,128 @@ from app.database import get_db
 
 logger = logging.getLogger(__name__)
 
+_FLUSH_INTERVAL_S = 0.25
+_FLUSH_MAX_LINES = 200
+
+_INSERT_SQL = "INSERT INTO run_logs (run_id, timestamp, level, message) VALUES (?, ?, ?, ?)"
+
+# (run_id, timestamp, level, message) rows not yet written, shared by all runs
+_pending: list[tuple[str, str, str, str]] = []
+_flush_task: asyncio.Task | None = None
+_full: asyncio.Event | None = None
+
+
+def _buffer(run_id: str, level: str, message: str) -> None:
+    """Queue a row and make sure a flush is scheduled. Event loop thread only."""
+    global _flush_task, _full
+    _pending.append((run_id, datetime.now(timezone.utc).isoformat(), level, message))
+    if not _flush_scheduled():
+        _full = asyncio.Event()
+        _flush_task = asyncio.get_running_loop().create_task(_flush_later(_full))
+    elif len(_pending) >= _FLUSH_MAX_LINES:
+        _full.set()
+
+
+def _flush_scheduled() -> bool:
+    return (
+        _flush_task is not None
+        and not _flush_task.done()
+        and _flush_task.get_loop() is asyncio.get_running_loop()
+    )
+
+
+async def _flush_later(full: asyncio.Event) -> None:
+    try:
+        await asyncio.wait_for(full.wait(), timeout=_FLUSH_INTERVAL_S)
+    except asyncio.TimeoutError:
+        pass
+    await _write()
+
+
+async def _write() -> None:
+    if not _pending:
+        return
+    rows = _pending[:]
+    _pending.clear()
+    try:
+        db = await get_db()
+        await db.executemany(_INSERT_SQL, rows)
+        await db.commit()
+    except Exception as exc:
+        logger.warning("Failed to write %d run log line(s): %s", len(rows), exc)
+
+
+async def flush() -> None:
+    """Write all buffered log lines now."""
+    task = _flush_task
+    if _flush_scheduled() and task is not asyncio.current_task():
+        _full.set()
+        await task
+    await _write()
+
 
 class RunLogger:
-    """Logger that writes each message to the run_logs table immediately."""
+    """Logger that writes each message to the run_logs table (batched)."""
 
     def __init__(self, run_id: str):
         self.run_id = run_id
 
     async def info(self, message: str) -> None:
         logger.info("[run:%s] %s", self.run_id[:8], message)
-        await self._log("info", message)
+        _buffer(self.run_id, "info", message)
 
     async def warning(self, message: str) -> None:
         logger.warning("[run:%s] %s", self.run_id[:8], message)
-        await self._log("warning", message)
+        _buffer(self.run_id, "warning", message)
 
     async def error(self, message: str) -> None:
         logger.error("[run:%s] %s", self.run_id[:8], message)
-        await self._log("error", message)
+        _buffer(self.run_id, "error", message)
 
     async def debug(self, message: str) -> None:
         logger.debug("[run:%s] %s", self.run_id[:8], message)
-        await self._log("debug", message)
+        _buffer(self.run_id, "debug", message)
 
-    async def _log(self, level: str, message: str) -> None:
-        """Insert a log row and commit immediately."""
-        try:
-            db = await get_db()
-            now = datetime.now(timezone.utc).isoformat()
-            await db.execute(
-                "INSERT INTO run_logs (run_id, timestamp, level, message) VALUES (?, ?, ?, ?)",
-                (self.run_id, now, level, message),
-            )
-            await db.commit()
-        except Exception as exc:
-            logger.warning("Failed to write run log: %s", exc)
+    async def flush(self) -> None:
+        """Write buffered lines (of every run) now."""
+        await flush()
 
     def sync_adapter(self) -> SyncRunLogger:
         """Return a synchronous wrapper for use in threaded contexts.
 
-        The sync adapter uses asyncio.run_coroutine_threadsafe() to post
-        log entries back to the event loop that owns the database connection.
+        Must be called on the event loop that owns the database connection;
+        the adapter hands lines back to that loop with call_soon_threadsafe().
         """
-        loop = asyncio.get_event_loop()
-        return SyncRunLogger(self, loop)
+        return SyncRunLogger(self, asyncio.get_running_loop())
 
 
 class SyncRunLogger:
-    """Synchronous facade for RunLogger, safe to call from worker threads."""
+    """Synchronous facade for RunLogger, safe to call from worker threads.
+
+    Never blocks: lines are queued on the event loop and written with the
+    next batch.
+    """
 
     def __init__(self, async_logger: RunLogger, loop: asyncio.AbstractEventLoop):
         self._async_logger = async_logger
         self._loop = loop
 
-    def _post(self, coro):
-        """Schedule a coroutine on the event loop and wait for it."""
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        future.result(timeout=5)
+    def _post(self, level: int, message: str) -> None:
+        run_id = self._async_logger.run_id
+        logger.log(level, "[run:%s] %s", run_id[:8], message)
+        try:
+            self._loop.call_soon_threadsafe(_buffer, run_id, logging.getLevelName(level).lower(), message)
+        except RuntimeError:
+            pass  # Loop closed; the line still went to the Python log
 
     def info(self, message: str) -> None:
-        self._post(self._async_logger.info(message))
+        self._post(logging.INFO, message)
 
     def warning(self, message: str) -> None:
-        self._post(self._async_logger.warning(message))
+        self._post(logging.WARNING, message)
 
     def error(self, message: str) -> None:
-        self._post(self._async_logger.error(message))
+        self._post(logging.ERROR, message)
 
     def debug(self, message: str) -> None:
-        self._post(self._async_logger.debug(message))
+        self._post(logging.DEBUG, message)
@@ -0,0 +1,125 @@
+"""In-process caches for deep search answers and Tier 2 extracts.
+
+Answers are keyed on (user, scope, normalized question, corpus fingerprint),
+where the fingerprint hashes the `updated_at` of every recording the search
+could read: the user's whole ready library for deep_search (Tier 1 picks
+candidates from all of it), or the collection's items for search_collection.
+Any edit, new recording or collection change therefore misses naturally.
+
+Tier 2 extracts are keyed per (normalized question, recording, updated_at,
+model), so overlapping searches reuse per-transcript work even when the
+overall answer misses.
+
+Both caches are LRU with a TTL and live only in this process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import get_settings
+from app.database import get_read_db
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A small LRU cache whose entries also expire after ttl seconds."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        stored_at, value = item
+        if time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_answer_cache: TTLCache | None = None
+_extract_cache: TTLCache | None = None
+
+
+def answer_cache() -> TTLCache:
+    global _answer_cache
+    if _answer_cache is None:
+        s = get_settings()
+        _answer_cache = TTLCache(s.deep_search_cache_max_entries, s.deep_search_cache_ttl_seconds)
+    return _answer_cache
+
+
+def extract_cache() -> TTLCache:
+    global _extract_cache
+    if _extract_cache is None:
+        s = get_settings()
+        _extract_cache = TTLCache(s.deep_search_extract_cache_max_entries, s.deep_search_cache_ttl_seconds)
+    return _extract_cache
+
+
+def clear_caches() -> None:
+    """Drop every cached answer and extract."""
+    for cache in (_answer_cache, _extract_cache):
+        if cache is not None:
+            cache.clear()
+
+
+def normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question, minus trailing punctuation."""
+    return re.sub(r"\s+", " ", question).strip().lower().rstrip("?.! ")
+
+
+def _digest(rows) -> str:
+    h = hashlib.sha256()
+    for r in rows:
+        h.update(f"{r[0]}|{r[1]};".encode())
+    return h.hexdigest()
+
+
+async def library_fingerprint(user_id: str) -> str:
+    """Fingerprint of (id, updated_at) over a user's ready recordings."""
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT id, updated_at FROM recordings
+           WHERE user_id = ? AND status = 'ready' ORDER BY id""",
+        (user_id,),
+    )
+    return _digest(rows)
+
+
+async def collection_fingerprint(collection_id: str, user_id: str) -> str:
+    """Fingerprint of (id, updated_at) over a collection's ready recordings."""
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT r.id, r.updated_at FROM collection_items ci
+           JOIN recordings r ON r.id = ci.recording_id
+           WHERE ci.collection_id = ? AND r.user_id = ? AND r.status = 'ready'
+           ORDER BY r.id""",
+        (collection_id, user_id),
+    )
+    return _digest(rows)
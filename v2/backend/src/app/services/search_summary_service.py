@@ -14,17 +14,14 @@ from openai import AsyncAzureOpenAI
 from app.config import get_settings
 from app.database import get_db
 from app.prompts import render
+from app.services import llm_client
+from app.services.llm_client import Priority
 
 logger = logging.getLogger(__name__)
 
 
 def _get_client() -> AsyncAzureOpenAI:
-    settings = get_settings()
-    return AsyncAzureOpenAI(
-        azure_endpoint=settings.azure_openai_endpoint,
-        api_key=settings.azure_openai_api_key,
-        api_version=settings.azure_openai_api_version,
-    )
+    return llm_client.get_client()
 
 
 def _format_duration(seconds: float | None) -> str:
@@ -52,12 +49,17 @@ def _extract_speaker_names(speaker_mapping_json: str | None) -> str:
         return "unknown"
 
 
-async def generate_search_summary(recording_id: str, user_id: str) -> dict:
+async def generate_search_summary(
+    recording_id: str,
+    user_id: str,
+    priority: Priority = Priority.BACKGROUND,
+) -> dict:
     """Generate a retrieval-optimized search summary for a recording.
 
     Args:
         recording_id: The recording ID.
         user_id: The user ID (for authorization).
+        priority: LLM scheduling priority; user-triggered calls pass INTERACTIVE.
 
     Returns:
         Dict with "summary" and "keywords" keys.
@@ -100,9 +102,10 @@ async def generate_search_summary(recording_id: str, user_id: str) -> dict:
         transcript=transcript,
     )
 
-    client = _get_client()
     try:
-        response = await client.chat.completions.create(
+        response = await llm_client.chat_completion(
+            priority,
+            client=_get_client(),
             model=settings.azure_openai_mini_deployment,
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that generates retrieval-optimized summaries. Always respond with valid JSON only."},
@@ -154,5 +157,3 @@ async def generate_search_summary(recording_id: str, user_id: str) -> dict:
     except (json.JSONDecodeError, KeyError, IndexError) as exc:
         logger.warning("Failed to parse search summary response: %s", exc)
         return {"summary": "", "keywords": []}
-    finally:
-        await client.close()
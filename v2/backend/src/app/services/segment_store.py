@@ -0,0 +1,83 @@
+"""Per-window ECAPA embedding cache.
+
+speaker_processor embeds a handful of trimmed diarization windows per
+speaker. Those vectors depend only on the audio, the window bounds and the
+model, so they are kept in `segment_embeddings` keyed by
+(recording_id, start_ms, end_ms, model_version). Re-identification after a
+profile change, or with different thresholds / top-N selection, then reuses
+them and only decodes windows that have never been embedded.
+
+A NULL vector records a window that produced no embedding (too short after
+decoding), so it is not retried on every run.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import aiosqlite
+import numpy as np
+
+from app.database import get_db
+
+# Bump when decoding or embedding preprocessing changes in a way that
+# alters the vectors for the same window and model
+PIPELINE_VERSION = 1
+
+WindowKey = tuple[int, int]
+
+
+def model_version(model_path: str) -> str:
+    """Cache key component identifying the embedding model and pipeline."""
+    return f"{Path(model_path).name}@{PIPELINE_VERSION}"
+
+
+def window_key(window: tuple[float, float]) -> WindowKey:
+    """Window bounds in whole milliseconds."""
+    return round(window[0] * 1000), round(window[1] * 1000)
+
+
+async def get_embeddings(
+    recording_id: str,
+    version: str,
+    db: aiosqlite.Connection | None = None,
+) -> dict[WindowKey, np.ndarray | None]:
+    """All cached window embeddings for a recording under one model version."""
+    db = db or await get_db()
+    rows = await db.execute_fetchall(
+        """SELECT start_ms, end_ms, vector FROM segment_embeddings
+           WHERE recording_id = ? AND model_version = ?""",
+        (recording_id, version),
+    )
+    return {
+        (r["start_ms"], r["end_ms"]): (
+            np.frombuffer(r["vector"], dtype=np.float32).copy() if r["vector"] else None
+        )
+        for r in rows
+    }
+
+
+async def save_embeddings(
+    recording_id: str,
+    version: str,
+    windows: list[tuple[float, float]],
+    embeddings: list[np.ndarray | None],
+    db: aiosqlite.Connection | None = None,
+) -> None:
+    """Store freshly computed window embeddings (commits)."""
+    db = db or await get_db()
+    await db.executemany(
+        """INSERT OR REPLACE INTO segment_embeddings
+           (recording_id, start_ms, end_ms, model_version, vector)
+           VALUES (?, ?, ?, ?, ?)""",
+        [
+            (
+                recording_id,
+                *window_key(window),
+                version,
+                emb.astype(np.float32).tobytes() if emb is not None else None,
+            )
+            for window, emb in zip(windows, embeddings)
+        ],
+    )
+    await db.commit()
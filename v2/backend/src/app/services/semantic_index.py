@@ -0,0 +1,321 @@
+"""Local vector index over recording summaries and transcripts.
+
+Backs deep search Tier 1: instead of sending every summary to the LLM, the
+router first narrows the library to the top-K recordings by cosine
+similarity over chunk vectors, fused (reciprocal rank fusion) with FTS5
+bm25 hits. Recordings not yet indexed are always kept, so nothing is lost
+while the index catches up.
+
+Chunk vectors are float32 BLOBs in `search_chunks`. `search_index_state`
+marks a recording as indexed; the `search_index_au` trigger drops both when
+the title, summary or transcript changes, and `index_pending()` (scheduled)
+re-indexes whatever is missing.
+
+The encoder is pluggable via `semantic_index_encoder`. The built-in
+"hashing" encoder is a dependency-free signed feature-hashing bag of
+unigrams and bigrams; "sentence-transformers:<model>" uses that package
+if it is installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Protocol
+
+import numpy as np
+
+from app.config import get_settings
+from app.database import get_db, get_read_db
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by did do does for from had has have how i if in "
+    "is it its me my of on or our so that the their them then there these they "
+    "this to was we were what when where which who why will with you your".split()
+)
+
+_encoder: "Encoder | None" = None
+
+# user_id -> (signature, (N, D) vectors grouped by recording, recording ids, group start rows)
+_matrix_cache: dict[str, tuple[tuple, np.ndarray, list[str], np.ndarray]] = {}
+
+
+# ---------------------------------------------------------------------------
+# Encoders
+# ---------------------------------------------------------------------------
+
+
+class Encoder(Protocol):
+    name: str
+    dim: int
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """Return an (len(texts), dim) float32 array of L2-normalized rows."""
+        ...
+
+
+class HashingEncoder:
+    """Signed feature hashing of unigrams + bigrams with sublinear TF.
+
+    Lexical rather than semantic, but needs no model download and is stable
+    across processes (crc32, not Python's salted hash()).
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> Counter:
+        words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+        feats = Counter(words)
+        feats.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        return feats
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for feat, count in self._features(text).items():
+                h = zlib.crc32(feat.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                out[i, h % self.dim] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / (norms + 1e-12)
+
+
+class SentenceTransformerEncoder:
+    """Wraps a sentence-transformers model (optional dependency)."""
+
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise RuntimeError(
+                "semantic_index_encoder=sentence-transformers:... requires the "
+                "sentence-transformers package. Install it or use 'hashing'."
+            )
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        vecs = self._model.encode(texts, normalize_embeddings=True, batch_size=32)
+        return np.asarray(vecs, dtype=np.float32)
+
+
+def get_encoder() -> Encoder:
+    """Get the process-wide encoder configured by semantic_index_encoder."""
+    global _encoder
+    if _encoder is None:
+        spec = get_settings().semantic_index_encoder
+        if spec.startswith("sentence-transformers:"):
+            _encoder = SentenceTransformerEncoder(spec.split(":", 1)[1])
+        else:
+            _encoder = HashingEncoder()
+    return _encoder
+
+
+# ---------------------------------------------------------------------------
+# Indexing
+# ---------------------------------------------------------------------------
+
+
+def chunk_recording(row: dict, chunk_words: int) -> list[tuple[str, str]]:
+    """Split a recording into (source, text) chunks.
+
+    Chunk 0 is title + summary; transcript chunks overlap by a fifth so a
+    passage straddling a boundary still lands whole in one chunk.
+    """
+    chunks: list[tuple[str, str]] = []
+    head = " ".join(filter(None, [row.get("title"), row.get("search_summary") or row.get("description")]))
+    if head.strip():
+        chunks.append(("summary", head))
+
+    transcript = row.get("diarized_text") or row.get("transcript_text") or ""
+    words = transcript.split()
+    step = max(1, chunk_words - chunk_words // 5)
+    for start in range(0, len(words), step):
+        piece = words[start:start + chunk_words]
+        if len(piece) < 20 and start > 0:
+            break
+        chunks.append(("transcript", " ".join(piece)))
+    return chunks
+
+
+async def index_pending(limit: int = 100) -> int:
+    """Index ready recordings that have no current index state.
+
+    Encoding runs in a thread. Returns the number of recordings indexed.
+    """
+    settings = get_settings()
+    encoder = get_encoder()
+    db = await get_db()
+
+    rows = await db.execute_fetchall(
+        """SELECT r.id, r.user_id, r.title, r.description, r.search_summary,
+                  r.diarized_text, r.transcript_text
+           FROM recordings r
+           LEFT JOIN search_index_state s ON s.recording_id = r.id
+           WHERE r.status = 'ready' AND (s.recording_id IS NULL OR s.encoder != ?)
+           LIMIT ?""",
+        (encoder.name, limit),
+    )
+    if not rows:
+        return 0
+
+    recs = [dict(r) for r in rows]
+    per_rec = [chunk_recording(r, settings.semantic_index_chunk_words) for r in recs]
+    texts = [text for chunks in per_rec for _, text in chunks]
+    vectors = await asyncio.to_thread(encoder.encode, texts) if texts else np.empty((0, encoder.dim))
+
+    pos = 0
+    for rec, chunks in zip(recs, per_rec):
+        await db.execute("DELETE FROM search_chunks WHERE recording_id = ?", (rec["id"],))
+        await db.executemany(
+            """INSERT INTO search_chunks (recording_id, user_id, chunk_index, source, vector)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (rec["id"], rec["user_id"], i, source, vectors[pos + i].astype(np.float32).tobytes())
+                for i, (source, _) in enumerate(chunks)
+            ],
+        )
+        pos += len(chunks)
+        await db.execute(
+            """INSERT INTO search_index_state (recording_id, encoder) VALUES (?, ?)
+               ON CONFLICT(recording_id) DO UPDATE
+               SET encoder = excluded.encoder, indexed_at = datetime('now')""",
+            (rec["id"], encoder.name),
+        )
+    await db.commit()
+
+    logger.info("Semantic index: indexed %d recording(s), %d chunk(s)", len(recs), len(texts))
+    return len(recs)
+
+
+# ---------------------------------------------------------------------------
+# Retrieval
+# ---------------------------------------------------------------------------
+
+
+async def _load_matrix(user_id: str) -> tuple[np.ndarray, list[str], np.ndarray]:
+    """Load (and cache) a user's chunk vectors as one (N, D) matrix.
+
+    Rows are grouped by recording: rec_ids[i]'s chunks start at row
+    starts[i], so per-recording reductions can use np.*.reduceat.
+
+    Only chunks written by the current encoder are loaded; while a changed
+    encoder is still re-indexing the library, the rest are left out (and
+    prefilter keeps those recordings as unindexed).
+    """
+    encoder = get_encoder()
+    db = await get_read_db()
+    sig_rows = await db.execute_fetchall(
+        "SELECT COUNT(*) AS n, COALESCE(MAX(id), 0) AS max_id FROM search_chunks WHERE user_id = ?",
+        (user_id,),
+    )
+    signature = (*sig_rows[0], encoder.name)
+    cached = _matrix_cache.get(user_id)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2], cached[3]
+
+    rows = await db.execute_fetchall(
+        """SELECT c.recording_id, c.vector FROM search_chunks c
+           JOIN search_index_state s ON s.recording_id = c.recording_id
+           WHERE c.user_id = ? AND s.encoder = ?
+           ORDER BY c.recording_id, c.id""",
+        (user_id, encoder.name),
+    )
+    rows = [r for r in rows if len(r["vector"]) == encoder.dim * 4]
+    if rows:
+        matrix = np.frombuffer(b"".join(r["vector"] for r in rows), dtype=np.float32)
+        matrix = matrix.reshape(len(rows), encoder.dim)
+    else:
+        matrix = np.empty((0, encoder.dim), dtype=np.float32)
+    rec_ids: list[str] = []
+    starts: list[int] = []
+    for i, r in enumerate(rows):
+        if not rec_ids or r["recording_id"] != rec_ids[-1]:
+            rec_ids.append(r["recording_id"])
+            starts.append(i)
+    starts_arr = np.asarray(starts, dtype=np.intp)
+    _matrix_cache[user_id] = (signature, matrix, rec_ids, starts_arr)
+    return matrix, rec_ids, starts_arr
+
+
+async def vector_search(user_id: str, question: str, top_k: int) -> list[str]:
+    """Recording ids ranked by best chunk cosine similarity to the question."""
+    matrix, rec_ids, starts = await _load_matrix(user_id)
+    encoder = get_encoder()
+    if not rec_ids or matrix.shape[1] != encoder.dim:
+        return []
+
+    query = encoder.encode([question])[0]
+    best = np.maximum.reduceat(matrix @ query, starts)
+    top = np.argsort(-best, kind="stable")[:top_k]
+    return [rec_ids[i] for i in top]
+
+
+def _fts_query(question: str) -> str | None:
+    """Turn free text into an OR of quoted FTS5 terms (None if nothing usable)."""
+    terms = [w for w in _WORD_RE.findall(question.lower()) if w not in _STOPWORDS and len(w) > 1]
+    terms = list(dict.fromkeys(t.replace('"', "") for t in terms))
+    return " OR ".join(f'"{t}"' for t in terms) if terms else None
+
+
+async def bm25_search(user_id: str, question: str, top_k: int) -> list[str]:
+    """Recording ids ranked by FTS5 bm25 over title/summary/transcript."""
+    query = _fts_query(question)
+    if not query:
+        return []
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT r.id FROM recordings_fts f
+           JOIN recordings r ON r.rowid = f.rowid
+           WHERE recordings_fts MATCH ? AND r.user_id = ? AND r.status = 'ready'
+           ORDER BY bm25(recordings_fts)
+           LIMIT ?""",
+        (query, user_id, top_k),
+    )
+    return [r["id"] for r in rows]
+
+
+def reciprocal_rank_fusion(*rankings: list[str], k: int = RRF_K) -> list[str]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, rid in enumerate(ranking):
+            scores[rid] = scores.get(rid, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
+
+
+async def prefilter(user_id: str, question: str, top_k: int) -> set[str]:
+    """Recording ids Tier 1 should consider for this question.
+
+    Fused top-K of vector and bm25 retrieval, plus every ready recording
+    that is not yet indexed with the current encoder.
+    """
+    vec_ids, bm25_ids = await asyncio.gather(
+        vector_search(user_id, question, top_k),
+        bm25_search(user_id, question, top_k),
+    )
+    keep = set(reciprocal_rank_fusion(vec_ids, bm25_ids)[:top_k])
+
+    db = await get_read_db()
+    rows = await db.execute_fetchall(
+        """SELECT r.id FROM recordings r
+           LEFT JOIN search_index_state s ON s.recording_id = r.id
+           WHERE r.user_id = ? AND r.status = 'ready'
+             AND (s.recording_id IS NULL OR s.encoder != ?)""",
+        (user_id, get_encoder().name),
+    )
+    keep.update(r["id"] for r in rows)
+    return keep
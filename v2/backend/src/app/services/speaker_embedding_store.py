@@ -0,0 +1,126 @@
+"""Binary storage for per-speaker embeddings referenced from speaker_mapping.
+
+Each speaker_mapping entry used to carry its 192-dim ECAPA centroid as a
+JSON list of floats, which made the mapping ~20x larger than its metadata
+and forced every reader to parse it. The centroid now lives in
+`speaker_embeddings` as raw float32 bytes, one row per
+(recording_id, speaker_label); the mapping entry stores only the row's
+`embeddingId`. voice_index searches these rows across the library.
+"""
+
+from __future__ import annotations
+
+import json
+
+import aiosqlite
+import numpy as np
+
+from app.database import get_db
+
+_CHUNK = 500
+
+
+def _to_blob(embedding: np.ndarray | list[float]) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def _from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32).copy()
+
+
+async def save_embedding(
+    recording_id: str,
+    speaker_label: str,
+    embedding: np.ndarray | list[float],
+    db: aiosqlite.Connection | None = None,
+) -> int:
+    """Store a speaker's embedding, replacing any previous one for the label.
+
+    Every write gets a new id (callers store it in the mapping entry), so
+    voice_index can pick up changes by loading only ids above its last one.
+    Does not commit; callers commit alongside their speaker_mapping write.
+    """
+    db = db or await get_db()
+    cursor = await db.execute(
+        """INSERT OR REPLACE INTO speaker_embeddings (recording_id, speaker_label, vector)
+           VALUES (?, ?, ?)""",
+        (recording_id, speaker_label, _to_blob(embedding)),
+    )
+    return cursor.lastrowid
+
+
+async def load_embeddings(
+    embedding_ids: list[int],
+    db: aiosqlite.Connection | None = None,
+) -> dict[int, np.ndarray]:
+    """Load many embeddings by id. Missing ids are absent from the result."""
+    db = db or await get_db()
+    ids = list(dict.fromkeys(i for i in embedding_ids if i is not None))
+    result: dict[int, np.ndarray] = {}
+    for i in range(0, len(ids), _CHUNK):
+        chunk = ids[i:i + _CHUNK]
+        placeholders = ",".join("?" for _ in chunk)
+        rows = await db.execute_fetchall(
+            f"SELECT id, vector FROM speaker_embeddings WHERE id IN ({placeholders})",
+            chunk,
+        )
+        for r in rows:
+            result[r["id"]] = _from_blob(r["vector"])
+    return result
+
+
+async def load_embedding(
+    embedding_id: int | None,
+    db: aiosqlite.Connection | None = None,
+) -> np.ndarray | None:
+    """Load a single embedding by id (None if absent)."""
+    if embedding_id is None:
+        return None
+    return (await load_embeddings([embedding_id], db=db)).get(embedding_id)
+
+
+async def move_inline_embeddings(db: aiosqlite.Connection, batch_size: int = 200) -> int:
+    """Move JSON `embedding` lists out of speaker_mapping into speaker_embeddings.
+
+    Runs from _migrate_schema on every start, so mappings written by older
+    tooling are converted too. `updated_at` is left alone: the mapping's
+    meaning does not change.
+
+    Returns:
+        Number of recordings rewritten.
+    """
+    moved = 0
+    last_rowid = 0
+    while True:
+        rows = await db.execute_fetchall(
+            """SELECT rowid, id, speaker_mapping FROM recordings
+               WHERE rowid > ? AND speaker_mapping LIKE '%"embedding":%'
+               ORDER BY rowid LIMIT ?""",
+            (last_rowid, batch_size),
+        )
+        if not rows:
+            break
+        last_rowid = rows[-1]["rowid"]
+        for r in rows:
+            try:
+                mapping = json.loads(r["speaker_mapping"])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if not isinstance(mapping, dict):
+                continue
+            changed = False
+            for label, entry in mapping.items():
+                if not isinstance(entry, dict) or "embedding" not in entry:
+                    continue
+                emb = entry.pop("embedding")
+                if isinstance(emb, list) and emb:
+                    entry["embeddingId"] = await save_embedding(r["id"], label, emb, db=db)
+                changed = True
+            if changed:
+                await db.execute(
+                    "UPDATE recordings SET speaker_mapping = ? WHERE id = ?",
+                    (json.dumps(mapping), r["id"]),
+                )
+                moved += 1
+        await db.commit()
+    return moved
@@ -0,0 +1,246 @@
+"""SQLite-backed queue for speaker identification jobs.
+
+Sync and the manual endpoints enqueue a row in `speaker_id_jobs`; a
+dispatcher task started with the app claims jobs and runs
+speaker_processor.process_recording, whose embedding work happens in the
+speaker_id_worker process pool.
+
+Ordering: a job is claimable only if it is its user's oldest pending job
+and that user has nothing running, so one user's recordings are identified
+in order while different users' recordings run in parallel (up to
+`speaker_id_workers` at once). Jobs left `running` by a crash are reset to
+`pending` on start. A failed job goes back to `pending` (keeping its place
+in its user's order) until it has been tried `_MAX_ATTEMPTS` times.
+
+Without a running dispatcher (CLI, tests), `identify_now` runs the job
+inline, first resetting `running` rows that no task in this process owns.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from app.config import get_settings
+from app.database import get_db
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 5.0
+_MAX_ATTEMPTS = 3
+_INLINE_WAIT_SECONDS = 0.1
+
+_dispatcher: asyncio.Task | None = None
+_wakeup: asyncio.Event | None = None
+# ids of jobs whose run_job is in progress in this process
+_active: set[int] = set()
+# job id -> futures awaiting its outcome (identify_now callers)
+_waiters: dict[int, list[asyncio.Future]] = {}
+
+
+async def enqueue(user_id: str, recording_id: str) -> int:
+    """Queue a recording for identification; reuses an existing pending job."""
+    db = await get_db()
+    rows = await db.execute_fetchall(
+        """SELECT id FROM speaker_id_jobs
+           WHERE recording_id = ? AND status = 'pending' ORDER BY id LIMIT 1""",
+        (recording_id,),
+    )
+    if rows:
+        return rows[0]["id"]
+    cursor = await db.execute(
+        "INSERT INTO speaker_id_jobs (user_id, recording_id) VALUES (?, ?)",
+        (user_id, recording_id),
+    )
+    await db.commit()
+    if _wakeup is not None:
+        _wakeup.set()
+    return cursor.lastrowid
+
+
+async def claim_next() -> dict | None:
+    """Mark the next runnable job as running and return it (None if none)."""
+    db = await get_db()
+    rows = await db.execute_fetchall(
+        """SELECT j.id, j.user_id, j.recording_id FROM speaker_id_jobs j
+           WHERE j.status = 'pending'
+             AND j.id = (SELECT MIN(id) FROM speaker_id_jobs
+                         WHERE user_id = j.user_id AND status = 'pending')
+             AND NOT EXISTS (SELECT 1 FROM speaker_id_jobs
+                             WHERE user_id = j.user_id AND status = 'running')
+           ORDER BY j.id
+           LIMIT 1"""
+    )
+    if not rows:
+        return None
+    job = dict(rows[0])
+    await db.execute(
+        """UPDATE speaker_id_jobs
+           SET status = 'running', attempts = attempts + 1, started_at = datetime('now')
+           WHERE id = ?""",
+        (job["id"],),
+    )
+    await db.commit()
+    return job
+
+
+async def _requeue_interrupted() -> int:
+    """Reset `running` jobs that no task in this process is running."""
+    db = await get_db()
+    placeholders = ",".join("?" * len(_active))
+    result = await db.execute(
+        f"""UPDATE speaker_id_jobs SET status = 'pending', started_at = NULL
+            WHERE status = 'running' AND id NOT IN ({placeholders})""",
+        tuple(_active),
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning("Re-queued %d interrupted speaker ID job(s)", result.rowcount)
+    return result.rowcount
+
+
+async def _finish(job_id: int, identified: bool | None, error: str | None) -> None:
+    db = await get_db()
+    if error:
+        # Retry in place while attempts remain; waiters keep waiting
+        result = await db.execute(
+            """UPDATE speaker_id_jobs SET status = 'pending', error = ?, started_at = NULL
+               WHERE id = ? AND attempts < ?""",
+            (error, job_id, _MAX_ATTEMPTS),
+        )
+        if result.rowcount:
+            await db.commit()
+            if _wakeup is not None:
+                _wakeup.set()
+            return
+    await db.execute(
+        """UPDATE speaker_id_jobs
+           SET status = ?, identified = ?, error = ?, finished_at = datetime('now')
+           WHERE id = ?""",
+        ("failed" if error else "done", identified, error, job_id),
+    )
+    await db.commit()
+    for fut in _waiters.pop(job_id, []):
+        if not fut.done():
+            if error:
+                fut.set_exception(RuntimeError(error))
+            else:
+                fut.set_result(bool(identified))
+
+
+async def run_job(job: dict) -> bool:
+    """Run one claimed job under its user's lock and record the outcome."""
+    from app.scheduler.jobs import schedule_rerate
+    from app.services import speaker_processor
+
+    user_id = job["user_id"]
+    _active.add(job["id"])
+    try:
+        async with speaker_processor.user_lock(user_id):
+            identified = await speaker_processor.process_recording(user_id, job["recording_id"])
+    except Exception as exc:
+        logger.warning("Speaker ID job %d failed for %s: %s", job["id"], job["recording_id"], exc)
+        await _finish(job["id"], None, str(exc) or type(exc).__name__)
+        return False
+    finally:
+        _active.discard(job["id"])
+
+    await _finish(job["id"], identified, None)
+    if identified:
+        logger.info("Speaker identification completed for %s", job["recording_id"])
+        # Re-rate other recordings against updated profiles (debounced)
+        await schedule_rerate(user_id)
+    return identified
+
+
+async def identify_now(user_id: str, recording_id: str) -> bool:
+    """Enqueue a recording and wait for its identification to finish.
+
+    Returns:
+        True if identification was performed, False if skipped (or, inline,
+        if the job failed on every attempt).
+
+    Raises:
+        RuntimeError: Inline mode found the job blocked with nothing in this
+            process able to run it.
+    """
+    job_id = await enqueue(user_id, recording_id)
+    if _dispatcher is None or _dispatcher.done():
+        await _requeue_interrupted()
+        db = await get_db()
+        # Inline mode: drain in order until our job has finished
+        while True:
+            rows = await db.execute_fetchall(
+                "SELECT status, identified FROM speaker_id_jobs WHERE id = ?", (job_id,)
+            )
+            if not rows or rows[0]["status"] in ("done", "failed"):
+                return bool(rows and rows[0]["identified"])
+            job = await claim_next()
+            if job is not None:
+                await run_job(job)
+            elif _active:
+                # Another inline caller is running this user's earlier job
+                await asyncio.sleep(_INLINE_WAIT_SECONDS)
+            else:
+                logger.error("Speaker ID job %d for %s cannot be claimed", job_id, recording_id)
+                raise RuntimeError(f"Speaker ID job {job_id} is blocked")
+
+    fut = asyncio.get_running_loop().create_future()
+    _waiters.setdefault(job_id, []).append(fut)
+    # The dispatcher may have finished the job before we registered
+    db = await get_db()
+    rows = await db.execute_fetchall(
+        "SELECT status, identified, error FROM speaker_id_jobs WHERE id = ?", (job_id,)
+    )
+    if rows and rows[0]["status"] in ("done", "failed") and not fut.done():
+        _waiters.pop(job_id, None)
+        if rows[0]["error"]:
+            raise RuntimeError(rows[0]["error"])
+        return bool(rows[0]["identified"])
+    return await fut
+
+
+async def _dispatch_loop() -> None:
+    running: set[asyncio.Task] = set()
+
+    def on_done(task: asyncio.Task) -> None:
+        running.discard(task)
+        _wakeup.set()
+
+    while True:
+        _wakeup.clear()
+        capacity = max(1, get_settings().speaker_id_workers)
+        try:
+            while len(running) < capacity:
+                job = await claim_next()
+                if job is None:
+                    break
+                task = asyncio.create_task(run_job(job))
+                running.add(task)
+                task.add_done_callback(on_done)
+        except Exception:
+            logger.exception("Speaker ID dispatcher failed to claim a job")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_dispatcher() -> None:
+    """Recover interrupted jobs and start draining the queue."""
+    global _dispatcher, _wakeup
+    await _requeue_interrupted()
+
+    _wakeup = asyncio.Event()
+    _dispatcher = asyncio.create_task(_dispatch_loop())
+
+
+async def stop_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.cancel()
+        try:
+            await _dispatcher
+        except asyncio.CancelledError:
+            pass
+        _dispatcher = None
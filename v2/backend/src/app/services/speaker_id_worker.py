@@ -0,0 +1,93 @@
+"""Process pool that runs ECAPA speaker embedding outside the API process.
+
+Each worker process loads the model once (in its initializer) and then
+serves `embed_windows` calls, so torch inference never competes
+with the FastAPI event loop for the GIL and the API process never imports
+torch. Workers are spawned (not forked) so they start from a clean
+interpreter rather than a copy of the running event loop.
+
+With `speaker_id_workers = 0` the call falls back to a thread in the API
+process (the previous behaviour), which is handy for local development.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+
+# Set inside worker processes by _init_worker
+_worker_engine = None
+
+
+def _init_worker(model_path: str, batch_size: int, num_threads: int) -> None:
+    """Worker initializer: load ECAPA once for this process's lifetime."""
+    global _worker_engine
+    from app.services.embedding_engine import get_engine
+
+    _worker_engine = get_engine(model_path, batch_size=batch_size, num_threads=num_threads)
+    _worker_engine._ensure_model()
+
+
+def _embed_in_worker(audio_path: str, windows: list, min_dur_s: float) -> list:
+    return _worker_engine.embeddings_for_file_windows(audio_path, windows, min_dur_s=min_dur_s)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.speaker_id_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                settings.speaker_id_model_path,
+                settings.speaker_id_batch_size,
+                settings.speaker_id_torch_threads,
+            ),
+        )
+        logger.info("Started speaker ID pool with %d worker(s)", settings.speaker_id_workers)
+    return _pool
+
+
+async def embed_windows(
+    audio_path: str,
+    windows: list[tuple[float, float]],
+    min_dur_s: float = 0.0,
+) -> list[np.ndarray | None]:
+    """Embed audio windows in a worker process (or a thread if disabled)."""
+    settings = get_settings()
+    if settings.speaker_id_workers <= 0:
+        from app.services.embedding_engine import get_engine
+
+        engine = get_engine(
+            settings.speaker_id_model_path,
+            batch_size=settings.speaker_id_batch_size,
+            num_threads=settings.speaker_id_torch_threads,
+        )
+        return await asyncio.to_thread(
+            engine.embeddings_for_file_windows, audio_path, windows, min_dur_s,
+        )
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_pool(), _embed_in_worker, audio_path, windows, min_dur_s,
+    )
+
+
+def shutdown_pool() -> None:
+    """Stop worker processes (called on app shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
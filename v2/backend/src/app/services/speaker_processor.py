@@ -2,7 +2,8 @@
 
 Core pipeline: processes a recording's speakers, matches against profiles,
 and writes results to speaker_mapping. All PyTorch work runs synchronously
-and should be called via asyncio.to_thread().
+in speaker_id_worker's process pool and its per-window output is cached in
+segment_store; recordings are queued through speaker_id_queue.
 """
 
 from __future__ import annotations
@@ -18,19 +19,32 @@ import numpy as np
 
 from app.config import get_settings
 from app.database import get_db
-from app.services import profile_store, storage_service
+from app.services import (
+    content_store,
+    profile_store,
+    segment_store,
+    speaker_embedding_store,
+    speaker_id_worker,
+    storage_service,
+)
 from app.services.embedding_engine import (
-    EmbeddingEngine,
-    get_engine,
     l2_normalize,
     merge_adjacent_segments,
 )
 
 logger = logging.getLogger(__name__)
 
-# Module-level lock prevents concurrent speaker ID operations
-# (manual trigger + sync overlap, or concurrent model access)
-_speaker_id_lock = asyncio.Lock()
+# Per-user locks serialize speaker_mapping read-modify-write cycles
+# (identification, re-rating) for one user; different users run in parallel
+_user_locks: dict[str, asyncio.Lock] = {}
+
+
+def user_lock(user_id: str) -> asyncio.Lock:
+    """Get the speaker ID lock for a user."""
+    lock = _user_locks.get(user_id)
+    if lock is None:
+        lock = _user_locks[user_id] = asyncio.Lock()
+    return lock
 
 # Thresholds — loaded from config at runtime
 def _thresholds():
@@ -85,28 +99,15 @@ def _parse_diarization(transcript_json_str: str) -> list[tuple[float, float, str
     return segments
 
 
-def _process_recording_sync(
-    engine: EmbeddingEngine,
-    audio_path: str,
-    diarization: list[tuple[float, float, str]],
-    existing_mapping: dict,
-    profiles: list[dict],
-) -> dict[str, dict]:
-    """Synchronous speaker identification — runs in a thread.
+def _classify_existing(existing_mapping: dict) -> tuple[set[str], set[str]]:
+    """Split existing speakers into (skip, needs_embedding_only).
 
-    Args:
-        engine: Loaded EmbeddingEngine.
-        audio_path: Path to local audio file.
-        diarization: Parsed diarization segments.
-        existing_mapping: Current speaker_mapping dict.
-        profiles: User's speaker profiles (from profile_store.get_profiles).
-
-    Returns:
-        Dict mapping speaker_label to identification result dict.
+    Dismissed speakers and verified speakers with a stored embedding are
+    skipped; verified speakers without one only need their embedding
+    extracted (for training).
     """
-    # Determine which speakers to skip
     skip_speakers = set()
-    needs_embedding_only = set()  # Verified but missing embedding
+    needs_embedding_only = set()
 
     for label, data in existing_mapping.items():
         if isinstance(data, dict):
@@ -121,19 +122,27 @@ def _process_recording_sync(
             skip_speakers.add(label)
         elif ex.get("manuallyVerified", False):
             # Training is automatic for verified speakers
-            if not ex.get("embedding"):
+            if not ex.get("embeddingId"):
                 needs_embedding_only.add(label)
                 logger.info("Need embedding for verified %s (no embedding stored)", label)
             else:
                 skip_speakers.add(label)
 
-    # Check what's left
-    all_speakers = set(s for _, _, s in diarization)
-    active_speakers = all_speakers - skip_speakers
-    if not active_speakers:
-        logger.info("All speakers verified/dismissed, nothing to do")
-        return {}
+    return skip_speakers, needs_embedding_only
 
+
+def _select_windows(
+    diarization: list[tuple[float, float, str]],
+    skip_speakers: set[str],
+) -> tuple[list[tuple[float, float]], list[str]]:
+    """Pick the audio windows to embed for each active speaker.
+
+    Takes the top N longest segments per speaker, edge-trims long ones and
+    center-windows them to CENTER_WINDOW.
+
+    Returns:
+        (windows, labels) — parallel lists of (start_s, end_s) and speaker label.
+    """
     if skip_speakers:
         logger.info("Skipping (verified/dismissed): %s", skip_speakers)
 
@@ -160,11 +169,8 @@ def _process_recording_sync(
         len(speaker_segments),
     )
 
-    # Load audio and extract embeddings
-    wav, sr = engine.load_audio_mono_16k(audio_path)
-    local_embs: dict[str, list[np.ndarray]] = {}
-
-    for (start_s, end_s), spk in zip(selected_segments, selected_labels):
+    windows: list[tuple[float, float]] = []
+    for start_s, end_s in selected_segments:
         dur = end_s - start_s
         # Edge trim on long segments
         if dur >= TRIM_THRESHOLD:
@@ -176,13 +182,34 @@ def _process_recording_sync(
             mid = (start_s + end_s) / 2.0
             start_s = mid - CENTER_WINDOW / 2.0
             end_s = mid + CENTER_WINDOW / 2.0
+        windows.append((start_s, end_s))
 
-        seg = engine.slice_audio(wav, sr, start_s, end_s)
-        if seg.shape[1] < int(MIN_DURATION * sr):
-            continue
+    return windows, selected_labels
+
+
+def _match_speakers(
+    labels: list[str],
+    embeddings: list[np.ndarray | None],
+    needs_embedding_only: set[str],
+    profiles: profile_store.ProfileMatrix,
+) -> dict[str, dict]:
+    """Build per-speaker centroids from window embeddings and match them.
 
-        emb = engine.embedding_from_waveform(seg)
-        local_embs.setdefault(spk, []).append(l2_normalize(emb))
+    Pure vector math — no audio or model involved.
+
+    Args:
+        labels: Speaker label for each window.
+        embeddings: Embedding for each window (None if it produced none).
+        needs_embedding_only: Verified speakers that only need an embedding.
+        profiles: User's profile matrix (from profile_store.get_profile_matrix).
+
+    Returns:
+        Dict mapping speaker_label to identification result dict.
+    """
+    local_embs: dict[str, list[np.ndarray]] = {}
+    for emb, spk in zip(embeddings, labels):
+        if emb is not None:
+            local_embs.setdefault(spk, []).append(l2_normalize(emb))
 
     # Build per-speaker centroids
     centroids: dict[str, np.ndarray] = {}
@@ -192,13 +219,17 @@ def _process_recording_sync(
 
     logger.info("Built centroids for %d speakers", len(centroids))
 
-    # Build in-memory profile lookup for matching
-    profile_centroids = []
-    for p in profiles:
-        if p["centroid"] is not None:
-            profile_centroids.append(p)
+    # Match all speakers against all profiles in one product
+    match_labels = [spk for spk in centroids if spk not in needs_embedding_only]
+    candidates_by_label: dict[str, list[dict]] = {}
+    if match_labels:
+        matched = profiles.top_candidates(
+            np.stack([centroids[spk] for spk in match_labels]),
+            top_n=5,
+            threshold=MIN_CANDIDATE_THRESHOLD,
+        )
+        candidates_by_label = dict(zip(match_labels, matched))
 
-    # Match each speaker against profiles
     results: dict[str, dict] = {}
     auto_matches: dict[str, str] = {}  # participant_id -> speaker_label
 
@@ -210,26 +241,12 @@ def _process_recording_sync(
                 "participantId": None,
                 "similarity": None,
                 "topCandidates": [],
-                "embedding": centroid.tolist(),
+                "embedding": centroid,
             }
             logger.info("  %s: extracted embedding for training (verified)", speaker_label)
             continue
 
-        # Match against all profiles
-        embedding_norm = l2_normalize(centroid)
-        candidates = []
-        for p in profile_centroids:
-            a_norm = embedding_norm
-            b_norm = l2_normalize(p["centroid"])
-            sim = float(np.dot(a_norm, b_norm))
-            candidates.append({
-                "participantId": p["participant_id"],
-                "displayName": p["display_name"],
-                "similarity": round(sim, 4),
-            })
-
-        candidates.sort(key=lambda x: x["similarity"], reverse=True)
-        top_candidates = [c for c in candidates[:5] if c["similarity"] >= MIN_CANDIDATE_THRESHOLD]
+        top_candidates = candidates_by_label[speaker_label]
 
         if not top_candidates:
             result = {
@@ -237,7 +254,7 @@ def _process_recording_sync(
                 "participantId": None,
                 "similarity": None,
                 "topCandidates": [],
-                "embedding": centroid.tolist(),
+                "embedding": centroid,
             }
         else:
             best = top_candidates[0]
@@ -259,7 +276,7 @@ def _process_recording_sync(
                 "participantId": best_id,
                 "similarity": best_sim,
                 "topCandidates": top_candidates,
-                "embedding": centroid.tolist(),
+                "embedding": centroid,
             }
 
         # Duplicate auto-match detection
@@ -305,8 +322,10 @@ async def process_recording(
 ) -> bool:
     """Main entry point: identify speakers for a recording.
 
-    Acquires the speaker ID lock, downloads audio, runs embedding extraction
-    in a thread, matches against profiles, and updates the database.
+    Callers hold user_lock(user_id). Window embeddings cached in
+    segment_store are reused; audio is downloaded and embedded in the worker
+    pool only for windows not seen before. Matching and the database update
+    run here.
 
     Args:
         user_id: Owner of the recording.
@@ -316,12 +335,11 @@ async def process_recording(
     Returns:
         True if identification was performed, False if skipped.
     """
-    settings = get_settings()
     db = await get_db()
 
     # Load recording
     rows = await db.execute_fetchall(
-        """SELECT id, user_id, file_path, source, transcript_json, speaker_mapping
+        """SELECT id, user_id, file_path, source, speaker_mapping
            FROM recordings WHERE id = ? AND user_id = ?""",
         (recording_id, user_id),
     )
@@ -330,6 +348,7 @@ async def process_recording(
         return False
 
     rec = dict(rows[0])
+    rec["transcript_json"] = await content_store.get_transcript_json(recording_id, db=db)
 
     # Skip paste recordings (no audio)
     if rec["source"] == "paste":
@@ -370,36 +389,59 @@ async def process_recording(
         except (json.JSONDecodeError, TypeError):
             pass
 
-    # Load profiles
-    profiles = await profile_store.get_profiles(user_id)
+    # Load profiles (version first, so a concurrent change is re-rated later)
+    rated_version = await profile_store.get_profile_version(user_id)
+    profiles = await profile_store.get_profile_matrix(user_id)
 
-    # Download audio to temp file
-    suffix = os.path.splitext(rec["file_path"])[1] or ".mp3"
-    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-    tmp.close()
-
-    try:
-        await storage_service.download_file(rec["file_path"], tmp.name)
-    except Exception as exc:
-        logger.warning("Failed to download audio for %s: %s", recording_id, exc)
-        if os.path.exists(tmp.name):
-            os.remove(tmp.name)
+    skip_speakers, needs_embedding_only = _classify_existing(existing_mapping)
+    windows, window_labels = _select_windows(diarization, skip_speakers)
+    if not windows:
+        logger.info("No speakers to identify for recording %s", recording_id)
+        if run_logger:
+            await run_logger.info("No speakers to identify for %s" % recording_id[:8])
         return False
 
-    try:
-        # Run CPU-bound work in thread
-        engine = get_engine(settings.speaker_id_model_path)
-        results = await asyncio.to_thread(
-            _process_recording_sync,
-            engine,
-            tmp.name,
-            diarization,
-            existing_mapping,
-            profiles,
-        )
-    finally:
-        if os.path.exists(tmp.name):
-            os.remove(tmp.name)
+    # Reuse window embeddings from earlier runs; only embed the rest
+    settings = get_settings()
+    version = segment_store.model_version(settings.speaker_id_model_path)
+    embeddings_by_key = await segment_store.get_embeddings(recording_id, version, db=db)
+    missing = [w for w in windows if segment_store.window_key(w) not in embeddings_by_key]
+    logger.info(
+        "Embedding cache for %s: %d/%d windows cached",
+        recording_id, len(windows) - len(missing), len(windows),
+    )
+
+    if missing:
+        # Download audio to temp file
+        suffix = os.path.splitext(rec["file_path"])[1] or ".mp3"
+        tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        tmp.close()
+
+        try:
+            await storage_service.download_file(rec["file_path"], tmp.name)
+        except Exception as exc:
+            logger.warning("Failed to download audio for %s: %s", recording_id, exc)
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            return False
+
+        try:
+            # CPU-bound embedding runs in the speaker ID worker pool
+            computed = await speaker_id_worker.embed_windows(tmp.name, missing, MIN_DURATION)
+        finally:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+
+        await segment_store.save_embeddings(recording_id, version, missing, computed, db=db)
+        for window, emb in zip(missing, computed):
+            embeddings_by_key[segment_store.window_key(window)] = emb
+
+    results = _match_speakers(
+        window_labels,
+        [embeddings_by_key[segment_store.window_key(w)] for w in windows],
+        needs_embedding_only,
+        profiles,
+    )
 
     if not results:
         if run_logger:
@@ -427,14 +469,15 @@ async def process_recording(
         if status == "embedding_only":
             # Just add embedding to existing entry
             if speaker_label in existing_mapping:
-                existing_mapping[speaker_label]["embedding"] = result["embedding"]
+                existing_mapping[speaker_label]["embeddingId"] = await speaker_embedding_store.save_embedding(
+                    recording_id, speaker_label, result["embedding"], db=db,
+                )
 
                 # Auto-train: update profile for verified speakers
                 pid = existing_mapping[speaker_label].get("participantId")
                 if pid:
-                    embedding = np.array(result["embedding"], dtype=np.float32)
                     await profile_store.update_profile_with_embedding(
-                        user_id, pid, embedding, recording_id
+                        user_id, pid, result["embedding"], recording_id
                     )
             continue
 
@@ -450,7 +493,10 @@ async def process_recording(
             entry["similarity"] = result["similarity"]
             entry["topCandidates"] = result["topCandidates"]
             entry["identifiedAt"] = now
-            entry["embedding"] = result["embedding"]
+            entry["ratedAtVersion"] = rated_version
+            entry["embeddingId"] = await speaker_embedding_store.save_embedding(
+                recording_id, speaker_label, result["embedding"], db=db,
+            )
             existing_mapping[speaker_label] = entry
 
         elif status == "suggest":
@@ -463,7 +509,10 @@ async def process_recording(
             entry["suggestedDisplayName"] = best_candidate.get("displayName")
             entry["topCandidates"] = result["topCandidates"]
             entry["identifiedAt"] = now
-            entry["embedding"] = result["embedding"]
+            entry["ratedAtVersion"] = rated_version
+            entry["embeddingId"] = await speaker_embedding_store.save_embedding(
+                recording_id, speaker_label, result["embedding"], db=db,
+            )
             existing_mapping[speaker_label] = entry
 
         else:  # unknown
@@ -472,16 +521,19 @@ async def process_recording(
             entry["similarity"] = result["similarity"]
             entry["topCandidates"] = result["topCandidates"]
             entry["identifiedAt"] = now
-            entry["embedding"] = result["embedding"]
+            entry["ratedAtVersion"] = rated_version
+            entry["embeddingId"] = await speaker_embedding_store.save_embedding(
+                recording_id, speaker_label, result["embedding"], db=db,
+            )
             existing_mapping[speaker_label] = entry
 
     # Save updated speaker_mapping
     await db.execute(
         """UPDATE recordings
            SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'),
-               updated_at = datetime('now')
+               speaker_rated_version = ?, updated_at = datetime('now')
            WHERE id = ?""",
-        (json.dumps(existing_mapping), recording_id),
+        (json.dumps(existing_mapping), rated_version, recording_id),
     )
     await db.commit()
 
@@ -496,130 +548,172 @@ async def process_recording(
 async def rerate_speakers(user_id: str) -> int:
     """Re-rate speakers against current profiles.
 
-    Queries recordings with suggest/unknown speakers, re-matches stored
-    embeddings against current profiles. Only upgrades (unknown->suggest,
-    suggest->auto), never downgrades.
+    Only recordings rated before the user's current profile version that
+    still have suggest/unknown speakers are scanned. Within them, an entry
+    is re-matched only if a profile it could now match has changed since
+    it was rated: a logged change for a participant that still has a
+    profile, or a library-wide change (no participant_id). Removing a
+    profile cannot upgrade anything, so those changes are ignored. Only
+    upgrades (unknown->suggest, suggest->auto), never downgrades. Every
+    scanned recording is stamped with the current version afterwards.
 
     Returns:
         Number of recordings updated.
     """
-    settings = get_settings()
     db = await get_db()
 
-    # Find recordings with speaker IDs that might benefit from re-rating
+    version = await profile_store.get_profile_version(user_id)
+    matrix = await profile_store.get_profile_matrix(user_id)
+    if not len(matrix):
+        return 0
+
+    # Recordings not yet rated against the current profile version that
+    # have anything left to upgrade
     rows = await db.execute_fetchall(
-        """SELECT id, speaker_mapping FROM recordings
-           WHERE user_id = ? AND speaker_mapping IS NOT NULL""",
-        (user_id,),
+        """SELECT r.id, r.speaker_mapping, COALESCE(r.speaker_rated_version, 0) AS rated_version
+           FROM recordings r
+           WHERE r.user_id = ? AND r.speaker_mapping IS NOT NULL
+             AND COALESCE(r.speaker_rated_version, 0) < ?
+             AND EXISTS (SELECT 1 FROM recording_speakers rs
+                         WHERE rs.recording_id = r.id AND rs.status IN ('suggest', 'unknown'))""",
+        (user_id, version),
     )
-
-    profiles = await profile_store.get_profiles(user_id)
-    if not profiles:
+    if not rows:
         return 0
 
-    # Build profile centroid lookup
-    profile_centroids = [p for p in profiles if p["centroid"] is not None]
-    if not profile_centroids:
-        return 0
+    # Latest change that could upgrade an entry; an entry rated at or after
+    # it has already been matched against every relevant profile
+    profile_ids = set(matrix.participant_ids)
+    change_rows = await db.execute_fetchall(
+        """SELECT id, participant_id FROM speaker_profile_changes
+           WHERE user_id = ? AND id > ? ORDER BY id""",
+        (user_id, min(r["rated_version"] for r in rows)),
+    )
+    relevant_ids = [
+        c["id"] for c in change_rows
+        if c["participant_id"] is None or c["participant_id"] in profile_ids
+    ]
+    last_relevant = relevant_ids[-1] if relevant_ids else 0
 
-    updated_count = 0
+    # Collect every stale re-ratable entry, then score them all in one product
+    scanned_ids: list[str] = []
+    mappings: dict[str, dict] = {}
+    pending: list[tuple[str, str, dict]] = []  # (recording_id, label, entry)
 
     for row in rows:
         r = dict(row)
-        recording_id = r["id"]
+        scanned_ids.append(r["id"])
         try:
             mapping = json.loads(r["speaker_mapping"])
         except (json.JSONDecodeError, TypeError):
             continue
+        if not isinstance(mapping, dict):
+            continue
 
-        changed = False
         for label, entry in mapping.items():
             if not isinstance(entry, dict):
                 continue
 
             # Only re-rate suggest and unknown entries
-            id_status = entry.get("identificationStatus")
-            if id_status not in ("suggest", "unknown"):
+            if entry.get("identificationStatus") not in ("suggest", "unknown"):
+                continue
+
+            # No profile it could match has changed since it was rated
+            if max(entry.get("ratedAtVersion") or 0, r["rated_version"]) >= last_relevant:
                 continue
 
             # Need a stored embedding
-            emb_data = entry.get("embedding")
-            if not emb_data or not isinstance(emb_data, list):
+            if not entry.get("embeddingId"):
                 continue
 
-            embedding = l2_normalize(np.array(emb_data, dtype=np.float32))
+            mappings[r["id"]] = mapping
+            pending.append((r["id"], label, entry))
 
-            # Match against current profiles
-            candidates = []
-            for p in profile_centroids:
-                b_norm = l2_normalize(p["centroid"])
-                sim = float(np.dot(embedding, b_norm))
-                candidates.append({
-                    "participantId": p["participant_id"],
-                    "displayName": p["display_name"],
-                    "similarity": round(sim, 4),
-                })
+    embeddings = await speaker_embedding_store.load_embeddings(
+        [entry["embeddingId"] for _, _, entry in pending], db=db,
+    )
+    dim = matrix.centroids.shape[1]
+    pending = [
+        p for p in pending
+        if p[2]["embeddingId"] in embeddings and embeddings[p[2]["embeddingId"]].shape == (dim,)
+    ]
+    query_embs = [embeddings[entry["embeddingId"]] for _, _, entry in pending]
+
+    all_candidates = (
+        matrix.top_candidates(
+            np.stack(query_embs), top_n=5, threshold=MIN_CANDIDATE_THRESHOLD,
+        )
+        if pending else []
+    )
 
-            candidates.sort(key=lambda x: x["similarity"], reverse=True)
-            top_candidates = [c for c in candidates[:5] if c["similarity"] >= MIN_CANDIDATE_THRESHOLD]
+    auto_t, suggest_t = _thresholds()
+    status_rank = {"unknown": 0, "suggest": 1, "auto": 2}
+    changed_ids: list[str] = []
 
-            if not top_candidates:
-                continue
+    for (recording_id, label, entry), top_candidates in zip(pending, all_candidates):
+        # Persisted only if this recording changes; otherwise the
+        # recording-level speaker_rated_version covers it
+        entry["ratedAtVersion"] = version
+        if not top_candidates:
+            continue
 
-            best = top_candidates[0]
-            best_sim = best["similarity"]
+        id_status = entry.get("identificationStatus")
+        best = top_candidates[0]
+        best_sim = best["similarity"]
 
-            # Determine new status
-            auto_t, suggest_t = _thresholds()
-            if best_sim >= auto_t:
-                new_status = "auto"
-            elif best_sim >= suggest_t:
-                new_status = "suggest"
-            else:
-                continue  # Still unknown, no upgrade
+        # Determine new status
+        if best_sim >= auto_t:
+            new_status = "auto"
+        elif best_sim >= suggest_t:
+            new_status = "suggest"
+        else:
+            continue  # Still unknown, no upgrade
 
-            # Only upgrade, never downgrade
-            status_rank = {"unknown": 0, "suggest": 1, "auto": 2}
-            old_rank = status_rank.get(id_status, 0)
-            new_rank = status_rank.get(new_status, 0)
+        # Only upgrade, never downgrade
+        if status_rank[new_status] <= status_rank.get(id_status, 0):
+            continue
 
-            if new_rank <= old_rank:
-                continue
+        # Apply upgrade
+        now = datetime.now(timezone.utc).isoformat()
+        if new_status == "auto":
+            entry["participantId"] = best["participantId"]
+            entry["displayName"] = best.get("displayName")
+            entry["confidence"] = best_sim
+            entry["identificationStatus"] = "auto"
+        elif new_status == "suggest":
+            entry["suggestedParticipantId"] = best["participantId"]
+            entry["suggestedDisplayName"] = best.get("displayName")
+            entry["identificationStatus"] = "suggest"
 
-            # Apply upgrade
-            now = datetime.now(timezone.utc).isoformat()
-            if new_status == "auto":
-                entry["participantId"] = best["participantId"]
-                entry["displayName"] = best.get("displayName")
-                entry["confidence"] = best_sim
-                entry["identificationStatus"] = "auto"
-            elif new_status == "suggest":
-                entry["suggestedParticipantId"] = best["participantId"]
-                entry["suggestedDisplayName"] = best.get("displayName")
-                entry["identificationStatus"] = "suggest"
-
-            entry["similarity"] = best_sim
-            entry["topCandidates"] = top_candidates
-            entry["identifiedAt"] = now
+        entry["similarity"] = best_sim
+        entry["topCandidates"] = top_candidates
+        entry["identifiedAt"] = now
 
-            changed = True
-            logger.info(
-                "Re-rated %s in %s: %s -> %s (sim=%.3f)",
-                label, recording_id, id_status, new_status, best_sim,
-            )
+        if not changed_ids or changed_ids[-1] != recording_id:
+            changed_ids.append(recording_id)
+        logger.info(
+            "Re-rated %s in %s: %s -> %s (sim=%.3f)",
+            label, recording_id, id_status, new_status, best_sim,
+        )
 
-        if changed:
-            await db.execute(
-                """UPDATE recordings
-                   SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'),
-                       updated_at = datetime('now')
-                   WHERE id = ?""",
-                (json.dumps(mapping), recording_id),
-            )
-            updated_count += 1
+    for recording_id in changed_ids:
+        await db.execute(
+            """UPDATE recordings
+               SET speaker_mapping = ?, speaker_mapping_updated_at = datetime('now'),
+                   speaker_rated_version = ?, updated_at = datetime('now')
+               WHERE id = ?""",
+            (json.dumps(mappings[recording_id]), version, recording_id),
+        )
+
+    # Stamp the rest so the next pass skips them until profiles change again
+    changed = set(changed_ids)
+    await db.executemany(
+        "UPDATE recordings SET speaker_rated_version = ? WHERE id = ?",
+        [(version, rid) for rid in scanned_ids if rid not in changed],
+    )
+    await db.commit()
 
-    if updated_count:
-        await db.commit()
-        logger.info("Re-rated speakers in %d recordings for user %s", updated_count, user_id)
+    if changed_ids:
+        logger.info("Re-rated speakers in %d recordings for user %s", len(changed_ids), user_id)
 
-    return updated_count
+    return len(changed_ids)
@@ -1,6 +1,8 @@
 """Handwritten Azure Speech Services v3.2 batch transcription client.
 
 Replaces the 120-file auto-generated Swagger client with ~150 lines of httpx.
+All SpeechClient instances share one pooled httpx.AsyncClient, so polling
+many jobs reuses keep-alive connections instead of a TLS handshake per call.
 """
 
 from __future__ import annotations
@@ -15,6 +17,26 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 
 _TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+_LIST_PAGE_SIZE = 100
+
+_http: httpx.AsyncClient | None = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Get the process-wide HTTP client for Speech Services calls."""
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(timeout=_TIMEOUT, limits=_LIMITS)
+    return _http
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
 
 
 class SpeechClient:
@@ -72,13 +94,12 @@ class SpeechClient:
             },
         }
 
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.post(
-                self._url("transcriptions"),
-                json=payload,
-                headers=self.headers,
-            )
-            resp.raise_for_status()
+        resp = await _get_http().post(
+            self._url("transcriptions"),
+            json=payload,
+            headers=self.headers,
+        )
+        resp.raise_for_status()
 
         data = resp.json()
         # The self link looks like .../transcriptions/{id}
@@ -100,15 +121,38 @@ class SpeechClient:
             Full transcription object with status, createdDateTime, etc.
             Key field: status ("NotStarted", "Running", "Succeeded", "Failed").
         """
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.get(
-                self._url(f"transcriptions/{transcription_id}"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
+        resp = await _get_http().get(
+            self._url(f"transcriptions/{transcription_id}"),
+            headers=self.headers,
+        )
+        resp.raise_for_status()
 
         return resp.json()
 
+    async def list_transcriptions(self) -> dict[str, dict]:
+        """List every transcription job on the resource, following @nextLink.
+
+        One paged listing replaces a status GET per job when many jobs are
+        pending.
+
+        Returns:
+            Dict mapping transcription ID to its transcription object.
+        """
+        result: dict[str, dict] = {}
+        url: str | None = self._url("transcriptions")
+        params: dict | None = {"top": _LIST_PAGE_SIZE}
+        while url:
+            resp = await _get_http().get(url, params=params, headers=self.headers)
+            resp.raise_for_status()
+            data = resp.json()
+            for item in data.get("values", []):
+                transcription_id = item.get("self", "").rstrip("/").rsplit("/", 1)[-1]
+                if transcription_id:
+                    result[transcription_id] = item
+            # nextLink already carries skip/top
+            url, params = data.get("@nextLink"), None
+        return result
+
     async def get_transcript_content(self, transcription_id: str) -> dict:
         """Download the completed transcript JSON.
 
@@ -126,12 +170,11 @@ class SpeechClient:
             RuntimeError: If no transcript file is found.
         """
         # Step 1: list files for this transcription
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.get(
-                self._url(f"transcriptions/{transcription_id}/files"),
-                headers=self.headers,
-            )
-            resp.raise_for_status()
+        resp = await _get_http().get(
+            self._url(f"transcriptions/{transcription_id}/files"),
+            headers=self.headers,
+        )
+        resp.raise_for_status()
 
         files_data = resp.json()
         values = files_data.get("values", [])
@@ -150,9 +193,8 @@ class SpeechClient:
             )
 
         # Step 3: download the transcript content (no auth header needed, SAS in URL)
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.get(content_url)
-            resp.raise_for_status()
+        resp = await _get_http().get(content_url)
+        resp.raise_for_status()
 
         logger.info("Downloaded transcript content for %s", transcription_id)
         return resp.json()
@@ -163,13 +205,12 @@ class SpeechClient:
         Args:
             transcription_id: The transcription job ID.
         """
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-            resp = await client.delete(
-                self._url(f"transcriptions/{transcription_id}"),
-                headers=self.headers,
-            )
-            # 204 No Content is expected; 404 means already deleted
-            if resp.status_code not in (204, 404):
-                resp.raise_for_status()
+        resp = await _get_http().delete(
+            self._url(f"transcriptions/{transcription_id}"),
+            headers=self.headers,
+        )
+        # 204 No Content is expected; 404 means already deleted
+        if resp.status_code not in (204, 404):
+            resp.raise_for_status()
 
         logger.info("Deleted transcription %s", transcription_id)
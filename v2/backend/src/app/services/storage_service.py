@@ -174,9 +174,9 @@ async def _azure_download(blob_name: str, local_path: Path, settings) -> Path:
         container = client.get_container_client(settings.azure_storage_container)
         blob = container.get_blob_client(blob_name)
         with open(local_path, "wb") as f:
+            # readinto streams chunk by chunk instead of buffering the blob
             stream = await blob.download_blob()
-            data = await stream.readall()
-            f.write(data)
+            await stream.readinto(f)
 
     logger.info("Azure Blob: downloaded %s -> %s", blob_name, local_path)
     return local_path
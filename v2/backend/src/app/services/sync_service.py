@@ -6,10 +6,16 @@ Logs each sync run to the sync_runs table. Idempotent by design.
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import logging
+import shutil
 import tempfile
+import time
+import traceback
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -28,8 +34,16 @@ from app.models import (
     SyncRunSummary,
     SyncTrigger,
 )
-from app.services import ai_service, plaud_client, recording_service, storage_service
-from app.services.run_logger import RunLogger
+from app.services import (
+    ai_service,
+    content_store,
+    job_queue,
+    plaud_client,
+    recording_service,
+    storage_service,
+)
+from app.services import job_tasks  # noqa: F401  (registers job handlers)
+from app.services.run_logger import RunLogger, flush as flush_run_logs
 from app.services.speech_client import SpeechClient
 
 logger = logging.getLogger(__name__)
@@ -62,6 +76,7 @@ async def _finish_sync_run(
     users_processed: list[str] | None = None,
 ) -> None:
     """Update a sync_run with final status and stats."""
+    await flush_run_logs()
     db = await get_db()
     now = datetime.now(timezone.utc).isoformat()
 
@@ -86,10 +101,11 @@ async def _finish_sync_run(
 async def run_sync(trigger: str = "scheduled", user_id: str | None = None) -> SyncRun:
     """Run a full Plaud sync cycle for all enabled users (or a specific user).
 
-    Steps for each user:
-    1. Fetch recording list from Plaud API
+    Steps:
+    1. Fetch each user's recording list from Plaud API
     2. Filter out already-imported and deleted recordings
-    3. Download, upload to blob storage, and submit for transcription
+    3. Download, transcode, upload to blob storage, and submit for
+       transcription in a staged pipeline shared by all users
 
     Args:
         trigger: "scheduled" or "manual".
@@ -129,6 +145,7 @@ async def run_sync(trigger: str = "scheduled", user_id: str | None = None) -> Sy
 
         await run_logger.info("Found %d enabled user(s)" % len(user_rows))
 
+        per_user: list[list[_SyncJob]] = []
         for user_row in user_rows:
             user = dict(user_row)
             user_id = user["id"]
@@ -137,7 +154,10 @@ async def run_sync(trigger: str = "scheduled", user_id: str | None = None) -> Sy
             users_processed.append(user_id)
 
             try:
-                await _sync_user(user_id, token, stats, run_logs, settings, run_logger)
+                new_recordings = await _list_new_recordings(
+                    user_id, token, stats, run_logs, settings, run_logger
+                )
+                per_user.append([_SyncJob(user_id, token, af) for af in new_recordings])
             except Exception as exc:
                 stats["errors"] += 1
                 msg = f"Error syncing user {user_id}: {exc}"
@@ -145,6 +165,17 @@ async def run_sync(trigger: str = "scheduled", user_id: str | None = None) -> Sy
                 run_logs.append(msg)
                 await run_logger.error(msg)
 
+        # Round-robin across users so one large backlog doesn't delay everyone else
+        jobs = [
+            job for batch in itertools.zip_longest(*per_user) for job in batch if job is not None
+        ]
+        if jobs:
+            stats["stages"] = await _run_pipeline(jobs, stats, run_logs, settings, run_logger)
+
+        for batch in per_user:
+            if batch:
+                await _mark_synced(batch[0].user_id)
+
         status = SyncRunStatus.completed
         error_message = None
         await run_logger.info(
@@ -171,15 +202,15 @@ async def run_sync(trigger: str = "scheduled", user_id: str | None = None) -> Sy
     return SyncRun(**dict(rows[0]))
 
 
-async def _sync_user(
+async def _list_new_recordings(
     user_id: str,
     token: str,
     stats: dict,
     run_logs: list[str],
     settings,
     run_logger: RunLogger | None = None,
-) -> None:
-    """Sync recordings for a single user."""
+) -> list[plaud_client.AudioFile]:
+    """Fetch a user's Plaud recordings and return the ones to import."""
     db = await get_db()
 
     # Fetch recordings from Plaud
@@ -229,33 +260,14 @@ async def _sync_user(
         await run_logger.info(summary)
     stats["skipped"] += already_imported + previously_deleted
 
-    for audio_file in new_recordings:
-        try:
-            was_processed = await _process_new_recording(user_id, token, audio_file, run_logger)
-            if was_processed:
-                stats["new_recordings"] += 1
-                run_logs.append(f"Processed: {audio_file.filename}")
-            else:
-                stats["skipped"] += 1
-                if run_logger:
-                    await run_logger.info(f"Skipped (duplicate): {audio_file.filename}")
-        except Exception as exc:
-            if "UNIQUE constraint failed: recordings.plaud_id" in str(exc):
-                stats["skipped"] += 1
-                if run_logger:
-                    await run_logger.info(f"Skipped (duplicate): {audio_file.filename}")
-            else:
-                stats["errors"] += 1
-                msg = f"Error processing {audio_file.id}: {type(exc).__name__}: {exc}"
-                logger.exception(msg)
-                run_logs.append(msg)
-                if run_logger:
-                    import traceback
-                    tb = traceback.format_exc()
-                    await run_logger.error(f"Error: {audio_file.filename}: {type(exc).__name__}: {exc}")
-                    await run_logger.error(f"Traceback: {tb[-500:]}")
+    if not new_recordings:
+        await _mark_synced(user_id)
+    return new_recordings
+
 
-    # Update last sync timestamp
+async def _mark_synced(user_id: str) -> None:
+    """Update the user's last sync timestamp."""
+    db = await get_db()
     await db.execute(
         "UPDATE users SET plaud_last_sync = datetime('now') WHERE id = ?",
         (user_id,),
@@ -269,7 +281,6 @@ async def _transcode_to_mp3(input_path: Path, output_path: Path) -> Path:
     Azure Speech Services batch transcription requires mono audio for
     reliable diarization. Runs in a thread to avoid blocking the event loop.
     """
-    import asyncio
     import subprocess
 
     def _run_ffmpeg():
@@ -291,65 +302,89 @@ async def _transcode_to_mp3(input_path: Path, output_path: Path) -> Path:
     return await asyncio.to_thread(_run_ffmpeg)
 
 
-async def _process_new_recording(
-    user_id: str,
-    token: str,
-    audio_file: plaud_client.AudioFile,
-    run_logger: RunLogger | None = None,
-) -> bool:
-    """Download a Plaud recording, transcode, upload to blob, and submit for transcription.
+# ---------------------------------------------------------------------------
+# Import pipeline: download -> transcode -> upload -> submit
+# ---------------------------------------------------------------------------
 
-    Returns True if the recording was actually processed, False if skipped (already exists).
-    """
-    settings = get_settings()
+
+@dataclass
+class _SyncJob:
+    """One Plaud recording moving through the import pipeline."""
+
+    user_id: str
+    token: str
+    audio_file: plaud_client.AudioFile
+    tmpdir: Path | None = None
+    upload_path: Path | None = None
+    blob_name: str | None = None
+
+    def cleanup(self) -> None:
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            self.tmpdir = None
+
+
+async def _download_stage(job: _SyncJob, settings, run_logger: RunLogger | None) -> bool:
+    """Download the recording to a private temp dir. False if already imported."""
     db = await get_db()
 
     # Double-check plaud_id doesn't already exist
     existing = await db.execute_fetchall(
-        "SELECT id FROM recordings WHERE plaud_id = ?", (audio_file.id,)
+        "SELECT id FROM recordings WHERE plaud_id = ?", (job.audio_file.id,)
     )
     if existing:
         return False
 
     if run_logger:
-        await run_logger.info(f"Downloading: {audio_file.filename}")
+        await run_logger.info(f"Downloading: {job.audio_file.filename}")
+    job.tmpdir = Path(tempfile.mkdtemp(prefix="plaud-sync-"))
+    job.upload_path = await plaud_client.download_file(job.token, job.audio_file, job.tmpdir)
+    return True
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Download from Plaud
-        local_path = await plaud_client.download_file(token, audio_file, tmpdir)
 
-        # Transcode to MP3
-        mp3_path = Path(tmpdir) / f"{audio_file.id}.mp3"
-        try:
-            await _transcode_to_mp3(local_path, mp3_path)
-            upload_path = mp3_path
-            extension = ".mp3"
-        except Exception as exc:
-            logger.warning(
-                "ffmpeg transcode failed for %s, uploading original: %s",
-                audio_file.id, exc,
-            )
-            upload_path = local_path
-            extension = local_path.suffix
-
-        # Build blob path
-        blob_name = f"{user_id}/{audio_file.id}{extension}"
-
-        # Upload to local/Azure storage (for playback)
-        await storage_service.upload_file(upload_path, blob_name)
-
-        # If using local storage but speech is enabled, also upload to Azure Blob
-        # so Azure Speech Services can access the audio via a SAS URL
-        if settings.use_local_storage and settings.speech_enabled and settings.azure_storage_connection_string:
-            from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
-            async with AsyncBlobServiceClient.from_connection_string(
-                settings.azure_storage_connection_string
-            ) as azure_client:
-                container = azure_client.get_container_client(settings.azure_storage_container)
-                blob = container.get_blob_client(blob_name)
-                with open(upload_path, "rb") as f:
-                    await blob.upload_blob(f, overwrite=True)
-                logger.info(f"Also uploaded to Azure Blob for transcription: {blob_name}")
+async def _transcode_stage(job: _SyncJob, settings, run_logger: RunLogger | None) -> bool:
+    """Transcode to MP3, falling back to the original file if ffmpeg fails."""
+    local_path = job.upload_path
+    mp3_path = job.tmpdir / f"{job.audio_file.id}.mp3"
+    try:
+        await _transcode_to_mp3(local_path, mp3_path)
+        job.upload_path = mp3_path
+        # Only the MP3 is uploaded; don't hold two copies on temp disk
+        local_path.unlink()
+    except Exception as exc:
+        logger.warning(
+            "ffmpeg transcode failed for %s, uploading original: %s",
+            job.audio_file.id, exc,
+        )
+    job.blob_name = f"{job.user_id}/{job.audio_file.id}{job.upload_path.suffix}"
+    return True
+
+
+async def _upload_stage(job: _SyncJob, settings, run_logger: RunLogger | None) -> bool:
+    """Upload to storage (and to Azure Blob for transcription if storage is local)."""
+    # Upload to local/Azure storage (for playback)
+    await storage_service.upload_file(job.upload_path, job.blob_name)
+
+    # If using local storage but speech is enabled, also upload to Azure Blob
+    # so Azure Speech Services can access the audio via a SAS URL
+    if settings.use_local_storage and settings.speech_enabled and settings.azure_storage_connection_string:
+        from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+        async with AsyncBlobServiceClient.from_connection_string(
+            settings.azure_storage_connection_string
+        ) as azure_client:
+            container = azure_client.get_container_client(settings.azure_storage_container)
+            blob = container.get_blob_client(job.blob_name)
+            with open(job.upload_path, "rb") as f:
+                await blob.upload_blob(f, overwrite=True)
+            logger.info(f"Also uploaded to Azure Blob for transcription: {job.blob_name}")
+
+    job.cleanup()
+    return True
+
+
+async def _submit_stage(job: _SyncJob, settings, run_logger: RunLogger | None) -> bool:
+    """Create the recording row and submit it for transcription."""
+    audio_file = job.audio_file
 
     # Build Plaud metadata
     plaud_meta = PlaudMetadata(
@@ -367,10 +402,10 @@ async def _process_new_recording(
 
     # Create recording in DB
     recording = await recording_service.create_recording(
-        user_id=user_id,
+        user_id=job.user_id,
         original_filename=audio_file.filename,
         source=RecordingSource.plaud,
-        file_path=blob_name,
+        file_path=job.blob_name,
         duration_seconds=audio_file.duration_seconds,
         recorded_at=audio_file.recording_datetime.isoformat(),
         plaud_id=audio_file.id,
@@ -384,7 +419,7 @@ async def _process_new_recording(
         if run_logger:
             await run_logger.info(f"Submitting for transcription: {audio_file.filename}")
         # Always generate Azure SAS URL for speech (not local URL)
-        audio_url = storage_service._azure_sas_url(blob_name, 24, settings)
+        audio_url = storage_service._azure_sas_url(job.blob_name, 24, settings)
         speech = SpeechClient()
         transcription_id = await speech.create_transcription(
             audio_url=audio_url,
@@ -407,11 +442,199 @@ async def _process_new_recording(
     return True
 
 
-async def poll_pending_transcriptions() -> list[str]:
-    """Check status of all pending transcription jobs and process completed ones.
+async def _run_pipeline(
+    jobs: list[_SyncJob],
+    stats: dict,
+    run_logs: list[str],
+    settings,
+    run_logger: RunLogger | None = None,
+) -> dict:
+    """Import recordings through concurrent download/transcode/upload/submit stages.
+
+    Each stage has its own worker count and an input queue bounded by it,
+    so a slow stage applies backpressure instead of letting downloads pile
+    up on temp disk. Each transcode is its own ffmpeg process, so
+    transcode workers run in parallel on separate cores. Jobs enter in the
+    order given (round-robin across users).
 
     Returns:
-        List of recording IDs that completed processing.
+        Per-stage stats: items, errors, busy seconds, and items/minute over
+        the stage's active span.
+    """
+    stages = [
+        ("download", _download_stage, settings.sync_download_concurrency),
+        ("transcode", _transcode_stage, settings.sync_transcode_concurrency),
+        ("upload", _upload_stage, settings.sync_upload_concurrency),
+        ("submit", _submit_stage, settings.sync_submit_concurrency),
+    ]
+    queues = [asyncio.Queue(maxsize=max(1, n)) for _, _, n in stages]
+    stage_stats = {
+        name: {"workers": max(1, n), "items": 0, "errors": 0, "busy_s": 0.0, "first": None, "last": None}
+        for name, _, n in stages
+    }
+
+    async def run_one(i: int, job: _SyncJob) -> None:
+        name, fn, _ = stages[i]
+        s = stage_stats[name]
+        start = time.monotonic()
+        if s["first"] is None:
+            s["first"] = start
+        outcome = "ok"
+        try:
+            if not await fn(job, settings, run_logger):
+                outcome = "skipped"
+            s["items"] += 1
+        except Exception as exc:
+            outcome = "failed"
+            if await _job_failed(job, exc, stats, run_logs, run_logger):
+                s["errors"] += 1
+        finally:
+            s["last"] = time.monotonic()
+            s["busy_s"] += s["last"] - start
+
+        if outcome == "skipped":
+            stats["skipped"] += 1
+            if run_logger:
+                await run_logger.info(f"Skipped (duplicate): {job.audio_file.filename}")
+        if outcome != "ok":
+            job.cleanup()
+        elif i + 1 < len(stages):
+            await queues[i + 1].put(job)
+        else:
+            stats["new_recordings"] += 1
+            run_logs.append(f"Processed: {job.audio_file.filename}")
+
+    async def worker(i: int) -> None:
+        while True:
+            job = await queues[i].get()
+            # task_done() must run whatever happens, or the join below hangs
+            # and the sync never finishes
+            try:
+                await run_one(i, job)
+            except Exception:
+                logger.exception(
+                    "Sync pipeline %s stage failed for %s", stages[i][0], job.audio_file.filename,
+                )
+                job.cleanup()
+            finally:
+                queues[i].task_done()
+
+    workers = [
+        asyncio.create_task(worker(i))
+        for i, (_, _, n) in enumerate(stages)
+        for _ in range(max(1, n))
+    ]
+    started = time.monotonic()
+    try:
+        for job in jobs:
+            await queues[0].put(job)
+        # A job is put on the next queue before task_done() on the current one,
+        # so joining the stages in order waits for every job to finish
+        for q in queues:
+            await q.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for job in jobs:
+            job.cleanup()
+
+    result = {"wall_s": round(time.monotonic() - started, 2)}
+    for name, s in stage_stats.items():
+        span = (s["last"] - s["first"]) if s["first"] is not None else 0.0
+        result[name] = {
+            "workers": s["workers"],
+            "items": s["items"],
+            "errors": s["errors"],
+            "busy_s": round(s["busy_s"], 2),
+            "per_min": round(s["items"] * 60 / span, 1) if span > 0 else None,
+        }
+    return result
+
+
+async def _job_failed(
+    job: _SyncJob,
+    exc: Exception,
+    stats: dict,
+    run_logs: list[str],
+    run_logger: RunLogger | None,
+) -> bool:
+    """Record a failed job. Returns False if it was only a duplicate.
+
+    Must be called from the except block (logs the active traceback).
+    """
+    audio_file = job.audio_file
+    if "UNIQUE constraint failed: recordings.plaud_id" in str(exc):
+        stats["skipped"] += 1
+        if run_logger:
+            await run_logger.info(f"Skipped (duplicate): {audio_file.filename}")
+        return False
+
+    stats["errors"] += 1
+    msg = f"Error processing {audio_file.id}: {type(exc).__name__}: {exc}"
+    logger.exception(msg)
+    run_logs.append(msg)
+    if run_logger:
+        tb = traceback.format_exc()
+        await run_logger.error(f"Error: {audio_file.filename}: {type(exc).__name__}: {exc}")
+        await run_logger.error(f"Traceback: {tb[-500:]}")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Transcription polling
+# ---------------------------------------------------------------------------
+
+# Before the first check, wait this long or this fraction of the audio
+# duration, whichever is longer (batch jobs rarely finish sooner)
+_POLL_FIRST_CHECK_S = 60.0
+_POLL_EXPECTED_RTF = 0.15
+# Once overdue, check every quarter of the overdue time, clamped to this range
+_POLL_MIN_INTERVAL_S = 60.0
+_POLL_MAX_INTERVAL_S = 900.0
+
+# recording_id -> monotonic time of the last status check
+_last_polled: dict[str, float] = {}
+
+# Job types queued for each transcribed recording, in priority order
+_ENRICHMENT_TASKS = ("title_description", "search_summary", "meeting_notes")
+
+
+def _poll_due(age_s: float | None, duration_s: float | None, since_last_s: float | None) -> bool:
+    """Whether a transcribing job should be checked now.
+
+    Jobs are left alone until they could plausibly be done (scaled by the
+    audio length), then checked with an interval that grows with how
+    overdue they are, so long-stuck jobs stop costing a request per poll.
+    """
+    if age_s is None:
+        return True
+    expected = max(_POLL_FIRST_CHECK_S, (duration_s or 0.0) * _POLL_EXPECTED_RTF)
+    if age_s < expected:
+        return False
+    if since_last_s is None:
+        return True
+    interval = min(_POLL_MAX_INTERVAL_S, max(_POLL_MIN_INTERVAL_S, (age_s - expected) / 4))
+    return since_last_s >= interval
+
+
+async def poll_pending_transcriptions(force: bool = False) -> list[str]:
+    """Check pending transcription jobs and queue completed ones.
+
+    Only jobs that are due (see _poll_due) are checked, unless `force`.
+    Status checks run concurrently (transcription_poll_concurrency), or as
+    one paged listing of all jobs when transcription_poll_bulk is set.
+    A completed recording moves to `processing` and gets a durable
+    `transcription_complete` job (see job_tasks), so a slow AI step on one
+    recording doesn't delay the rest and a restart loses nothing. Without
+    a running job dispatcher (CLI, tests) the queued work is drained
+    before returning.
+
+    Args:
+        force: Check every pending job regardless of its schedule.
+
+    Returns:
+        List of recording IDs whose transcription completed.
     """
     settings = get_settings()
     if not settings.speech_enabled:
@@ -419,70 +642,116 @@ async def poll_pending_transcriptions() -> list[str]:
 
     db = await get_db()
     rows = await db.execute_fetchall(
-        """SELECT id, user_id, provider_job_id, original_filename
+        """SELECT id, user_id, provider_job_id, original_filename, duration_seconds,
+                  (julianday('now') - julianday(processing_started)) * 86400 AS age_s
            FROM recordings
            WHERE status = ? AND provider_job_id IS NOT NULL""",
         (RecordingStatus.transcribing.value,),
     )
 
-    if not rows:
+    now = time.monotonic()
+    pending_ids = {r["id"] for r in rows}
+    for stale in set(_last_polled) - pending_ids:
+        del _last_polled[stale]
+    due = [
+        dict(r) for r in rows
+        if force or _poll_due(
+            r["age_s"], r["duration_seconds"],
+            now - _last_polled[r["id"]] if r["id"] in _last_polled else None,
+        )
+    ]
+    if not due:
         return []
 
     # Create a run for transcription polling
     run_id = await _create_sync_run("scheduled", run_type="transcription_poll")
     run_logger = RunLogger(run_id)
-
     speech = SpeechClient()
-    completed: list[str] = []
+    await run_logger.info(
+        "Polling %d of %d pending transcription(s)" % (len(due), len(rows))
+    )
 
-    await run_logger.info("Polling %d pending transcription(s)" % len(rows))
+    listing: dict[str, dict] = {}
+    if settings.transcription_poll_bulk:
+        try:
+            listing = await speech.list_transcriptions()
+        except Exception as exc:
+            logger.warning("Bulk transcription listing failed, checking jobs one by one: %s", exc)
+            await run_logger.warning("Bulk listing failed: %s" % exc)
 
-    for row in rows:
-        r = dict(row)
-        recording_id = r["id"]
+    sem = asyncio.Semaphore(max(1, settings.transcription_poll_concurrency))
+
+    async def check(r: dict) -> dict | None:
         job_id = r["provider_job_id"]
+        if job_id in listing:
+            return listing[job_id]
+        async with sem:
+            try:
+                return await speech.get_transcription(job_id)
+            except Exception as exc:
+                logger.exception("Error polling transcription for %s: %s", r["id"], exc)
+                await run_logger.error("Error polling %s: %s" % (r["id"][:8], exc))
+                return None
 
-        try:
-            transcription = await speech.get_transcription(job_id)
-            status = transcription.get("status", "")
+    statuses = await asyncio.gather(*(check(r) for r in due))
 
-            if status == "Succeeded":
-                await run_logger.info(
-                    "Transcription complete: %s" % (r["original_filename"] or recording_id[:8])
-                )
-                await _handle_transcription_complete(
-                    recording_id, r["user_id"], job_id, speech, run_logger
-                )
-                completed.append(recording_id)
-
-            elif status == "Failed":
-                error = transcription.get("properties", {}).get(
-                    "error", {}
-                ).get("message", "Transcription failed")
-                await db.execute(
-                    """UPDATE recordings
-                       SET status = ?, status_message = ?, updated_at = datetime('now')
-                       WHERE id = ?""",
-                    (RecordingStatus.failed.value, error, recording_id),
-                )
-                await db.commit()
-                logger.warning("Transcription failed for %s: %s", recording_id, error)
-                await run_logger.error(
-                    "Transcription failed: %s — %s" % (r["original_filename"] or recording_id[:8], error)
-                )
+    completed: list[str] = []
+    failed = 0
+    for r, transcription in zip(due, statuses):
+        recording_id = r["id"]
+        name = r["original_filename"] or recording_id[:8]
+        _last_polled[recording_id] = now
+        if transcription is None:
+            continue
+        status = transcription.get("status", "")
+
+        if status == "Succeeded":
+            await run_logger.info("Transcription complete: %s" % name)
+            completed.append(recording_id)
+            _last_polled.pop(recording_id, None)
+            await job_queue.enqueue(
+                "transcription_complete",
+                {"recording_id": recording_id, "user_id": r["user_id"], "job_id": r["provider_job_id"]},
+                key=f"transcription_complete:{recording_id}",
+                run_id=run_id,
+                commit=False,
+            )
+            await db.execute(
+                "UPDATE recordings SET status = ? WHERE id = ?",
+                (RecordingStatus.processing.value, recording_id),
+            )
+            await db.commit()
+
+        elif status == "Failed":
+            failed += 1
+            error = transcription.get("properties", {}).get(
+                "error", {}
+            ).get("message", "Transcription failed")
+            await db.execute(
+                """UPDATE recordings
+                   SET status = ?, status_message = ?, updated_at = datetime('now')
+                   WHERE id = ?""",
+                (RecordingStatus.failed.value, error, recording_id),
+            )
+            await db.commit()
+            _last_polled.pop(recording_id, None)
+            logger.warning("Transcription failed for %s: %s", recording_id, error)
+            await run_logger.error("Transcription failed: %s — %s" % (name, error))
 
-            else:
-                await run_logger.debug(
-                    "Still %s: %s" % (status, r["original_filename"] or recording_id[:8])
-                )
+        else:
+            await run_logger.debug("Still %s: %s" % (status, name))
 
-        except Exception as exc:
-            logger.exception("Error polling transcription for %s: %s", recording_id, exc)
-            await run_logger.error("Error polling %s: %s" % (recording_id[:8], exc))
+    if completed and not job_queue.is_running():
+        await job_queue.drain({"transcription_complete", *_ENRICHMENT_TASKS})
 
-    poll_status = SyncRunStatus.completed
     await run_logger.info("Poll complete: %d transcription(s) finished" % len(completed))
-    await _finish_sync_run(run_id, poll_status, {"completed": len(completed), "polled": len(rows)})
+    await _finish_sync_run(run_id, SyncRunStatus.completed, {
+        "completed": len(completed),
+        "failed": failed,
+        "polled": len(due),
+        "pending": len(rows),
+        "bulk": bool(listing),
+    })
 
     return completed
 
@@ -494,15 +763,74 @@ async def _handle_transcription_complete(
     speech: SpeechClient,
     run_logger: RunLogger | None = None,
 ) -> None:
-    """Process a completed transcription: download result, run AI enrichment."""
+    """Store a completed transcription and queue its enrichment.
+
+    Downloads and parses the transcript, marks the recording ready, then
+    queues title/description, search summary, meeting notes and speaker
+    identification as separate jobs so each is retried on its own.
+
+    Idempotent: a retry after the transcript was committed (e.g. the
+    process died before the job was marked done, possibly after the Azure
+    job was deleted) skips straight to the cleanup steps.
+    """
     db = await get_db()
+    settings = get_settings()
 
-    # Update status to processing (AI post-processing)
-    await db.execute(
-        "UPDATE recordings SET status = ? WHERE id = ?",
-        (RecordingStatus.processing.value, recording_id),
+    rows = await db.execute_fetchall(
+        "SELECT status, transcript_text, diarized_text FROM recordings WHERE id = ?",
+        (recording_id,),
     )
-    await db.commit()
+    if not rows:
+        logger.info("Recording %s was deleted before its transcript was stored", recording_id)
+        return
+    already_stored = rows[0]["status"] == RecordingStatus.ready.value and bool(
+        rows[0]["transcript_text"] or rows[0]["diarized_text"]
+    )
+    if already_stored:
+        logger.info("Transcript for %s already stored; finishing cleanup", recording_id)
+    else:
+        await _store_transcript(recording_id, user_id, job_id, speech, run_logger)
+
+    # Clean up the transcription job from Azure
+    try:
+        await speech.delete_transcription(job_id)
+    except Exception:
+        pass  # Non-critical cleanup
+
+    # Speaker identification (if enabled); runs in the speaker ID worker pool.
+    # A retry only queues it if the first attempt did not get that far.
+    if settings.speaker_id_enabled and not (
+        already_stored
+        and await db.execute_fetchall(
+            "SELECT 1 FROM speaker_id_jobs WHERE recording_id = ? LIMIT 1", (recording_id,)
+        )
+    ):
+        try:
+            from app.services import speaker_id_queue
+
+            await speaker_id_queue.enqueue(user_id, recording_id)
+            if run_logger:
+                await run_logger.info("Queued speaker identification for %s" % recording_id[:8])
+        except Exception as exc:
+            logger.warning(
+                "Failed to queue speaker identification for %s (non-fatal): %s",
+                recording_id, exc,
+            )
+            if run_logger:
+                await run_logger.warning("Speaker ID queueing failed for %s: %s" % (recording_id[:8], exc))
+
+    logger.info("Completed processing for recording %s", recording_id)
+
+
+async def _store_transcript(
+    recording_id: str,
+    user_id: str,
+    job_id: str,
+    speech: SpeechClient,
+    run_logger: RunLogger | None,
+) -> None:
+    """Save a finished transcript and queue its AI enrichment in one commit."""
+    db = await get_db()
 
     # Download transcript content
     content = await speech.get_transcript_content(job_id)
@@ -514,110 +842,69 @@ async def _handle_transcription_complete(
     # Extract speaker mapping skeleton from diarization
     speaker_mapping = _extract_speaker_mapping(content)
 
-    # Run AI enrichment (title + description)
-    title = None
-    description = None
-    settings = get_settings()
-    if settings.ai_enabled and diarized_text:
-        if run_logger:
-            await run_logger.info("Running AI enrichment for %s" % recording_id[:8])
-        try:
-            result = await ai_service.generate_title_description(diarized_text)
-            title = result.get("title")
-            description = result.get("description")
-            if run_logger and title:
-                await run_logger.info("AI title: %s" % title)
-        except Exception as exc:
-            logger.warning("AI title/description failed for %s: %s", recording_id, exc)
-            if run_logger:
-                await run_logger.warning("AI enrichment failed for %s: %s" % (recording_id[:8], exc))
-
-    # Update recording with all results
     speaker_mapping_json = json.dumps(speaker_mapping) if speaker_mapping else None
     await db.execute(
         """UPDATE recordings
            SET status = ?, transcript_text = ?, diarized_text = ?,
-               transcript_json = ?, token_count = ?, speaker_mapping = ?,
+               token_count = ?, speaker_mapping = ?,
                speaker_mapping_updated_at = CASE WHEN ? IS NOT NULL THEN datetime('now') ELSE speaker_mapping_updated_at END,
-               title = COALESCE(?, title), description = COALESCE(?, description),
                processing_completed = datetime('now'), updated_at = datetime('now')
            WHERE id = ?""",
         (
             RecordingStatus.ready.value,
             transcript_text,
             diarized_text,
-            json.dumps(content),
             token_count,
             speaker_mapping_json,
             speaker_mapping_json,
-            title,
-            description,
             recording_id,
         ),
     )
-    await db.commit()
+    await content_store.save_transcript_json(recording_id, json.dumps(content), db=db)
 
-    # Generate search summary (non-fatal)
-    if settings.ai_enabled and (diarized_text or transcript_text):
-        try:
-            from app.services import search_summary_service
-            await search_summary_service.generate_search_summary(recording_id, user_id)
-            if run_logger:
-                await run_logger.info("Search summary generated for %s" % recording_id[:8])
-        except Exception as exc:
-            logger.warning("Search summary generation failed for %s: %s", recording_id, exc)
-            if run_logger:
-                await run_logger.warning("Search summary failed for %s: %s" % (recording_id[:8], exc))
-
-    # Generate meeting notes (non-fatal)
+    # AI enrichment, committed with the transcript so none of it is lost
+    settings = get_settings()
+    run_id = run_logger.run_id if run_logger else None
     if settings.ai_enabled and (diarized_text or transcript_text):
-        try:
-            from app.services import meeting_notes_service
-            await meeting_notes_service.generate_meeting_notes(recording_id, user_id)
-            if run_logger:
-                await run_logger.info("Meeting notes generated for %s" % recording_id[:8])
-        except Exception as exc:
-            logger.warning("Meeting notes generation failed for %s: %s", recording_id, exc)
-            if run_logger:
-                await run_logger.warning("Meeting notes failed for %s: %s" % (recording_id[:8], exc))
+        for task_type in _ENRICHMENT_TASKS:
+            await job_queue.enqueue(
+                task_type,
+                {"recording_id": recording_id, "user_id": user_id},
+                key=f"{task_type}:{recording_id}",
+                run_id=run_id,
+                commit=False,
+            )
+        if run_logger:
+            await run_logger.info("Queued AI enrichment for %s" % recording_id[:8])
+    await db.commit()
 
-    # Clean up the transcription job from Azure
-    try:
-        await speech.delete_transcription(job_id)
-    except Exception:
-        pass  # Non-critical cleanup
 
-    # Speaker identification (if enabled and recording has audio)
-    if settings.speaker_id_enabled:
-        if run_logger:
-            await run_logger.info("Starting speaker identification for %s" % recording_id[:8])
-        try:
-            from app.services import speaker_processor
+async def _enrich_title_description(recording_id: str, run_logger: RunLogger | None = None) -> None:
+    """Generate an AI title and description for a transcribed recording.
 
-            async with speaker_processor._speaker_id_lock:
-                identified = await speaker_processor.process_recording(
-                    user_id, recording_id, run_logger=run_logger
-                )
-                if identified:
-                    logger.info("Speaker identification completed for %s", recording_id)
-                    if run_logger:
-                        await run_logger.info("Speaker identification completed for %s" % recording_id[:8])
-
-                    # Re-rate other recordings against updated profiles
-                    rerated = await speaker_processor.rerate_speakers(user_id)
-                    if rerated:
-                        logger.info("Re-rated speakers in %d recordings for user %s", rerated, user_id)
-                        if run_logger:
-                            await run_logger.info("Re-rated speakers in %d recording(s)" % rerated)
-        except Exception as exc:
-            logger.warning(
-                "Speaker identification failed for %s (non-fatal): %s",
-                recording_id, exc,
-            )
-            if run_logger:
-                await run_logger.warning("Speaker ID failed for %s: %s" % (recording_id[:8], exc))
+    Raises on AI errors so the job is retried; a recording without a
+    diarized transcript is left alone.
+    """
+    db = await get_db()
+    rows = await db.execute_fetchall(
+        "SELECT diarized_text FROM recordings WHERE id = ?", (recording_id,)
+    )
+    if not rows or not rows[0]["diarized_text"]:
+        return
 
-    logger.info("Completed processing for recording %s", recording_id)
+    result = await ai_service.generate_title_description(rows[0]["diarized_text"])
+    title = result.get("title")
+    description = result.get("description")
+    await db.execute(
+        """UPDATE recordings
+           SET title = COALESCE(?, title), description = COALESCE(?, description),
+               updated_at = datetime('now')
+           WHERE id = ?""",
+        (title, description, recording_id),
+    )
+    await db.commit()
+    if run_logger and title:
+        await run_logger.info("AI title: %s" % title)
 
 
 def _parse_transcript(content: dict) -> tuple[str, str]:
@@ -81,6 +81,23 @@ class TestAuthRequired:
 
         app.dependency_overrides.clear()
 
+    async def test_llm_metrics_require_auth(self, test_db):
+        """The LLM scheduler metrics are not served to anonymous callers."""
+        from app.main import app
+        from app.auth import get_current_user  # noqa: F811
+
+        app.dependency_overrides.pop(get_current_user, None)
+        app.dependency_overrides[get_settings] = _settings_auth_enabled
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as ac:
+            resp = await ac.get("/api/metrics/llm")
+            assert resp.status_code == 401
+
+        app.dependency_overrides.clear()
+
     async def test_invalid_token_format(self, test_db):
         """A garbage Bearer token should return 401."""
         from app.main import app
@@ -0,0 +1,368 @@
+"""Tests for database connection management and derived tables."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import uuid
+
+import pytest
+
+import app.database as db_mod
+from app.config import Settings
+from app.services import content_store
+
+
+@pytest.fixture
+async def file_db(tmp_path, monkeypatch):
+    """Initialize a file-backed database with a 2-connection read pool."""
+    settings = Settings(
+        database_path=str(tmp_path / "app.db"),
+        database_read_pool_size=2,
+        auth_disabled=True,
+    )
+    monkeypatch.setattr(db_mod, "get_settings", lambda: settings)
+    original = db_mod._db
+    await db_mod.init_db()
+    yield
+    await db_mod.close_db()
+    db_mod._db = original
+
+
+class TestReadPool:
+    async def test_read_pool_is_separate_from_writer(self, file_db):
+        writer = await db_mod.get_write_db()
+        reader = await db_mod.get_read_db()
+        assert reader is not writer
+        assert writer is await db_mod.get_db()
+
+    async def test_read_pool_round_robin(self, file_db):
+        first = await db_mod.get_read_db()
+        second = await db_mod.get_read_db()
+        third = await db_mod.get_read_db()
+        assert first is not second
+        assert first is third
+
+    async def test_reader_rejects_writes(self, file_db):
+        reader = await db_mod.get_read_db()
+        with pytest.raises(sqlite3.OperationalError):
+            await reader.execute(
+                "INSERT INTO users (id, name) VALUES ('u1', 'Nope')"
+            )
+
+    async def test_reader_sees_committed_writes(self, file_db):
+        writer = await db_mod.get_write_db()
+        await writer.execute("INSERT INTO users (id, name) VALUES ('u1', 'Alice')")
+        await writer.commit()
+
+        reader = await db_mod.get_read_db()
+        rows = await reader.execute_fetchall("SELECT name FROM users WHERE id = 'u1'")
+        assert dict(rows[0])["name"] == "Alice"
+
+    async def test_close_db_empties_pool(self, file_db):
+        await db_mod.close_db()
+        assert db_mod._read_pool == []
+        assert db_mod._db is None
+
+
+class TestReadFallback:
+    async def test_falls_back_to_writer_without_pool(self, test_db):
+        original = db_mod._db
+        db_mod._db = test_db
+        try:
+            assert await db_mod.get_read_db() is test_db
+        finally:
+            db_mod._db = original
+
+
+async def _speaker_rows(db, recording_id: str) -> list[dict]:
+    rows = await db.execute_fetchall(
+        """SELECT label, participant_id, display_name, status, manually_verified
+           FROM recording_speakers WHERE recording_id = ? ORDER BY label""",
+        (recording_id,),
+    )
+    return [dict(r) for r in rows]
+
+
+class TestRecordingSpeakers:
+    async def _insert(self, db, user_id: str, mapping) -> str:
+        rec_id = str(uuid.uuid4())
+        await db.execute(
+            """INSERT INTO recordings (id, user_id, original_filename, source, speaker_mapping)
+               VALUES (?, ?, 'a.mp3', 'upload', ?)""",
+            (rec_id, user_id, mapping if isinstance(mapping, str) or mapping is None else json.dumps(mapping)),
+        )
+        await db.commit()
+        return rec_id
+
+    async def test_insert_derives_rows(self, test_db, test_user):
+        rec_id = await self._insert(test_db, test_user.id, {
+            "Speaker 1": {"participantId": "p1", "displayName": "Alice",
+                          "identificationStatus": "auto", "manuallyVerified": True},
+            "Speaker 2": {"identificationStatus": "unknown"},
+        })
+        assert await _speaker_rows(test_db, rec_id) == [
+            {"label": "Speaker 1", "participant_id": "p1", "display_name": "Alice",
+             "status": "auto", "manually_verified": 1},
+            {"label": "Speaker 2", "participant_id": None, "display_name": None,
+             "status": "unknown", "manually_verified": 0},
+        ]
+
+    async def test_update_and_delete_resync(self, test_db, test_user):
+        rec_id = await self._insert(test_db, test_user.id, {"Speaker 1": {"participantId": "p1"}})
+        await test_db.execute(
+            "UPDATE recordings SET speaker_mapping = ? WHERE id = ?",
+            (json.dumps({"Speaker 3": {"participantId": "p2"}}), rec_id),
+        )
+        rows = await _speaker_rows(test_db, rec_id)
+        assert [(r["label"], r["participant_id"]) for r in rows] == [("Speaker 3", "p2")]
+
+        await test_db.execute("DELETE FROM recordings WHERE id = ?", (rec_id,))
+        assert await _speaker_rows(test_db, rec_id) == []
+
+    async def test_invalid_json_is_ignored(self, test_db, test_user):
+        rec_id = await self._insert(test_db, test_user.id, "not json")
+        assert await _speaker_rows(test_db, rec_id) == []
+
+    async def test_migration_backfills(self, test_db, test_user):
+        rec_id = await self._insert(test_db, test_user.id, {"Speaker 1": {"participantId": "p1"}})
+        await test_db.execute("DELETE FROM recording_speakers")
+
+        await db_mod._migrate_schema(test_db)
+        rows = await _speaker_rows(test_db, rec_id)
+        assert [r["participant_id"] for r in rows] == ["p1"]
+
+
+class TestProfileVersionSeed:
+    async def test_migration_seeds_a_version_for_existing_profiles(self, test_db, test_user, other_user):
+        from app.services import profile_store
+
+        await test_db.execute(
+            "INSERT INTO participants (id, user_id, display_name) VALUES ('p1', ?, 'Alice')", (test_user.id,)
+        )
+        await test_db.execute(
+            """INSERT INTO speaker_profiles (id, user_id, participant_id, display_name)
+               VALUES ('sp1', ?, 'p1', 'Alice')""",
+            (test_user.id,),
+        )
+        original = db_mod._db
+        db_mod._db = test_db
+        try:
+            assert await profile_store.get_profile_version(test_user.id) == 0
+            await db_mod._migrate_schema(test_db)
+            await db_mod._migrate_schema(test_db)
+            assert await profile_store.get_profile_version(test_user.id) == 1
+            assert await profile_store.get_profile_version(other_user.id) == 0
+        finally:
+            db_mod._db = original
+
+
+class TestSortAt:
+    async def test_migration_rebuilds_nullable_sort_at(self, test_db, test_user):
+        await test_db.execute("DROP INDEX IF EXISTS idx_recordings_user_sort")
+        await test_db.execute("DROP INDEX IF EXISTS idx_recordings_user_status_sort")
+        await test_db.execute("ALTER TABLE recordings DROP COLUMN sort_at")
+        await test_db.execute(
+            """ALTER TABLE recordings ADD COLUMN sort_at TEXT
+               GENERATED ALWAYS AS (COALESCE(recorded_at, created_at)) VIRTUAL"""
+        )
+        await db_mod._migrate_schema(test_db)
+        await db_mod._migrate_schema(test_db)
+
+        await test_db.execute(
+            """INSERT INTO recordings (id, user_id, original_filename, source, status, created_at)
+               VALUES ('r-null', ?, 'a.mp3', 'upload', 'ready', NULL)""",
+            (test_user.id,),
+        )
+        rows = await test_db.execute_fetchall("SELECT sort_at FROM recordings WHERE id = 'r-null'")
+        assert rows[0]["sort_at"] == ""
+        indexes = {
+            row["name"]
+            for row in await test_db.execute_fetchall("PRAGMA index_list(recordings)")
+        }
+        assert {"idx_recordings_user_sort", "idx_recordings_user_status_sort"} <= indexes
+
+
+class TestTagCounts:
+    async def _setup(self, db, user_id: str, statuses: list[str]) -> tuple[str, list[str]]:
+        tag_id = str(uuid.uuid4())
+        await db.execute(
+            "INSERT INTO tags (id, user_id, name, color) VALUES (?, ?, 'work', '#fff')",
+            (tag_id, user_id),
+        )
+        rec_ids = []
+        for status in statuses:
+            rec_id = str(uuid.uuid4())
+            await db.execute(
+                """INSERT INTO recordings (id, user_id, original_filename, source, status)
+                   VALUES (?, ?, 'a.mp3', 'upload', ?)""",
+                (rec_id, user_id, status),
+            )
+            await db.execute(
+                "INSERT INTO recording_tags (recording_id, tag_id) VALUES (?, ?)", (rec_id, tag_id)
+            )
+            rec_ids.append(rec_id)
+        return tag_id, rec_ids
+
+    async def _count(self, db, tag_id: str) -> int:
+        rows = await db.execute_fetchall("SELECT recording_count FROM tags WHERE id = ?", (tag_id,))
+        return rows[0][0]
+
+    async def test_counts_follow_tagging_status_and_deletes(self, test_db, test_user):
+        tag_id, (ready, pending, ready2) = await self._setup(
+            test_db, test_user.id, ["ready", "pending", "ready"]
+        )
+        assert await self._count(test_db, tag_id) == 2
+
+        await test_db.execute("UPDATE recordings SET status = 'ready' WHERE id = ?", (pending,))
+        assert await self._count(test_db, tag_id) == 3
+        await test_db.execute("UPDATE recordings SET status = 'failed' WHERE id = ?", (ready,))
+        assert await self._count(test_db, tag_id) == 2
+
+        await test_db.execute(
+            "DELETE FROM recording_tags WHERE recording_id = ? AND tag_id = ?", (ready2, tag_id)
+        )
+        assert await self._count(test_db, tag_id) == 1
+        # Deleting the recording cascades to recording_tags
+        await test_db.execute("DELETE FROM recordings WHERE id = ?", (pending,))
+        assert await self._count(test_db, tag_id) == 0
+        await test_db.execute("DELETE FROM recordings WHERE id = ?", (ready,))
+        assert await self._count(test_db, tag_id) == 0
+
+    async def test_other_users_recordings_are_not_counted(self, test_db, test_user, other_user):
+        tag_id, _ = await self._setup(test_db, test_user.id, ["ready"])
+        rec_id = str(uuid.uuid4())
+        await test_db.execute(
+            """INSERT INTO recordings (id, user_id, original_filename, source, status)
+               VALUES (?, ?, 'b.mp3', 'upload', 'ready')""",
+            (rec_id, other_user.id),
+        )
+        await test_db.execute(
+            "INSERT INTO recording_tags (recording_id, tag_id) VALUES (?, ?)", (rec_id, tag_id)
+        )
+        assert await self._count(test_db, tag_id) == 1
+
+    async def test_migration_backfills(self, test_db, test_user):
+        tag_id, _ = await self._setup(test_db, test_user.id, ["ready", "ready", "pending"])
+        # Simulate a database from before the column existed
+        await test_db.executescript(
+            """DROP TRIGGER trg_tag_count_insert;
+               DROP TRIGGER trg_tag_count_delete;
+               DROP TRIGGER trg_tag_count_recording_delete;
+               DROP TRIGGER trg_tag_count_recording_status;
+               ALTER TABLE tags DROP COLUMN recording_count;"""
+        )
+        await db_mod._migrate_schema(test_db)
+        assert await self._count(test_db, tag_id) == 2
+
+
+class TestRecordingContent:
+    @pytest.fixture(autouse=True)
+    def _patch_db(self, test_db):
+        original = db_mod._db
+        db_mod._db = test_db
+        yield
+        db_mod._db = original
+
+    async def test_roundtrip_is_compressed(self, test_db, sample_recording):
+        payload = json.dumps({"recognizedPhrases": [{"speaker": 1, "text": "hello " * 500}]})
+        await content_store.save_transcript_json(sample_recording.id, payload)
+        await test_db.commit()
+
+        rows = await test_db.execute_fetchall(
+            "SELECT length(transcript_json) AS n, encoding FROM recording_content WHERE recording_id = ?",
+            (sample_recording.id,),
+        )
+        assert rows[0]["encoding"] == "zlib"
+        assert rows[0]["n"] < len(payload) / 10
+        assert await content_store.get_transcript_json(sample_recording.id) == payload
+
+    async def test_migration_moves_inline_json(self, test_db, sample_recording):
+        await test_db.execute(
+            "UPDATE recordings SET transcript_json = ? WHERE id = ?",
+            ('{"legacy": true}', sample_recording.id),
+        )
+        await test_db.commit()
+
+        await db_mod._migrate_schema(test_db)
+
+        rows = await test_db.execute_fetchall(
+            "SELECT transcript_json FROM recordings WHERE id = ?", (sample_recording.id,)
+        )
+        assert rows[0]["transcript_json"] is None
+        assert await content_store.get_transcript_json_bulk([sample_recording.id]) == {
+            sample_recording.id: '{"legacy": true}'
+        }
+
+    async def test_deleted_with_recording(self, test_db, sample_recording):
+        await content_store.save_transcript_json(sample_recording.id, "{}")
+        await test_db.execute("DELETE FROM recordings WHERE id = ?", (sample_recording.id,))
+        await test_db.commit()
+        assert await content_store.get_transcript_json(sample_recording.id) is None
+
+
+class TestFtsTriggers:
+    async def _fts_ids(self, db, query: str) -> list[str]:
+        rows = await db.execute_fetchall(
+            """SELECT r.id FROM recordings r
+               WHERE r.rowid IN (SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?)""",
+            (query,),
+        )
+        return [r["id"] for r in rows]
+
+    async def test_title_update_reindexes(self, test_db, sample_recording):
+        await test_db.execute(
+            "UPDATE recordings SET title = 'Quarterly roadmap' WHERE id = ?", (sample_recording.id,)
+        )
+        assert await self._fts_ids(test_db, "roadmap") == [sample_recording.id]
+        assert await self._fts_ids(test_db, "title:meeting") == []
+
+    async def test_status_update_does_not_fire(self, test_db, sample_recording):
+        counter = []
+        await test_db.create_function("fts_reindexed", 0, lambda: counter.append(1))
+        await test_db.execute("DROP TRIGGER recordings_au")
+        await test_db.executescript(
+            db_mod.FTS_SCHEMA_SQL.replace(
+                "BEGIN\n    INSERT INTO recordings_fts(recordings_fts",
+                "BEGIN\n    SELECT fts_reindexed();\n    INSERT INTO recordings_fts(recordings_fts",
+            )
+        )
+
+        await test_db.execute(
+            "UPDATE recordings SET status = 'failed', retry_count = 2, updated_at = datetime('now'), "
+            "speaker_mapping = '{}' WHERE id = ?",
+            (sample_recording.id,),
+        )
+        # Listed column, unchanged value
+        await test_db.execute(
+            "UPDATE recordings SET title = title WHERE id = ?", (sample_recording.id,)
+        )
+        assert counter == []
+
+        await test_db.execute(
+            "UPDATE recordings SET search_summary = 'new' WHERE id = ?", (sample_recording.id,)
+        )
+        assert counter == [1]
+
+    async def test_migration_replaces_legacy_trigger(self, test_db):
+        await test_db.execute("DROP TRIGGER recordings_au")
+        await test_db.execute(
+            """CREATE TRIGGER recordings_au AFTER UPDATE ON recordings BEGIN
+                   SELECT 1;
+               END"""
+        )
+        await db_mod._migrate_schema(test_db)
+        rows = await test_db.execute_fetchall(
+            "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='recordings_au'"
+        )
+        assert "UPDATE OF" in rows[0]["sql"]
+
+    async def test_optimize_fts(self, test_db, sample_recording):
+        original = db_mod._db
+        db_mod._db = test_db
+        try:
+            assert await db_mod.optimize_fts() >= 1
+            assert await db_mod.optimize_fts(full=True) == 1
+        finally:
+            db_mod._db = original
+        assert await self._fts_ids(test_db, "transcript") == [sample_recording.id]
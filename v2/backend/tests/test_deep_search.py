@@ -0,0 +1,225 @@
+"""Tests for the deep search Tier 1 routing corpus."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+
+import aiosqlite
+import pytest
+
+import app.database as db_mod
+from app.models import User
+from app.services import deep_search, search_cache
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(test_db: aiosqlite.Connection, monkeypatch):
+    original = db_mod._db
+    db_mod._db = test_db
+    calls: list[str] = []
+
+    def fake_count_tokens(text: str) -> int:
+        calls.append(text)
+        return len(text.split())
+
+    monkeypatch.setattr(deep_search, "count_tokens", fake_count_tokens)
+    yield calls
+    db_mod._db = original
+
+
+async def _recording(db, user_id: str, title: str, summary: str | None, mapping: dict | None = None) -> str:
+    rid = str(uuid.uuid4())
+    await db.execute(
+        """INSERT INTO recordings (id, user_id, title, original_filename, source, status,
+                                   search_summary, speaker_mapping, duration_seconds, recorded_at)
+           VALUES (?, ?, ?, 'a.mp3', 'upload', 'ready', ?, ?, 600, '2025-01-01T10:00:00')""",
+        (rid, user_id, title, summary, json.dumps(mapping) if mapping else None),
+    )
+    await db.commit()
+    return rid
+
+
+class TestRoutingCorpus:
+    async def test_renders_once_and_reuses(self, test_db, test_user: User, _patch_db):
+        rid = await _recording(
+            test_db, test_user.id, "Planning", "Roadmap for Q3",
+            {"Speaker 1": {"displayName": "Alice"}, "Speaker 2": {}},
+        )
+
+        rows = await deep_search._load_routing_corpus(test_user.id)
+        assert len(rows) == 1
+        assert rows[0]["id"] == rid
+        assert rows[0]["body"] == (
+            "Planning\ndate:2025-01-01T10:00:00 | speakers:Alice, Speaker 2 | duration:10m\nRoadmap for Q3"
+        )
+        assert json.loads(rows[0]["speakers"]) == ["Alice", "Speaker 2"]
+        assert rows[0]["token_count"] == len(rows[0]["body"].split())
+
+        _patch_db.clear()
+        again = await deep_search._load_routing_corpus(test_user.id)
+        assert again[0]["body"] == rows[0]["body"]
+        assert _patch_db == []
+
+    async def test_recordings_without_summary_cached_as_empty(self, test_db, test_user: User):
+        await _recording(test_db, test_user.id, "Blank", None)
+        rows = await deep_search._load_routing_corpus(test_user.id)
+        assert rows[0]["body"] == ""
+        assert rows[0]["token_count"] == 0
+
+    async def test_rendered_field_change_invalidates(self, test_db, test_user: User):
+        rid = await _recording(test_db, test_user.id, "Planning", "Roadmap")
+        await deep_search._load_routing_corpus(test_user.id)
+
+        await test_db.execute("UPDATE recordings SET meeting_notes = 'x' WHERE id = ?", (rid,))
+        rows = await test_db.execute_fetchall("SELECT COUNT(*) FROM search_corpus")
+        assert rows[0][0] == 1
+
+        await test_db.execute(
+            "UPDATE recordings SET speaker_mapping = ? WHERE id = ?",
+            (json.dumps({"Speaker 1": {"displayName": "Bob"}}), rid),
+        )
+        rows = await test_db.execute_fetchall("SELECT COUNT(*) FROM search_corpus")
+        assert rows[0][0] == 0
+
+        rows = await deep_search._load_routing_corpus(test_user.id)
+        assert "speakers:Bob" in rows[0]["body"]
+
+
+class TestTTLCache:
+    def test_lru_eviction_and_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(search_cache.time, "monotonic", lambda: now[0])
+        cache = search_cache.TTLCache(max_entries=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a is now most recent
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert cache.get("a") == 1
+
+        now[0] += 11
+        assert cache.get("a") is None
+        assert len(cache) == 1
+
+    def test_normalize_question(self):
+        assert search_cache.normalize_question("  What did  Bob say?\n") == "what did bob say"
+
+
+class TestAnswerCache:
+    @pytest.fixture(autouse=True)
+    def _clear(self):
+        search_cache.clear_caches()
+        yield
+        search_cache.clear_caches()
+
+    async def test_replays_until_library_changes(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id, "Planning", "Roadmap")
+        runs: list[str] = []
+
+        async def fake_uncached(question, user_id):
+            runs.append(question)
+            yield {"event": "status", "data": "Searching..."}
+            yield {"event": "candidates", "data": [{"tag": "AB12", "recording_id": rid}]}
+            yield {"event": "result", "data": {"answer": "42", "tag_map": {}, "sources": [], "search_id": "s1"}}
+            yield {"event": "done", "data": ""}
+
+        monkeypatch.setattr(deep_search, "_deep_search_uncached", fake_uncached)
+
+        first = [e async for e in deep_search.deep_search("What is it?", test_user.id)]
+        second = [e async for e in deep_search.deep_search("what is it", test_user.id)]
+        assert len(runs) == 1
+        assert [e["event"] for e in second] == ["status", "candidates", "result", "trace_summary", "done"]
+        results = [e["data"] for e in first + second if e["event"] == "result"]
+        assert results[0]["answer"] == results[1]["answer"] == "42"
+        # The replay points at the original search's traces
+        assert results[0]["search_id"] == results[1]["search_id"] == "s1"
+
+        await test_db.execute(
+            "UPDATE recordings SET updated_at = datetime('now', '+1 minute') WHERE id = ?", (rid,)
+        )
+        await test_db.commit()
+        [e async for e in deep_search.deep_search("what is it", test_user.id)]
+        assert len(runs) == 2
+
+    async def test_collection_hit_is_recorded_in_history(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id, "Planning", "Roadmap")
+        cid = str(uuid.uuid4())
+        await test_db.execute("INSERT INTO collections (id, user_id) VALUES (?, ?)", (cid, test_user.id))
+        await test_db.execute(
+            "INSERT INTO collection_items (collection_id, recording_id) VALUES (?, ?)", (cid, rid)
+        )
+        await test_db.commit()
+
+        async def fake_uncached(question, collection_id, user_id):
+            yield {"event": "candidates", "data": [{"tag": "AB12", "recording_id": rid}]}
+            yield {"event": "result", "data": {"answer": "42", "tag_map": {}, "sources": [], "search_id": "s1"}}
+            yield {"event": "done", "data": ""}
+
+        monkeypatch.setattr(deep_search, "_search_collection_uncached", fake_uncached)
+        [e async for e in deep_search.search_collection("What is it?", cid, test_user.id)]
+        [e async for e in deep_search.search_collection("what is it", cid, test_user.id)]
+
+        rows = await test_db.execute_fetchall(
+            "SELECT question, answer, item_count, search_id FROM collection_searches WHERE collection_id = ?",
+            (cid,),
+        )
+        assert [tuple(r) for r in rows] == [("what is it", "42", 1, "s1")]
+
+    async def test_errors_are_not_cached(self, test_user: User, monkeypatch):
+        runs: list[str] = []
+
+        async def failing(question, user_id):
+            runs.append(question)
+            yield {"event": "error", "data": "boom"}
+            yield {"event": "done", "data": ""}
+
+        monkeypatch.setattr(deep_search, "_deep_search_uncached", failing)
+        [e async for e in deep_search.deep_search("q", test_user.id)]
+        [e async for e in deep_search.deep_search("q", test_user.id)]
+        assert len(runs) == 2
+
+    async def test_tier2_extracts_reused_per_recording(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id, "Planning", "Roadmap")
+        await test_db.execute("UPDATE recordings SET transcript_text = 'we talked' WHERE id = ?", (rid,))
+        await test_db.commit()
+        calls: list[str] = []
+
+        async def fake_llm(messages, model, **kwargs):
+            calls.append(kwargs.get("trace_step", ""))
+            return "They discussed the roadmap."
+
+        monkeypatch.setattr(deep_search, "_call_llm_text", fake_llm)
+        candidate = {"recording_id": rid, "tag": "AB12", "title": "Planning", "speakers": []}
+
+        first = await deep_search._tier2_extract("Roadmap?", [candidate], {}, test_user.id)
+        second = await deep_search._tier2_extract("roadmap", [{**candidate, "tag": "CD34"}], {}, test_user.id)
+        assert len(calls) == 1
+        assert first[0]["answer"] == second[0]["answer"]
+        assert second[0]["tag"] == "CD34"
+
+    async def test_tier2_bounds_extractions_in_flight(self, test_db, test_user: User, monkeypatch):
+        from app.config import Settings
+
+        settings = Settings(database_path=":memory:", deep_search_extract_concurrency=2)
+        monkeypatch.setattr(deep_search, "get_settings", lambda: settings)
+        candidates = []
+        for i in range(6):
+            rid = await _recording(test_db, test_user.id, f"Rec {i}", "Summary")
+            await test_db.execute("UPDATE recordings SET transcript_text = 'words' WHERE id = ?", (rid,))
+            candidates.append({"recording_id": rid, "tag": f"T{i}", "title": f"Rec {i}", "speakers": []})
+        await test_db.commit()
+        active = {"now": 0, "max": 0}
+
+        async def fake_llm(messages, model, **kwargs):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return "Relevant."
+
+        monkeypatch.setattr(deep_search, "_call_llm_text", fake_llm)
+        extracts = await deep_search._tier2_extract("q", candidates, {}, test_user.id)
+        assert len(extracts) == 6
+        assert active["max"] == 2
@@ -0,0 +1,158 @@
+"""Tests for the durable background job queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+import app.database as db_mod
+from app.services import job_queue
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(test_db: aiosqlite.Connection, monkeypatch):
+    original = db_mod._db
+    db_mod._db = test_db
+    monkeypatch.setattr(job_queue, "_task_types", {})
+    yield
+    db_mod._db = original
+
+
+async def _noop(job) -> None:
+    return None
+
+
+async def _status(db, job_id: int) -> dict:
+    rows = await db.execute_fetchall("SELECT * FROM jobs WHERE id = ?", (job_id,))
+    return dict(rows[0])
+
+
+class TestEnqueue:
+    async def test_idempotency_key_collapses_active_jobs(self, test_db):
+        job_queue.register("t", _noop)
+        first = await job_queue.enqueue("t", {"n": 1}, key="t:a")
+        assert await job_queue.enqueue("t", {"n": 2}, key="t:a") == first
+        assert await job_queue.enqueue("t", {"n": 3}, key="t:b") != first
+
+        # Once the job is finished the key is free again
+        await job_queue.drain()
+        assert await job_queue.enqueue("t", key="t:a") != first
+
+    async def test_claims_by_priority_then_age(self, test_db):
+        job_queue.register("low", _noop, priority=50, concurrency=5)
+        job_queue.register("high", _noop, priority=10, concurrency=5)
+        a = await job_queue.enqueue("low")
+        b = await job_queue.enqueue("high")
+        c = await job_queue.enqueue("low", priority=5)
+        claimed = [(await job_queue.claim_next()).id for _ in range(3)]
+        assert claimed == [c, b, a]
+        assert await job_queue.claim_next() is None
+
+    async def test_delayed_jobs_wait(self, test_db):
+        job_queue.register("t", _noop)
+        await job_queue.enqueue("t", delay_seconds=60)
+        assert await job_queue.claim_next() is None
+
+
+class TestRunning:
+    async def test_failure_retries_with_backoff_then_fails(self, test_db):
+        async def boom(job):
+            raise RuntimeError("nope")
+
+        job_queue.register("t", boom, max_attempts=2)
+        job_id = await job_queue.enqueue("t")
+
+        assert await job_queue.drain() == 1
+        row = await _status(test_db, job_id)
+        assert (row["status"], row["attempts"], row["error"]) == ("pending", 1, "RuntimeError: nope")
+        # Backed off: not due yet
+        assert await job_queue.drain() == 0
+
+        await test_db.execute("UPDATE jobs SET run_after = datetime('now') WHERE id = ?", (job_id,))
+        await test_db.commit()
+        assert await job_queue.drain() == 1
+        row = await _status(test_db, job_id)
+        assert (row["status"], row["attempts"]) == ("failed", 2)
+
+    async def test_drain_respects_type_concurrency(self, test_db):
+        active = {"now": 0, "max": 0}
+
+        async def handler(job):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+
+        job_queue.register("t", handler, concurrency=2)
+        for _ in range(5):
+            await job_queue.enqueue("t")
+        assert await job_queue.drain() == 5
+        assert active["max"] == 2
+
+    async def test_concurrency_setting_overrides_default(self, test_db, monkeypatch):
+        from app.config import Settings
+
+        settings = Settings(database_path=":memory:", job_concurrency={"t": 4})
+        monkeypatch.setattr(job_queue, "get_settings", lambda: settings)
+        job_queue.register("t", _noop, concurrency=1)
+        assert job_queue._concurrency("t") == 4
+
+    async def test_expired_lease_is_reclaimed(self, test_db):
+        job_queue.register("t", _noop)
+        job_id = await job_queue.enqueue("t")
+        assert (await job_queue.claim_next()).id == job_id
+        assert await job_queue.claim_next() is None
+
+        await test_db.execute(
+            "UPDATE jobs SET lease_until = datetime('now', '-1 seconds') WHERE id = ?", (job_id,)
+        )
+        await test_db.commit()
+        assert await job_queue.reclaim_expired() == 1
+        job = await job_queue.claim_next()
+        assert (job.id, job.attempts) == (job_id, 2)
+
+    async def test_dispatcher_requeues_interrupted_jobs(self, test_db):
+        done = asyncio.Event()
+
+        async def handler(job):
+            done.set()
+
+        job_queue.register("t", handler)
+        job_id = await job_queue.enqueue("t")
+        await job_queue.claim_next()  # left running by a "crashed" process
+
+        await job_queue.start_dispatcher()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=2)
+        finally:
+            await job_queue.stop_dispatcher()
+        assert not job_queue.is_running()
+        for _ in range(50):
+            if (await _status(test_db, job_id))["status"] == "done":
+                break
+            await asyncio.sleep(0.01)
+        assert (await _status(test_db, job_id))["status"] == "done"
+
+
+class TestStats:
+    async def test_backlog_and_throughput_per_type(self, test_db):
+        async def boom(job):
+            raise RuntimeError("nope")
+
+        job_queue.register("ok", _noop, concurrency=3)
+        job_queue.register("bad", boom, max_attempts=1)
+        await job_queue.enqueue("ok")
+        await job_queue.enqueue("ok")
+        await job_queue.enqueue("bad")
+        await job_queue.drain()
+        await job_queue.enqueue("ok")
+        await job_queue.enqueue("ok", delay_seconds=60)
+
+        stats = await job_queue.stats()
+        assert stats["ok"]["done"] == 2
+        assert (stats["ok"]["due"], stats["ok"]["delayed"]) == (1, 1)
+        assert stats["ok"]["concurrency"] == 3
+        assert stats["ok"]["avg_run_s"] is not None
+        assert stats["bad"]["failed"] == 1
@@ -0,0 +1,162 @@
+"""Tests for the shared LLM client scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.config import Settings
+from app.services import llm_client
+from app.services.llm_client import Priority
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(
+        llm_max_concurrency=overrides.pop("llm_max_concurrency", 1),
+        llm_max_retries=overrides.pop("llm_max_retries", 2),
+        **overrides,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset(monkeypatch):
+    llm_client._deployments.clear()
+    monkeypatch.setattr(llm_client, "get_settings", lambda: _settings())
+    yield
+    llm_client._deployments.clear()
+
+
+class FakeClient:
+    """Minimal stand-in for AsyncAzureOpenAI.chat.completions."""
+
+    def __init__(self, handler):
+        self.calls: list[dict] = []
+
+        async def create(**kwargs):
+            self.calls.append(kwargs)
+            return await handler(kwargs)
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+def _response(total_tokens: int = 10):
+    return SimpleNamespace(usage=SimpleNamespace(total_tokens=total_tokens), choices=[])
+
+
+def _rate_limit_error(retry_after_ms: str) -> openai.RateLimitError:
+    response = httpx.Response(
+        429,
+        headers={"retry-after-ms": retry_after_ms},
+        request=httpx.Request("POST", "https://example.invalid"),
+    )
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class TestScheduler:
+    async def test_interactive_admitted_before_background(self):
+        gate = asyncio.Event()
+        order: list[str] = []
+
+        async def handler(kwargs):
+            if kwargs["tag"] == "first":
+                await gate.wait()
+            order.append(kwargs["tag"])
+            return _response()
+
+        client = FakeClient(handler)
+
+        def call(priority, tag):
+            return asyncio.create_task(llm_client.chat_completion(
+                priority, client=client, model="mini", messages=[], tag=tag,
+            ))
+
+        first = call(Priority.BACKGROUND, "first")
+        await asyncio.sleep(0)
+        background = call(Priority.BACKGROUND, "background")
+        interactive = call(Priority.INTERACTIVE, "interactive")
+        await asyncio.sleep(0)
+
+        snapshot = llm_client.metrics()["mini"]
+        assert snapshot["in_flight"] == 1
+        assert snapshot["queue_depth"] == {"interactive": 1, "background": 1}
+
+        gate.set()
+        await asyncio.gather(first, background, interactive)
+        assert order == ["first", "interactive", "background"]
+        assert llm_client.metrics()["mini"]["completed"] == 3
+
+    async def test_rate_limit_pauses_deployment_and_retries(self):
+        attempts: list[int] = []
+
+        async def handler(kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise _rate_limit_error("50")
+            return _response()
+
+        client = FakeClient(handler)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await llm_client.chat_completion(Priority.INTERACTIVE, client=client, model="mini", messages=[])
+
+        assert len(attempts) == 2
+        assert loop.time() - start >= 0.045
+        snapshot = llm_client.metrics()["mini"]
+        assert snapshot["rate_limited"] == 1
+        assert snapshot["in_flight"] == 0
+
+    async def test_rate_limit_gives_up_after_max_retries(self):
+        async def handler(kwargs):
+            raise _rate_limit_error("1")
+
+        client = FakeClient(handler)
+        with pytest.raises(openai.RateLimitError):
+            await llm_client.chat_completion(Priority.BACKGROUND, client=client, model="mini", messages=[])
+        assert len(client.calls) == 3
+        assert llm_client.metrics()["mini"]["in_flight"] == 0
+
+    async def test_request_bucket_spaces_calls(self, monkeypatch):
+        monkeypatch.setattr(
+            llm_client, "get_settings",
+            lambda: _settings(llm_max_concurrency=0, llm_rate_limits={"mini": (600, 0)}),
+        )
+
+        async def handler(kwargs):
+            return _response()
+
+        client = FakeClient(handler)
+        dep = llm_client._deployment("mini")
+        dep.request_tokens = 0  # bucket drained; refills at 10 requests/second
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await llm_client.chat_completion(Priority.INTERACTIVE, client=client, model="mini", messages=[])
+        assert loop.time() - start >= 0.09
+
+    async def test_backoff_releases_concurrency_slot(self):
+        failed = asyncio.Event()
+
+        async def handler(kwargs):
+            if kwargs["tag"] == "flaky":
+                failed.set()
+                raise openai.APIConnectionError(request=httpx.Request("POST", "https://example.invalid"))
+            return _response()
+
+        client = FakeClient(handler)
+        flaky = asyncio.create_task(llm_client.chat_completion(
+            Priority.BACKGROUND, client=client, model="mini", messages=[], tag="flaky",
+        ))
+        await failed.wait()
+        await asyncio.sleep(0)
+        try:
+            # The flaky call is sleeping out its 1s back-off; the slot is free
+            await asyncio.wait_for(llm_client.chat_completion(
+                Priority.INTERACTIVE, client=client, model="mini", messages=[], tag="ok",
+            ), timeout=0.5)
+            assert llm_client.metrics()["mini"]["in_flight"] == 0
+        finally:
+            flaky.cancel()
@@ -757,6 +757,60 @@ class TestSearchPagination:
         env = resp.json()
         assert env["total"] is None  # cascade total deferred
 
+    async def test_cursor_walks_every_row_once(self, client, test_db, test_user):
+        await self._seed_n(test_db, test_user.id, 5)
+        # Same timestamp as "Rec 4": ties are broken by id
+        await _insert_recording(
+            test_db, test_user.id, str(uuid.uuid4()), "Rec tie",
+            recorded_at="2024-01-01T00:04:00+00:00",
+        )
+        titles, cursor, pages = [], None, 0
+        while True:
+            params = {"paginated": "true", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            env = (await client.get("/api/mcp/recordings", params=params)).json()
+            pages += 1
+            titles += [r["title"] for r in env["results"]]
+            assert env["total"] == (6 if pages == 1 else None)
+            cursor = env["next_cursor"]
+            assert (cursor is not None) == env["has_more"]
+            if not cursor:
+                break
+        assert pages == 3
+        assert len(titles) == len(set(titles)) == 6
+        assert titles[2:] == ["Rec 3", "Rec 2", "Rec 1", "Rec 0"]
+
+    async def test_cursor_ascending_sort(self, client, test_db, test_user):
+        await self._seed_n(test_db, test_user.id, 3)
+        first = (await client.get(
+            "/api/mcp/recordings",
+            params={"paginated": "true", "limit": 2, "sort": "recorded_at_asc"},
+        )).json()
+        rest = (await client.get(
+            "/api/mcp/recordings",
+            params={"paginated": "true", "limit": 2, "sort": "recorded_at_asc",
+                    "cursor": first["next_cursor"]},
+        )).json()
+        assert [r["title"] for r in first["results"] + rest["results"]] == ["Rec 0", "Rec 1", "Rec 2"]
+        assert rest["has_more"] is False
+
+    async def test_cursor_errors_return_400(self, client, test_db, test_user):
+        await self._seed_n(test_db, test_user.id, 3)
+        resp = await client.get("/api/mcp/recordings", params={"cursor": "not-a-cursor"})
+        assert resp.status_code == 400
+        env = (await client.get(
+            "/api/mcp/recordings", params={"paginated": "true", "limit": 1},
+        )).json()
+        for params in (
+            {"sort": "duration_desc"},
+            {"query": "rec", "mode": "cascade"},
+        ):
+            resp = await client.get(
+                "/api/mcp/recordings", params={**params, "cursor": env["next_cursor"]},
+            )
+            assert resp.status_code == 400
+
 
 # ===========================================================================
 # search_recordings — tag filter
@@ -817,6 +871,21 @@ class TestSearchTagFilter:
         ids = set(r["id"] for r in resp.json())
         assert rid_ab in ids and rid_a not in ids
 
+    @pytest.mark.parametrize("mode", ["title", "summary", "full", "cascade"])
+    async def test_search_modes_return_tag_ids(self, client, test_db, test_user, mode):
+        tag_a = str(uuid.uuid4())
+        await _insert_tag(test_db, test_user.id, tag_a, "alpha")
+        rid = str(uuid.uuid4())
+        await _insert_recording(test_db, test_user.id, rid, "Budget review")
+        await _attach_tag(test_db, rid, tag_a)
+
+        resp = await client.get(
+            "/api/mcp/recordings", params={"query": "Budget", "mode": mode},
+        )
+        rows = resp.json()
+        assert [r["id"] for r in rows] == [rid]
+        assert rows[0]["tag_ids"] == [tag_a]
+
     async def test_other_users_tag_no_leak(
         self, client, test_db, test_user, other_user
     ):
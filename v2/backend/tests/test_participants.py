@@ -5,12 +5,14 @@ Covers: list, create, detail, update, delete, search, merge.
 
 from __future__ import annotations
 
+import json
 import uuid
 
 import httpx
 import pytest
 
 from app.models import Participant, User
+from app.services import participant_service
 
 
 # ---------------------------------------------------------------------------
@@ -324,3 +326,75 @@ class TestMergeParticipants:
             f"/api/participants/{sample_participant.id}/merge/{other_id}"
         )
         assert resp.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# speaker_mapping references (service level)
+# ---------------------------------------------------------------------------
+
+
+class TestSpeakerMappingReferences:
+    @pytest.fixture(autouse=True)
+    def _patch_db(self, test_db):
+        import app.database as db_mod
+
+        original = db_mod._db
+        db_mod._db = test_db
+        yield
+        db_mod._db = original
+
+    async def _recording_with(self, test_db, user_id: str, mapping: dict) -> str:
+        rec_id = str(uuid.uuid4())
+        await test_db.execute(
+            """INSERT INTO recordings (id, user_id, original_filename, source, speaker_mapping)
+               VALUES (?, ?, 'a.mp3', 'upload', ?)""",
+            (rec_id, user_id, json.dumps(mapping)),
+        )
+        await test_db.commit()
+        return rec_id
+
+    async def _mapping(self, test_db, rec_id: str) -> dict:
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_mapping FROM recordings WHERE id = ?", (rec_id,)
+        )
+        return json.loads(rows[0]["speaker_mapping"])
+
+    async def test_merge_rewrites_mapping(
+        self, test_db, test_user: User, sample_participant: Participant
+    ):
+        other_id = str(uuid.uuid4())
+        await test_db.execute(
+            "INSERT INTO participants (id, user_id, display_name) VALUES (?, ?, 'Dup')",
+            (other_id, test_user.id),
+        )
+        rec_id = await self._recording_with(test_db, test_user.id, {
+            "Speaker 1": {"participantId": other_id, "displayName": "Dup", "embedding": [0.5, 0.25]},
+            "Speaker 2": {"participantId": "someone-else", "displayName": "Else"},
+        })
+
+        await participant_service.merge_participants(test_user.id, sample_participant.id, other_id)
+
+        mapping = await self._mapping(test_db, rec_id)
+        assert mapping["Speaker 1"] == {
+            "participantId": sample_participant.id,
+            "displayName": sample_participant.display_name,
+            "embedding": [0.5, 0.25],
+        }
+        assert mapping["Speaker 2"]["participantId"] == "someone-else"
+        rows = await test_db.execute_fetchall(
+            "SELECT participant_id FROM recording_speakers WHERE recording_id = ? ORDER BY label",
+            (rec_id,),
+        )
+        assert [r["participant_id"] for r in rows] == [sample_participant.id, "someone-else"]
+
+    async def test_delete_clears_mapping(
+        self, test_db, test_user: User, sample_participant: Participant
+    ):
+        rec_id = await self._recording_with(test_db, test_user.id, {
+            "Speaker 1": {"participantId": sample_participant.id, "displayName": "Jane Doe"},
+        })
+
+        await participant_service.delete_participant(test_user.id, sample_participant.id)
+
+        mapping = await self._mapping(test_db, rec_id)
+        assert mapping["Speaker 1"] == {"participantId": None, "displayName": None}
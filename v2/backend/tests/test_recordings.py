@@ -112,6 +112,73 @@ class TestListRecordings:
         assert sample_recording.id not in ids
 
 
+class TestListRecordingsCursor:
+    @pytest.fixture(autouse=True)
+    def _patch_db(self, test_db, monkeypatch):
+        import app.database as db_mod
+
+        monkeypatch.setattr(db_mod, "_db", test_db)
+
+    async def test_cursor_pages_cover_every_row_once(self, test_db, test_user: User):
+        from app.services import recording_service
+
+        for i in range(5):
+            await test_db.execute(
+                """INSERT INTO recordings (id, user_id, original_filename, source, status,
+                       recorded_at, created_at, updated_at)
+                   VALUES (?, ?, ?, 'upload', 'ready', ?, datetime('now'), datetime('now'))""",
+                # Two recordings share a timestamp; id breaks the tie
+                (str(uuid.uuid4()), test_user.id, f"file{i}.mp3", f"2024-01-0{min(i, 3) + 1}T00:00:00"),
+            )
+        await test_db.commit()
+
+        first = await recording_service.list_recordings(test_user.id, per_page=2)
+        assert first.total == 5
+        names = [r.original_filename for r in first.data]
+        cursor = first.next_cursor
+        while cursor:
+            page = await recording_service.list_recordings(test_user.id, per_page=2, cursor=cursor)
+            assert page.total is None
+            names += [r.original_filename for r in page.data]
+            cursor = page.next_cursor
+        assert len(names) == len(set(names)) == 5
+        assert names[-3:] == ["file2.mp3", "file1.mp3", "file0.mp3"]
+
+        # Offset paging returns the same order
+        offset_page = await recording_service.list_recordings(test_user.id, page=2, per_page=2)
+        assert [r.original_filename for r in offset_page.data] == names[2:4]
+
+    async def test_cursor_pages_past_rows_without_timestamps(self, test_db, test_user: User):
+        from app.services import recording_service
+
+        for i in range(3):
+            await test_db.execute(
+                """INSERT INTO recordings (id, user_id, original_filename, source, status,
+                       recorded_at, created_at, updated_at)
+                   VALUES (?, ?, ?, 'upload', 'ready', NULL, NULL, datetime('now'))""",
+                (str(uuid.uuid4()), test_user.id, f"file{i}.mp3"),
+            )
+        await test_db.commit()
+
+        page = await recording_service.list_recordings(test_user.id, per_page=1)
+        names = [r.original_filename for r in page.data]
+        while page.next_cursor:
+            page = await recording_service.list_recordings(
+                test_user.id, per_page=1, cursor=page.next_cursor
+            )
+            names += [r.original_filename for r in page.data]
+        assert sorted(names) == ["file0.mp3", "file1.mp3", "file2.mp3"]
+
+    async def test_invalid_cursor_is_400(self, test_user: User):
+        from fastapi import HTTPException
+
+        from app.services import recording_service
+
+        with pytest.raises(HTTPException) as exc:
+            await recording_service.list_recordings(test_user.id, cursor="%%%")
+        assert exc.value.status_code == 400
+
+
 # ---------------------------------------------------------------------------
 # GET /api/recordings/{id} — Detail
 # ---------------------------------------------------------------------------
@@ -0,0 +1,95 @@
+"""Tests for the buffered run_logs writer."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+
+import aiosqlite
+import pytest
+
+import app.database as db_mod
+from app.services import run_logger
+from app.services.run_logger import RunLogger
+
+
+@pytest.fixture
+async def run_id(test_db: aiosqlite.Connection):
+    original = db_mod._db
+    db_mod._db = test_db
+    rid = str(uuid.uuid4())
+    await test_db.execute(
+        "INSERT INTO sync_runs (id, started_at, status, trigger) VALUES (?, datetime('now'), 'running', 'manual')",
+        (rid,),
+    )
+    await test_db.commit()
+    yield rid
+    await run_logger.flush()
+    db_mod._db = original
+
+
+async def _lines(db, run_id: str) -> list[tuple[str, str]]:
+    rows = await db.execute_fetchall(
+        "SELECT level, message FROM run_logs WHERE run_id = ? ORDER BY id", (run_id,)
+    )
+    return [tuple(r) for r in rows]
+
+
+class TestBuffering:
+    async def test_lines_are_written_in_one_batch(self, test_db, run_id, monkeypatch):
+        commits = 0
+        real_commit = test_db.commit
+
+        async def counting_commit():
+            nonlocal commits
+            commits += 1
+            await real_commit()
+
+        monkeypatch.setattr(test_db, "commit", counting_commit)
+        log = RunLogger(run_id)
+        for i in range(20):
+            await log.info(f"line {i}")
+        await log.error("boom")
+        assert await _lines(test_db, run_id) == []
+
+        await log.flush()
+        lines = await _lines(test_db, run_id)
+        assert lines[0] == ("info", "line 0")
+        assert lines[-1] == ("error", "boom")
+        assert len(lines) == 21
+        assert commits == 1
+
+    async def test_flushes_on_its_own_after_the_interval(self, test_db, run_id, monkeypatch):
+        monkeypatch.setattr(run_logger, "_FLUSH_INTERVAL_S", 0.01)
+        await RunLogger(run_id).warning("later")
+        await asyncio.sleep(0.05)
+        assert await _lines(test_db, run_id) == [("warning", "later")]
+
+    async def test_flushes_early_when_the_buffer_fills(self, test_db, run_id, monkeypatch):
+        monkeypatch.setattr(run_logger, "_FLUSH_INTERVAL_S", 10)
+        monkeypatch.setattr(run_logger, "_FLUSH_MAX_LINES", 5)
+        log = RunLogger(run_id)
+        for i in range(5):
+            await log.debug(f"line {i}")
+        await asyncio.sleep(0.01)
+        assert len(await _lines(test_db, run_id)) == 5
+
+
+class TestSyncAdapter:
+    async def test_thread_side_logging_does_not_wait_for_the_loop(self, test_db, run_id):
+        log = RunLogger(run_id).sync_adapter()
+
+        def work() -> float:
+            start = time.perf_counter()
+            for i in range(100):
+                log.info(f"thread {i}")
+            return time.perf_counter() - start
+
+        elapsed = await asyncio.to_thread(work)
+        assert elapsed < 1.0
+        await asyncio.sleep(0)
+        await run_logger.flush()
+        lines = await _lines(test_db, run_id)
+        assert len(lines) == 100
+        assert lines[0] == ("info", "thread 0")
@@ -0,0 +1,164 @@
+"""Tests for the deep search semantic index (encoder, indexing, prefilter)."""
+
+from __future__ import annotations
+
+import uuid
+
+import aiosqlite
+import numpy as np
+import pytest
+
+import app.database as db_mod
+from app.models import User
+from app.services import semantic_index
+from app.services.semantic_index import HashingEncoder
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(test_db: aiosqlite.Connection):
+    original = db_mod._db
+    db_mod._db = test_db
+    semantic_index._matrix_cache.clear()
+    yield
+    db_mod._db = original
+    semantic_index._matrix_cache.clear()
+
+
+async def _recording(db, user_id: str, title: str, summary: str, transcript: str = "") -> str:
+    rid = str(uuid.uuid4())
+    await db.execute(
+        """INSERT INTO recordings (id, user_id, title, original_filename, source, status,
+                                   search_summary, transcript_text)
+           VALUES (?, ?, ?, 'a.mp3', 'upload', 'ready', ?, ?)""",
+        (rid, user_id, title, summary, transcript),
+    )
+    await db.commit()
+    return rid
+
+
+class TestHashingEncoder:
+    def test_rows_are_normalized_and_deterministic(self):
+        enc = HashingEncoder()
+        a = enc.encode(["quarterly budget review", "hiring plan"])
+        b = HashingEncoder().encode(["quarterly budget review", "hiring plan"])
+        assert a.shape == (2, enc.dim)
+        np.testing.assert_allclose(np.linalg.norm(a, axis=1), 1.0, atol=1e-5)
+        np.testing.assert_array_equal(a, b)
+
+    def test_overlapping_text_scores_higher(self):
+        enc = HashingEncoder()
+        q, near, far = enc.encode([
+            "budget for the marketing launch",
+            "we reviewed the marketing budget ahead of launch",
+            "the dog needs a vet appointment on friday",
+        ])
+        assert q @ near > q @ far
+
+
+class TestChunking:
+    def test_summary_then_overlapping_transcript_chunks(self):
+        words = " ".join(f"w{i}" for i in range(250))
+        chunks = semantic_index.chunk_recording(
+            {"title": "Standup", "search_summary": "Daily sync", "transcript_text": words}, 100,
+        )
+        assert chunks[0] == ("summary", "Standup Daily sync")
+        transcript = [text for source, text in chunks if source == "transcript"]
+        assert len(transcript) == 3
+        # Step is 80 words, so consecutive chunks share 20
+        assert transcript[1].split()[0] == "w80"
+
+
+class TestIndexAndPrefilter:
+    async def test_index_pending_and_prefilter_ranks_relevant(self, test_db, test_user: User):
+        target = await _recording(
+            test_db, test_user.id, "Kitchen remodel", "Contractor quote for cabinets and countertops",
+        )
+        for i in range(20):
+            await _recording(test_db, test_user.id, f"Standup {i}", f"Sprint status update number {i}")
+
+        assert await semantic_index.index_pending() == 21
+        assert await semantic_index.index_pending() == 0
+
+        keep = await semantic_index.prefilter(test_user.id, "what did the contractor quote for cabinets?", 3)
+        assert target in keep
+        assert len(keep) <= 3
+
+    async def test_vector_search_scores_by_best_chunk(self, test_db, test_user: User, monkeypatch):
+        monkeypatch.setattr(
+            semantic_index.get_settings(), "semantic_index_chunk_words", 20, raising=False,
+        )
+        filler = " ".join(f"filler{i}" for i in range(60))
+        deep = await _recording(
+            test_db, test_user.id, "Weekly sync", "General updates",
+            f"{filler} the contractor quoted cabinets and countertops {filler}",
+        )
+        shallow = await _recording(test_db, test_user.id, "Chat", "Cabinets mentioned once")
+        other = await _recording(test_db, test_user.id, "Garden", "Tomatoes and compost")
+        await semantic_index.index_pending()
+        rows = await test_db.execute_fetchall(
+            "SELECT COUNT(*) FROM search_chunks WHERE recording_id = ?", (deep,)
+        )
+        assert rows[0][0] > 2  # the match sits in one of several chunks
+
+        ranked = await semantic_index.vector_search(
+            test_user.id, "contractor quoted cabinets and countertops", 3,
+        )
+        assert ranked[0] == deep
+        assert set(ranked) == {deep, shallow, other}
+
+    async def test_mixed_encoders_during_reindex(self, test_db, test_user: User, monkeypatch):
+        a = await _recording(test_db, test_user.id, "Kitchen", "Contractor quote for cabinets")
+        b = await _recording(test_db, test_user.id, "Garden", "Tomatoes and compost")
+        await semantic_index.index_pending()
+        await semantic_index.vector_search(test_user.id, "cabinets", 5)  # warm the cache
+
+        # Encoder changed; only part of the library has been re-indexed so far
+        monkeypatch.setattr(semantic_index, "_encoder", HashingEncoder(dim=384))
+        assert await semantic_index.index_pending(limit=1) == 1
+        rows = await test_db.execute_fetchall(
+            "SELECT recording_id FROM search_index_state WHERE encoder = 'hashing-384'"
+        )
+        [reindexed] = [r[0] for r in rows]
+        # A stray blob of the wrong size under the current encoder is skipped too
+        await test_db.execute(
+            """INSERT INTO search_chunks (recording_id, user_id, chunk_index, source, vector)
+               VALUES (?, ?, 99, 'summary', ?)""",
+            (reindexed, test_user.id, b"\0" * 12),
+        )
+        await test_db.commit()
+
+        assert await semantic_index.vector_search(test_user.id, "cabinets", 5) == [reindexed]
+        assert {a, b} <= await semantic_index.prefilter(test_user.id, "cabinets", 5)
+
+    async def test_unindexed_recordings_always_kept(self, test_db, test_user: User):
+        await _recording(test_db, test_user.id, "Old", "Sprint planning notes")
+        await semantic_index.index_pending()
+        fresh = await _recording(test_db, test_user.id, "New", "Unrelated gardening chat")
+
+        keep = await semantic_index.prefilter(test_user.id, "sprint planning", 1)
+        assert fresh in keep
+
+    async def test_summary_change_invalidates_index(self, test_db, test_user: User):
+        rid = await _recording(test_db, test_user.id, "Sync", "Roadmap discussion")
+        await semantic_index.index_pending()
+
+        await test_db.execute("UPDATE recordings SET speaker_mapping = '{}' WHERE id = ?", (rid,))
+        rows = await test_db.execute_fetchall(
+            "SELECT COUNT(*) FROM search_index_state WHERE recording_id = ?", (rid,)
+        )
+        assert rows[0][0] == 1
+
+        await test_db.execute("UPDATE recordings SET search_summary = 'Hiring plan' WHERE id = ?", (rid,))
+        rows = await test_db.execute_fetchall(
+            "SELECT (SELECT COUNT(*) FROM search_index_state WHERE recording_id = ?),"
+            "       (SELECT COUNT(*) FROM search_chunks WHERE recording_id = ?)",
+            (rid, rid),
+        )
+        assert tuple(rows[0]) == (0, 0)
+        assert await semantic_index.index_pending() == 1
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = semantic_index.reciprocal_rank_fusion(["a", "b", "c"], ["b", "d"])
+    assert fused[0] == "b"
+    assert set(fused) == {"a", "b", "c", "d"}
@@ -0,0 +1,153 @@
+"""Tests for the SQLite-backed speaker identification queue."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import aiosqlite
+import pytest
+
+import app.database as db_mod
+from app.models import User
+from app.services import speaker_id_queue, speaker_processor
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(test_db: aiosqlite.Connection, monkeypatch):
+    original = db_mod._db
+    db_mod._db = test_db
+
+    async def no_rerate(user_id):
+        return None
+
+    monkeypatch.setattr("app.scheduler.jobs.schedule_rerate", no_rerate)
+    yield
+    db_mod._db = original
+
+
+async def _recording(db, user_id: str) -> str:
+    rid = str(uuid.uuid4())
+    await db.execute(
+        """INSERT INTO recordings (id, user_id, original_filename, source, status)
+           VALUES (?, ?, 'a.mp3', 'plaud', 'ready')""",
+        (rid, user_id),
+    )
+    await db.commit()
+    return rid
+
+
+class TestClaimOrdering:
+    async def test_one_running_job_per_user_in_order(self, test_db, test_user: User, other_user: User):
+        a1 = await _recording(test_db, test_user.id)
+        a2 = await _recording(test_db, test_user.id)
+        b1 = await _recording(test_db, other_user.id)
+        for uid, rid in [(test_user.id, a1), (test_user.id, a2), (other_user.id, b1)]:
+            await speaker_id_queue.enqueue(uid, rid)
+
+        first = await speaker_id_queue.claim_next()
+        second = await speaker_id_queue.claim_next()
+        assert (first["recording_id"], second["recording_id"]) == (a1, b1)
+        # a2 waits for a1 even though it is pending
+        assert await speaker_id_queue.claim_next() is None
+
+        await speaker_id_queue._finish(first["id"], True, None)
+        third = await speaker_id_queue.claim_next()
+        assert third["recording_id"] == a2
+
+    async def test_enqueue_reuses_pending_job(self, test_db, test_user: User):
+        rid = await _recording(test_db, test_user.id)
+        assert await speaker_id_queue.enqueue(test_user.id, rid) == await speaker_id_queue.enqueue(test_user.id, rid)
+
+
+class TestRunning:
+    async def test_identify_now_runs_inline_without_dispatcher(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id)
+
+        async def fake_process(user_id, recording_id, run_logger=None):
+            return True
+
+        monkeypatch.setattr(speaker_processor, "process_recording", fake_process)
+        assert await speaker_id_queue.identify_now(test_user.id, rid) is True
+
+        rows = await test_db.execute_fetchall("SELECT status, identified FROM speaker_id_jobs")
+        assert tuple(rows[0]) == ("done", 1)
+
+    async def test_failures_are_recorded(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id)
+
+        async def boom(user_id, recording_id, run_logger=None):
+            raise ValueError("no audio")
+
+        monkeypatch.setattr(speaker_processor, "process_recording", boom)
+        assert await speaker_id_queue.identify_now(test_user.id, rid) is False
+        rows = await test_db.execute_fetchall("SELECT status, error FROM speaker_id_jobs")
+        assert tuple(rows[0]) == ("failed", "no audio")
+
+    async def test_failed_job_is_retried(self, test_db, test_user: User, monkeypatch):
+        rid = await _recording(test_db, test_user.id)
+        calls: list[str] = []
+
+        async def flaky(user_id, recording_id, run_logger=None):
+            calls.append(recording_id)
+            if len(calls) == 1:
+                raise RuntimeError("worker died")
+            return True
+
+        monkeypatch.setattr(speaker_processor, "process_recording", flaky)
+        assert await speaker_id_queue.identify_now(test_user.id, rid) is True
+        rows = await test_db.execute_fetchall("SELECT status, attempts FROM speaker_id_jobs")
+        assert tuple(rows[0]) == ("done", 2)
+
+    async def test_inline_resets_stale_running_job(self, test_db, test_user: User, monkeypatch):
+        stale = await _recording(test_db, test_user.id)
+        rid = await _recording(test_db, test_user.id)
+        ran: list[str] = []
+
+        async def fake_process(user_id, recording_id, run_logger=None):
+            ran.append(recording_id)
+            return True
+
+        monkeypatch.setattr(speaker_processor, "process_recording", fake_process)
+        job_id = await speaker_id_queue.enqueue(test_user.id, stale)
+        await test_db.execute("UPDATE speaker_id_jobs SET status = 'running' WHERE id = ?", (job_id,))
+        await test_db.commit()
+
+        assert await speaker_id_queue.identify_now(test_user.id, rid) is True
+        assert ran == [stale, rid]
+
+    async def test_dispatcher_runs_users_in_parallel(
+        self, test_db, test_user: User, other_user: User, monkeypatch,
+    ):
+        a = await _recording(test_db, test_user.id)
+        b = await _recording(test_db, other_user.id)
+        started: list[str] = []
+        both_started = asyncio.Event()
+
+        async def fake_process(user_id, recording_id, run_logger=None):
+            started.append(recording_id)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=2)
+            return False
+
+        monkeypatch.setattr(speaker_processor, "process_recording", fake_process)
+        # A job left running by a crash is recovered on start
+        job_id = await speaker_id_queue.enqueue(test_user.id, a)
+        await test_db.execute("UPDATE speaker_id_jobs SET status = 'running' WHERE id = ?", (job_id,))
+        await test_db.commit()
+
+        await speaker_id_queue.start_dispatcher()
+        try:
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    speaker_id_queue.identify_now(test_user.id, a),
+                    speaker_id_queue.identify_now(other_user.id, b),
+                ),
+                timeout=5,
+            )
+        finally:
+            await speaker_id_queue.stop_dispatcher()
+
+        assert results == [False, False]
+        assert set(started) == {a, b}
@@ -0,0 +1,507 @@
+"""Tests for vectorized speaker matching (profile matrix + re-rating)."""
+
+from __future__ import annotations
+
+import json
+import uuid
+from types import SimpleNamespace
+
+import aiosqlite
+import numpy as np
+import pytest
+
+import app.database as db_mod
+from app.models import User
+from app.services import profile_store, speaker_embedding_store, speaker_processor, voice_index
+from app.services.profile_store import ProfileMatrix
+
+
+def _rand_unit(rng: np.random.Generator, n: int = 1) -> np.ndarray:
+    v = rng.standard_normal((n, profile_store.EMBEDDING_DIM)).astype(np.float32)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def _profiles(centroids: np.ndarray) -> list[dict]:
+    return [
+        {"participant_id": f"p{i}", "display_name": f"Person {i}", "centroid": c}
+        for i, c in enumerate(centroids)
+    ]
+
+
+async def _save(db, user_id: str, pid: str, name: str, centroid: np.ndarray) -> None:
+    await db.execute(
+        "INSERT OR IGNORE INTO participants (id, user_id, display_name) VALUES (?, ?, ?)",
+        (pid, user_id, name),
+    )
+    await profile_store.save_profile(user_id, pid, name, centroid, [centroid], [], 1)
+
+
+async def _recording_with_embeddings(db, user_id: str, mapping: dict) -> str:
+    """Insert a recording whose entries carry an `embedding` list, stored by id."""
+    rec_id = str(uuid.uuid4())
+    await db.execute(
+        """INSERT INTO recordings (id, user_id, title, original_filename, source, status)
+           VALUES (?, ?, 'r', 'r.mp3', 'upload', 'ready')""",
+        (rec_id, user_id),
+    )
+    for label, entry in mapping.items():
+        emb = entry.pop("embedding", None)
+        if emb is not None:
+            entry["embeddingId"] = await speaker_embedding_store.save_embedding(rec_id, label, emb, db=db)
+    await db.execute(
+        "UPDATE recordings SET speaker_mapping = ? WHERE id = ?", (json.dumps(mapping), rec_id)
+    )
+    await db.commit()
+    return rec_id
+
+
+@pytest.fixture(autouse=True)
+def _patch_db(test_db: aiosqlite.Connection):
+    original = db_mod._db
+    db_mod._db = test_db
+    profile_store.invalidate_profile_matrix()
+    voice_index.invalidate()
+    yield
+    db_mod._db = original
+    profile_store.invalidate_profile_matrix()
+    voice_index.invalidate()
+
+
+class TestProfileMatrix:
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        centroids = _rand_unit(rng, 50)
+        matrix = ProfileMatrix(_profiles(centroids))
+        # Queries near a few profiles so candidates clear the threshold
+        queries = centroids[[3, 17, 42]] + 0.3 * _rand_unit(rng, 3)
+
+        results = matrix.top_candidates(queries, top_n=5, threshold=0.0)
+
+        for q, got in zip(queries, results):
+            qn = q / np.linalg.norm(q)
+            sims = centroids @ qn
+            expected = [f"p{i}" for i in np.argsort(-sims)[:5]]
+            assert [c["participantId"] for c in got] == expected
+            assert got[0]["similarity"] == round(float(sims.max()), 4)
+
+    def test_threshold_and_single_query(self):
+        rng = np.random.default_rng(1)
+        centroids = _rand_unit(rng, 3)
+        matrix = ProfileMatrix(_profiles(centroids))
+
+        [hits] = matrix.top_candidates(centroids[1], threshold=0.9)
+        assert [c["participantId"] for c in hits] == ["p1"]
+        assert hits[0]["displayName"] == "Person 1"
+
+    def test_skips_profiles_without_centroid(self):
+        profiles = _profiles(_rand_unit(np.random.default_rng(2), 2))
+        profiles[0]["centroid"] = None
+        matrix = ProfileMatrix(profiles)
+        assert len(matrix) == 1
+        assert matrix.participant_ids == ["p1"]
+
+    def test_empty_matrix(self):
+        matrix = ProfileMatrix([])
+        assert matrix.top_candidates(np.ones((2, 192))) == [[], []]
+
+
+class TestMatcherModes:
+    def _bimodal(self, rng, n_profiles: int = 6, per_mode: int = 8):
+        """Profiles whose embeddings come from two distinct conditions."""
+        profiles = []
+        for i in range(n_profiles):
+            mode_a, mode_b = _rand_unit(rng, 2)
+            embs = [m + 0.15 * e for m in (mode_a, mode_b) for e in _rand_unit(rng, per_mode)]
+            embs = [e / np.linalg.norm(e) for e in embs]
+            profiles.append({
+                "participant_id": f"p{i}",
+                "display_name": f"Person {i}",
+                "centroid": profile_store._compute_centroid(embs),
+                "embeddings": embs,
+                "subcentroids": profile_store._compute_subcentroids(embs, 2),
+                "modes": (mode_a, mode_b),
+            })
+        return profiles
+
+    def test_subcentroids_separate_conditions(self):
+        rng = np.random.default_rng(10)
+        [profile] = self._bimodal(rng, n_profiles=1)
+        sub = profile["subcentroids"]
+        assert sub.shape == (2, profile_store.EMBEDDING_DIM)
+        best = sorted(int(np.argmax(sub @ m)) for m in profile["modes"])
+        assert best == [0, 1]
+
+    def test_subcentroid_and_knn_beat_centroid_on_bimodal_profiles(self):
+        rng = np.random.default_rng(11)
+        profiles = self._bimodal(rng)
+        # Query lies in one condition only
+        query = profiles[2]["modes"][1] + 0.15 * _rand_unit(rng, 1)[0]
+
+        scores = {
+            mode: ProfileMatrix(profiles, mode=mode, knn_k=3).top_candidates(query, threshold=0.0)[0][0]
+            for mode in ProfileMatrix.MODES
+        }
+        for mode in ("subcentroid", "knn"):
+            assert scores[mode]["participantId"] == "p2"
+            assert scores[mode]["similarity"] > scores["centroid"]["similarity"] + 0.1
+
+    def test_knn_matches_brute_force(self):
+        rng = np.random.default_rng(12)
+        profiles = self._bimodal(rng)
+        profiles[0]["embeddings"] = profiles[0]["embeddings"][:2]  # fewer than k
+        queries = _rand_unit(rng, 4)
+        scores = ProfileMatrix(profiles, mode="knn", knn_k=3).scores(queries)
+
+        for s_i, q in enumerate(queries):
+            for p_i, p in enumerate(profiles):
+                sims = np.sort(np.stack(p["embeddings"]) @ q)[::-1]
+                assert scores[s_i, p_i] == pytest.approx(sims[:3].mean(), abs=1e-5)
+
+    async def test_save_profile_stores_subcentroids(self, test_user: User, test_db):
+        rng = np.random.default_rng(13)
+        embs = list(_rand_unit(rng, 5))
+        await test_db.execute(
+            "INSERT INTO participants (id, user_id, display_name) VALUES ('p-sub', ?, 'Sub')",
+            (test_user.id,),
+        )
+        await profile_store.save_profile(
+            test_user.id, "p-sub", "Sub", profile_store._compute_centroid(embs), embs, [], 5,
+        )
+        [profile] = await profile_store.get_profiles(test_user.id)
+        assert profile["subcentroids"].shape == (3, profile_store.EMBEDDING_DIM)
+
+    async def test_migration_backfills_legacy_subcentroids(self, test_user: User, test_db):
+        rng = np.random.default_rng(17)
+        embs = list(_rand_unit(rng, 5))
+        await test_db.execute(
+            "INSERT INTO participants (id, user_id, display_name) VALUES ('p-old', ?, 'Old')",
+            (test_user.id,),
+        )
+        await profile_store.save_profile(
+            test_user.id, "p-old", "Old", profile_store._compute_centroid(embs), embs, [], 5,
+        )
+        await test_db.execute("UPDATE speaker_profiles SET subcentroids = NULL")
+        [profile] = await profile_store.get_profiles(test_user.id)
+        assert profile["subcentroids"] is None  # default centroid matcher: not clustered on load
+
+        await db_mod._migrate_schema(test_db)
+        [profile] = await profile_store.get_profiles(test_user.id)
+        assert profile["subcentroids"].shape == (3, profile_store.EMBEDDING_DIM)
+
+
+class TestMatrixCache:
+    async def test_save_profile_invalidates(self, test_user: User, test_db):
+        rng = np.random.default_rng(3)
+        [c0, c1] = _rand_unit(rng, 2)
+        await _save(test_db, test_user.id, "p0", "A", c0)
+
+        first = await profile_store.get_profile_matrix(test_user.id)
+        assert await profile_store.get_profile_matrix(test_user.id) is first
+        assert len(first) == 1
+
+        await _save(test_db, test_user.id, "p1", "B", c1)
+        second = await profile_store.get_profile_matrix(test_user.id)
+        assert second is not first
+        assert len(second) == 2
+
+
+class TestRerateSpeakers:
+    async def test_upgrades_unknown_to_auto(self, test_user: User, test_db):
+        rng = np.random.default_rng(4)
+        [target, other] = _rand_unit(rng, 2)
+        await _save(test_db, test_user.id, "p-target", "Target", target)
+        await _save(test_db, test_user.id, "p-other", "Other", other)
+
+        rec_id = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "unknown", "embedding": target},
+            "Speaker 2": {"identificationStatus": "auto", "participantId": "p-other",
+                          "embedding": target},
+        })
+
+        assert await speaker_processor.rerate_speakers(test_user.id) == 1
+
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_mapping FROM recordings WHERE id = ?", (rec_id,)
+        )
+        updated = json.loads(rows[0]["speaker_mapping"])
+        assert updated["Speaker 1"]["identificationStatus"] == "auto"
+        assert updated["Speaker 1"]["participantId"] == "p-target"
+        assert updated["Speaker 1"]["topCandidates"][0]["similarity"] == 1.0
+        # Already-auto entries are left alone
+        assert updated["Speaker 2"]["participantId"] == "p-other"
+
+    async def test_skips_recordings_rated_at_current_version(self, test_user: User, test_db):
+        rng = np.random.default_rng(5)
+        [target, stranger] = _rand_unit(rng, 2)
+        await _save(test_db, test_user.id, "p-other", "Other", stranger)
+
+        rec_id = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "unknown", "embedding": target},
+        })
+
+        # First pass: nothing matches, but the recording is stamped
+        assert await speaker_processor.rerate_speakers(test_user.id) == 0
+        version = await profile_store.get_profile_version(test_user.id)
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_rated_version FROM recordings WHERE id = ?", (rec_id,)
+        )
+        assert rows[0]["speaker_rated_version"] == version
+
+        # A new matching profile bumps the version and the entry is upgraded
+        await _save(test_db, test_user.id, "p-target", "Target", target)
+        assert await profile_store.get_profile_version(test_user.id) > version
+        assert await speaker_processor.rerate_speakers(test_user.id) == 1
+
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_mapping, speaker_rated_version FROM recordings WHERE id = ?", (rec_id,)
+        )
+        entry = json.loads(rows[0]["speaker_mapping"])["Speaker 1"]
+        assert entry["participantId"] == "p-target"
+        assert entry["ratedAtVersion"] == rows[0]["speaker_rated_version"]
+
+    async def test_scan_limited_to_pending_speakers_and_relevant_changes(
+        self, test_user: User, test_db, monkeypatch,
+    ):
+        rng = np.random.default_rng(6)
+        [target, stranger] = _rand_unit(rng, 2)
+        await _save(test_db, test_user.id, "p-other", "Other", stranger)
+        pending = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "unknown", "embedding": target},
+        })
+        settled = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "auto", "participantId": "p-other", "embedding": stranger},
+        })
+        assert await speaker_processor.rerate_speakers(test_user.id) == 0
+
+        # A change for a participant with no profile cannot upgrade anything
+        await profile_store.record_profile_change(test_user.id, "p-gone", "clear")
+        await test_db.commit()
+        loaded: list[list[str]] = []
+        real_load = speaker_embedding_store.load_embeddings
+
+        async def spy(ids, db=None):
+            loaded.append(list(ids))
+            return await real_load(ids, db=db)
+
+        monkeypatch.setattr(speaker_embedding_store, "load_embeddings", spy)
+        assert await speaker_processor.rerate_speakers(test_user.id) == 0
+        assert loaded == [[]]
+
+        rows = await test_db.execute_fetchall(
+            "SELECT id, speaker_rated_version FROM recordings WHERE id IN (?, ?)", (pending, settled)
+        )
+        versions = {r["id"]: r["speaker_rated_version"] for r in rows}
+        assert versions[pending] == await profile_store.get_profile_version(test_user.id)
+        assert versions[settled] is None  # never scanned
+
+
+class TestSpeakerEmbeddingStore:
+    async def test_migration_moves_inline_embeddings(self, test_user: User, test_db):
+        rng = np.random.default_rng(6)
+        [voice] = _rand_unit(rng, 1)
+        rec_id = str(uuid.uuid4())
+        mapping = {
+            "Speaker 1": {"identificationStatus": "unknown", "embedding": voice.tolist()},
+            "Speaker 2": {"identificationStatus": "dismissed"},
+        }
+        await test_db.execute(
+            """INSERT INTO recordings (id, user_id, title, original_filename, source, status, speaker_mapping)
+               VALUES (?, ?, 'r', 'r.mp3', 'upload', 'ready', ?)""",
+            (rec_id, test_user.id, json.dumps(mapping)),
+        )
+        await test_db.commit()
+
+        assert await speaker_embedding_store.move_inline_embeddings(test_db) == 1
+        assert await speaker_embedding_store.move_inline_embeddings(test_db) == 0
+
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_mapping FROM recordings WHERE id = ?", (rec_id,)
+        )
+        raw = rows[0]["speaker_mapping"]
+        assert len(raw) * 10 < len(json.dumps(mapping))
+        entry = json.loads(raw)["Speaker 1"]
+        assert "embedding" not in entry
+        stored = await speaker_embedding_store.load_embedding(entry["embeddingId"])
+        np.testing.assert_allclose(stored, voice, rtol=1e-6)
+
+    async def test_save_replaces_previous_row_for_label(self, test_user: User, test_db):
+        rec_id = await _recording_with_embeddings(test_db, test_user.id, {})
+        first = await speaker_embedding_store.save_embedding(rec_id, "Speaker 1", [0.5, 0.25])
+        second = await speaker_embedding_store.save_embedding(rec_id, "Speaker 1", [1.0, 0.0])
+        assert second > first
+        assert await speaker_embedding_store.load_embedding(first) is None
+        assert (await speaker_embedding_store.load_embedding(second)).tolist() == [1.0, 0.0]
+
+
+class TestVoiceIndex:
+    async def test_index_tracks_inserts_replacements_and_deletes(self, test_user: User, test_db):
+        rng = np.random.default_rng(8)
+        a, b, c = _rand_unit(rng, 3)
+        rec1 = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"embedding": a}, "Speaker 2": {"embedding": b},
+        })
+        index = await voice_index.get_index(test_user.id)
+        assert len(index) == 2
+
+        # New recording: appended without reloading existing rows
+        rec2 = await _recording_with_embeddings(test_db, test_user.id, {"Speaker 1": {"embedding": c}})
+        grown = await voice_index.get_index(test_user.id)
+        assert len(grown) == 3
+        assert grown.recording_ids[-1] == rec2
+
+        # Re-identification replaces a row; deletion drops the recording's rows
+        await speaker_embedding_store.save_embedding(rec1, "Speaker 1", c)
+        await test_db.commit()
+        replaced = await voice_index.get_index(test_user.id)
+        assert len(replaced) == 3
+        rows, _ = replaced.search(c, threshold=0.99)
+        assert sorted(replaced.recording_ids[i] for i in rows) == sorted([rec1, rec2])
+
+        await test_db.execute("DELETE FROM recordings WHERE id = ?", (rec2,))
+        await test_db.commit()
+        assert (await voice_index.get_index(test_user.id)).recording_ids == [rec1, rec1]
+
+    async def test_find_voice_matches(self, test_user: User, test_db):
+        rng = np.random.default_rng(9)
+        voice, stranger = _rand_unit(rng, 2)
+        await _save(test_db, test_user.id, "p-voice", "Voice", voice)
+        unlabeled = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "unknown", "embedding": stranger},
+            "Speaker 2": {"identificationStatus": "unknown", "embedding": voice * 0.9 + stranger * 0.1},
+        })
+        labeled = await _recording_with_embeddings(test_db, test_user.id, {
+            "Speaker 1": {"identificationStatus": "auto", "participantId": "p-voice",
+                          "displayName": "Voice", "embedding": voice},
+        })
+        await _recording_with_embeddings(test_db, test_user.id, {"Speaker 1": {"embedding": stranger}})
+
+        matches = await voice_index.find_voice_matches(test_user.id, participant_id="p-voice")
+        assert [m["recording_id"] for m in matches] == [labeled, unlabeled]
+        assert matches[1]["speaker_label"] == "Speaker 2"
+        assert matches[1]["participant_id"] is None
+
+        only_new = await voice_index.find_voice_matches(
+            test_user.id, participant_id="p-voice", unassigned_only=True,
+        )
+        assert [m["recording_id"] for m in only_new] == [unlabeled]
+
+        # Query by a speaker: its own recording is excluded
+        by_speaker = await voice_index.find_voice_matches(
+            test_user.id, recording_id=labeled, speaker_label="Speaker 1",
+        )
+        assert [m["recording_id"] for m in by_speaker] == [unlabeled]
+
+        assert await voice_index.find_voice_matches(test_user.id, participant_id="nobody") is None
+
+
+class TestSegmentEmbeddingCache:
+    async def test_second_run_reuses_window_embeddings(self, test_user: User, test_db, monkeypatch):
+        from app.services import content_store, segment_store, speaker_id_worker, storage_service
+
+        rng = np.random.default_rng(7)
+        [voice] = _rand_unit(rng, 1)
+        await _save(test_db, test_user.id, "p-voice", "Voice", voice)
+
+        rec_id = str(uuid.uuid4())
+        await test_db.execute(
+            """INSERT INTO recordings (id, user_id, title, original_filename, file_path, source, status)
+               VALUES (?, ?, 'r', 'r.mp3', 'blob/r.mp3', 'upload', 'ready')""",
+            (rec_id, test_user.id),
+        )
+        transcript = [
+            {"start": 0.0, "end": 4.0, "speaker": 1},
+            {"start": 6.0, "end": 30.0, "speaker": 1},
+            {"start": 31.0, "end": 31.5, "speaker": 2},
+        ]
+        await content_store.save_transcript_json(rec_id, json.dumps(transcript), db=test_db)
+        await test_db.commit()
+
+        downloads: list[str] = []
+        embedded: list[list] = []
+
+        async def fake_download(blob_path, local_path):
+            downloads.append(blob_path)
+
+        async def fake_embed(audio_path, windows, min_dur_s=0.0):
+            embedded.append(list(windows))
+            return [voice.copy() for _ in windows]
+
+        monkeypatch.setattr(storage_service, "download_file", fake_download)
+        monkeypatch.setattr(speaker_id_worker, "embed_windows", fake_embed)
+
+        assert await speaker_processor.process_recording(test_user.id, rec_id) is True
+        # Only speaker 1's windows qualify; the 30s segment is trimmed and centered
+        assert embedded == [[(6.0 + 7.0, 6.0 + 17.0), (0.0, 4.0)]]
+        rows = await test_db.execute_fetchall(
+            "SELECT start_ms, end_ms FROM segment_embeddings ORDER BY start_ms"
+        )
+        assert [tuple(r) for r in rows] == [(0, 4000), (13000, 23000)]
+
+        # Clear the result so the speaker is identified again
+        await test_db.execute("UPDATE recordings SET speaker_mapping = NULL WHERE id = ?", (rec_id,))
+        await test_db.commit()
+        assert await speaker_processor.process_recording(test_user.id, rec_id) is True
+        assert len(downloads) == 1 and len(embedded) == 1
+
+        rows = await test_db.execute_fetchall(
+            "SELECT speaker_mapping FROM recordings WHERE id = ?", (rec_id,)
+        )
+        mapping = json.loads(rows[0]["speaker_mapping"])
+        assert mapping["Speaker 1"]["participantId"] == "p-voice"
+
+        # A different model version misses the cache
+        assert await segment_store.get_embeddings(rec_id, "other@1") == {}
+
+
+class TestBatchedEmbeddings:
+    def test_windows_are_batched_padded_and_realigned(self):
+        torch = pytest.importorskip("torch")
+        from app.services.embedding_engine import EmbeddingEngine
+
+        calls: list[tuple[tuple, list[float]]] = []
+
+        class FakeModel:
+            def encode_batch(self, wavs, wav_lens=None):
+                calls.append((tuple(wavs.shape), wav_lens.tolist()))
+                # Embedding = valid (unpadded) length in samples, repeated
+                valid = (wav_lens * wavs.shape[1]).round()
+                return valid[:, None, None].repeat(1, 1, 192)
+
+        engine = EmbeddingEngine(batch_size=2)
+        engine._model = FakeModel()
+        sr = 100
+        wav = torch.ones(1, 60 * sr)
+        windows = [(0.0, 3.0), (10.0, 10.5), (20.0, 30.0), (40.0, 45.0)]
+
+        embs = engine.embeddings_for_windows(wav, sr, windows, min_dur_s=2.0)
+
+        assert embs[1] is None  # shorter than min_dur_s
+        assert [e[0] for e in (embs[0], embs[2], embs[3])] == [300, 1000, 500]
+        # Longest first: (10s, 5s) then (3s)
+        assert calls == [((2, 1000), [1.0, 0.5]), ((1, 300), [1.0])]
+
+
+class TestDecodeWindows:
+    def test_each_window_seeks_and_pipes_pcm(self, monkeypatch):
+        from app.services import embedding_engine
+
+        commands: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            commands.append(cmd)
+            dur = float(cmd[cmd.index("-t") + 1])
+            samples = np.full(int(dur * 16000), 16384, dtype="<i2")
+            return SimpleNamespace(stdout=samples.tobytes())
+
+        monkeypatch.setattr(embedding_engine.subprocess, "run", fake_run)
+
+        clips = embedding_engine.decode_windows("a.mp3", [(-1.0, 2.0), (30.0, 30.5), (5.0, 5.0)])
+
+        assert [len(c) for c in clips] == [32000, 8000, 0]
+        assert clips[0].dtype == np.float32
+        np.testing.assert_allclose(clips[0][:3], 0.5)
+        assert len(commands) == 2  # empty window never spawns ffmpeg
+        first = commands[0]
+        assert first[first.index("-ss") + 1] == "0.000"
+        assert first.index("-ss") < first.index("-i")  # input seeking
+        assert first[-1] == "pipe:1"
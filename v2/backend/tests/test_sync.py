@@ -5,9 +5,12 @@ Covers: trigger sync, list sync runs, get sync run detail.
 
 from __future__ import annotations
 
+import asyncio
 import json
+import shutil
 import uuid
 from datetime import datetime, timezone
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import httpx
@@ -102,3 +105,478 @@ class TestGetSyncRunDetail:
     async def test_get_detail_not_found(self, client: httpx.AsyncClient):
         resp = await client.get(f"/api/sync/status/{uuid.uuid4()}")
         assert resp.status_code in (404, 405)  # 405 if route doesn't exist
+
+
+# ---------------------------------------------------------------------------
+# plaud_client.stream_to_file — streaming download with resume
+# ---------------------------------------------------------------------------
+
+
+class _FlakyStream(httpx.AsyncByteStream):
+    """Yields `data` in chunks, then drops the connection after `fail_after` bytes."""
+
+    def __init__(self, data: bytes, fail_after: int | None = None):
+        self.data = data
+        self.fail_after = fail_after
+
+    async def __aiter__(self):
+        sent = 0
+        for i in range(0, len(self.data), 1000):
+            if self.fail_after is not None and sent >= self.fail_after:
+                raise httpx.ReadError("connection reset")
+            chunk = self.data[i:i + 1000]
+            sent += len(chunk)
+            yield chunk
+
+
+class TestStreamToFile:
+    DATA = bytes(range(256)) * 40  # 10 KB
+
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch):
+        from app.services import plaud_client
+
+        monkeypatch.setattr(plaud_client.asyncio, "sleep", AsyncMock())
+
+    def _client(self, handler) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def test_resumes_with_range(self, tmp_path):
+        import hashlib
+
+        from app.services.plaud_client import stream_to_file
+
+        ranges = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            ranges.append(request.headers.get("range"))
+            if request.headers.get("range"):
+                offset = int(request.headers["range"].split("=")[1].rstrip("-"))
+                body = self.DATA[offset:]
+                return httpx.Response(206, headers={"content-length": str(len(body))},
+                                      stream=_FlakyStream(body))
+            return httpx.Response(200, headers={"content-length": str(len(self.DATA))},
+                                  stream=_FlakyStream(self.DATA, fail_after=4000))
+
+        dest = tmp_path / "rec.mp3"
+        async with self._client(handler) as client:
+            size = await stream_to_file(
+                client, "https://s3.example/rec", dest,
+                sha256=hashlib.sha256(self.DATA).hexdigest(),
+            )
+
+        assert size == len(self.DATA)
+        assert dest.read_bytes() == self.DATA
+        assert ranges == [None, "bytes=4000-"]
+        assert not (tmp_path / "rec.mp3.part").exists()
+
+    async def test_restarts_when_range_ignored(self, tmp_path):
+        from app.services.plaud_client import stream_to_file
+
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.headers.get("range"))
+            fail = 3000 if len(calls) == 1 else None
+            return httpx.Response(200, headers={"content-length": str(len(self.DATA))},
+                                  stream=_FlakyStream(self.DATA, fail_after=fail))
+
+        dest = tmp_path / "rec.mp3"
+        async with self._client(handler) as client:
+            await stream_to_file(client, "https://s3.example/rec", dest)
+
+        assert dest.read_bytes() == self.DATA
+        assert calls == [None, "bytes=3000-"]
+
+    async def test_encoded_body_restarts_instead_of_resuming(self, tmp_path):
+        import gzip
+        import os
+
+        from app.services.plaud_client import stream_to_file
+
+        calls = []
+        data = os.urandom(10_000)  # incompressible, so the encoded body is long
+        encoded = gzip.compress(data)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.headers.get("accept-encoding"), request.headers.get("range")))
+            fail = 500 if len(calls) == 1 else None
+            return httpx.Response(200, headers={"content-encoding": "gzip"},
+                                  stream=_FlakyStream(encoded, fail_after=fail))
+
+        dest = tmp_path / "rec.mp3"
+        async with self._client(handler) as client:
+            await stream_to_file(client, "https://s3.example/rec", dest)
+
+        assert dest.read_bytes() == data
+        assert calls == [("identity", None), ("identity", None)]
+
+    async def test_checksum_mismatch_leaves_no_file(self, tmp_path):
+        from app.services.plaud_client import stream_to_file
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=self.DATA)
+
+        dest = tmp_path / "rec.mp3"
+        async with self._client(handler) as client:
+            with pytest.raises(RuntimeError, match="SHA-256"):
+                await stream_to_file(client, "https://s3.example/rec", dest, sha256="0" * 64)
+
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_gives_up_after_attempts(self, tmp_path):
+        from app.services.plaud_client import stream_to_file
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"content-length": str(len(self.DATA))},
+                                  stream=_FlakyStream(self.DATA, fail_after=0))
+
+        async with self._client(handler) as client:
+            with pytest.raises(RuntimeError, match="after 3 attempts"):
+                await stream_to_file(client, "https://s3.example/rec", tmp_path / "x", attempts=3)
+        assert list(tmp_path.iterdir()) == []
+
+
+# ---------------------------------------------------------------------------
+# run_sync — staged import pipeline
+# ---------------------------------------------------------------------------
+
+
+def _audio_file(file_id: str):
+    from app.services.plaud_client import AudioFile
+
+    return AudioFile(
+        id=file_id, filename=f"rec {file_id}", filesize=3, filetype="audio/mp3",
+        fullname=f"{file_id}.mp3", duration=60_000, start_time=1_700_000_000_000,
+        end_time=1_700_000_060_000, timezone=0, zonemins=0,
+    )
+
+
+class TestSyncPipeline:
+    @pytest.fixture
+    async def plaud_users(self, test_db, test_user: User, other_user: User, tmp_path, monkeypatch):
+        import app.database as db_mod
+        from app.config import Settings
+        from app.services import plaud_client, storage_service, sync_service
+
+        original = db_mod._db
+        db_mod._db = test_db
+        for u in (test_user, other_user):
+            await test_db.execute(
+                "UPDATE users SET plaud_enabled = 1, plaud_token = ? WHERE id = ?", (u.id, u.id)
+            )
+        await test_db.commit()
+
+        settings = Settings(
+            database_path=":memory:", local_blob_path=str(tmp_path / "blobs"),
+            speech_services_key="", azure_storage_connection_string="",
+            sync_download_concurrency=1, sync_transcode_concurrency=2,
+        )
+        monkeypatch.setattr(sync_service, "get_settings", lambda: settings)
+        monkeypatch.setattr(storage_service, "get_settings", lambda: settings)
+
+        listings = {
+            test_user.id: [_audio_file(f"a{i}") for i in range(3)],
+            other_user.id: [_audio_file(f"b{i}") for i in range(2)],
+        }
+        downloads: list[str] = []
+
+        async def fetch_recordings(token):
+            return listings[token]
+
+        async def download_file(token, audio_file, output_dir, sha256=None):
+            downloads.append(audio_file.id)
+            await asyncio.sleep(0)
+            path = Path(output_dir) / audio_file.fullname
+            path.write_bytes(b"abc")
+            return path
+
+        async def transcode(input_path, output_path):
+            if input_path.name.startswith("a2"):
+                raise RuntimeError("ffmpeg failed")
+            shutil.copy(input_path, output_path)
+            return output_path
+
+        monkeypatch.setattr(plaud_client, "fetch_recordings", fetch_recordings)
+        monkeypatch.setattr(plaud_client, "download_file", download_file)
+        monkeypatch.setattr(sync_service, "_transcode_to_mp3", transcode)
+        yield downloads
+        db_mod._db = original
+
+    async def test_imports_round_robin_across_users(
+        self, test_db, plaud_users, test_user: User, other_user: User, tmp_path
+    ):
+        from app.services import sync_service
+
+        await test_db.execute(
+            "INSERT INTO deleted_plaud_ids (plaud_id, user_id) VALUES ('a1', ?)", (test_user.id,)
+        )
+        await test_db.commit()
+
+        run = await sync_service.run_sync(trigger="manual")
+
+        assert plaud_users == ["a0", "b0", "a2", "b1"]
+        rows = await test_db.execute_fetchall(
+            "SELECT plaud_id, file_path FROM recordings ORDER BY plaud_id"
+        )
+        paths = {r["plaud_id"]: r["file_path"] for r in rows}
+        assert set(paths) == {"a0", "a2", "b0", "b1"}
+        # Transcode failure falls back to uploading the original
+        assert paths["a2"] == f"{test_user.id}/a2.mp3"
+        assert (tmp_path / "blobs" / paths["b1"]).read_bytes() == b"abc"
+
+        stats = json.loads(run.stats_json)
+        assert stats["new_recordings"] == 4
+        assert stats["skipped"] == 1
+        assert stats["errors"] == 0
+        assert stats["stages"]["download"]["items"] == 4
+        assert stats["stages"]["submit"]["items"] == 4
+        assert stats["stages"]["transcode"]["workers"] == 2
+
+    async def test_already_imported_and_failures(
+        self, test_db, plaud_users, test_user: User, monkeypatch
+    ):
+        from app.services import storage_service, sync_service
+
+        await sync_service.run_sync(trigger="manual")
+        plaud_users.clear()
+
+        async def broken_upload(path, blob_name):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(storage_service, "upload_file", broken_upload)
+        await test_db.execute("DELETE FROM recordings WHERE plaud_id = 'b1'")
+        await test_db.commit()
+
+        run = await sync_service.run_sync(trigger="manual")
+
+        assert plaud_users == ["b1"]
+        stats = json.loads(run.stats_json)
+        assert stats["errors"] == 1
+        assert stats["stages"]["upload"]["errors"] == 1
+        assert stats["new_recordings"] == 0
+
+    async def test_failing_error_bookkeeping_does_not_hang_the_sync(
+        self, test_db, plaud_users, monkeypatch
+    ):
+        from app.services import storage_service, sync_service
+
+        async def broken_upload(path, blob_name):
+            raise OSError("disk full")
+
+        async def broken_bookkeeping(*args, **kwargs):
+            raise RuntimeError("log write failed")
+
+        monkeypatch.setattr(storage_service, "upload_file", broken_upload)
+        monkeypatch.setattr(sync_service, "_job_failed", broken_bookkeeping)
+
+        await asyncio.wait_for(sync_service.run_sync(trigger="manual"), timeout=5)
+        # The sync finished, so the next one is allowed to start
+        await asyncio.wait_for(sync_service.run_sync(trigger="manual"), timeout=5)
+
+
+# ---------------------------------------------------------------------------
+# poll_pending_transcriptions — scheduling, bulk status, completion jobs
+# ---------------------------------------------------------------------------
+
+
+class TestTranscriptionPolling:
+    @pytest.fixture
+    async def polling(self, test_db, test_user: User, monkeypatch):
+        import app.database as db_mod
+        from app.config import Settings
+        from app.services import sync_service
+
+        original = db_mod._db
+        db_mod._db = test_db
+        settings = Settings(
+            database_path=":memory:", speech_services_key="k", speech_services_region="r",
+            transcription_poll_bulk=True,
+        )
+        monkeypatch.setattr(sync_service, "get_settings", lambda: settings)
+        monkeypatch.setattr(sync_service, "_last_polled", {})
+
+        calls = {"get": [], "list": 0, "handled": [], "active": 0, "max_active": 0}
+        jobs = {"job-ok": "Succeeded", "job-slow": "Succeeded", "job-bad": "Failed", "job-run": "Running"}
+
+        class FakeSpeech:
+            async def list_transcriptions(self):
+                calls["list"] += 1
+                return {
+                    j: {"status": st, "properties": {"error": {"message": "bad audio"}}}
+                    for j, st in jobs.items() if j != "job-run"
+                }
+
+            async def get_transcription(self, job_id):
+                calls["get"].append(job_id)
+                return {"status": jobs[job_id]}
+
+        async def handle(recording_id, user_id, job_id, speech, run_logger=None):
+            calls["active"] += 1
+            calls["max_active"] = max(calls["max_active"], calls["active"])
+            await asyncio.sleep(0.05 if job_id == "job-slow" else 0.01)
+            calls["active"] -= 1
+            calls["handled"].append(job_id)
+
+        monkeypatch.setattr(sync_service, "SpeechClient", FakeSpeech)
+        monkeypatch.setattr(sync_service, "_handle_transcription_complete", handle)
+
+        async def add(job_id: str, minutes_ago: int, duration: float = 600.0) -> str:
+            rid = str(uuid.uuid4())
+            await test_db.execute(
+                """INSERT INTO recordings (id, user_id, original_filename, source, status,
+                       provider_job_id, duration_seconds, processing_started)
+                   VALUES (?, ?, ?, 'plaud', 'transcribing', ?, ?, datetime('now', ?))""",
+                (rid, test_user.id, f"{job_id}.mp3", job_id, duration, f"-{minutes_ago} minutes"),
+            )
+            await test_db.commit()
+            return rid
+
+        yield calls, add
+        db_mod._db = original
+
+    def test_poll_due_backs_off_with_age(self):
+        from app.services.sync_service import _poll_due
+
+        # Not before the expected finish time (15% of a 1 h recording = 9 min)
+        assert not _poll_due(300, 3600, None)
+        assert _poll_due(600, 3600, None)
+        # Just overdue: every minute; an hour overdue: every 15 min
+        assert _poll_due(660, 3600, 60)
+        assert not _poll_due(540 + 3600, 3600, 600)
+        assert _poll_due(540 + 3600, 3600, 900)
+        # Unknown start time: always due
+        assert _poll_due(None, None, 0)
+
+    async def test_bulk_listing_and_concurrent_completion(self, test_db, polling):
+        from app.services import sync_service
+
+        calls, add = polling
+        ok = await add("job-ok", 30)
+        slow = await add("job-slow", 30)
+        bad = await add("job-bad", 30)
+        await add("job-run", 30)
+
+        completed = await sync_service.poll_pending_transcriptions()
+
+        assert set(completed) == {ok, slow}
+        assert calls["list"] == 1
+        # Jobs missing from the listing fall back to a single GET
+        assert calls["get"] == ["job-run"]
+        assert sorted(calls["handled"]) == ["job-ok", "job-slow"]
+        assert calls["max_active"] == 2
+        rows = await test_db.execute_fetchall(
+            "SELECT status, status_message FROM recordings WHERE id = ?", (bad,)
+        )
+        assert tuple(rows[0]) == ("failed", "bad audio")
+
+    async def test_schedule_skips_young_and_recently_checked_jobs(self, polling):
+        from app.services import sync_service
+
+        calls, add = polling
+        await add("job-run", 1)
+
+        assert await sync_service.poll_pending_transcriptions() == []
+        assert calls["list"] == 0
+
+        assert await sync_service.poll_pending_transcriptions(force=True) == []
+        assert calls["get"] == ["job-run"]
+
+    async def test_completion_is_queued_as_a_durable_job(self, test_db, polling):
+        from app.services import job_queue, sync_service
+
+        calls, add = polling
+        rid = await add("job-slow", 30)
+
+        await job_queue.start_dispatcher()
+        try:
+            assert await sync_service.poll_pending_transcriptions() == [rid]
+            # Returned before the slow handler finished; a second poll does not re-queue it
+            assert calls["handled"] == []
+            rows = await test_db.execute_fetchall("SELECT status FROM recordings WHERE id = ?", (rid,))
+            assert rows[0]["status"] == "processing"
+            assert await sync_service.poll_pending_transcriptions(force=True) == []
+            for _ in range(100):
+                if calls["handled"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert calls["handled"] == ["job-slow"]
+        finally:
+            await job_queue.stop_dispatcher()
+
+        rows = await test_db.execute_fetchall(
+            "SELECT type, status, idempotency_key FROM jobs WHERE type = 'transcription_complete'"
+        )
+        assert [tuple(r) for r in rows] == [
+            ("transcription_complete", "done", f"transcription_complete:{rid}")
+        ]
+
+
+class TestTranscriptionCompleteRetry:
+    @pytest.fixture(autouse=True)
+    def _db(self, test_db, monkeypatch):
+        import app.database as db_mod
+        from app.config import Settings
+        from app.services import sync_service
+
+        original = db_mod._db
+        db_mod._db = test_db
+        settings = Settings(database_path=":memory:", speaker_id_enabled=False)
+        monkeypatch.setattr(sync_service, "get_settings", lambda: settings)
+        yield
+        db_mod._db = original
+
+    class GoneSpeech:
+        """The Azure job was already deleted by the first attempt."""
+
+        def __init__(self):
+            self.deleted: list[str] = []
+
+        async def get_transcript_content(self, job_id):
+            raise RuntimeError("404 transcription not found")
+
+        async def delete_transcription(self, job_id):
+            self.deleted.append(job_id)
+
+    async def _ready_recording(self, db, user_id: str) -> str:
+        rid = str(uuid.uuid4())
+        await db.execute(
+            """INSERT INTO recordings (id, user_id, original_filename, source, status, transcript_text)
+               VALUES (?, ?, 'a.mp3', 'plaud', 'ready', 'hello there')""",
+            (rid, user_id),
+        )
+        await db.commit()
+        return rid
+
+    async def test_retry_after_stored_transcript_is_a_no_op(self, test_db, test_user: User):
+        from app.services import sync_service
+
+        rid = await self._ready_recording(test_db, test_user.id)
+        speech = self.GoneSpeech()
+        await sync_service._handle_transcription_complete(rid, test_user.id, "job-1", speech)
+
+        assert speech.deleted == ["job-1"]
+        rows = await test_db.execute_fetchall(
+            "SELECT status, transcript_text FROM recordings WHERE id = ?", (rid,)
+        )
+        assert tuple(rows[0]) == ("ready", "hello there")
+
+    async def test_final_attempt_never_downgrades_ready(self, test_db, test_user: User, monkeypatch):
+        from app.services import job_tasks, sync_service
+        from app.services.job_queue import Job
+
+        rid = await self._ready_recording(test_db, test_user.id)
+
+        async def boom(*args, **kwargs):
+            raise RuntimeError("late failure")
+
+        monkeypatch.setattr(sync_service, "_handle_transcription_complete", boom)
+        monkeypatch.setattr(sync_service, "SpeechClient", lambda: None)
+        job = Job(
+            id=1, type="transcription_complete", attempts=3, max_attempts=3,
+            payload={"recording_id": rid, "user_id": test_user.id, "job_id": "job-1"},
+        )
+        with pytest.raises(RuntimeError):
+            await job_tasks.transcription_complete(job)
+        rows = await test_db.execute_fetchall("SELECT status FROM recordings WHERE id = ?", (rid,))
+        assert rows[0]["status"] == "ready"
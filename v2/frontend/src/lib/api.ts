@@ -88,6 +88,7 @@ export async function fetchRecordings(
   const params = new URLSearchParams();
   if (filters.page) params.set("page", String(filters.page));
   if (filters.per_page) params.set("per_page", String(filters.per_page));
+  if (filters.cursor) params.set("cursor", filters.cursor);
   if (filters.search) params.set("search", filters.search);
   if (filters.status) params.set("status", filters.status);
   if (filters.source) params.set("source", filters.source);
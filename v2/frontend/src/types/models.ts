@@ -141,7 +141,7 @@ export interface SpeakerMappingEntry {
   identifiedAt?: string | null;
   useForTraining?: boolean;
   identificationHistory?: IdentificationHistoryEntry[];
-  embedding?: number[] | null;
+  embeddingId?: number | null;
 }
 
 // ---------------------------------------------------------------------------
@@ -181,6 +181,8 @@ export interface Tag {
   name: string;
   color: string;
   created_at: string;
+  /** Ready recordings carrying this tag. */
+  recording_count?: number;
 }
 
 // ---------------------------------------------------------------------------
@@ -336,9 +338,12 @@ export interface SearchHistoryDetail {
 
 export interface PaginatedResponse<T> {
   data: T[];
-  total: number;
+  /** Null on cursor pages, where the count is skipped. */
+  total: number | null;
   page: number;
   per_page: number;
+  /** Pass back as `cursor` for the next page (GET /api/recordings). */
+  next_cursor?: string | null;
 }
 
 export interface ErrorResponse {
@@ -361,6 +366,7 @@ export interface SyncTriggerResponse {
 export interface RecordingFilters {
   page?: number;
   per_page?: number;
+  cursor?: string;
   search?: string;
   status?: RecordingStatus;
   source?: RecordingSource;
@@ -112,7 +112,9 @@ def normalize_entry(entry: dict, participant_lookup: dict[str, str]) -> dict:
         "useForTraining": uft,
     }
 
-    # Keep embedding as-is
+    # Keep embedding reference (or a legacy inline embedding) as-is
+    if "embeddingId" in entry:
+        result["embeddingId"] = entry["embeddingId"]
     if "embedding" in entry:
         result["embedding"] = entry["embedding"]
 